@@ -7,13 +7,22 @@ from backend.app.ChromaDbManager import ChromaDbManager
 from backend.app.RagChatApp import RAGChatApp
 from backend.app.systemMessageManager import SystemMessageManager
 from backend.app.auth_session_service import SessionService
+from backend.app.SessionActivityTracker import get_session_tracker
 from backend.app.auth_middleware import DatabasePool
 from backend.app.auth_service import AuthService
+from backend.app.LLMRateLimiter import set_current_user, reset_current_user
+from backend.app.RequestTracer import start_trace, end_trace, trace_span, get_stage_metrics
+from backend.app.MetricsRegistry import get_metrics_registry
+from backend.app.PasswordHasher import PasswordHasherBusy
+from backend.app.UploadSpool import UploadRequest, materialize_upload, discard_upload
+from backend.app.ExtractTextFromFile import PDF_ENGINES
+from backend.app.ollamaOptimizer import ModelNotAvailableError
 
 from flask import Blueprint, Flask, request, Response, jsonify, make_response
 from flask_cors import CORS
 import logging, json
 import traceback
+import hmac
 from fastapi import FastAPI, HTTPException
 from pydantic import BaseModel
 from typing import List
@@ -26,6 +35,7 @@ import jwt
 from functools import wraps
 from dotenv import load_dotenv
 import os
+import time
 
 load_dotenv()
 
@@ -68,6 +78,9 @@ os.environ["FILLTERED_DOC_NUMBER"] = '5'
   
 app = Flask(__name__)
 # Flask 서버 설정
+# 업로드 파일은 요청 파싱 단계에서 바로 uploads/ 에 청크 단위로 기록 (UploadRequest)
+app.request_class = UploadRequest
+app.config['UPLOAD_FOLDER'] = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'uploads'))
 
 CORS(app, resources={
     r"/api/*": {  
@@ -80,6 +93,26 @@ CORS(app, resources={
 
 auth_bp = Blueprint('auth', __name__)
 
+# 메트릭 (GET /metrics 에서 Prometheus 텍스트 형식으로 노출)
+metrics = get_metrics_registry()
+HTTP_REQUESTS = metrics.counter("rag_http_requests_total", "HTTP requests by route", ["route", "method", "status"])
+HTTP_LATENCY = metrics.histogram("rag_http_request_duration_seconds", "HTTP request latency by route", ["route", "method"])
+INGESTION_IN_PROGRESS = metrics.gauge("rag_ingestion_queue_depth", "Uploads waiting for or in extraction/embedding")
+
+@app.before_request
+def start_request_timer():
+    request._metrics_started = time.perf_counter()
+
+@app.after_request
+def record_request_metrics(response):
+    started = getattr(request, '_metrics_started', None)
+    if started is not None:
+        # URL 패턴 기준으로 집계 (경로 파라미터별로 시계열이 늘어나지 않도록)
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        HTTP_REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+        HTTP_LATENCY.observe(time.perf_counter() - started, route=route, method=request.method)
+    return response
+
 
 # 서비스 초기화
 auth_service = AuthService(
@@ -88,6 +121,9 @@ auth_service = AuthService(
     jwt_expiration_delta=JWT_EXPIRATION_DELTA
 )
 
+# 세션 last_accessed 일괄 반영 및 만료 세션 정리 (백그라운드)
+get_session_tracker().start(dbpool)
+
 # JWT 인증 데코레이터
 def require_auth(f):
     @wraps(f)
@@ -99,11 +135,28 @@ def require_auth(f):
         token = auth_header.split(' ')[1]
         try:
             request.user = auth_service.verify_token(token)
-            return f(*args, **kwargs)
         except ValueError as e:
             return jsonify({'message': str(e)}), 401
+        # LLM 속도 제한기의 사용자별 공정 스케줄링 단위 (요청이 끝나면 원래 값으로 복원)
+        user_token = set_current_user(request.user.get('username'))
+        try:
+            return f(*args, **kwargs)
+        finally:
+            reset_current_user(user_token)
     return decorated
 
+def stream_as_current_user(events):
+    """SSE 스트림은 require_auth 가 반환된 뒤에 소비되므로, 스트림을 읽는 동안 요청 사용자를 다시 설정"""
+    username = request.user.get('username')
+
+    def generate():
+        user_token = set_current_user(username)
+        try:
+            yield from events
+        finally:
+            reset_current_user(user_token)
+    return generate()
+
 def require_admin(f):
     @require_auth
     @wraps(f)
@@ -164,6 +217,11 @@ def login():
                 'error_code': error_code
             }), 401
             
+        except PasswordHasherBusy as e:
+            response = jsonify({'message': str(e), 'error_code': 'SERVER_BUSY'})
+            response.headers['Retry-After'] = '1'
+            return response, 503
+
         except Exception as e:
             logger.error(f"Login error: {str(e)}")
             return jsonify({'message': str(e)}), 500
@@ -721,6 +779,15 @@ file_handler.setFormatter(logging.Formatter(
 logger.addHandler(file_handler)
 
 
+# 모델 미설치: 요청 경로에서는 pull 하지 않으므로 바로 503 (관리자 워밍업 API 로 설치)
+@app.errorhandler(ModelNotAvailableError)
+def handle_model_not_available(e):
+    return jsonify({
+        "success": False,
+        "error": str(e),
+        "message": "model not available"
+    }), 503
+
 # 전역 에러 핸들러
 @app.errorhandler(Exception)
 def handle_exception(e):
@@ -742,6 +809,49 @@ else:
 rag_app = RAGChatApp(db_type=db_type)
 message_manager = SystemMessageManager()
 
+def collect_db_pool_metrics():
+    """인증 DB 연결 풀 사용 현황"""
+    pool = getattr(dbpool, '_pool', None)
+    if pool is None:
+        return []
+    in_use = len(getattr(pool, '_used', {}))
+    idle = len(getattr(pool, '_pool', []))
+    return [
+        ('rag_db_pool_connections', {'state': 'in_use'}, in_use),
+        ('rag_db_pool_connections', {'state': 'idle'}, idle),
+        ('rag_db_pool_connections', {'state': 'max'}, getattr(pool, 'maxconn', 0)),
+    ]
+
+_collection_counts_cache = {'expires_at': 0.0, 'samples': []}
+COLLECTION_COUNTS_TTL = float(os.getenv('METRICS_COLLECTION_TTL', '60'))
+
+def collect_collection_chunk_counts():
+    """컬렉션별 청크 수 (스크랩마다 조회하지 않도록 TTL 캐시)"""
+    now = time.monotonic()
+    if now >= _collection_counts_cache['expires_at']:
+        counts = db_manager.get_collection_chunk_counts() if hasattr(db_manager, 'get_collection_chunk_counts') else {}
+        _collection_counts_cache['samples'] = [
+            ('rag_collection_chunks', {'collection': name}, count) for name, count in counts.items()
+        ]
+        _collection_counts_cache['expires_at'] = now + COLLECTION_COUNTS_TTL
+    return _collection_counts_cache['samples']
+
+def collect_stage_latency():
+    """RequestTracer 단계별 지연 시간 히스토그램 (밀리초 버킷)"""
+    samples = []
+    for stage, hist in get_stage_metrics().snapshot().items():
+        for le, count in hist['buckets'].items():
+            samples.append(('rag_stage_latency_ms_bucket', {'stage': stage, 'le': le}, count))
+        samples.append(('rag_stage_latency_ms_count', {'stage': stage}, hist['count']))
+        samples.append(('rag_stage_latency_ms_sum', {'stage': stage}, hist['sum_ms']))
+    return samples
+
+metrics.register_collector('rag_db_pool_connections', 'gauge', 'Auth DB connection pool usage', collect_db_pool_metrics)
+metrics.register_collector('rag_collection_chunks', 'gauge', 'Chunks per collection', collect_collection_chunk_counts)
+metrics.register_collector('rag_stage_latency_ms', 'histogram', 'RAG pipeline stage latency in milliseconds', collect_stage_latency)
+# 토큰 없이 공개할 때 제외하는 메트릭 (컬렉션 이름이 라벨로 노출됨)
+ANONYMOUS_EXCLUDED_METRICS = ('rag_collection_chunks',)
+
 def document_to_dict(document):
     """Document 객체를 dictionary로 변환합니다."""
     try:
@@ -1131,15 +1241,6 @@ def check_file_exists():
 @require_auth
 def upload_and_embed():
     try:
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        UPLOAD_FOLDER = os.path.abspath(os.path.join(current_dir, 'uploads'))
-        logger.debug(f"Upload folder path: {UPLOAD_FOLDER}")
-        
-        if not os.path.exists(UPLOAD_FOLDER):
-            os.makedirs(UPLOAD_FOLDER)
-
-        app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-
         if 'file' not in request.files:
             return jsonify({'error': 'No file part'}), 400
             
@@ -1148,31 +1249,132 @@ def upload_and_embed():
             return jsonify({'error': 'No selected file'}), 400
         
         collection = request.form['collection']
+        # 업로드별 PDF 추출 엔진 (없으면 PDF_ENGINE 환경 변수 기본값)
+        pdf_engine = request.form.get('pdf_engine') or None
+        if pdf_engine and pdf_engine.lower() not in PDF_ENGINES:
+            return jsonify({'error': f"pdf_engine must be one of {', '.join(PDF_ENGINES)}"}), 400
         
         if file:
             filename = file.filename
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], filename)
-            file.save(filepath)
-                    
+            filepath = None
+            INGESTION_IN_PROGRESS.inc()
             try:
-                text = db_manager.extract_text_from_file(filepath, filename)
-                chunks_stored = db_manager.split_embed_docs_store(text, filename, collection)
+                # 요청 본문을 받은 파일을 rename 으로 확정 (추가 복사 없음), 이후 경로 기반 리더 사용
+                filepath = materialize_upload(file, filename)
+                if db_manager.extractor.is_streamable(filename):
+                    # CSV/TSV 는 행 묶음 단위로 읽으며 바로 임베딩/저장 (메모리 사용량 일정)
+                    docs = db_manager.extractor.iter_csv_documents(filepath, filename)
+                    chunks_stored = db_manager.split_embed_docs_stream(docs, filename, collection)
+                else:
+                    text = db_manager.extract_text_from_file(filepath, filename, pdf_engine=pdf_engine)
+                    chunks_stored = db_manager.split_embed_docs_store(text, filename, collection)
                 if chunks_stored >0:
                     return jsonify({'success': True, 'chunks_stored': chunks_stored})
                 else: 
                     return jsonify({'success': False, 'error': f'{chunks_stored} 저장이 않됨됨'})
             finally:
-                if os.path.exists(filepath):
-                    try:
-                        os.remove(filepath)
-                        logger.debug(f"Temporary file {filepath} has been deleted.")
-                    except Exception as e:
-                        logger.error(f"Error deleting file {filepath}: {str(e)}")
+                INGESTION_IN_PROGRESS.dec()
+                if filepath:
+                    discard_upload(filepath)
     except Exception as e:
         logger.error(f"Error in upload_and_embed: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
 
+# API 크롤링 요청 한도 (CLI WebCrawler 는 별도 한도)
+CRAWL_API_MAX_SEEDS = int(os.getenv('CRAWL_API_MAX_SEEDS', '10'))
+CRAWL_API_MAX_PAGES = int(os.getenv('CRAWL_API_MAX_PAGES', '100'))
+CRAWL_API_MAX_DEPTH = int(os.getenv('CRAWL_API_MAX_DEPTH', '3'))
+
+
+def _bounded_int(data: dict, name: str, default: int, low: int, high: int) -> int:
+    """요청 JSON 의 정수 값을 [low, high] 로 제한. 정수가 아니면 ValueError"""
+    value = data.get(name, default)
+    if isinstance(value, bool) or not isinstance(value, (int, str)):
+        raise ValueError(f"{name} must be an integer")
+    try:
+        value = int(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an integer")
+    return min(max(value, low), high)
+
+
+@app.route('/api/crawl_and_embed', methods=['POST'])
+@require_auth
+def crawl_and_embed():
+    """
+    시작 URL 들에서 크롤링하며 바로 컬렉션에 임베딩/저장 (WebCrawler)
+
+    크롤링은 수 분이 걸릴 수 있으므로 백그라운드 작업으로 등록하고 202 와 작업 id 를 바로 돌려준다.
+    진행 상태와 결과는 /api/crawl_jobs/<job_id> 로 조회한다.
+    """
+    try:
+        data = request.json
+        if not data:
+            return jsonify({'error': 'No JSON data provided'}), 400
+
+        collection = data.get('collection')
+        urls = data.get('urls') or []
+        if isinstance(urls, str):
+            urls = [urls]
+        if not collection or not urls:
+            return jsonify({'error': 'Missing collection or urls'}), 400
+        if not isinstance(urls, list) or not all(isinstance(url, str) for url in urls):
+            return jsonify({'error': 'urls must be a list of strings'}), 400
+        if len(urls) > CRAWL_API_MAX_SEEDS:
+            return jsonify({'error': f'At most {CRAWL_API_MAX_SEEDS} urls are allowed'}), 400
+        try:
+            max_pages = _bounded_int(data, 'max_pages', 50, 1, CRAWL_API_MAX_PAGES)
+            max_depth = _bounded_int(data, 'max_depth', 1, 0, CRAWL_API_MAX_DEPTH)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        # playwright 는 크롤링을 쓸 때만 필요하므로 요청 시점에 불러옴
+        import asyncio
+        from backend.app.WebCrawler import crawl_into_collection, is_public_url
+        from backend.app.CrawlJobs import get_crawl_jobs
+
+        # 서버 내부망(사설/루프백/링크로컬, 클라우드 메타데이터 주소 등)으로의 요청 차단
+        blocked = [url for url in urls if not is_public_url(url)]
+        if blocked:
+            return jsonify({'error': 'URLs must be public http(s) addresses', 'urls': blocked}), 400
+
+        username = request.user.get('username')
+
+        def run():
+            user_token = set_current_user(username)
+            INGESTION_IN_PROGRESS.inc()
+            try:
+                return asyncio.run(crawl_into_collection(
+                    db_manager, db_type, collection, urls,
+                    max_pages=max_pages, max_depth=max_depth, block_private_hosts=True
+                ))
+            finally:
+                INGESTION_IN_PROGRESS.dec()
+                reset_current_user(user_token)
+
+        params = {'collection': collection, 'urls': urls, 'max_pages': max_pages, 'max_depth': max_depth}
+        job = get_crawl_jobs().submit(username, params, run)
+        if job is None:
+            return jsonify({'error': 'Too many crawl jobs in progress, try again later'}), 429
+        return jsonify({'success': True, 'job_id': job['job_id'], 'status': job['status'], 'params': params}), 202
+    except Exception as e:
+        logger.error(f"Error in crawl_and_embed: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/crawl_jobs/<job_id>', methods=['GET'])
+@require_auth
+def get_crawl_job(job_id):
+    """크롤링 작업 상태/결과 조회 (등록한 사용자만)"""
+    from backend.app.CrawlJobs import get_crawl_jobs
+
+    job = get_crawl_jobs().get(job_id)
+    if job is None or job['owner'] != request.user.get('username'):
+        return jsonify({'error': 'Crawl job not found'}), 404
+    chunks_stored = (job['report'] or {}).get('ingest', {}).get('chunks_stored', 0)
+    return jsonify({**job, 'chunks_stored': chunks_stored})
+
 @app.route('/api/get-all-documents-source', methods=['GET'])
 @require_auth
 def get_all_documents_source():
@@ -1243,9 +1445,12 @@ def get_all_documents_source():
 @app.route('/api/process_query', methods=['POST'])
 @require_auth
 def process_query():
+    trace = start_trace("api.process_query")
     try:
         data = request.json
         logger.debug(f"Received data: {data}")  # 전체 요청 데이터 로깅
+        # 단계별 소요 시간을 응답 메타데이터에 포함할지 여부
+        include_timings = bool(data.get('trace')) or request.args.get('trace') == '1'
 
         query = data.get('query')
         collection_names = data.get('collections', [])
@@ -1320,12 +1525,81 @@ def process_query():
         if docs:
             response['docs'] = [document_to_dict(doc) for doc in docs]
         
-        return jsonify(response), 200
+        if include_timings:
+            response['metadata']['timings'] = trace.to_dict()
+        
+        with trace_span("api.serialize"):
+            http_response = jsonify(response)
+        http_response.headers['Server-Timing'] = trace.server_timing()
+        return http_response, 200
         
+    except ModelNotAvailableError as e:
+        return jsonify({'error': str(e), 'message': 'model not available'}), 503
     except Exception as e:
         logger.error(f"Error in process_query: {str(e)}")
         logger.error(traceback.format_exc())
         return jsonify({'error': str(e)}), 500
+    finally:
+        end_trace()
+
+@app.route('/api/process_query_stream', methods=['POST'])
+@require_auth
+def process_query_stream():
+    """Ollama 응답을 토큰 조각 단위 SSE 로 전달 (검색 결과 문서는 첫 이벤트로 전달)"""
+    try:
+        data = request.json
+        if not data:
+            return jsonify({'error': 'No JSON data provided'}), 400
+
+        query = data.get('query')
+        collection_names = data.get('collections', [])
+        llm_model = data.get('llm_model')
+        select_sources = data.get('select_sources', [])
+        rag_mode = data.get('ragmode')
+        score_threshold = data.get('score_threshold')
+
+        if not all([query, collection_names, llm_model]):
+            return jsonify({'error': 'Missing required parameters: query, collections, llm_model'}), 400
+        if data.get('llm_name', 'Ollama') != 'Ollama':
+            return jsonify({'error': 'Streaming is only supported for Ollama'}), 400
+
+        # 스트림을 열기 전에 모델 설치 확인 (미설치면 503)
+        rag_app.ollama_processor.ensure_model_loaded(llm_model)
+
+        rag_app.set_system_message(data.get('system_message'))
+        docs = rag_app.perform_search(
+            query=query,
+            db_manager=db_manager,
+            collection_names=collection_names,
+            select_sources=select_sources,
+            score_threshold=score_threshold
+        )
+        if not docs and rag_mode == 'RAG':
+            return jsonify({'result': 'No matching documents found in any collection.', 'docs': []}), 200
+
+        # 검색 문서가 있으면 컨텍스트와 함께, 없으면 질문만 전달 (일반 LLM 질의)
+        if docs:
+            context = "\n".join(doc.page_content for doc in docs)
+            prompt = f"Context: {context}\n\nQuestion: {query}\n\n"
+        else:
+            prompt = query
+
+        def generate():
+            try:
+                yield f"data: {json.dumps({'type': 'docs', 'value': [document_to_dict(doc) for doc in docs or []]})}\n\n"
+                for event in rag_app.ollama_generate_stream(llm_model, prompt):
+                    yield f"data: {json.dumps(event)}\n\n"
+            except Exception as e:
+                logger.error(f"Error in process_query_stream: {str(e)}")
+                yield f"data: {json.dumps({'type': 'error', 'value': str(e)})}\n\n"
+
+        return Response(stream_as_current_user(generate()), content_type='text/event-stream')
+
+    except ModelNotAvailableError as e:
+        return jsonify({'error': str(e), 'message': 'model not available'}), 503
+    except Exception as e:
+        logger.error(f"Error in process_query_stream: {str(e)}")
+        return jsonify({'error': str(e)}), 500
 
 @app.route('/api/summarize-selectdocs', methods=['POST'])
 @require_auth
@@ -1440,7 +1714,7 @@ def summarize_sources():
                 error_msg = f"요약 프로세스 중 예기치 않은 오류 발생: {str(e)}\n{traceback.format_exc()}"
                 yield f"data: {json.dumps({'type': 'error', 'value': error_msg})}\n\n"
 
-        return Response(generate(), content_type='text/event-stream')
+        return Response(stream_as_current_user(generate()), content_type='text/event-stream')
 
     except ValueError as ve:
         return jsonify({"success": False, "error": str(ve)}), 400
@@ -1508,7 +1782,7 @@ def summarize_sse():
                 logger.error(error_msg)
                 yield f"data: {json.dumps({'type': 'error', 'value': error_msg})}\n\n"
 
-        return Response(generate(), content_type='text/event-stream')
+        return Response(stream_as_current_user(generate()), content_type='text/event-stream')
     
     except Exception as e:
         error_msg = f"API 처리 중 오류 발생: {str(e)}"
@@ -1629,8 +1903,8 @@ def summarize_page_content():
         )
 
         for result in generator:
-            if 'type' in result and result['type'] == 'progress':
-                # 진행 상황 처리는 건너뛰기
+            if 'type' in result and result['type'] in ('progress', 'info', 'warning'):
+                # 진행 상황/일부 청크 실패 알림은 건너뛰고 최종 결과까지 읽음
                 continue
             elif 'type' in result and result['type'] == 'error':
                 # 에러 처리
@@ -1643,9 +1917,15 @@ def summarize_page_content():
                 return jsonify({
                     'success': True,
                     'pages': result['pages'],
+                    'cache_hit': result.get('cache_hit', False),
                     'metadata': result.get('metadata', {})
                 })
 
+        return jsonify({
+            'success': False,
+            'error': "페이지 요약 결과가 없습니다."
+        })
+
     except Exception as e:
         error_msg = f"API 처리 중 오류 발생: {str(e)}"
         logger.error(f"{error_msg}\n{traceback.format_exc()}")
@@ -1747,6 +2027,77 @@ def get_current_db_config():
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/admin/ollama/warmup', methods=['POST'])
+@require_admin
+def warmup_ollama_models():
+    """Ollama 모델 워밍업/설치 (백그라운드 실행)"""
+    try:
+        data = request.get_json() or {}
+        models = data.get('models') or [m.strip() for m in os.getenv('OLLAMA_WARMUP_MODELS', '').split(',') if m.strip()]
+        if not models:
+            return jsonify({'error': 'No models specified'}), 400
+        
+        rag_app.ollama_processor.start_warmup(
+            models,
+            pull_missing=bool(data.get('pull', False)),
+            keep_alive=data.get('keep_alive')
+        )
+        return jsonify({'message': 'Warmup started', 'models': models}), 202
+    except Exception as e:
+        logger.error(f"Error starting Ollama warmup: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/ollama/models', methods=['GET'])
+@require_admin
+def get_ollama_model_stats():
+    """Ollama 모델 로드 상태 및 로드 지연 통계"""
+    try:
+        processor = rag_app.ollama_processor
+        running = []
+        try:
+            with processor.connection_pool as client:
+                running = [m.get('name') for m in client.list_running_models()]
+        except Exception as e:
+            logger.warning(f"Error listing running Ollama models: {str(e)}")
+        
+        return jsonify({
+            'running_models': running,
+            'load_stats': processor.get_model_stats()
+        }), 200
+    except Exception as e:
+        logger.error(f"Error getting Ollama model stats: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/metrics/latency', methods=['GET'])
+@require_auth
+def get_latency_metrics():
+    """RAG 요청 단계별 지연 시간 히스토그램"""
+    try:
+        return jsonify({'stages': get_stage_metrics().snapshot()}), 200
+    except Exception as e:
+        logger.error(f"Error getting latency metrics: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/metrics', methods=['GET'])
+def prometheus_metrics():
+    """
+    Prometheus 스크랩 엔드포인트 (METRICS_TOKEN 의 Bearer 토큰 필요)
+    METRICS_TOKEN 없이 METRICS_ALLOW_ANONYMOUS=true 로 공개하면 컬렉션 이름이 드러나는 메트릭은 제외
+    """
+    metrics_token = os.getenv('METRICS_TOKEN')
+    if metrics_token:
+        if not hmac.compare_digest(request.headers.get('Authorization', ''), f'Bearer {metrics_token}'):
+            return jsonify({'message': 'Missing or invalid token'}), 401
+        body = metrics.render()
+    elif os.getenv('METRICS_ALLOW_ANONYMOUS', 'false').lower() == 'true':
+        body = metrics.render(exclude=ANONYMOUS_EXCLUDED_METRICS)
+    else:
+        return jsonify({'message': 'Metrics are disabled until METRICS_TOKEN is configured'}), 403
+    return Response(body, mimetype='text/plain; version=0.0.4; charset=utf-8')
+
+
 @app.route('/api/health', methods=['GET'])
 @require_auth
 def health_check():
@@ -1758,7 +2109,7 @@ def health_check():
                 "type": db_type,
                 "connected": True
             },
-            "timestamp": datetime.datetime.now().isoformat()
+            "timestamp": datetime.now().isoformat()
         }
         
         # 데이터베이스 연결 확인
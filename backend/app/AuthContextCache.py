@@ -0,0 +1,116 @@
+from typing import Dict, Any, Optional, List
+from collections import OrderedDict
+import threading
+import logging
+import time
+import os
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+ADMIN_GROUP_ID = 'GRP000001'
+
+
+class AuthContextCache:
+    """
+    요청마다 DB를 조회하지 않도록 인증 컨텍스트를 메모리에 보관하는 캐시
+
+    - 토큰: 디코딩된 JWT 클레임 (토큰 만료 시각 또는 TTL 중 빠른 시점까지)
+    - 사용자: user_id, username, 소속 그룹 목록 (TTL, 그룹 변경 시 즉시 무효화)
+
+    여러 프로세스로 실행될 때는 다른 프로세스의 변경이 TTL 이내에 반영된다.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, max_tokens: int = 10000):
+        self.ttl = ttl if ttl is not None else float(os.getenv('AUTH_CACHE_TTL', '30'))
+        self.max_tokens = max_tokens
+        self._tokens: "OrderedDict[str, tuple]" = OrderedDict()
+        self._users: Dict[int, Dict[str, Any]] = {}
+        self._usernames: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    # --- 토큰 클레임 ---
+    def get_claims(self, token: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._tokens.get(token)
+            if entry is None:
+                return None
+            claims, expires_at = entry
+            if now >= expires_at:
+                del self._tokens[token]
+                return None
+            self._tokens.move_to_end(token)
+            # 호출자가 바꿔도(request.user 등) 캐시가 오염되지 않도록 복사본 반환
+            return dict(claims)
+
+    def put_claims(self, token: str, claims: Dict[str, Any]) -> None:
+        expires_at = time.time() + self.ttl
+        exp = claims.get('exp')
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, float(exp))
+        with self._lock:
+            self._tokens[token] = (dict(claims), expires_at)
+            self._tokens.move_to_end(token)
+            while len(self._tokens) > self.max_tokens:
+                self._tokens.popitem(last=False)
+
+    # --- 사용자 / 그룹 ---
+    def get_user(self, user_id: Optional[int] = None, username: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            if user_id is None and username is not None:
+                user_id = self._usernames.get(username)
+            if user_id is None:
+                return None
+            entry = self._users.get(int(user_id))
+            if entry is None or now >= entry['expires_at']:
+                return None
+            return dict(entry)
+
+    def put_user(self, user_id: int, username: str, group_ids: List[str]) -> Dict[str, Any]:
+        entry = {
+            'user_id': int(user_id),
+            'username': username,
+            'group_ids': frozenset(group_ids or []),
+            'is_admin': ADMIN_GROUP_ID in (group_ids or []),
+            'expires_at': time.time() + self.ttl
+        }
+        with self._lock:
+            self._users[int(user_id)] = entry
+            if username:
+                self._usernames[username] = int(user_id)
+        return entry
+
+    def invalidate_user(self, user_id: Optional[int] = None, username: Optional[str] = None) -> None:
+        """그룹 소속/활성 상태 변경 시 호출"""
+        with self._lock:
+            if user_id is None and username is not None:
+                user_id = self._usernames.get(username)
+            if user_id is None:
+                return
+            entry = self._users.pop(int(user_id), None)
+            if entry and entry.get('username'):
+                self._usernames.pop(entry['username'], None)
+        logger.debug(f"인증 캐시 무효화: user_id={user_id}")
+
+    def clear(self) -> None:
+        """그룹 삭제 등 전체 영향이 있는 변경 시 호출"""
+        with self._lock:
+            self._users.clear()
+            self._usernames.clear()
+
+
+_auth_cache: Optional[AuthContextCache] = None
+_auth_cache_lock = threading.Lock()
+
+
+def get_auth_context_cache() -> AuthContextCache:
+    """프로세스 전역 인증 컨텍스트 캐시"""
+    global _auth_cache
+    with _auth_cache_lock:
+        if _auth_cache is None:
+            _auth_cache = AuthContextCache()
+        return _auth_cache
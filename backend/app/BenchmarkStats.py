@@ -0,0 +1,26 @@
+from typing import List, Dict, Sequence
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> float:
+    """정렬된 값의 q 분위수 (0~100, 선형 보간 - numpy.percentile 기본 방식과 동일)"""
+    if not sorted_values:
+        raise ValueError("percentile of empty sequence")
+    position = (len(sorted_values) - 1) * q / 100.0
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """지연 시간 통계 (초 단위 표본 → 밀리초). 벤치마크 도구들이 같은 방식으로 p50/p95/p99 를 보고하도록 공유"""
+    if not samples:
+        return {'count': 0}
+    values = sorted(float(s) * 1000.0 for s in samples)
+    return {
+        'count': len(values),
+        'mean_ms': sum(values) / len(values),
+        'p50_ms': percentile(values, 50),
+        'p95_ms': percentile(values, 95),
+        'p99_ms': percentile(values, 99),
+        'max_ms': values[-1]
+    }
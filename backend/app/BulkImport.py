@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""
+디렉토리 / zip 아카이브 대량 적재
+
+디렉토리 트리(하위의 zip 포함) 또는 zip 파일의 문서를 프로세스 풀에서 병렬로 추출(ExtractTextFromFile)하고,
+추출 결과를 파일 경계와 무관하게 묶음으로 모아 한 번에 임베딩/저장한다 (store_document_batch).
+진행 상태는 SQLite 체크포인트에 기록하므로 중단 후 같은 명령으로 다시 실행하면 이어서 적재한다.
+
+건너뛰기 규칙:
+- 체크포인트에 완료로 기록된 파일: 크기/수정 시각이 같으면 해시도 계산하지 않고, 다르면 내용 SHA-256 을 비교해
+  같으면 건너뛰고 바뀌었으면 다시 적재 (새 청크 저장이 끝난 뒤 기존 청크 삭제)
+- 체크포인트에 없는 파일: 컬렉션에 같은 소스가 이미 있으면(check_source_exists) 건너뜀 (--replace-existing 이면 교체)
+- --force: 모두 다시 적재
+
+소스 이름(체크포인트 키와 같음)은 적재 경로 기준 상대 경로다. 디렉토리는 그 디렉토리 이름부터
+(docs/인사/규정.pdf), zip 항목은 아카이브 경로 뒤에 ! 와 항목 경로(docs/규정집.zip!2024/규정.pdf)를 붙인다.
+그래서 이름이 같은 다른 폴더의 파일이 한 소스로 합쳐지지 않는다.
+
+사용 예:
+    python -m backend.app.BulkImport /mnt/share/docs --collection 공유문서
+    python -m backend.app.BulkImport archive.zip --collection 규정집 --db postgres --workers 8 --output import.json
+"""
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Iterator
+import multiprocessing
+import argparse
+import tempfile
+import sqlite3
+import zipfile
+import hashlib
+import logging
+import shutil
+import json
+import sys
+import os
+import time
+
+from langchain.docstore.document import Document
+
+from backend.app.ExtractTextFromFile import ExtractTextFromFile, SUPPORTED_EXTENSIONS, PDF_ENGINES, READ_CHUNK_BYTES
+from backend.app.ExtractionCache import file_digest
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+DEFAULT_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+# 한 번에 임베딩/저장할 Document 수 (여러 파일의 Document 를 모아 채운다)
+BULK_BATCH_DOCS = int(os.getenv("BULK_BATCH_DOCS", "256"))
+DEFAULT_CHECKPOINT = "bulk_import.sqlite3"
+ARCHIVE_SEPARATOR = "!"
+
+STATUS_DONE = "done"
+STATUS_PENDING = "pending"
+STATUS_FAILED = "failed"
+
+
+class ImportCheckpoint:
+    """파일별 적재 상태 (컬렉션 + 파일 키 단위)"""
+
+    def __init__(self, path: str):
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS import_files (
+                collection TEXT NOT NULL,
+                file_key TEXT NOT NULL,
+                source TEXT,
+                size INTEGER,
+                mtime REAL,
+                digest TEXT,
+                status TEXT NOT NULL,
+                documents INTEGER DEFAULT 0,
+                error TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (collection, file_key)
+            )
+        """)
+        self._conn.commit()
+
+    def get(self, collection: str, file_key: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("""
+            SELECT source, size, mtime, digest, status, documents FROM import_files
+            WHERE collection = ? AND file_key = ?
+        """, (collection, file_key)).fetchone()
+        if row is None:
+            return None
+        return dict(zip(('source', 'size', 'mtime', 'digest', 'status', 'documents'), row))
+
+    def mark(self, collection: str, task: Dict[str, Any], status: str, digest: Optional[str] = None,
+             documents: int = 0, error: Optional[str] = None, commit: bool = True) -> None:
+        self._conn.execute("""
+            INSERT OR REPLACE INTO import_files
+                (collection, file_key, source, size, mtime, digest, status, documents, error, updated_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, (collection, task['key'], task['source'], task['size'], task['mtime'], digest, status,
+              documents, error, time.strftime('%Y-%m-%d %H:%M:%S')))
+        if commit:
+            self._conn.commit()
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+def _member_name(info: zipfile.ZipInfo) -> str:
+    """zip 항목 이름 (UTF-8 플래그가 없으면 한국어 Windows 압축 프로그램의 cp949 로 해석)"""
+    if info.flag_bits & 0x800:
+        return info.filename
+    try:
+        return info.filename.encode('cp437').decode('cp949')
+    except UnicodeError:
+        return info.filename
+
+
+def _relative_source(path: str, base: str) -> str:
+    """적재 기준 디렉토리에서의 상대 경로 (운영체제와 무관하게 / 구분)"""
+    return os.path.relpath(path, base).replace(os.sep, '/')
+
+
+def _archive_tasks(archive_path: str, archive_source: str) -> Iterator[Dict[str, Any]]:
+    with zipfile.ZipFile(archive_path) as zf:
+        for info in zf.infolist():
+            if info.is_dir():
+                continue
+            name = _member_name(info)
+            if os.path.splitext(name)[1].lower() not in SUPPORTED_EXTENSIONS:
+                continue
+            source = f"{archive_source}{ARCHIVE_SEPARATOR}{name}"
+            yield {
+                'key': source,
+                'path': archive_path,
+                'member': info.filename,
+                'source': source,
+                'size': info.file_size,
+                'mtime': time.mktime(info.date_time + (0, 0, -1))
+            }
+
+
+def discover(paths: List[str]) -> List[Dict[str, Any]]:
+    """적재 대상 파일 목록 (디렉토리는 하위까지, zip 은 내부 항목까지)"""
+    tasks = []
+    files = []
+    for path in paths:
+        path = os.path.abspath(path)
+        # 상대 경로 기준: 지정한 디렉토리/파일의 상위 디렉토리 (디렉토리 이름이 소스에 남도록)
+        base = os.path.dirname(path.rstrip(os.sep)) or path
+        if os.path.isdir(path):
+            for root, dirs, names in os.walk(path):
+                dirs.sort()
+                files.extend((os.path.join(root, name), base) for name in sorted(names))
+        else:
+            files.append((path, base))
+
+    for path, base in files:
+        ext = os.path.splitext(path)[1].lower()
+        source = _relative_source(path, base)
+        try:
+            if ext == '.zip':
+                tasks.extend(_archive_tasks(path, source))
+            elif ext in SUPPORTED_EXTENSIONS:
+                stat = os.stat(path)
+                tasks.append({
+                    'key': source,
+                    'path': path,
+                    'member': None,
+                    'source': source,
+                    'size': stat.st_size,
+                    'mtime': stat.st_mtime
+                })
+        except (OSError, zipfile.BadZipFile) as e:
+            logger.error(f"Skipping unreadable path {path}: {e}")
+    return tasks
+
+
+# ---- 추출 워커 (별도 프로세스) ----
+
+_worker_extractor: Optional[ExtractTextFromFile] = None
+_worker_pdf_engine: Optional[str] = None
+
+
+def _init_worker(pdf_engine: Optional[str]) -> None:
+    global _worker_extractor, _worker_pdf_engine
+    logging.basicConfig(level=logging.WARNING, stream=sys.stderr)
+    _worker_extractor = ExtractTextFromFile()
+    _worker_pdf_engine = pdf_engine
+
+
+def _member_digest(zf: zipfile.ZipFile, member: str) -> str:
+    digest = hashlib.sha256()
+    with zf.open(member) as f:
+        for block in iter(lambda: f.read(READ_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def extract_task(task: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    파일 하나 추출. 내용 해시가 known_digest 와 같으면 추출하지 않고 unchanged 로 반환
+
+    Document 대신 (본문, 메타데이터) 튜플로 돌려줘 프로세스 간 전달 비용을 줄인다.
+    """
+    start = time.perf_counter()
+    result = {'key': task['key'], 'status': STATUS_FAILED, 'digest': None, 'documents': [], 'error': None}
+    try:
+        if task['member'] is None:
+            result['digest'] = file_digest(task['path'])
+            if result['digest'] != task.get('known_digest'):
+                docs = _worker_extractor.extract_text_from_file(task['path'], task['source'],
+                                                                pdf_engine=_worker_pdf_engine)
+        else:
+            with zipfile.ZipFile(task['path']) as zf:
+                result['digest'] = _member_digest(zf, task['member'])
+                if result['digest'] != task.get('known_digest'):
+                    # 경로 기반 리더를 쓰도록 원래 파일명으로 임시 디렉토리에 풀어서 추출
+                    with tempfile.TemporaryDirectory(prefix="bulk-import-") as temp_dir:
+                        local_path = os.path.join(temp_dir, os.path.basename(task['member']))
+                        with zf.open(task['member']) as src, open(local_path, 'wb') as dst:
+                            shutil.copyfileobj(src, dst, READ_CHUNK_BYTES)
+                        docs = _worker_extractor.extract_text_from_file(local_path, task['source'],
+                                                                        pdf_engine=_worker_pdf_engine)
+
+        if result['digest'] == task.get('known_digest'):
+            result['status'] = 'unchanged'
+        else:
+            result['documents'] = [(doc.page_content, dict(doc.metadata)) for doc in docs or []]
+            result['status'] = 'extracted'
+    except Exception as e:
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['seconds'] = time.perf_counter() - start
+    return result
+
+
+# ---- 적재 ----
+
+class BulkImporter:
+    """
+    추출 결과를 모아 BULK_BATCH_DOCS 개 단위로 store_document_batch 호출
+
+    파일은 묶음에 들어갈 때 체크포인트에 pending, 묶음 저장이 끝나면 done 으로 기록한다.
+    이미 있는 소스의 기존 청크는 새 청크가 든 묶음 저장이 성공한 뒤에 지운다 (저장 실패 시 기존 청크 유지).
+    중단으로 pending 에 남은 파일은 다음 실행에서 다시 적재하며, 그때 남아 있던 청크를 모두 교체한다.
+    """
+
+    def __init__(self, db_manager, backend: str, collection: str, checkpoint: ImportCheckpoint,
+                 batch_docs: int = BULK_BATCH_DOCS, force: bool = False, replace_existing: bool = False):
+        self.db = db_manager
+        self.backend = backend
+        self.collection = collection
+        self.checkpoint = checkpoint
+        self.batch_docs = batch_docs
+        self.force = force
+        self.replace_existing = replace_existing
+        self._documents: List[Document] = []
+        self._pending: List[tuple] = []
+        self._sources_this_run = set()
+        self.stats = {'files': 0, 'imported': 0, 'unchanged': 0, 'skipped_existing': 0, 'failed': 0,
+                      'documents': 0, 'chunks_stored': 0, 'extract_seconds': 0.0, 'store_seconds': 0.0}
+        self.failures: List[Dict[str, str]] = []
+
+    def plan(self, task: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """추출이 필요한 작업이면 known_digest 를 채워 반환, 건너뛸 파일이면 None"""
+        record = None if self.force else self.checkpoint.get(self.collection, task['key'])
+        if record is None:
+            if not self.force and not self.replace_existing and \
+                    self.db.check_source_exists(self.collection, task['source']):
+                self.stats['skipped_existing'] += 1
+                return None
+            return dict(task, known_digest=None)
+        if record['status'] == STATUS_DONE:
+            if record['size'] == task['size'] and record['mtime'] == task['mtime']:
+                self.stats['unchanged'] += 1
+                return None
+            return dict(task, known_digest=record['digest'])
+        return dict(task, known_digest=None)
+
+    def handle(self, task: Dict[str, Any], result: Dict[str, Any]) -> None:
+        self.stats['extract_seconds'] += result.get('seconds', 0.0)
+        if result['status'] == 'unchanged':
+            # 수정 시각만 바뀐 파일: 다음 실행에서 해시를 다시 계산하지 않도록 갱신
+            self.checkpoint.mark(self.collection, task, STATUS_DONE, digest=result['digest'])
+            self.stats['unchanged'] += 1
+            return
+        if result['status'] != 'extracted' or not result['documents']:
+            error = result['error'] or "No text could be extracted from file"
+            self.checkpoint.mark(self.collection, task, STATUS_FAILED, digest=result['digest'], error=error)
+            self.stats['failed'] += 1
+            self.failures.append({'file': task['key'], 'error': error})
+            return
+
+        source = task['source']
+        # 바뀐 파일/중단된 적재의 이전 청크 id (묶음 저장이 성공하면 flush 에서 삭제)
+        stale_ids = []
+        if source not in self._sources_this_run and self.db.check_source_exists(self.collection, source):
+            stale_ids = self.db.get_ids_by_source(self.collection, source)
+        self._sources_this_run.add(source)
+
+        for content, metadata in result['documents']:
+            metadata['source'] = source
+            metadata['file_name'] = source
+            self._documents.append(Document(page_content=content, metadata=metadata))
+        self._pending.append((task, result['digest'], len(result['documents']), stale_ids))
+        self.checkpoint.mark(self.collection, task, STATUS_PENDING, digest=result['digest'])
+        if len(self._documents) >= self.batch_docs:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pending:
+            return
+        documents, pending = self._documents, self._pending
+        self._documents, self._pending = [], []
+        start = time.perf_counter()
+        try:
+            stored = self.db.store_document_batch(documents, self.collection)
+        except Exception as e:
+            logger.error(f"Failed to store batch of {len(documents)} documents: {e}")
+            for task, digest, _, _ in pending:
+                self.checkpoint.mark(self.collection, task, STATUS_FAILED, digest=digest, error=str(e), commit=False)
+                self.stats['failed'] += 1
+                self.failures.append({'file': task['key'], 'error': str(e)})
+            self.checkpoint.commit()
+            return
+        finally:
+            self.stats['store_seconds'] += time.perf_counter() - start
+
+        # 새 청크가 저장된 뒤에만 이전 청크 삭제
+        stale_ids = [i for _, _, _, ids in pending for i in ids]
+        if stale_ids:
+            self.db.delete_ids(self.collection, stale_ids)
+        for task, digest, count, _ in pending:
+            self.checkpoint.mark(self.collection, task, STATUS_DONE, digest=digest, documents=count, commit=False)
+        self.checkpoint.commit()
+        self.stats['imported'] += len(pending)
+        self.stats['documents'] += len(documents)
+        self.stats['chunks_stored'] += stored
+        logger.info(f"Stored {stored} chunks from {len(pending)} files "
+                    f"(imported {self.stats['imported']}, failed {self.stats['failed']})")
+
+    def run(self, tasks: List[Dict[str, Any]], workers: int, pdf_engine: Optional[str] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        self.stats['files'] = len(tasks)
+        planned = (job for job in map(self.plan, tasks) if job is not None)
+        max_in_flight = workers * 2
+
+        # 임베딩 모델/DB 연결을 가진 부모 프로세스를 fork 하지 않도록 spawn 사용
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                 initializer=_init_worker, initargs=(pdf_engine,)) as pool:
+            in_flight = {}
+            try:
+                for job in planned:
+                    in_flight[pool.submit(extract_task, job)] = job
+                    while len(in_flight) >= max_in_flight:
+                        self._collect(in_flight, wait(in_flight, return_when=FIRST_COMPLETED).done)
+                while in_flight:
+                    self._collect(in_flight, wait(in_flight, return_when=FIRST_COMPLETED).done)
+            except BaseException:
+                for future in in_flight:
+                    future.cancel()
+                raise
+            finally:
+                self.flush()
+
+        elapsed = time.perf_counter() - start
+        return {
+            'collection': self.collection,
+            'backend': self.backend,
+            'workers': workers,
+            **{k: round(v, 3) if isinstance(v, float) else v for k, v in self.stats.items()},
+            'seconds': round(elapsed, 3),
+            'files_per_second': round(self.stats['imported'] / elapsed, 2) if elapsed else None,
+            'failures': self.failures
+        }
+
+    def _collect(self, in_flight: Dict[Any, Dict[str, Any]], done) -> None:
+        for future in done:
+            task = in_flight.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # 워커 프로세스 자체가 죽은 경우 (BrokenProcessPool 등)
+                result = {'key': task['key'], 'status': STATUS_FAILED, 'digest': None, 'documents': [],
+                          'error': f"{type(e).__name__}: {e}"}
+            self.handle(task, result)
+
+
+def create_db_manager(backend: str, persist_directory: Optional[str] = None):
+    if backend == 'postgres':
+        from backend.app.PostgresDbManager import PostgresDbManager
+        return PostgresDbManager()
+    from backend.app.ChromaDbManager import ChromaDbManager
+    return ChromaDbManager(persist_directory or "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='디렉토리 / zip 아카이브 대량 적재')
+    parser.add_argument('paths', nargs='+', help='디렉토리, zip 파일 또는 문서 파일')
+    parser.add_argument('--collection', required=True, help='적재할 컬렉션 이름')
+    parser.add_argument('--db', choices=['chroma', 'postgres'], default=os.getenv('DB_TYPE', 'chroma').lower(),
+                        help='저장소 (기본값: DB_TYPE 환경 변수)')
+    parser.add_argument('--persist-directory', help='Chroma 저장 경로 (기본값: ChromaDbManager 기본 경로)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='추출 프로세스 수')
+    parser.add_argument('--batch-docs', type=int, default=BULK_BATCH_DOCS, help='한 번에 임베딩/저장할 Document 수')
+    parser.add_argument('--pdf-engine', choices=PDF_ENGINES, help='PDF 추출 엔진 (기본값: PDF_ENGINE 환경 변수)')
+    parser.add_argument('--checkpoint', default=DEFAULT_CHECKPOINT, help='체크포인트 SQLite 파일 경로')
+    parser.add_argument('--force', action='store_true', help='체크포인트/기존 소스와 무관하게 모두 다시 적재')
+    parser.add_argument('--replace-existing', action='store_true',
+                        help='체크포인트에 없는 파일도 컬렉션에 같은 소스가 있으면 교체')
+    parser.add_argument('--output', help='결과 JSON 파일 경로 (기본값: 표준 출력)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    tasks = discover(args.paths)
+    if not tasks:
+        parser.error('적재할 문서가 없습니다')
+    # 같은 상대 경로가 여러 번 나오면(이름이 같은 디렉토리를 함께 지정한 경우) 처음 것만 적재
+    unique = {}
+    for task in tasks:
+        if task['key'] in unique:
+            logger.warning(f"Skipping {task['path']}: source {task['key']} already comes from {unique[task['key']]['path']}")
+        else:
+            unique[task['key']] = task
+    tasks = list(unique.values())
+    logger.info(f"Discovered {len(tasks)} files")
+
+    db_manager = create_db_manager(args.db, args.persist_directory)
+    if args.db == 'postgres' and db_manager.get_collection_id(args.collection) is None:
+        parser.error(f"컬렉션이 없습니다: {args.collection} (먼저 생성하세요)")
+
+    checkpoint = ImportCheckpoint(args.checkpoint)
+    try:
+        importer = BulkImporter(db_manager, args.db, args.collection, checkpoint, batch_docs=args.batch_docs,
+                                force=args.force, replace_existing=args.replace_existing)
+        report = importer.run(tasks, max(1, args.workers), args.pdf_engine)
+    finally:
+        checkpoint.close()
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+    if report['failed']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,9 +5,24 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'backend/app'))
 from backend.app.ExtractTextFromFile import ExtractTextFromFile
 from backend.app.CustomSentenceTransformerEmbeddings import CustomSentenceTransformerEmbeddings as CSTFM
 from backend.app.QuoteExtractor import QuoteExtractor as QuoExt
+from backend.app.MapReduceSummarizer import MapReduceSummarizer
+from backend.app.LLMRateLimiter import get_current_user
+from backend.app.LLMRegistry import get_llm_registry
+from backend.app.RequestTracer import trace_span
+from backend.app.MetricsRegistry import get_metrics_registry
+from backend.app.SummaryCache import (SqliteSummaryCache, build_prompt_version,
+                                      compute_content_hash, build_cache_key)
+from backend.app.ChromaSourceIndex import ChromaSourceIndex
+from backend.app.TabularTextConverter import iter_batches
+from backend.app.ExtractionCache import get_extraction_cache
+from backend.app.ScoreCalibration import (SqliteCalibrationStore, ScoreCalibration, DEFAULT_CALIBRATION,
+                                          calibrate, sample_queries)
 
 from dotenv import load_dotenv
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import threading
+import math
 import chromadb
 import uuid
 import logging, traceback, re
@@ -20,14 +35,8 @@ from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain.docstore.document import Document
 import warnings
 from konlpy.tag import Kkma
-from sklearn.preprocessing import MinMaxScaler
 import numpy as np
-from langchain.chains.summarize import load_summarize_chain
-from langchain.prompts import PromptTemplate
-from langchain.text_splitter import TokenTextSplitter
-from typing import Union, List, Any
-# groq 라이브러리 import 수정
-import groq
+from typing import Union, List, Any, Dict, Optional
 from logging.handlers import RotatingFileHandler
 
       
@@ -35,6 +44,17 @@ logging.basicConfig(level=logging.DEBUG)
 logging.getLogger("langchain").setLevel(logging.ERROR)
 logger = logging.getLogger(__name__)
 
+SUMMARY_CACHE_FILE = "summary_cache.sqlite3"
+SOURCE_INDEX_FILE = "source_index.sqlite3"
+SCORE_CALIBRATION_FILE = "score_calibration.sqlite3"
+INGESTED_CHUNKS = get_metrics_registry().counter(
+    "rag_ingested_chunks_total", "Chunks stored in the vector store", ["backend"])
+SOURCE_SUMMARY_TEMPLATE = "다음 텍스트를 요약해주세요. 주요 포인트만 추출하여 간단명료하게 작성하세요:\n\n{text}\n\n요약:"
+# 한 번의 add/upsert 호출에 넣을 청크 수 (클라이언트 최대 배치 크기를 넘지 않음)
+CHROMA_ADD_BATCH_SIZE = int(os.getenv("CHROMA_ADD_BATCH_SIZE", "256"))
+# 여러 컬렉션 동시 검색 스레드 수
+CHROMA_SEARCH_WORKERS = int(os.getenv("CHROMA_SEARCH_WORKERS", "4"))
+
 class ChromaDbManager:
     distance_metric = "l2"  # 클래스 속성으로 이동
     def __init__(self, persist_directory=""):
@@ -48,7 +68,17 @@ class ChromaDbManager:
             self.config_file = "chroma_config.json"
             self.embeddings = CSTFM()
             self.client = self._create_client()
+            self.summary_cache = SqliteSummaryCache(os.path.join(self.persist_directory, SUMMARY_CACHE_FILE))
+            self.source_index = ChromaSourceIndex(os.path.join(self.persist_directory, SOURCE_INDEX_FILE))
+            self.score_calibration = SqliteCalibrationStore(os.path.join(self.persist_directory, SCORE_CALIBRATION_FILE))
+            self.llm_registry = get_llm_registry()
             self.vectordb = None
+            # 컬렉션 핸들 / LangChain 래퍼 캐시 (컬렉션 이름별로 한 번만 생성)
+            self._collections: Dict[str, Any] = {}
+            self._vectordbs: Dict[str, Chroma] = {}
+            self._handle_lock = threading.Lock()
+            self._search_executor = ThreadPoolExecutor(max_workers=CHROMA_SEARCH_WORKERS,
+                                                       thread_name_prefix="chroma-search")
             #self.docnum = os.environ.get("DOC_NUM")
             #self.chunk_size = os.environ.get("CHUNK_SIZE")
             #self.chunk_overlap = os.environ.get("CHUNK_OVERLAP")
@@ -93,21 +123,109 @@ class ChromaDbManager:
     
         
     def get_or_create_collection(self, collection_name):
+            """컬렉션별 LangChain Chroma 래퍼 (캐시)"""
             try:
-                if self.vectordb is None or self.vectordb._collection.name != collection_name:
-                    self.vectordb = Chroma(
-                        collection_name=collection_name,
-                        embedding_function=self.embeddings,
-                        persist_directory=self.persist_directory,
-                    )
-                return self.vectordb
+                vectordb = self._vectordbs.get(collection_name)
+                if vectordb is None:
+                    with self._handle_lock:
+                        vectordb = self._vectordbs.get(collection_name)
+                        if vectordb is None:
+                            vectordb = Chroma(
+                                client=self.client,
+                                collection_name=collection_name,
+                                embedding_function=self.embeddings,
+                            )
+                            self._vectordbs[collection_name] = vectordb
+                self.vectordb = vectordb
+                return vectordb
             except Exception as e:
                 error_message = f"get_or_create_collection 오류: {e}"
                 logger.error(error_message)
                 return None   
+
+    def _get_collection(self, collection_name, create=False):
+        """
+        컬렉션 핸들 조회 (캐시). create=False 이면 없는 컬렉션에 대해 예외 발생.
+        """
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            with self._handle_lock:
+                collection = self._collections.get(collection_name)
+                if collection is None:
+                    if create:
+                        collection = self.client.get_or_create_collection(collection_name)
+                    else:
+                        collection = self.client.get_collection(collection_name)
+                    self._collections[collection_name] = collection
+        return collection
+
+    def _forget_collection(self, collection_name=None):
+        """컬렉션 삭제/저장 경로 변경 시 캐시된 핸들 제거"""
+        with self._handle_lock:
+            if collection_name is None:
+                self._collections.clear()
+                self._vectordbs.clear()
+                self.vectordb = None
+            else:
+                self._collections.pop(collection_name, None)
+                vectordb = self._vectordbs.pop(collection_name, None)
+                if vectordb is not None and self.vectordb is vectordb:
+                    self.vectordb = None
+
+    def _add_chunks(self, collection, texts: List[str], metadatas: List[Dict],
+                    ids: Optional[List[str]] = None, progress_callback=None) -> List[str]:
+        """
+        청크를 배치 단위로 임베딩 후 upsert
+
+        임베딩은 배치마다 한 번 계산해 전달하므로 컬렉션 임베딩 함수를 다시 호출하지 않는다.
+        """
+        if ids is None:
+            ids = [str(uuid.uuid4()) for _ in texts]
+        self._ensure_source_index(collection.name, collection)
+        try:
+            batch_size = min(CHROMA_ADD_BATCH_SIZE, self.client.get_max_batch_size())
+        except Exception:
+            batch_size = CHROMA_ADD_BATCH_SIZE
+        total = len(texts)
+        for start in range(0, total, batch_size):
+            end = min(start + batch_size, total)
+            batch_texts = texts[start:end]
+            embeddings = self._embed_chunks(batch_texts)
+            collection.upsert(
+                ids=ids[start:end],
+                embeddings=embeddings,
+                documents=batch_texts,
+                metadatas=metadatas[start:end]
+            )
+            self.source_index.add(collection.name, ids[start:end],
+                                  [(m or {}).get("source") for m in metadatas[start:end]])
+            if progress_callback:
+                progress_callback(end / total * 100)
+        return ids
+
+    def _ensure_source_index(self, collection_name, collection=None) -> bool:
+        """소스 인덱스가 없는 컬렉션이면 한 번 구축. 컬렉션이 없으면 False"""
+        if self.source_index.is_built(collection_name):
+            return True
+        try:
+            collection = collection or self._get_collection(collection_name)
+        except Exception:
+            return False
+        self.source_index.rebuild(collection_name, collection)
+        return True
     
-    def extract_text_from_file(self, file, file_name):
-        return self.extractor.extract_text_from_file(file, file_name)
+    def _embed_chunks(self, texts):
+        """청크 임베딩 (추출 캐시의 청크 해시별 임베딩을 재사용하고 나머지만 계산)"""
+        cache = get_extraction_cache()
+        if cache is None:
+            embeddings = self.embeddings.embed_documents(texts)
+        else:
+            model = getattr(self.embeddings, 'MODEL_NAME', type(self.embeddings).__name__)
+            embeddings = cache.embed_documents(model, texts, self.embeddings.embed_documents)
+        return embeddings.tolist() if isinstance(embeddings, np.ndarray) else embeddings
+
+    def extract_text_from_file(self, file, file_name, pdf_engine=None):
+        return self.extractor.extract_text_from_file(file, file_name, pdf_engine=pdf_engine)
     
     def set_persist_directory(self, new_directory):
         try:
@@ -116,7 +234,14 @@ class ChromaDbManager:
                 # 기존 클라이언트를 닫고 새로운 클라이언트를 생성
                 if hasattr(self, 'client'):
                     self.client.close()
+                self._forget_collection()
                 self.client = self._create_client()
+                self.summary_cache.close()
+                self.summary_cache = SqliteSummaryCache(os.path.join(self.persist_directory, SUMMARY_CACHE_FILE))
+                self.source_index.close()
+                self.source_index = ChromaSourceIndex(os.path.join(self.persist_directory, SOURCE_INDEX_FILE))
+                self.score_calibration.close()
+                self.score_calibration = SqliteCalibrationStore(os.path.join(self.persist_directory, SCORE_CALIBRATION_FILE))
         except Exception as e:
             error_message = f"set_persist_directory 오류 발생: {e}"
             logger.debug(f"{error_message}")
@@ -133,6 +258,10 @@ class ChromaDbManager:
     def delete_collection(self, collection_name):
         try:
             self.client.delete_collection(name=collection_name)
+            self._forget_collection(collection_name)
+            self.source_index.drop_collection(collection_name)
+            self.score_calibration.delete(collection_name)
+            self.summary_cache.invalidate(collection_name)
             #logger.debug(f"delete collection info: {self.client.get_collection(name=collection_name).count()}")
             return f"Collection '{collection_name}' deleted successfully."
         except ValueError as e:
@@ -305,37 +434,35 @@ class ChromaDbManager:
     
     def store_in_chroma(self, text, filename, collection_name, progress_callback=None):
         try:
-            collection = self.client.get_or_create_collection(collection_name)
-            
-            existing_docs = self.get_ids_by_source(collection_name=collection_name, source=filename)
-            if existing_docs[0]:
-                messagebox.showinfo("Success", f"문서 '{filename}'이(가) 이미 존재합니다. 업데이트합니다.")
-                chunks = self.chunk_text(text,self.chunk_size)
-                total_chunks = len(chunks)                    
-                for i, chunk in enumerate(chunks):
-                    collection.update(
-                        documents=[chunk],
-                        metadatas=[{"source": filename}],
-                        ids=existing_docs[0]
-                    )
-                    if progress_callback:
-                        progress_callback((i + 1) / total_chunks * 100)
+            collection = self._get_collection(collection_name, create=True)
             
+            chunk_size = int(self.chunk_size) if self.chunk_size is not None else 1000
+            chunk_overlap = int(self.chunk_overlap) if self.chunk_overlap is not None else 200
+            text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+            chunks = text_splitter.split_text(text)
+            total_chunks = len(chunks)
+
+            # 이미 있는 문서는 새 청크를 모두 저장한 뒤 기존 청크를 지움 (저장이 실패하면 기존 청크 유지)
+            existing_ids = self.get_ids_by_source(collection_name=collection_name, source=filename)
+            if existing_ids:
+                logger.info(f"문서 '{filename}'이(가) 이미 존재합니다. 업데이트합니다.")
             else:
-                messagebox.showinfo("Success", f"새 문서 '{filename}'을(를) 추가합니다.")
-                chunks = self.chunk_text(text, self.chunk_size)
-                total_chunks = len(chunks)
-                ids = [str(uuid.uuid4()) for _ in chunks]
-                
-                for i, chunk in enumerate(chunks):
-                    collection.add(
-                        documents=[chunk],
-                        metadatas=[{"source": filename}],
-                        ids=[ids[i]]
-                    )
-                    if progress_callback:
-                        progress_callback((i + 1) / total_chunks * 100)       
+                logger.info(f"새 문서 '{filename}'을(를) 추가합니다.")
 
+            new_ids = [str(uuid.uuid4()) for _ in chunks]
+            try:
+                self._add_chunks(collection, chunks, [{"source": filename} for _ in chunks],
+                                 ids=new_ids, progress_callback=progress_callback)
+            except Exception:
+                # 일부만 저장된 새 청크를 지워 기존 내용만 남김
+                collection.delete(ids=new_ids)
+                self.source_index.remove_ids(collection_name, new_ids)
+                raise
+            if existing_ids:
+                self.delete_ids(collection_name, existing_ids)
+
+            self.summary_cache.invalidate(collection_name, [filename])
+            INGESTED_CHUNKS.inc(total_chunks, backend="chroma")
             return total_chunks
         except Exception as e:
             error_message = f"stor_in_chroma 오류 발생: {e}"
@@ -346,6 +473,17 @@ class ChromaDbManager:
     def get_list_collections(self):
         return [col.name for col in self.client.list_collections()]
     
+    def get_collection_chunk_counts(self):
+        """컬렉션별 청크 수 (Chroma count()는 메타데이터 세그먼트만 조회)"""
+        try:
+            counts = {}
+            for name in self.list_collections():
+                counts[name] = self._get_collection(name).count()
+            return counts
+        except Exception as e:
+            logger.error(f"get_collection_chunk_counts 오류 발생: {e}")
+            return {}
+    
     def split_embed_docs_store(self, text, file_name, collection_name):
         try:
             logger.info("Starting document processing")
@@ -360,28 +498,94 @@ class ChromaDbManager:
                 logger.warning("No chunks created from the document")
                 return 0
 
-            logger.info("Initializing embedding model")
-            embeddings = self.embeddings
-            logger.info("Creating Chroma vector store")
-            vectordb = Chroma.from_documents(
-                documents=chunks,
-                embedding=embeddings,
-                persist_directory=f"{self.persist_directory}/{collection_name}",
-                client=self.client,
-                collection_name=collection_name,
-                client_settings={"anonymized_telemetry":False}
+            # 배치 단위 임베딩 + upsert (청크마다 임베딩/쓰기를 반복하지 않음)
+            logger.info("Embedding and storing chunks in batches")
+            collection = self._get_collection(collection_name, create=True)
+            self._add_chunks(
+                collection,
+                [chunk.page_content for chunk in chunks],
+                [dict(chunk.metadata) for chunk in chunks]
             )
-            
-            logger.info("Persisting vector store")
                         
             logger.info("Verifying storage")
             count = self.verify_storage(collection_name)
             
+            # 재등록된 소스의 요약 캐시 무효화
+            self.summary_cache.invalidate(collection_name, [file_name])
+            INGESTED_CHUNKS.inc(len(chunks), backend="chroma")
+            
             return count
         except Exception as e:
             logger.error(f"Error in split_embed_docs_store: {str(e)}", exc_info=True)
             raise
 
+    def store_document_batch(self, documents, collection_name) -> int:
+        """
+        여러 파일의 Document 를 한 번에 분할/임베딩/저장 (소스는 각 Document 의 metadata['source'])
+
+        대량 적재(BulkImport)에서 파일 경계와 무관하게 임베딩 묶음을 채우는 용도. 저장한 청크 수 반환
+        """
+        chunk_size = int(self.chunk_size) if self.chunk_size is not None else 1000
+        chunk_overlap = int(self.chunk_overlap) if self.chunk_overlap is not None else 200
+        text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        chunks = text_splitter.split_documents(documents=documents)
+        if not chunks:
+            return 0
+        collection = self._get_collection(collection_name, create=True)
+        self._add_chunks(
+            collection,
+            [chunk.page_content for chunk in chunks],
+            [dict(chunk.metadata) for chunk in chunks]
+        )
+        sources = sorted({str(chunk.metadata.get("source")) for chunk in chunks})
+        self.summary_cache.invalidate(collection_name, sources)
+        INGESTED_CHUNKS.inc(len(chunks), backend="chroma")
+        return len(chunks)
+
+    def split_embed_docs_stream(self, documents, file_name, collection_name):
+        """
+        Document 이터러블(CSV 행 묶음 등)을 CHROMA_ADD_BATCH_SIZE 개씩 분할/임베딩/저장
+
+        전체 Document 목록을 만들지 않으므로 파일 크기와 무관하게 메모리 사용량이 일정하다.
+        도중에 실패하면 이번 실행에서 저장한 청크를 지우고 예외를 다시 던진다 (반쯤 적재된 소스가 남지 않도록).
+        """
+        stored_ids: List[str] = []
+        try:
+            chunk_size = int(self.chunk_size) if self.chunk_size is not None else 1000
+            chunk_overlap = int(self.chunk_overlap) if self.chunk_overlap is not None else 200
+            text_splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+            collection = self._get_collection(collection_name, create=True)
+
+            stored = 0
+            for batch in iter_batches(documents, CHROMA_ADD_BATCH_SIZE):
+                chunks = text_splitter.split_documents(documents=batch)
+                if not chunks:
+                    continue
+                ids = [str(uuid.uuid4()) for _ in chunks]
+                stored_ids.extend(ids)
+                self._add_chunks(
+                    collection,
+                    [chunk.page_content for chunk in chunks],
+                    [dict(chunk.metadata) for chunk in chunks],
+                    ids=ids
+                )
+                stored += len(chunks)
+                INGESTED_CHUNKS.inc(len(chunks), backend="chroma")
+                logger.info(f"Stored {stored} chunks from {file_name}")
+
+            if not stored:
+                logger.warning("No chunks created from the document")
+                return 0
+
+            self.summary_cache.invalidate(collection_name, [file_name])
+            return self.verify_storage(collection_name)
+        except Exception as e:
+            logger.error(f"Error in split_embed_docs_stream: {str(e)}", exc_info=True)
+            if stored_ids:
+                removed = self.delete_ids(collection_name, stored_ids)
+                logger.warning(f"Removed {removed} chunks of {file_name} stored before the failure")
+            raise
+
     
         
         
@@ -405,54 +609,96 @@ class ChromaDbManager:
     # query = "document search"
     # reranked_results = rerank_with_advanced_model(query, initial_results, top_k=5)
 
+    @staticmethod
+    def _relevance_score(distance: float, space: str) -> float:
+        """거리 -> 관련도 (LangChain Chroma 의 relevance score 함수와 동일한 변환)"""
+        if space == "cosine":
+            return 1.0 - distance
+        if space == "ip":
+            return 1.0 - distance if distance > 0 else -distance
+        return 1.0 - distance / math.sqrt(2)
+
+    def _query_collection(self, collection_name, query_embedding, n_results, where):
+        """단일 컬렉션 벡터 검색 (검색 스레드에서 실행)"""
+        try:
+            collection = self._get_collection(collection_name)
+        except Exception as e:
+            logger.warning(f"Collection '{collection_name}' not found: {e}")
+            return []
+        with trace_span("search.vector_query"):
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=n_results,
+                where=where,
+                include=["documents", "metadatas", "distances"]
+            )
+        space = (collection.metadata or {}).get("hnsw:space", self.distance_metric)
+        hits = []
+        for doc, metadata, distance in zip(results['documents'][0], results['metadatas'][0],
+                                           results['distances'][0]):
+            metadata = dict(metadata) if metadata else {}
+            metadata['collection'] = collection_name
+            hits.append((self._relevance_score(distance, space), doc, metadata))
+        return hits
+
     #similarity_threshold 값이 높을 수록 정확도가 높아짐
-    def search_collection(self, collection_name, query, n_results, source_name=None, similarity_threshold=0.7):
+    def search_collection(self, collection_names: Union[str, List[str]], query, n_results=5, source_name=None,
+                          score_threshold=None, similarity_threshold=0.7, calibrated=True):
         """
-        컬렉션을 검색하는 함수
+        컬렉션을 검색하는 함수 (여러 컬렉션은 병렬 검색 후 전체 top-k 병합)
         
         Args:
-            collection_name: 검색할 컬렉션 이름
+            collection_names: 검색할 컬렉션 이름 또는 이름 목록
             query: 검색 쿼리
             n_results: 반환할 결과 수
             source_name: 검색할 source 이름 (선택적)
+            score_threshold: 유사도 임계값 (PostgresDbManager 와 같은 인자 이름, 지정 시 우선)
             similarity_threshold: 유사도 임계값 (기본값: 0.7)
+            calibrated: 컬렉션별 보정값(ScoreCalibration) 적용 여부 (False 이면 원점수)
         Returns:
-            검색 결과 리스트
+            검색 결과 리스트 (score: 보정 점수, raw_score: 관련도 원점수)
         """
         try:
-            vectordb = self.get_or_create_collection(collection_name)
-            if not vectordb:
+            if isinstance(collection_names, str):
+                collection_names = [collection_names]
+            if not collection_names:
                 return []
+            threshold = score_threshold if score_threshold is not None else similarity_threshold
 
             n_results = int(n_results) if n_results is not None else 5
-            querytmp = QuoExt.extract_and_join(query)
+            with trace_span("search.quote_extract"):
+                querytmp = QuoExt.extract_and_join(query)
             #print(f"query ===: {querytmp}")
             
-            with warnings.catch_warnings():
-                warnings.simplefilter("ignore", UserWarning)
-                # source_name 유무와 관계없이 동일한 메서드 사용
-                results = vectordb.similarity_search_with_relevance_scores(
-                    querytmp,
-                    k=n_results,
-                    filter={"source": source_name} if source_name else None
-                )
-            
-            # 점수 정규화 및 결과 처리
-            if results:
-                scores = np.array([score for _, score in results]).reshape(-1, 1)
-                scaler = MinMaxScaler()
-                normalized_scores = scaler.fit_transform(scores).flatten()
-                
-                filtered_results = []
-                for (doc, _), score in zip(results, normalized_scores):
-                    if score >= similarity_threshold:
-                        filtered_results.append({
-                            'page_content': doc.page_content,
-                            'metadata': doc.metadata,
-                            'score': float(score)
-                        })
-                
-                return filtered_results
+            # 쿼리 임베딩은 한 번만 계산해 모든 컬렉션에 사용
+            with trace_span("search.embedding"):
+                query_embedding = self.embeddings.embed_query(querytmp)
+            if isinstance(query_embedding, np.ndarray):
+                query_embedding = query_embedding.tolist()
+            where = {"source": source_name} if source_name else None
+
+            if len(collection_names) == 1:
+                hits = self._query_collection(collection_names[0], query_embedding, n_results, where)
+            else:
+                futures = [self._search_executor.submit(self._query_collection, name,
+                                                        query_embedding, n_results, where)
+                           for name in collection_names]
+                hits = [hit for future in futures for hit in future.result()]
+
+            # 컬렉션별 보정 점수로 변환 (질의 결과 집합과 무관한 고정 변환)
+            calibrations = {name: (self.score_calibration.get(name) if calibrated else DEFAULT_CALIBRATION)
+                            for name in collection_names}
+            scored = [(calibrations[metadata['collection']].normalize(raw), raw, doc, metadata)
+                      for raw, doc, metadata in hits]
+
+            # 전체 컬렉션 기준 top-k
+            scored.sort(key=lambda hit: hit[0], reverse=True)
+            return [{
+                'page_content': doc,
+                'metadata': metadata,
+                'score': float(score),
+                'raw_score': float(raw)
+            } for score, raw, doc, metadata in scored[:n_results] if score >= threshold]
                 
         except Exception as e:
             logger.error(f"Error in search_collection: {str(e)}")
@@ -460,27 +706,43 @@ class ChromaDbManager:
        
     
         
+    def calibrate_scores(self, collection_name, num_queries=200, k=10, queries=None) -> Optional[ScoreCalibration]:
+        """
+        컬렉션의 청크 일부(또는 queries 로 받은 실제 질의)로 검색해 점수 보정값을 계산하고 저장 (오프라인 작업)
+        """
+        try:
+            collection = self._get_collection(collection_name)
+            total = collection.count()
+            if not total:
+                return None
+            limit = min(total, num_queries * 2)
+            offset = np.random.randint(0, max(1, total - limit + 1))
+            texts = collection.get(include=["documents"], limit=limit, offset=int(offset))['documents']
+
+            def raw_search(query):
+                # 질의를 뽑은 청크 자신을 제외할 수 있도록 한 개 더 조회
+                return self.search_collection(collection_name, query, n_results=k + 1,
+                                              score_threshold=-1.0, calibrated=False)
+
+            calibration = calibrate(raw_search, queries or sample_queries(texts, num_queries), k)
+            if calibration.is_default:
+                return None
+            self.score_calibration.put(collection_name, calibration)
+            logger.info(f"Score calibration for '{collection_name}': {calibration.to_dict()}")
+            return calibration
+        except Exception as e:
+            logger.error(f"calibrate_scores 오류 발생: {e}")
+            return None
+
     def get_all_documents_source(self, collection_name, source_search):
         try:
-            collection = self.client.get_collection(collection_name)
-            all_docs = collection.get()
-            
+            # 소스 인덱스 조회 (컬렉션 전체를 읽지 않음)
+            if not self._ensure_source_index(collection_name):
+                return []
             if source_search is None or len(source_search) == 0:
                 # source_search가 비어있으면 모든 결과 반환  100개로 제한
-                all_sources = list(dict.fromkeys(metadata.get('source', 'Unknown') for metadata in all_docs['metadatas']))[:100]  # 최대 100개로 제한
-                filtered_sources = []
-                for s in all_sources:
-                    filtered_sources.append(s)
-                # logger.debug(filtered_sources)   
-                return filtered_sources
-            else:
-                all_sources = list(dict.fromkeys(metadata.get('source', 'Unknown') for metadata in all_docs['metadatas']))
-                filtered_sources = []
-                for s in all_sources:
-                    if source_search.lower() in s.lower():
-                        if not any(fs.lower() == s.lower() for fs in filtered_sources):
-                            filtered_sources.append(s)       
-                return filtered_sources
+                return self.source_index.list_sources(collection_name, limit=100)
+            return self.source_index.list_sources(collection_name, search=source_search)
         except Exception as e:
             error_message = f"get_all_documents_source 오류 발생: {e}"
             logger.debug(f"{error_message}")
@@ -488,7 +750,7 @@ class ChromaDbManager:
     
     def get_documents_by_source(self, collection_name, sources):
         try:
-            collection = self.client.get_collection(collection_name)
+            collection = self._get_collection(collection_name)
             
             #logger.debug(f"Searching for documents with sources: {sources}")
             
@@ -516,17 +778,9 @@ class ChromaDbManager:
     
     def get_ids_by_source(self, collection_name, source):
         try:
-            collection = self.client.get_collection(collection_name)
-            
-            #logger.debug(f"Searching for document IDs with source '{source}'")
-            
-            results = collection.query(
-                query_texts=[""],  # 빈 쿼리 텍스트
-                where={"source": source},
-                include=["ids"]
-            )
-
-            matching_ids = results['ids'][0]  # 'ids'는 리스트의 리스트 형태로 반환됩니다
+            if not self._ensure_source_index(collection_name):
+                return []
+            matching_ids = self.source_index.get_ids(collection_name, str(source))
             
             if matching_ids:
                 logger.debug(f"Found {len(matching_ids)} document(s) with source '{source}'")
@@ -538,6 +792,24 @@ class ChromaDbManager:
             error_message = f"get_ids_by_source 오류 발생: {e}"
             logger.debug(f"{error_message}")
             return []
+
+    def delete_ids(self, collection_name: str, ids: List[str]) -> int:
+        """
+        문서 ID 로 청크 삭제 (재적재 시 새 청크를 저장한 뒤 이전 청크만 지우는 용도). 삭제한 청크 수 반환
+
+        요약 캐시는 새 청크를 저장할 때(store_document_batch) 이미 무효화된다.
+        """
+        if not ids:
+            return 0
+        try:
+            collection = self._get_collection(collection_name)
+            self._ensure_source_index(collection_name, collection)
+            collection.delete(ids=list(ids))
+            self.source_index.remove_ids(collection_name, ids)
+            return len(ids)
+        except Exception as e:
+            logger.error(f"Error deleting ids from collection '{collection_name}': {str(e)}")
+            return 0
         
         
     def delete_source(self, collection_name: str, sources: Union[str, List[str], 'FileObject', List['FileObject']]) -> dict:
@@ -553,7 +825,8 @@ class ChromaDbManager:
             dict: A dictionary containing the results of the deletion operation.
         """
         try:
-            collection = self.client.get_collection(collection_name)
+            collection = self._get_collection(collection_name)
+            self._ensure_source_index(collection_name, collection)
             
             if not isinstance(sources, list):
                 sources = [sources]
@@ -565,9 +838,13 @@ class ChromaDbManager:
                     if not isinstance(source, str):
                         source = os.path.basename(source.name)
                     
-                    delete_result = collection.delete(where={"source": str(source)})
+                    # 소스 인덱스의 id 로 삭제 (Chroma delete 는 삭제 건수를 돌려주지 않음)
+                    ids = self.source_index.get_ids(collection_name, str(source))
+                    if ids:
+                        collection.delete(ids=ids)
+                        self.source_index.remove_source(collection_name, str(source))
                     
-                    if delete_result:
+                    if ids:
                         logger.info(f"Successfully deleted documents with source '{source}' from collection '{collection_name}'")
                         results["successful"].append(source)
                     else:
@@ -577,6 +854,9 @@ class ChromaDbManager:
                     logger.error(f"Error deleting source '{source}' from collection '{collection_name}': {str(inner_e)}")
                     results["failed"].append(source)
             
+            # 삭제된 소스의 요약 캐시 무효화
+            if results["successful"]:
+                self.summary_cache.invalidate(collection_name, results["successful"])
             return results
         except Exception as e:
             logger.error(f"Error accessing collection '{collection_name}': {str(e)}")
@@ -584,29 +864,18 @@ class ChromaDbManager:
     
     def check_source_exists(self, collection_name, source):
         try:
-            collection = self.client.get_collection(collection_name)
+            # 파일 객체는 파일 이름만, 문자열 소스(상대 경로, URL)는 저장된 그대로 비교
             if not isinstance(source, str): #파일 객체인 경우
-                source = source.name   
-            source = os.path.basename(source)   
-           
-            try:
-                results = collection.get(
-                    where={"source": str(source)},
-                    include=["metadatas"]
-                )                
-                
-                # metadatas가 비어있지 않으면 문서가 존재한다고 판단
-                exists = len(results['metadatas']) > 0
-                
-                if exists:                    
-                    logger.debug(f"Documents with source '{source}' exist in the collection")
-                else:
-                    logger.debug(f"No documents with source '{source}' found in the collection")
-                            
-                return exists
-            except Exception as e:
-                logger.debug(f"Error querying the database: {str(e)}")
+                source = os.path.basename(source.name)
+            if not self._ensure_source_index(collection_name):
                 return False
+           
+            exists = self.source_index.exists(collection_name, str(source))
+            if exists:                    
+                logger.debug(f"Documents with source '{source}' exist in the collection")
+            else:
+                logger.debug(f"No documents with source '{source}' found in the collection")
+            return exists
         except Exception as e:
             error_message = f"check_source_exits 오류 발생: {e}"
             logger.debug(f"{error_message}")
@@ -616,10 +885,12 @@ class ChromaDbManager:
     # summary = summarize_documents_from_source("my_collection", "example_source", "gpt-3.5-turbo")
 
     def summarize_documents_from_source(self, collection_name, sources, llm_name, llm_model):
+        # 생성기는 요청 처리 후에 소비될 수 있으므로 호출 시점의 사용자를 보관
+        user_id = get_current_user()
+
         def generator():
             try:
-                client = self.client
-                collection = client.get_collection(collection_name)
+                collection = self._get_collection(collection_name)
                 all_documents = []
                 
                 total_steps = len(sources) + 3  # 소스 처리 + LLM 초기화 + 텍스트 분할 + 최종 요약
@@ -634,80 +905,49 @@ class ChromaDbManager:
                     current_step += 1
                     yield {'type': 'progress', 'value': (current_step / total_steps) * 100}
 
-                # LLM 초기화
-                if llm_name == "Ollama":
-                    from langchain_community.llms import Ollama
-                    llm = Ollama(model=llm_model)
-                elif llm_name == "Openai":
-                    from langchain_community.chat_models import ChatOpenAI
-                    llm = ChatOpenAI(model_name=llm_model, max_tokens=1024)
-                elif llm_name == "Groq":
-                    from langchain_groq import ChatGroq
-                    llm = ChatGroq(model_name=llm_model, max_tokens=1024)
-                else:
-                    raise ValueError(f"Unsupported LLM: {llm_name}")
+                # 요약 캐시 조회
+                model = f"{llm_name}-{llm_model}"
+                prompt_version = build_prompt_version(SOURCE_SUMMARY_TEMPLATE)
+                content_hash = compute_content_hash(doc.page_content for doc in all_documents)
+                cache_key = build_cache_key(collection_name, sources, "all", model,
+                                            prompt_version, content_hash)
+                cached = self.summary_cache.get(cache_key)
+                if cached is not None:
+                    yield {'type': 'info', 'value': "저장된 요약 결과를 사용합니다."}
+                    yield {'type': 'progress', 'value': 100}
+                    yield {'type': 'summary', 'value': cached, 'cache_hit': True}
+                    return
+
+                # 요약 체인 조회 (LLM 클라이언트/프롬프트/체인은 레지스트리에서 재사용)
+                summarize_chain = self.llm_registry.get_summarize_chain(
+                    llm_name, llm_model, SOURCE_SUMMARY_TEMPLATE
+                )
                 
                 current_step += 1
                 yield {'type': 'progress', 'value': (current_step / total_steps) * 100}
 
                 # 텍스트 분할
-                text_splitter = TokenTextSplitter(chunk_size=1000, chunk_overlap=100)
+                text_splitter = self.llm_registry.get_token_splitter(1000, 100)
                 splits = text_splitter.split_documents(all_documents)
                 
                 current_step += 1
                 yield {'type': 'progress', 'value': (current_step / total_steps) * 100}
 
-                # 요약 프롬프트
-                summarize_prompt = PromptTemplate(
-                    template="다음 텍스트를 요약해주세요. 주요 포인트만 추출하여 간단명료하게 작성하세요:\n\n{text}\n\n요약:",
-                    input_variables=["text"]
+                # 청크 병렬 요약 + 계층적 통합 요약 (제공자별 동시성 한도 적용)
+                summarizer = MapReduceSummarizer(summarize_chain, llm_name, user_id=user_id)
+                summaries = yield from summarizer.run(
+                    splits, (current_step / total_steps) * 100, 100
                 )
 
-                # 요약 체인 생성
-                summarize_chain = load_summarize_chain(llm, chain_type="stuff", prompt=summarize_prompt)
-
-                # 각 청크 요약 및 결과 저장
-                summaries = []
-                for i, chunk in enumerate(splits):
-                    retry_count = 0
-                    max_retries = 5
-                    while retry_count < max_retries:
-                        try:
-                            summary = summarize_chain.invoke({"input_documents": [chunk]})
-                            summaries.append(summary['output_text'])
-                            yield {'type': 'progress', 'value': ((current_step + (i+1)/len(splits)) / total_steps) * 100}
-                            break  # 성공적으로 요약되면 while 루프 종료
-                        except groq.RateLimitError as e:
-                            retry_count += 1
-                            error_message = str(e)
-                            yield {'type': 'info', 'value': f"Rate limit 오류 발생 (시도 {retry_count}/{max_retries}): {error_message}"}
-                            
-                            wait_time = self.parse_rate_limit_wait_time(error_message)
-                            yield {'type': 'info', 'value': f"Rate limit 도달. {wait_time:.2f}초 대기 후 재시도합니다."}
-                            time.sleep(wait_time + 0.5)  # 여유를 두고 조금 더 기다림
-                            
-                            if retry_count == max_retries:
-                                yield {'type': 'error', 'value': f"최대 재시도 횟수 도달. 청크 {i+1} 요약 실패."}
-                        except Exception as e:
-                            error_msg = f"청크 {i+1} 요약 중 예기치 않은 오류 발생: {str(e)}\n{traceback.format_exc()}"
-                            yield {'type': 'error', 'value': error_msg}
-                            break  # 다른 종류의 오류 발생 시 다음 청크로 넘어감
-
                 # 최종 요약 생성 (로컬에서 통합)
                 final_summary = "\n\n".join(summaries)
-            
-                # 결과가 너무 길 경우 추가 요약
-                if len(final_summary.split()) > 10240:  # 단어 수가 10240을 넘으면 추가 요약
-                    try:
-                        final_summary_doc = Document(page_content=final_summary)
-                        final_summary_chain = load_summarize_chain(llm, chain_type="stuff", prompt=summarize_prompt)
-                        final_summary = final_summary_chain.invoke({"input_documents": [final_summary_doc]})['output_text']
-                    except Exception as e:
-                        error_msg = f"최종 요약 생성 중 오류 발생: {str(e)}\n{traceback.format_exc()}"
-                        yield {'type': 'error', 'value': error_msg}
-                        # 오류 발생 시 기존의 요약을 그대로 사용
-
-                yield {'type': 'summary', 'value': final_summary}
+
+                # 모든 청크가 요약된 경우에만 캐시에 저장
+                if summaries and summarizer.failed_count == 0:
+                    self.summary_cache.put(cache_key, collection_name, sources, "all", model,
+                                           prompt_version, content_hash, final_summary)
+
+                yield {'type': 'summary', 'value': final_summary, 'cache_hit': False}
                 #print(f"요약결과  : {final_summary}")
             
             except Exception as e:
@@ -715,17 +955,9 @@ class ChromaDbManager:
                 yield {'type': 'error', 'value': error_msg}
         return generator()
     
-    def parse_rate_limit_wait_time(self, error_message):
-        # 정규 표현식을 사용하여 대기 시간 추출
-        match = re.search(r'Please try again in (\d+m)?(\d+(\.\d+)?)s', error_message)
-        if match:
-            minutes = int(match.group(1)[:-1]) if match.group(1) else 0
-            seconds = float(match.group(2))
-            return minutes * 60 + seconds
-        else:
-            # 대기 시간을 추출할 수 없는 경우 기본값 반환
-            return 60  # 기본 1분 대기
-
     def close(self):
         # 필요한 정리 작업을 수행
-        pass
\ No newline at end of file
+        self._search_executor.shutdown(wait=False)
+        self.summary_cache.close()
+        self.source_index.close()
+        self.score_calibration.close()
\ No newline at end of file
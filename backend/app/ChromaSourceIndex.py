@@ -0,0 +1,214 @@
+from datetime import datetime
+from typing import List, Optional, Iterable
+import threading
+import sqlite3
+import logging
+import os
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+class ChromaSourceIndex:
+    """
+    Chroma 컬렉션의 source -> 청크 id 보조 인덱스 (persist_directory 옆 SQLite 파일)
+
+    Chroma 는 메타데이터 값 목록 조회를 지원하지 않아 소스 목록/존재 확인/id 조회가
+    컬렉션 전체를 읽어야 한다. 청크 추가/삭제 시 이 인덱스를 함께 갱신해
+    소스 목록은 소스 수, id 조회는 해당 소스의 청크 수에 비례하도록 한다.
+
+    인덱스가 없는(이전에 만들어진) 컬렉션은 처음 사용할 때 한 번 전체를 읽어 구축한다.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS source_index (
+                    collection TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    source_lower TEXT NOT NULL,
+                    PRIMARY KEY (collection, source)
+                )
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_source_index_lower
+                ON source_index(collection, source_lower)
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS source_chunks (
+                    collection TEXT NOT NULL,
+                    chunk_id TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    PRIMARY KEY (collection, chunk_id)
+                )
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_source_chunks_source
+                ON source_chunks(collection, source)
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS indexed_collections (
+                    collection TEXT PRIMARY KEY,
+                    built_at TEXT
+                )
+            """)
+            self._conn.commit()
+
+    # --- 갱신 ---
+    def add(self, collection: str, ids: List[str], sources: List[Optional[str]]) -> None:
+        """청크 추가/upsert 후 호출 (source 가 없는 청크는 'Unknown')"""
+        rows = [(collection, str(chunk_id), str(source) if source is not None else 'Unknown')
+                for chunk_id, source in zip(ids, sources)]
+        if not rows:
+            return
+        with self._lock:
+            # upsert 로 source 가 바뀐 청크의 이전 소스 정리
+            previous = self._sources_of(collection, [r[1] for r in rows])
+            self._conn.executemany("""
+                INSERT OR REPLACE INTO source_chunks (collection, chunk_id, source)
+                VALUES (?, ?, ?)
+            """, rows)
+            self._conn.executemany("""
+                INSERT OR IGNORE INTO source_index (collection, source, source_lower)
+                VALUES (?, ?, ?)
+            """, [(collection, s, s.lower()) for s in dict.fromkeys(r[2] for r in rows)])
+            self._prune_sources(collection, previous - {r[2] for r in rows})
+            self._conn.commit()
+
+    def remove_ids(self, collection: str, ids: Iterable[str]) -> None:
+        """청크 삭제 후 호출"""
+        ids = [str(i) for i in ids]
+        if not ids:
+            return
+        with self._lock:
+            affected = self._sources_of(collection, ids)
+            for start in range(0, len(ids), 500):
+                batch = ids[start:start + 500]
+                self._conn.execute(f"""
+                    DELETE FROM source_chunks
+                    WHERE collection = ? AND chunk_id IN ({','.join('?' * len(batch))})
+                """, [collection, *batch])
+            self._prune_sources(collection, affected)
+            self._conn.commit()
+
+    def remove_source(self, collection: str, source: str) -> List[str]:
+        """소스 삭제 후 호출. 삭제된 청크 id 목록 반환"""
+        with self._lock:
+            ids = [row[0] for row in self._conn.execute(
+                "SELECT chunk_id FROM source_chunks WHERE collection = ? AND source = ?",
+                (collection, source))]
+            self._conn.execute("DELETE FROM source_chunks WHERE collection = ? AND source = ?",
+                               (collection, source))
+            self._conn.execute("DELETE FROM source_index WHERE collection = ? AND source = ?",
+                               (collection, source))
+            self._conn.commit()
+        return ids
+
+    def drop_collection(self, collection: str) -> None:
+        with self._lock:
+            for table in ("source_chunks", "source_index", "indexed_collections"):
+                self._conn.execute(f"DELETE FROM {table} WHERE collection = ?", (collection,))
+            self._conn.commit()
+
+    def _sources_of(self, collection: str, ids: List[str]) -> set:
+        sources = set()
+        for start in range(0, len(ids), 500):
+            batch = ids[start:start + 500]
+            sources.update(row[0] for row in self._conn.execute(f"""
+                SELECT DISTINCT source FROM source_chunks
+                WHERE collection = ? AND chunk_id IN ({','.join('?' * len(batch))})
+            """, [collection, *batch]))
+        return sources
+
+    def _prune_sources(self, collection: str, sources: Iterable[str]) -> None:
+        """남은 청크가 없는 소스 제거"""
+        self._conn.executemany("""
+            DELETE FROM source_index
+            WHERE collection = ? AND source = ?
+            AND NOT EXISTS (
+                SELECT 1 FROM source_chunks c
+                WHERE c.collection = source_index.collection AND c.source = source_index.source
+            )
+        """, [(collection, s) for s in sources])
+
+    # --- 구축 ---
+    def is_built(self, collection: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM indexed_collections WHERE collection = ?", (collection,)
+            ).fetchone() is not None
+
+    def rebuild(self, collection_name: str, collection, page_size: int = 5000) -> int:
+        """Chroma 컬렉션 전체를 페이지 단위로 읽어 인덱스 재구축. 색인된 청크 수 반환"""
+        with self._lock:
+            self._conn.execute("DELETE FROM source_chunks WHERE collection = ?", (collection_name,))
+            self._conn.execute("DELETE FROM source_index WHERE collection = ?", (collection_name,))
+            self._conn.commit()
+        total, offset = 0, 0
+        while True:
+            page = collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            ids = page.get('ids') or []
+            if not ids:
+                break
+            sources = [(m or {}).get('source', 'Unknown') for m in page.get('metadatas') or []]
+            self.add(collection_name, ids, sources)
+            total += len(ids)
+            offset += len(ids)
+            if len(ids) < page_size:
+                break
+        with self._lock:
+            self._conn.execute("""
+                INSERT OR REPLACE INTO indexed_collections (collection, built_at) VALUES (?, ?)
+            """, (collection_name, datetime.now().isoformat()))
+            self._conn.commit()
+        logger.info(f"Source index built for '{collection_name}': {total} chunks")
+        return total
+
+    # --- 조회 ---
+    def list_sources(self, collection: str, search: Optional[str] = None,
+                     limit: Optional[int] = None) -> List[str]:
+        """
+        소스 목록 (등록 순). search 가 있으면 대소문자 구분 없이 포함 검색하고
+        대소문자만 다른 소스는 하나로 합친다.
+        """
+        with self._lock:
+            if search:
+                sql = """
+                    SELECT source FROM source_index
+                    WHERE collection = ? AND instr(source_lower, ?) > 0
+                    AND rowid IN (
+                        SELECT MIN(rowid) FROM source_index
+                        WHERE collection = ? GROUP BY source_lower
+                    )
+                    ORDER BY rowid
+                """
+                params = [collection, search.lower(), collection]
+            else:
+                sql = "SELECT source FROM source_index WHERE collection = ? ORDER BY rowid"
+                params = [collection]
+            if limit:
+                sql += " LIMIT ?"
+                params.append(int(limit))
+            return [row[0] for row in self._conn.execute(sql, params)]
+
+    def exists(self, collection: str, source: str) -> bool:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT 1 FROM source_index WHERE collection = ? AND source = ?", (collection, source)
+            ).fetchone() is not None
+
+    def get_ids(self, collection: str, source: str) -> List[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute(
+                "SELECT chunk_id FROM source_chunks WHERE collection = ? AND source = ?",
+                (collection, source))]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+크롤러 오프라인 검증용 로컬 HTTP 고정 사이트
+
+네트워크 없이 WebCrawler 의 링크 탐색, URL 중복 제거(프래그먼트/리다이렉트), 내용 중복 제거, robots.txt 준수,
+HTML 이 아닌 링크 건너뛰기, 호스트별 요청 간격을 확인할 수 있는 작은 사이트를 127.0.0.1 에서 제공한다.
+경로별 요청 기록(hits)을 남기므로 같은 페이지를 두 번 가져오지 않았는지, 요청 간격이 지켜졌는지 확인할 수 있다.
+
+사이트 구성:
+    /                 목록 (기사 링크, 프래그먼트/리다이렉트/외부/PDF/비공개 링크 포함)
+    /articles/<n>     기사 본문 (header/nav/footer 포함)
+    /articles/copy    /articles/1 과 같은 본문 (내용 중복)
+    /redirect         /articles/2 로 302
+    /private/admin    robots.txt 로 금지된 페이지
+    /files/report.pdf HTML 이 아닌 파일
+
+사용 예:
+    python -m backend.app.CrawlFixtureServer --port 8765
+    python -m backend.app.WebCrawler --fixture --dry-run
+"""
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from contextlib import contextmanager
+from typing import Dict, Tuple, Iterator, List
+import argparse
+import threading
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+FIXTURE_ARTICLES = 5
+ROBOTS_TXT = "User-agent: *\nDisallow: /private/\n"
+
+SENTENCES = [
+    "정부는 올해 공공 데이터 개방 확대를 위한 추진 계획을 확정하였다.",
+    "각 기관은 분기마다 데이터 품질 점검 결과를 보고하여야 한다.",
+    "시범사업 결과는 하반기 평가위원회에서 검토할 예정이다.",
+    "개인정보가 포함된 데이터는 가명 처리 후 제공하는 것을 원칙으로 한다.",
+    "표준화된 메타데이터를 함께 제공하면 활용도가 크게 높아진다.",
+    "예산 집행 현황은 매월 누리집에 공개한다.",
+]
+
+
+def _page(title: str, body: str, links: List[Tuple[str, str]] = ()) -> str:
+    nav = "".join(f'<li><a href="{href}">{label}</a></li>' for href, label in links)
+    return f"""<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>{title} - 고정 사이트</title>
+<style>body {{ font-family: sans-serif; }}</style><script>window.analytics = true;</script></head>
+<body>
+<header><nav><ul><li><a href="/">처음으로</a></li>{nav}</ul></nav></header>
+{body}
+<footer><p>Copyright 고정 사이트. All rights reserved.</p></footer>
+</body></html>"""
+
+
+def _article_body(n: int) -> str:
+    paragraphs = "".join(
+        f"<p>{SENTENCES[(n + i) % len(SENTENCES)]} 기사 {n}의 {i + 1}번째 문단입니다.</p>" for i in range(6))
+    return f'<article class="article-content"><h1>기사 {n}: 데이터 정책 동향</h1>{paragraphs}</article>'
+
+
+def build_site(articles: int = FIXTURE_ARTICLES) -> Dict[str, Tuple[int, str, bytes, Dict[str, str]]]:
+    """경로 → (상태 코드, Content-Type, 본문, 추가 헤더)"""
+    html = "text/html; charset=utf-8"
+    site = {}
+    index_links = [(f"/articles/{n}", f"기사 {n}") for n in range(1, articles + 1)]
+    index_links += [
+        ("/articles/1#comments", "기사 1 댓글"),
+        ("/articles/copy", "기사 1 사본"),
+        ("/redirect", "이동"),
+        ("/private/admin", "관리자"),
+        ("/files/report.pdf", "보고서 PDF"),
+        ("http://external.invalid/page", "외부 사이트"),
+    ]
+    listing = "".join(f'<li><a href="{href}">{label}</a></li>' for href, label in index_links)
+    site["/"] = (200, html, _page("목록", f'<main><h1>기사 목록</h1><ul>{listing}</ul></main>').encode("utf-8"), {})
+
+    for n in range(1, articles + 1):
+        links = [(f"/articles/{n % articles + 1}", "다음 기사")]
+        site[f"/articles/{n}"] = (200, html, _page(f"기사 {n}", _article_body(n), links).encode("utf-8"), {})
+    site["/articles/copy"] = (200, html, _page("기사 1 사본", _article_body(1)).encode("utf-8"), {})
+    site["/redirect"] = (302, html, b"", {"Location": "/articles/2"})
+    site["/private/admin"] = (200, html, _page("관리자", "<main><p>비공개 페이지</p></main>").encode("utf-8"), {})
+    site["/files/report.pdf"] = (200, "application/pdf", b"%PDF-1.4\n%%EOF\n", {})
+    site["/robots.txt"] = (200, "text/plain; charset=utf-8", ROBOTS_TXT.encode("utf-8"), {})
+    return site
+
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        with self.server.hits_lock:
+            self.server.hits.append((path, time.monotonic()))
+        status, content_type, body, headers = self.server.site.get(
+            path, (404, "text/plain; charset=utf-8", b"not found", {}))
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class FixtureServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, articles: int = FIXTURE_ARTICLES):
+        super().__init__(address, FixtureHandler)
+        self.site = build_site(articles)
+        self.hits: List[Tuple[str, float]] = []
+        self.hits_lock = threading.Lock()
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def hit_counts(self) -> Dict[str, int]:
+        with self.hits_lock:
+            counts: Dict[str, int] = {}
+            for path, _ in self.hits:
+                counts[path] = counts.get(path, 0) + 1
+        return counts
+
+    def min_interval(self) -> float:
+        """robots.txt 를 제외한 연속 요청 사이 최소 간격 (초)"""
+        with self.hits_lock:
+            times = sorted(t for path, t in self.hits if path != "/robots.txt")
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        return min(gaps) if gaps else 0.0
+
+
+@contextmanager
+def fixture_server(articles: int = FIXTURE_ARTICLES, host: str = "127.0.0.1", port: int = 0) -> Iterator[FixtureServer]:
+    """백그라운드 스레드에서 고정 사이트 실행 (port=0 이면 빈 포트 자동 선택)"""
+    server = FixtureServer((host, port), articles)
+    thread = threading.Thread(target=server.serve_forever, name="crawl-fixture", daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='크롤러 검증용 로컬 고정 사이트')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--articles', type=int, default=FIXTURE_ARTICLES, help='기사 페이지 수')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    server = FixtureServer((args.host, args.port), args.articles)
+    logger.info(f"Serving crawl fixture at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable
+from collections import OrderedDict
+import threading
+import logging
+import time
+import uuid
+import os
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 동시에 실행하는 크롤링 작업 수 (작업마다 브라우저 하나)
+CRAWL_JOB_WORKERS = int(os.getenv("CRAWL_JOB_WORKERS", "1"))
+# 실행 대기 + 실행 중 작업 수 상한 (넘으면 새 요청 거절)
+CRAWL_JOB_MAX_PENDING = int(os.getenv("CRAWL_JOB_MAX_PENDING", "4"))
+# 보관할 작업 기록 수 (끝난 작업부터 오래된 순으로 지움)
+CRAWL_JOB_HISTORY = int(os.getenv("CRAWL_JOB_HISTORY", "100"))
+
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_DONE = "done"
+STATUS_FAILED = "failed"
+
+
+class CrawlJobs:
+    """
+    크롤링 적재 작업을 API 요청과 분리해 백그라운드 스레드에서 실행
+
+    요청은 submit 으로 작업을 등록하고 바로 작업 id 를 돌려받으며, 진행 상태와 결과는 get 으로 조회한다.
+    작업 기록은 프로세스 메모리에만 있으므로 여러 프로세스로 실행하면 등록한 프로세스에서만 조회된다.
+    """
+
+    def __init__(self, workers: int = CRAWL_JOB_WORKERS, max_pending: int = CRAWL_JOB_MAX_PENDING,
+                 history: int = CRAWL_JOB_HISTORY):
+        self.max_pending = max(1, max_pending)
+        self.history = max(1, history)
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="crawl-job")
+        self._jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def submit(self, owner: Optional[str], params: Dict[str, Any],
+               run: Callable[[], Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """작업 등록. 대기 중인 작업이 max_pending 개면 None"""
+        with self._lock:
+            if self._active >= self.max_pending:
+                return None
+            job_id = uuid.uuid4().hex
+            self._jobs[job_id] = {
+                'job_id': job_id,
+                'owner': owner,
+                'status': STATUS_QUEUED,
+                'params': dict(params),
+                'created_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+                'started_at': None,
+                'finished_at': None,
+                'success': None,
+                'report': None,
+                'error': None
+            }
+            self._active += 1
+            self._trim()
+            snapshot = dict(self._jobs[job_id])
+        self._executor.submit(self._run, job_id, run)
+        return snapshot
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job is not None else None
+
+    def _update(self, job_id: str, **fields) -> None:
+        with self._lock:
+            self._jobs[job_id].update(fields)
+
+    def _run(self, job_id: str, run: Callable[[], Dict[str, Any]]) -> None:
+        self._update(job_id, status=STATUS_RUNNING, started_at=time.strftime('%Y-%m-%d %H:%M:%S'))
+        try:
+            report = run()
+            ingest = report.get('ingest', {})
+            # 저장에 실패한 페이지가 있으면 일부만 적재된 것이므로 성공으로 보지 않는다
+            success = ingest.get('chunks_stored', 0) > 0 and ingest.get('store_failures', 0) == 0
+            self._update(job_id, status=STATUS_DONE, success=success, report=report)
+        except Exception as e:
+            logger.error(f"Crawl job {job_id} failed: {str(e)}")
+            self._update(job_id, status=STATUS_FAILED, success=False, error=str(e))
+        finally:
+            with self._lock:
+                self._jobs[job_id]['finished_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+                self._active -= 1
+                self._trim()
+
+    def _trim(self) -> None:
+        """끝난 작업 기록을 오래된 순으로 history 개까지 줄임 (대기/실행 중 작업은 남김)"""
+        excess = len(self._jobs) - self.history
+        if excess <= 0:
+            return
+        for job_id in [j for j, job in self._jobs.items() if job['status'] in (STATUS_DONE, STATUS_FAILED)][:excess]:
+            del self._jobs[job_id]
+
+
+_crawl_jobs: Optional[CrawlJobs] = None
+_crawl_jobs_lock = threading.Lock()
+
+
+def get_crawl_jobs() -> CrawlJobs:
+    """프로세스 전역 크롤링 작업 실행기"""
+    global _crawl_jobs
+    with _crawl_jobs_lock:
+        if _crawl_jobs is None:
+            _crawl_jobs = CrawlJobs()
+        return _crawl_jobs
@@ -5,13 +5,26 @@ from sentence_transformers import SentenceTransformer
 import torch
 import numpy as np
 from typing import List
+from collections import OrderedDict
+import threading
+import time
+from backend.app.MetricsRegistry import get_metrics_registry
 logger = logging.getLogger(__name__)
 
+_metrics = get_metrics_registry()
+EMBEDDING_TEXTS = _metrics.counter("rag_embedding_texts_total", "Number of texts embedded", ["kind"])
+EMBEDDING_SECONDS = _metrics.counter("rag_embedding_seconds_total", "Time spent embedding texts", ["kind"])
+EMBEDDING_CACHE = _metrics.counter("rag_embedding_cache_requests_total", "Query embedding cache lookups", ["result"])
+
 class CustomSentenceTransformerEmbeddings:
     def __init__(self):
         current_dir = os.path.dirname(os.path.abspath(__file__))
         self.MODEL_PATH = os.path.join(os.path.dirname(current_dir), "models", "ko-sbert-nli")
         self.MODEL_NAME = "jhgan/ko-sroberta-nli"
+        # 반복되는 질의 임베딩 재사용 (LRU)
+        self.query_cache_size = int(os.getenv("EMBED_QUERY_CACHE_SIZE", "1024"))
+        self._query_cache = OrderedDict()
+        self._query_cache_lock = threading.Lock()
         
         try:
             self.load_or_download_model()
@@ -38,7 +51,10 @@ class CustomSentenceTransformerEmbeddings:
             if not documents:
                 raise ValueError("Empty document list")
             
+            start = time.perf_counter()
             embeddings = self.model.encode(documents)
+            EMBEDDING_SECONDS.inc(time.perf_counter() - start, kind="documents")
+            EMBEDDING_TEXTS.inc(len(documents), kind="documents")
             
             if isinstance(embeddings, torch.Tensor):
                 return embeddings.tolist()
@@ -52,7 +68,26 @@ class CustomSentenceTransformerEmbeddings:
 
     def embed_query(self, query):
         try:
-            return self.model.encode(query).tolist()
+            if self.query_cache_size > 0:
+                with self._query_cache_lock:
+                    cached = self._query_cache.get(query)
+                    if cached is not None:
+                        self._query_cache.move_to_end(query)
+                        EMBEDDING_CACHE.inc(result="hit")
+                        return list(cached)
+                EMBEDDING_CACHE.inc(result="miss")
+
+            start = time.perf_counter()
+            embedding = self.model.encode(query).tolist()
+            EMBEDDING_SECONDS.inc(time.perf_counter() - start, kind="query")
+            EMBEDDING_TEXTS.inc(1, kind="query")
+
+            if self.query_cache_size > 0:
+                with self._query_cache_lock:
+                    self._query_cache[query] = tuple(embedding)
+                    if len(self._query_cache) > self.query_cache_size:
+                        self._query_cache.popitem(last=False)
+            return embedding
         except Exception as e:
             logger.error(f"쿼리 임베딩 중 오류 발생: {e}")
             raise
\ No newline at end of file
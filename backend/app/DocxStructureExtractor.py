@@ -0,0 +1,176 @@
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple
+import logging
+import re
+import os
+
+from docx.table import Table
+from docx.text.paragraph import Paragraph
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 청크 최대 길이. 제목/구역 경계 없이 길게 이어지는 본문은 문단 경계에서, 한 문단이 더 길면 공백 기준으로 나눈다.
+# PostgresDbManager 가 CHUNKSIZE(2048) 에서 잘라 저장하므로 그보다 작게 둔다.
+DOCX_MAX_SECTION_CHARS = int(os.getenv("DOCX_MAX_SECTION_CHARS", "2000"))
+# 남은 공간이 이보다 작으면 문단을 쪼개 채우지 않고 새 청크에서 시작 (max_chars 비율)
+MIN_FILL_RATIO = 0.25
+HEADING_STYLE = re.compile(r'^(?:heading|제목)\s*(\d+)$', re.IGNORECASE)
+TITLE_STYLES = {'title', '제목', '표제'}
+HEADING_PATH_SEPARATOR = " > "
+
+
+def heading_level(paragraph: Paragraph) -> Optional[int]:
+    """
+    제목 수준 (Title=0, Heading N / 제목 N = N, 개요 수준 지정 문단 = 수준+1), 제목이 아니면 None
+    """
+    style = paragraph.style.name.strip() if paragraph.style is not None and paragraph.style.name else ""
+    match = HEADING_STYLE.match(style)
+    if match:
+        return int(match.group(1))
+    if style.lower() in TITLE_STYLES:
+        return 0
+    outline = paragraph._p.xpath('./w:pPr/w:outlineLvl/@w:val')
+    if outline:
+        level = int(outline[0])
+        # 9 는 "본문" 수준
+        return level + 1 if level < 9 else None
+    return None
+
+
+def iter_body(document) -> Iterator[Any]:
+    """본문 순서대로 Paragraph / Table 을 내보냄 (doc.paragraphs 는 표를 건너뛴다)"""
+    for child in document.element.body.iterchildren():
+        tag = child.tag.rsplit('}', 1)[-1]
+        if tag == 'p':
+            yield Paragraph(child, document)
+        elif tag == 'tbl':
+            yield Table(child, document)
+
+
+def table_rows(table: Table) -> List[List[str]]:
+    """표 셀 텍스트 (병합 셀은 python-docx 가 반복해서 돌려준다)"""
+    rows = []
+    for row in table.rows:
+        try:
+            rows.append([cell.text.strip() for cell in row.cells])
+        except Exception as e:
+            logger.debug(f"Skipping malformed table row: {e}")
+    return rows
+
+
+class DocxStructureExtractor:
+    """
+    DOCX 본문을 한 번 순회하며 제목/구역 경계 단위 청크로 나눈다
+
+    - 문단과 표를 본문 순서대로 처리 (표는 table_to_text 로 변환)
+    - 제목 문단과 구역 나누기(sectPr)에서 청크를 끊고, 제목 경로를 메타데이터로 유지
+    - 페이지 번호는 Word 가 저장한 lastRenderedPageBreak(없으면 명시적 페이지 나누기) 기준
+    - 정제(clean)는 청크를 내보낼 때 한 번만 적용
+    """
+
+    def __init__(self, clean: Callable[[str], str], table_to_text: Callable[[List[List[str]]], str],
+                 max_chars: int = DOCX_MAX_SECTION_CHARS):
+        self.clean = clean
+        self.table_to_text = table_to_text
+        self.max_chars = max_chars
+
+    def extract(self, document) -> List[Tuple[str, Dict[str, Any]]]:
+        """(본문, 메타데이터) 목록. 메타데이터: page, page_end, section, heading, heading_path, heading_level, tables"""
+        body = document.element.body
+        # Word 가 렌더링한 페이지 경계가 있으면 그것만, 없으면 명시적 페이지 나누기로 계산
+        if body.xpath('.//w:lastRenderedPageBreak'):
+            page_break_xpath = './/w:lastRenderedPageBreak'
+        else:
+            page_break_xpath = './/w:br[@w:type="page"]'
+
+        chunks = []
+        headings: List[Tuple[int, str]] = []
+        parts: List[str] = []
+        size = 0
+        has_body = False
+        tables = 0
+        page = 1
+        start_page = 1
+        section = 1
+
+        def emit():
+            nonlocal parts, size, tables, has_body
+            # 제목만 있는 버퍼는 내보내지 않는다 (제목은 다음 청크의 heading_path 로 남는다)
+            text = self.clean("\n".join(parts)) if has_body else ""
+            if text:
+                path = HEADING_PATH_SEPARATOR.join(title for _, title in headings)
+                chunks.append((text, {
+                    "page": start_page,
+                    "page_end": page,
+                    "section": section,
+                    "heading": headings[-1][1] if headings else "",
+                    "heading_path": path,
+                    "heading_level": headings[-1][0] if headings else -1,
+                    "tables": tables
+                }))
+            parts, size, tables, has_body = [], 0, 0, False
+
+        def append_body(text: str):
+            """본문을 버퍼에 추가. 추가 전에 길이를 확인해 청크가 max_chars 를 넘지 않게 한다"""
+            nonlocal size, has_body, start_page
+            while text:
+                sep = 1 if parts else 0
+                room = self.max_chars - size - sep
+                if len(text) <= room:
+                    piece, text = text, ""
+                elif (has_body and len(text) <= self.max_chars) or room < self.max_chars * MIN_FILL_RATIO:
+                    # 새 청크에 통째로 들어가거나 남은 공간이 작으면 현재 청크를 닫고 다시 시도
+                    emit()
+                    continue
+                else:
+                    cut = text.rfind(" ", 0, room + 1)
+                    if cut <= 0:
+                        cut = room
+                    piece, text = text[:cut].rstrip(), text[cut:].lstrip()
+                if not parts:
+                    start_page = page
+                parts.append(piece)
+                size += len(piece) + sep
+                has_body = True
+                if text:
+                    emit()
+
+        for block in iter_body(document):
+            if isinstance(block, Table):
+                rows = table_rows(block)
+                text = self.table_to_text(rows) if rows else ""
+                if text:
+                    append_body(text)
+                    tables += 1
+                page += len(block._tbl.xpath(page_break_xpath))
+                continue
+
+            breaks = len(block._p.xpath(page_break_xpath))
+            text = block.text.strip()
+            level = heading_level(block) if text else None
+
+            if level is not None:
+                emit()
+                # 같은 수준 이상의 이전 제목을 닫고 새 제목을 경로에 추가
+                while headings and headings[-1][0] >= level:
+                    headings.pop()
+                headings.append((level, text))
+                page += breaks
+                start_page = page
+                parts.append(text)
+                size += len(text) + (1 if len(parts) > 1 else 0)
+            else:
+                # 문단 중간의 페이지 경계는 문단 시작 기준으로 반영
+                page += breaks
+                if text:
+                    append_body(text)
+
+            # 구역 나누기: 이 문단으로 구역이 끝난다
+            if block._p.xpath('./w:pPr/w:sectPr'):
+                emit()
+                section += 1
+
+        emit()
+        return chunks
@@ -1,6 +1,7 @@
 import sys, os
 import io, re
 import tempfile
+import shutil
 import time
 import PyPDF2
 import docx
@@ -16,15 +17,22 @@ from bs4 import BeautifulSoup
 import markdown
 import html
 import pandas as pd
-from typing import Union, Optional, List, IO, Dict, Any
+from typing import Union, Optional, List, IO, Dict, Any, Iterator
 from langchain.docstore.document import Document
 from dotenv import load_dotenv
 from pathlib import Path
-import hwp5
-from hwp5.xmlmodel import Hwp5File
 import platform
 import numpy as np
 from langchain.text_splitter import MarkdownTextSplitter
+from backend.app.ExtractionCache import get_extraction_cache, file_digest
+from backend.app.PdfTableDetector import analyze_page
+from backend.app.DocxStructureExtractor import DocxStructureExtractor
+from backend.app.HwpExtractor import extract_hwpx, extract_hwp5, is_hwpx
+from backend.app.TextNormalizer import clean_layout_text, clean_extracted_text
+from backend.app.TabularTextConverter import (
+    TabularTextConverter, DATE_FORMAT, analyze_header_importance, select_key_columns,
+    clean_frame, rows_to_text, iter_csv_frames, csv_read_options, read_csv_sample
+)
 
 
 if platform.system() == 'Windows':
@@ -36,6 +44,26 @@ if platform.system() == 'Windows':
 logging.basicConfig(level=logging.ERROR)
 logger = logging.getLogger(__name__)
 
+# 추출 결과 형식이 바뀌는 변경(추출기/정제 로직)마다 올려서 추출 캐시를 무효화
+EXTRACTOR_VERSION = "3"
+
+# PDF 추출 엔진 (업로드별 pdf_engine 값으로 변경 가능)
+#   adaptive: PyMuPDF 텍스트 + 표 가능 페이지만 pdfplumber 표 분석
+#   plumber: 모든 페이지 pdfplumber 텍스트/표 분석 (기존 기본값)
+#   pymupdf4llm: 페이지별 Markdown 변환
+#   pypdf2: PyPDF2 텍스트만
+PDF_ENGINES = ('adaptive', 'plumber', 'pymupdf4llm', 'pypdf2')
+PDF_ENGINE = os.getenv("PDF_ENGINE", "adaptive").lower()
+
+# 파일 객체를 임시 파일로 옮길 때 한 번에 읽는 크기
+READ_CHUNK_BYTES = 1 << 20
+
+# 행 묶음 단위 스트리밍 적재를 지원하는 확장자
+STREAMING_EXTENSIONS = ('.csv', '.tsv')
+# extract_text_from_file 이 처리하는 확장자
+SUPPORTED_EXTENSIONS = ('.pdf', '.docx', '.doc', '.xlsx', '.xls', '.csv', '.tsv', '.pptx', '.ppt',
+                        '.hwp', '.hwpx', '.txt', '.md', '.htm', '.html')
+
 class TableProcessor:
     def __init__(self):
         """TableProcessor 클래스 초기화"""
@@ -117,6 +145,7 @@ class ExtractTextFromFile:
         load_dotenv(dotenv_path=env_path)
         self.chunk_size = os.environ.get("CHUNK_SIZE")
         self.chunk_overlap = os.environ.get("CHUNK_OVERLAP")
+        self.date_format = DATE_FORMAT
         self.table = TableProcessor()  # TableProcessor 인스턴스 생성
     
     def process_table_data(self, data: List[List[str]]) -> str:
@@ -298,12 +327,13 @@ class ExtractTextFromFile:
                     # 일반 텍스트 추출
                     text = page.extract_text() or ""
                     
-                    # 표 추출 및 처리
-                    tables = page.extract_tables()
-                    for table in tables:
+                    # 표 추출 및 처리 (tables_found 는 adaptive 엔진과 같이 텍스트가 나온 표만 셈)
+                    tables = []
+                    for table in page.extract_tables():
                         if table and any(any(cell for cell in row) for row in table):
                             table_text = self.process_table_data(table)
                             if table_text:
+                                tables.append(table_text)
                                 text += f"\n{table_text}\n"
                     
                     # 텍스트 정리
@@ -330,6 +360,76 @@ class ExtractTextFromFile:
             if file_obj and isinstance(file_obj, io.IOBase) and not isinstance(file_obj, io.BytesIO):
                 file_obj.close()
 
+    def extract_text_from_pdf_pages_adaptive(self, file: Union[str, IO], file_name: str) -> List[Document]:
+        """
+        PyMuPDF 로 모든 페이지 텍스트를 추출하고, 표가 있을 가능성이 높은 페이지
+        (괘선 또는 텍스트 격자, PdfTableDetector)만 pdfplumber extract_tables() + TableProcessor 로 처리
+
+        결과 형식은 extract_text_from_pdf_pages_plumber 와 같다 (페이지당 Document, 표는 본문 뒤에 추가).
+        """
+        documents = []
+        temp_path = None
+        pdf_path = file if isinstance(file, str) else self._disk_path(file)
+
+        try:
+            if not pdf_path:
+                # 디스크 파일이 아닌 스트림은 전체를 메모리로 읽지 않고 READ_CHUNK_BYTES 단위로 임시 파일에 옮김
+                temp_path = pdf_path = self._spool_to_disk(file, ".pdf")
+            pdf = fitz.open(pdf_path)
+
+            pages = []
+            table_pages = []
+            with pdf:
+                for page_num, page in enumerate(pdf, 1):
+                    pages.append((page_num, page.get_text("text", sort=True) or ""))
+                    analysis = analyze_page(page)
+                    if analysis['likely_table']:
+                        table_pages.append(page_num)
+                        logger.debug(f"Page {page_num} likely has tables: {analysis}")
+            logger.info(f"{file_name}: table analysis on {len(table_pages)}/{len(pages)} pages")
+
+            tables_by_page = self._extract_page_tables(pdf_path, table_pages) if table_pages else {}
+
+            for page_num, text in pages:
+                tables = tables_by_page.get(page_num, [])
+                for table_text in tables:
+                    text += f"\n{table_text}\n"
+                text = self.clean_text2(text)
+                metadata = {
+                    "source": os.path.basename(file_name),
+                    "file_name": file_name,
+                    "page": page_num,
+                    "tables_found": len(tables)
+                }
+                documents.append(Document(page_content=text, metadata=metadata))
+
+            return documents
+
+        except Exception as e:
+            logger.error(f"PDF 처리 중 오류 발생: {str(e)}")
+            return []
+
+        finally:
+            if temp_path:
+                try:
+                    os.unlink(temp_path)
+                except OSError as e:
+                    logger.warning(f"임시 PDF 파일 삭제 실패: {str(e)}")
+
+    def _extract_page_tables(self, pdf_path: str, page_numbers: List[int]) -> Dict[int, List[str]]:
+        """지정한 페이지(1부터)만 pdfplumber 로 열어 표 텍스트 추출"""
+        tables_by_page = {}
+        with pdfplumber.open(pdf_path, pages=page_numbers) as pdf:
+            for page in pdf.pages:
+                texts = []
+                for table in page.extract_tables():
+                    if table and any(any(cell for cell in row) for row in table):
+                        table_text = self.process_table_data(table)
+                        if table_text:
+                            texts.append(table_text)
+                tables_by_page[page.page_number] = texts
+        return tables_by_page
+
     def _analyze_table_structure(self, table: List[List[str]]) -> dict:
         """
         테이블 구조 분석
@@ -452,14 +552,8 @@ class ExtractTextFromFile:
         return "\n".join(table_text)
     
     def clean_text2(self, text):
-        # Remove extra whitespaces while preserving some structure
-        text = re.sub(r'\n{2,}', '\n\n', text)  # Normalize multiple line breaks
-        text = re.sub(r' +', ' ', text)  # Remove multiple spaces
-        
-        # Optional: Handle hyphenation
-        text = re.sub(r'-\n', '', text)  # Remove hyphenation line breaks
-        
-        return text.strip()
+        # 빈 줄/연속 공백 정리, 줄 끝 하이픈 이음 제거 (문단 구조 유지)
+        return clean_layout_text(text)
 
     def format_table(self, table_lines: List[str]) -> List[str]:
         """
@@ -515,64 +609,7 @@ class ExtractTextFromFile:
             str: 정제된 텍스트
         """
         try:
-            # 1. bytes 처리를 가장 먼저
-            if isinstance(text, bytes):
-                try:
-                    text = text.decode('utf-8')
-                except UnicodeDecodeError:
-                    try:
-                        text = text.decode('cp949')
-                    except UnicodeDecodeError:
-                        logger.warning(f"Failed to decode bytes: {text}")
-                        return str(text)
-
-            # 원본이 None이거나 빈 문자열인 경우
-            if not text:
-                return ""
-                
-            # 문자열로 변환
-            text = str(text).strip()
-            
-            # 새로 추가된 부분: 연속된 점, |, ○ 처리
-            text = re.sub(r'\.{2,}', '.', text)  # 연속된 점 하나로 줄이기
-            text = re.sub(r'\|{2,}', '|', text)  # 연속된 | 하나로 줄이기
-            text = re.sub(r'○', ' ', text)       # ○ 문자 공백으로 대체
-            text = re.sub(r'[|.]{2,}', ' ', text)  # 연속된 특수문자 공백으로 대체
-            
-            # 2. 여러 개의 공백을 하나로 통합 (줄바꿈 제외)
-            text = re.sub(r'[^\S\n]+', ' ', text)
-            
-            # 3. 시간 형식의 콜론 주변 공백 처리
-            text = re.sub(r'(\d)\s*:\s*(\d)', r'\1:\2', text)
-            
-            # 4. 숫자 사이의 물결 표시 주변 공백 제거
-            text = re.sub(r'(\d)\s*~\s*(\d)', r'\1~\2', text)
-            
-            # 5. 불필요한 유니코드 문자 제거
-            text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
-
-            # 6. | 문자를 공백으로 대체 (앞뒤에 글자가 있는 경우만 공백 유지)
-            text = re.sub(r'(\w)\s*\|\s*(\w)', r'\1 \2', text)  # 글자 사이의 | 
-            text = re.sub(r'^\|\s*', '', text)                  # 문장 시작의 |
-            text = re.sub(r'\s*\|$', '', text)                  # 문장 끝의 |
-            
-            # 7. 하이픈(-) 문자가 단독으로 있을 때만 공백으로 대체
-            text = re.sub(r'(\w)\s*-\s*(\w)', r'\1 \2', text)  # 글자 사이의 -
-            text = re.sub(r'^\-\s*', '', text)                 # 문장 시작의 -
-            text = re.sub(r'\s*\-$', '', text)                 # 문장 끝의 -
-
-            # 8. □, ○, ●, ◦ 문자를 공백으로 대체
-            text = re.sub(r'(\w)[□○●◦]\s*(\w)', r'\1 \2', text)  # 글자 사이의 특수문자
-            text = re.sub(r'^[□○●◦]\s*', '', text)              # 문장 시작의 특수문자
-            text = re.sub(r'\s*[□○●◦]$', '', text)              # 문장 끝의 특수문자
-            
-            # 9. 여러 개의 공백을 하나로 통합 (줄바꿈 제외)
-            text = re.sub(r'[^\S\n]+', ' ', text)
-            text = re.sub(r'-{2,}', ' ', text) 
-            
-            # 10. 문자열 앞뒤 공백 제거
-            return text.strip()
-            
+            return clean_extracted_text(text)
         except Exception as e:
             logger.error(f"텍스트 정제 중 오류 발생: {str(e)}")
             logger.error(f"원본 텍스트: {repr(text)}")
@@ -592,6 +629,9 @@ class ExtractTextFromFile:
         """
         Extract text from Word document pages.
 
+        제목/구역 나누기 경계로 청크를 만들고, 페이지(page/page_end)와 제목 경로(heading_path)를
+        메타데이터에 기록한다.
+
         Args:
             file (Union[str, IO]): Path to the Word document or a file-like object
 
@@ -614,40 +654,22 @@ class ExtractTextFromFile:
                 file_name = os.path.basename(file)
                 doc = docx.Document(file)
             else:
-                # 임시 파일 생성
-                temp_file = io.BytesIO(file.read())
+                # 전체를 메모리로 복사하지 않고 파일 객체를 그대로 사용
+                file_obj, owned = self._seekable_file(file)
+                temp_file = file_obj if owned else None
                 file_name = self.get_file_name(file)
                 file_path = file_name  # Streamlit의 file_uploader를 사용할 경우
-                doc = docx.Document(temp_file)
-
-            current_page = ""
-            page_number = 1
-
-            for para in doc.paragraphs:
-                current_page += para.text + "\n"
-                current_page = self.clean_text2(current_page)
-                
-                # 임의로 1000자마다 새 페이지로 간주 (실제 페이지 구분은 더 복잡할 수 있음)
-                if len(current_page) > 1000:
-                    metadata = {
-                        "source": os.path.basename(file_name),
-                        "file_name": file_name,
-                        "page": page_number
-                    }
-                    document = Document(page_content=current_page.strip(), metadata=metadata)
-                    documents.append(document)
-                    current_page = ""
-                    page_number += 1
+                doc = docx.Document(file_obj)
 
-            # 마지막 페이지 추가
-            if current_page:
+            # 본문(문단/표) 순서대로 한 번 순회하며 제목/구역 경계 단위로 나눔
+            extractor = DocxStructureExtractor(clean=self.clean_text2, table_to_text=self.process_table_data)
+            for text, structure in extractor.extract(doc):
                 metadata = {
                     "source": os.path.basename(file_name),
                     "file_name": file_name,
-                    "page": page_number
+                    **structure
                 }
-                document = Document(page_content=current_page.strip(), metadata=metadata)
-                documents.append(document)
+                documents.append(Document(page_content=text, metadata=metadata))
 
             return documents
 
@@ -671,6 +693,9 @@ class ExtractTextFromFile:
         """
         Extract text from Excel file pages.
 
+        시트마다 행 묶음 단위(TABULAR_CHUNK_CHARS 이하)로 Document 를 만들고
+        row_start/row_end 메타데이터에 원본 행 범위를 기록한다.
+
         Args:
             file (Union[str, IO]): Path to the Excel file or a file-like object
 
@@ -685,13 +710,14 @@ class ExtractTextFromFile:
                 file_path = file
                 file_name = os.path.basename(file_path)
             else:
-                # 임시 파일 생성
-                temp_file = io.BytesIO(file.read())
+                # 전체를 메모리로 복사하지 않고 파일 객체를 그대로 사용
+                file_obj, owned = self._seekable_file(file)
+                temp_file = file_obj if owned else None
                 file_name = self.get_file_name(file)
-                file_path = file_name
+                file_path = file_obj
 
             # ExcelFile 객체를 사용하여 모든 시트를 한 번에 읽습니다
-            with pd.ExcelFile(temp_file if temp_file else file_path) as xls:
+            with pd.ExcelFile(file_path) as xls:
                 for sheet_name in xls.sheet_names:
                     # 각 시트를 DataFrame으로 읽습니다
                     df = pd.read_excel(xls, sheet_name=sheet_name)
@@ -700,19 +726,14 @@ class ExtractTextFromFile:
                         logger.warning(f"Empty sheet found: {sheet_name}")
                         continue
                     
-                    # DataFrame을 분석 가능한 텍스트로 변환합니다
-                    text_chunks = self._convert_df_to_text(df)
-                    # 리스트를 문자열로 변환
-                    sheet_content = " ".join(text_chunks) if isinstance(text_chunks, list) else text_chunks
-
-                    # Document 객체를 생성합니다
                     metadata = {
                         "source": os.path.basename(file_name),
                         "file_name": file_name,
                         "page": sheet_name
                     }
-                    doc = Document(page_content=sheet_content, metadata=metadata)
-                    documents.append(doc)
+                    # 시트별로 키 컬럼을 감지하고 행 묶음 단위 Document 로 변환합니다
+                    converter = TabularTextConverter(date_format=self.date_format)
+                    documents.extend(converter.convert(df, metadata))
 
             if not documents:
                 logger.warning(f"No content extracted from file: {file_name}")
@@ -726,11 +747,52 @@ class ExtractTextFromFile:
         finally:
             if temp_file:
                 temp_file.close()
+
+    def is_streamable(self, file_name: str) -> bool:
+        """행 묶음 단위로 읽으며 바로 적재할 수 있는 형식(CSV/TSV)인지"""
+        return os.path.splitext(file_name)[1].lower() in STREAMING_EXTENSIONS
+
+    def iter_csv_documents(self, file: Union[str, IO], file_name: Optional[str] = None) -> Iterator[Document]:
+        """
+        CSV/TSV 를 CSV_CHUNK_ROWS 행씩 읽어 Document 를 순서대로 내보냄
+
+        - 인코딩(UTF-8/CP949)과 구분자는 앞부분 표본으로 한 번만 판별
+        - 키 컬럼은 앞부분 표본 행으로 detect_key_columns 를 한 번만 실행해 모든 묶음에 적용
+        - 한 번에 메모리에 있는 것은 현재 행 묶음과 그 Document 뿐이다
+        """
+        if file_name is None:
+            file_name = os.path.basename(file) if isinstance(file, str) else self.get_file_name(file)
+        options = csv_read_options(file, file_name)
+        logger.info(f"Reading {file_name} as CSV (encoding={options['encoding']}, sep={options['sep']!r})")
+
+        key_columns = self.detect_key_columns(read_csv_sample(file, **options))
+        metadata = {
+            "source": os.path.basename(file_name),
+            "file_name": file_name,
+            "page": os.path.splitext(os.path.basename(file_name))[0]
+        }
+        converter = TabularTextConverter(date_format=self.date_format, key_columns=key_columns)
+        yield from converter.convert_frames(iter_csv_frames(file, **options), metadata)
+
+    def extract_text_from_csv_pages(self, file: Union[str, IO]) -> List[Document]:
+        """
+        CSV/TSV 파일을 Document 목록으로 변환 (대용량 적재는 iter_csv_documents 를 직접 사용)
+        """
+        try:
+            documents = list(self.iter_csv_documents(file))
+            if not documents:
+                logger.warning("No content extracted from CSV file")
+            return documents
+
+        except Exception as e:
+            logger.error(f"Error processing CSV file: {str(e)}")
+            return []
     
     
     def analyze_header_importance(self, df: pd.DataFrame) -> Dict[str, float]:
         """
         데이터 분석을 통해 각 헤더(컬럼)의 중요도를 자동으로 계산합니다.
+        고유성/완전성은 컬럼 단위 연산으로, 형식/참조 분석은 표본 행으로 계산합니다.
         
         Args:
             df (pd.DataFrame): 분석할 데이터프레임
@@ -742,101 +804,8 @@ class ExtractTextFromFile:
             if df.empty:
                 logger.warning("Empty DataFrame provided")
                 return {}
-                
-            importance_scores = {}
-            
-            for column in df.columns:
-                try:
-                    col_data = df[column].dropna()
-                    score = 0.0
-                    
-                    # 1. 고유성 분석 (최대 2점)
-                    if len(col_data) > 0:
-                        unique_ratio = len(col_data.unique()) / len(col_data)
-                        score += unique_ratio * (2 if 0.3 <= unique_ratio <= 0.9 else 1)
-                    
-                    # 2. 데이터 완전성 (최대 1점)
-                    completion_ratio = 1 - (df[column].isna().sum() / len(df))
-                    score += completion_ratio
-                    
-                    # 3. 데이터 패턴 분석 (최대 2점)
-                    sample_values = col_data.head(min(10, len(col_data))).astype(str)
-                    
-                    # 3.1 길이 일관성 (최대 1점)
-                    if not sample_values.empty:
-                        lengths = [len(str(v)) for v in sample_values]
-                        length_variance = np.var(lengths) if len(lengths) > 1 else 0
-                        pattern_consistency = 1 / (1 + length_variance)
-                    else:
-                        pattern_consistency = 0
-                    
-                    # 3.2 형식 일관성 (최대 1점)
-                    def get_value_pattern(value):
-                        if pd.isna(value):
-                            return 'null'
-                        value = str(value).strip()
-                        if not value:
-                            return 'empty'
-                        if value.isdigit():
-                            return 'numeric'
-                        if value.replace('.', '', 1).isdigit():  # 소수점 하나만 허용
-                            return 'decimal'
-                        if any(c.isdigit() for c in value) and any(c.isalpha() for c in value):
-                            return 'alphanumeric'
-                        if all(c.isalpha() or c.isspace() for c in value):
-                            return 'text'
-                        return 'mixed'
-                    
-                    if not sample_values.empty:
-                        patterns = [get_value_pattern(v) for v in sample_values]
-                        pattern_ratio = len(set(patterns)) / len(patterns) if patterns else 1
-                        pattern_consistency += (1 - pattern_ratio)
-                    
-                    score += pattern_consistency
-                    
-                    # 4. 참조 빈도 분석 (최대 1점)
-                    if not col_data.empty:
-                        reference_score = 0
-                        sample_size = min(5, len(col_data))
-                        sample_values = col_data.head(sample_size)
-                        
-                        for other_col in df.columns:
-                            if other_col != column:
-                                try:
-                                    # 문자열 비교 전 데이터 타입 통일
-                                    other_col_data = df[other_col].astype(str)
-                                    ref_count = sum(
-                                        other_col_data.str.contains(
-                                            str(val), regex=False, na=False
-                                        ).sum()
-                                        for val in sample_values
-                                    )
-                                    reference_score += ref_count / (sample_size * len(df))
-                                except Exception as e:
-                                    logger.warning(f"Reference analysis failed for {column}->{other_col}: {str(e)}")
-                                    continue
-                        
-                        score += min(reference_score, 1.0)  # 최대 1점으로 제한
-                    
-                    importance_scores[column] = score
-                    
-                except Exception as e:
-                    logger.error(f"Error analyzing column {column}: {str(e)}")
-                    importance_scores[column] = 0.0
-            
-            # 점수 정규화
-            if importance_scores:
-                max_score = max(importance_scores.values())
-                if max_score > 0:
-                    importance_scores = {
-                        col: score/max_score 
-                        for col, score in importance_scores.items()
-                    }
-                else:
-                    # 모든 점수가 0인 경우
-                    importance_scores = {col: 1.0/len(importance_scores) for col in importance_scores}
-            
-            logger.debug(f"Importance scores before normalization: {importance_scores}")
+            importance_scores = analyze_header_importance(df)
+            logger.debug(f"Importance scores: {importance_scores}")
             return importance_scores
             
         except Exception as e:
@@ -866,27 +835,8 @@ class ExtractTextFromFile:
                 
             logger.info(f"Column importance scores: {importance_scores}")
             
-            # threshold 계산
-            scores = sorted(importance_scores.values(), reverse=True)
-            if len(scores) <= 3:
-                threshold = 0.5
-            else:
-                index = max(1, int(len(scores) * 0.3))  # 최소 1개는 선택되도록
-                threshold = scores[index - 1]  # 0-based index 조정
-            
-            logger.debug(f"Using threshold: {threshold}")
-            
-            # 키 컬럼 선택
-            key_columns = [
-                col for col, score in importance_scores.items() 
-                if score >= threshold
-            ]
-            
-            # 키 컬럼이 없는 경우 가장 높은 점수의 컬럼 선택
-            if not key_columns and importance_scores:
-                max_col = max(importance_scores.items(), key=lambda x: x[1])[0]
-                key_columns = [max_col]
-                logger.info(f"No columns above threshold, using highest scoring column: {max_col}")
+            # 상위 30% (컬럼 3개 이하면 0.5 이상) 선택, 없으면 최고 점수 컬럼
+            key_columns = select_key_columns(importance_scores)
             
             logger.info(f"Detected {len(key_columns)} key columns: {key_columns}")
             return key_columns
@@ -940,52 +890,18 @@ class ExtractTextFromFile:
             return str(value) if value is not None else ""
 
     def _convert_df_to_text(self, df: pd.DataFrame) -> str:
-        chunks = []
+        """행별 문장을 컬럼 단위 연산으로 만들어 하나의 문자열로 조인"""
+        if df.empty:
+            return ""
         key_columns = self.detect_key_columns(df)
-        
-        for idx, row in df.iterrows():
-            sentences = []
-            
-            # 키 컬럼 처리
-            if key_columns:
-                key_info = []
-                for key_col in key_columns:
-                    value = self.clean_value(row[key_col])
-                    key_info.append(f"{key_col} {value}")
-                sentences.append(", ".join(key_info))
-            
-            # 나머지 컬럼 처리
-            for col in df.columns:
-                if col not in (key_columns or []):
-                    value = self.clean_value(row[col])
-                    sentences.append(f"{col} {value}")
-            
-            chunk = ". ".join(sentences) + ","
-            chunks.append(chunk)
-        
-        # 리스트를 하나의 문자열로 조인
-        return " ".join(chunks)
+        cleaned = clean_frame(df, self.date_format)
+        return " ".join(rows_to_text(cleaned, key_columns).tolist())
     
     def create_markdown_format(self, df: pd.DataFrame) -> str:
         """
         데이터프레임을 Markdown 형식으로 변환
         """
-        markdown_chunks = []
-        
-        for idx, row in df.iterrows():
-            chunk = f"### Record {idx + 1}\n\n"
-            
-            for col in df.columns:
-                value = self.clean_value(row[col])
-                chunk += f"- **{col}**: {value}\n"
-                # 검색을 위한 별도 태그 추가
-                if value:
-                    chunk += f"- ##{col.lower().replace(' ', '_')}_{value.lower().replace(' ', '_')}\n"
-            
-            chunk += "\n---\n"
-            markdown_chunks.append(chunk)
-        
-        return "\n".join(markdown_chunks)
+        return TabularTextConverter(date_format=self.date_format).to_markdown(df)
 
     def create_json_format(self, df: pd.DataFrame) -> str:
         """
@@ -997,65 +913,10 @@ class ExtractTextFromFile:
             JSON 형식의 문자열
         """
         try:
-            records = []
-            
-            # DataFrame이 비어있는지 확인
             if df.empty:
                 logger.warning("Empty DataFrame received")
                 return json.dumps({"records": []}, ensure_ascii=False, indent=2)
-            
-            for idx, row in df.iterrows():
-                try:
-                    # 필드 값 변환 시 오류 처리
-                    fields = {}
-                    for col in df.columns:
-                        try:
-                            raw_value = row[col]
-                            # value가 아닌 raw_value를 사용하여 실제 데이터 값을 가져옴
-                            cleaned_value = self.clean_value(raw_value)
-                            fields[str(col)] = cleaned_value
-                        except Exception as e:
-                            logger.warning(f"Error processing column {col}: {str(e)}")
-                            fields[str(col)] = ""
-
-                    # 검색 태그 생성
-                    search_tags = []
-                    for col in df.columns:
-                        try:
-                            if not pd.isna(row[col]):
-                                col_str = str(col).lower().replace(' ', '_')
-                                val_str = str(row[col]).lower().replace(' ', '_')
-                                if val_str:  # 빈 문자열이 아닌 경우만 태그 추가
-                                    search_tags.append(f"{col_str}_{val_str}")
-                        except Exception as e:
-                            logger.warning(f"Error creating search tag for {col}: {str(e)}")
-
-                    record = {
-                        "record_id": int(idx) + 1,
-                        "fields": fields,
-                        "search_tags": search_tags
-                    }
-                    records.append(record)
-                    
-                except Exception as e:
-                    logger.error(f"Error processing row {idx}: {str(e)}")
-                    continue
-
-            # 최종 JSON 생성
-            json_str = json.dumps(
-                {"records": records}, 
-                ensure_ascii=False, 
-                indent=2,
-                default=str  # 직렬화할 수 없는 객체 처리
-            )
-            
-            # 결과 검증
-            try:
-                json.loads(json_str)  # JSON 유효성 검사
-                return json_str
-            except json.JSONDecodeError as e:
-                logger.error(f"Invalid JSON produced: {str(e)}")
-                return json.dumps({"records": []}, ensure_ascii=False, indent=2)
+            return TabularTextConverter(date_format=self.date_format).to_json(df)
 
         except Exception as e:
             logger.error(f"Error in create_json_format: {str(e)}")
@@ -1091,11 +952,12 @@ class ExtractTextFromFile:
                 file_name = os.path.basename(file_path)
                 prs = Presentation(file_path)
             else:
-                # 임시 파일 생성
-                temp_file = io.BytesIO(file.read())
+                # 전체를 메모리로 복사하지 않고 파일 객체를 그대로 사용
+                file_obj, owned = self._seekable_file(file)
+                temp_file = file_obj if owned else None
                 file_name = self.get_file_name(file)
                 file_path = file_name  # 파일 객체의 이름을 file_path로 사용
-                prs = Presentation(temp_file)
+                prs = Presentation(file_obj)
 
             for slide_number, slide in enumerate(prs.slides, 1):
                 slide_text = ""
@@ -1126,8 +988,56 @@ class ExtractTextFromFile:
     def chunk_text(self, text, chunk_size):
         return [text[i:i+chunk_size] for i in range(0, len(text), chunk_size)]
 
-    def extract_text_from_file(self, file, file_name):
-        """파일에서 텍스트 추출"""
+    def extract_text_from_file(self, file, file_name, pdf_engine: Optional[str] = None):
+        """
+        파일에서 텍스트 추출
+
+        경로로 주어진 파일은 내용 SHA-256 + EXTRACTOR_VERSION 으로 추출 캐시를 먼저 조회하고,
+        캐시가 맞으면 추출을 건너뛴다.
+
+        Args:
+            pdf_engine: PDF 추출 엔진 (PDF_ENGINES 중 하나, 없으면 PDF_ENGINE 환경 변수)
+        """
+        pdf_engine = self._resolve_pdf_engine(pdf_engine)
+        cache = get_extraction_cache() if isinstance(file, str) else None
+        if cache is None:
+            return self._extract_text_from_file(file, file_name, pdf_engine)
+
+        ext = os.path.splitext(file_name)[1].lower()
+        version = f"{EXTRACTOR_VERSION}-{pdf_engine}" if ext == '.pdf' else EXTRACTOR_VERSION
+        try:
+            cache_key = cache.build_key(file_digest(file), version, ext)
+        except OSError as e:
+            logger.warning(f"Extraction cache skipped for {file_name}: {str(e)}")
+            return self._extract_text_from_file(file, file_name, pdf_engine)
+
+        docs = cache.get_documents(cache_key, file_name)
+        if docs:
+            logger.info(f"Extraction cache hit for {file_name}: {len(docs)} documents")
+            return docs
+        docs = self._extract_text_from_file(file, file_name, pdf_engine)
+        cache.put_documents(cache_key, docs, file_name)
+        return docs
+
+    def _resolve_pdf_engine(self, pdf_engine: Optional[str]) -> str:
+        engine = (pdf_engine or PDF_ENGINE).lower()
+        if engine not in PDF_ENGINES:
+            raise ValueError(f"Unsupported PDF engine: {engine} (choose from {', '.join(PDF_ENGINES)})")
+        return engine
+
+    def extract_pdf(self, file: Union[str, IO], file_name: str, pdf_engine: Optional[str] = None) -> List[Document]:
+        """선택한 엔진으로 PDF 추출"""
+        engine = self._resolve_pdf_engine(pdf_engine)
+        if engine == 'adaptive':
+            return self.extract_text_from_pdf_pages_adaptive(file, file_name)
+        if engine == 'plumber':
+            return self.extract_text_from_pdf_pages_plumber(file, file_name)
+        if engine == 'pymupdf4llm':
+            return self.extract_text_from_pdf4llm_pages(file, file_name)
+        return self.extract_text_from_pdf_pages(file, file_name)
+
+    def _extract_text_from_file(self, file, file_name, pdf_engine: Optional[str] = None):
+        """확장자별 추출기 실행 (캐시 미사용)"""
         try:
             if isinstance(file, str):
                 file_path = file
@@ -1143,12 +1053,13 @@ class ExtractTextFromFile:
             
             # 파일 형식별 처리
             if ext == '.pdf':
-                #docs = self.extract_text_from_pdf4llm_pages(file_path, file_name)
-                docs = self.extract_text_from_pdf_pages_plumber(file_path, file_name)
+                docs = self.extract_pdf(file_path, file_name, pdf_engine)
             elif ext in ['.docx', '.doc']:
                 docs = self.extract_text_from_docx_pages(file_path)
-            elif ext in ['.xlsx', '.xls','.csv']:
+            elif ext in ['.xlsx', '.xls']:
                 docs = self.extract_text_from_xlsx_pages(file_path)
+            elif ext in ['.csv', '.tsv']:
+                docs = self.extract_text_from_csv_pages(file_path)
             elif ext in ['.pptx', '.ppt']:
                 docs = self.extract_text_from_pptx_pages(file_path)
             elif ext in ['.hwp', '.hwpx']:
@@ -1214,7 +1125,7 @@ class ExtractTextFromFile:
                 temp_dir = os.path.dirname(hwp_file)
                 temp_hwp_path = os.path.join(temp_dir, f"{base_name}.hwp")
                 with open(temp_hwp_path, 'wb') as temp_file:
-                    temp_file.write(hwp_file.read())
+                    shutil.copyfileobj(hwp_file, temp_file, READ_CHUNK_BYTES)
                 hwp_path = temp_hwp_path
 
             temp_pdf_path = os.path.join(temp_dir, f"{base_name}.pdf")
@@ -1270,35 +1181,46 @@ class ExtractTextFromFile:
                     logging.error(f"임시 PDF 파일 삭제 중 오류 발생: {str(e)}")
 
     def _extract_text_from_hwp(self, hwp_file: Union[str, IO], file_name) -> Optional[List[Document]]:
+        """
+        HWP 5 / HWPX 를 직접 파싱해 페이지·문단 단위 Document 목록으로 추출 (Linux 등 비 Windows)
+
+        HWPX 는 구역 XML 을 iterparse 로 스트리밍하고, HWP 5 는 BodyText 레코드를 문단 단위로 읽는다.
+        zip/OLE 리더가 파일 객체를 직접 받으므로 임시 복사본을 만들지 않는다.
+        """
+        temp_file = None
         try:
-            
             if isinstance(hwp_file, str):
-                hwp_path = hwp_file
+                source = hwp_file
+            elif self._disk_path(hwp_file):
+                source = self._disk_path(hwp_file)
             else:
-                temp_dir = tempfile.gettempdir()
-                temp_hwp_path = os.path.join(temp_dir, file_name)
-                with open(temp_hwp_path, 'wb') as temp_file:
-                    temp_file.write(hwp_file.read())
-                hwp_path = temp_hwp_path
+                source, owned = self._seekable_file(hwp_file)
+                temp_file = source if owned else None
 
-            hwp = hwp5.HwpFile(hwp_path)
-            text = hwp.text().strip()
-            
-            document = Document(page_content=text, metadata={"source": os.path.basename(file_name)})
-            return [document]
-        except ImportError:
-            logging.error("pyhwp 라이브러리가 설치되지 않았습니다. pip install pyhwp로 설치해주세요.")
-            return None
+            # 확장자가 틀린 경우도 있으므로 내용(zip 여부)으로 형식 판별
+            if is_hwpx(source):
+                chunks = extract_hwpx(source, table_to_text=self.process_table_data)
+            else:
+                chunks = extract_hwp5(source)
+
+            documents = []
+            for text, structure in chunks:
+                text = self.clean_text2(text)
+                if not text:
+                    continue
+                metadata = {
+                    "source": os.path.basename(file_name),
+                    "file_name": file_name,
+                    **structure
+                }
+                documents.append(Document(page_content=text, metadata=metadata))
+            return documents
         except Exception as e:
             logging.error(f"HWP 파일 처리 중 오류 발생: {str(e)}")
             return None
         finally:
-            if not isinstance(hwp_file, str) and os.path.exists(hwp_path):
-                try:
-                    os.remove(hwp_path)
-                    logging.info(f"임시 HWP 파일 삭제 완료: {hwp_path}")
-                except Exception as e:
-                    logging.error(f"임시 HWP 파일 삭제 중 오류 발생: {str(e)}")
+            if temp_file:
+                temp_file.close()
 
     # 기존의 handle_completion_dialog, close_hwp_popups, extract_text_from_pdf_pages 메서드는 그대로 유지
 
@@ -1360,6 +1282,47 @@ class ExtractTextFromFile:
         if name:
             return os.path.basename(name)
         return "Unknown"
+
+    def _disk_path(self, file_object) -> Optional[str]:
+        """파일 객체가 디스크 파일이면 그 경로 (경로 기반 리더에 그대로 전달)"""
+        name = getattr(file_object, 'name', None)
+        if isinstance(name, str) and os.path.isfile(name):
+            return name
+        return None
+
+    def _spool_to_disk(self, file_object, suffix: str) -> str:
+        """
+        경로가 필요한 리더(PyMuPDF + pdfplumber 페이지 지정)에 넘길 임시 파일 경로
+
+        READ_CHUNK_BYTES 단위로 복사하므로 전체 내용을 메모리에 올리지 않는다. 호출자가 삭제해야 한다.
+        """
+        try:
+            if file_object.seekable():
+                file_object.seek(0)
+        except (AttributeError, ValueError):
+            pass
+        with tempfile.NamedTemporaryFile(mode="w+b", suffix=suffix, delete=False) as spool:
+            shutil.copyfileobj(file_object, spool, READ_CHUNK_BYTES)
+            return spool.name
+
+    def _seekable_file(self, file_object) -> tuple:
+        """
+        zip/OLE 기반 리더(docx, pptx, xlsx)에 넘길 파일 객체
+
+        io.BytesIO(file.read()) 로 전체를 복사하지 않고, seek 가능한 파일은 그대로,
+        아니면 READ_CHUNK_BYTES 단위로 임시 파일에 옮겨 사용한다.
+        Returns:
+            (파일 객체, 호출자가 닫아야 하는지 여부)
+        """
+        try:
+            if file_object.seekable():
+                return file_object, False
+        except (AttributeError, ValueError):
+            pass
+        spool = tempfile.TemporaryFile(mode="w+b")
+        shutil.copyfileobj(file_object, spool, READ_CHUNK_BYTES)
+        spool.seek(0)
+        return spool, True
     
     def extract_text_from_markdown(self, file: Union[str, IO]) -> List[Document]:
         """
@@ -0,0 +1,315 @@
+from typing import List, Dict, Any, Optional, Callable
+from datetime import datetime
+from pathlib import Path
+from array import array
+import threading
+import hashlib
+import logging
+import sqlite3
+import gzip
+import json
+import os
+
+from langchain.docstore.document import Document
+from backend.app.MetricsRegistry import get_metrics_registry
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+_metrics = get_metrics_registry()
+EXTRACTION_CACHE_REQUESTS = _metrics.counter(
+    "rag_extraction_cache_requests_total", "Extraction/chunk embedding cache lookups", ["kind", "result"])
+
+
+EXTRACTION_CACHE_DIR = os.getenv(
+    "EXTRACTION_CACHE_DIR", str(Path(__file__).parent.parent / "cache" / "extraction"))
+# 추출 결과 + 청크 임베딩 전체 용량 상한 (초과 시 오래 사용되지 않은 항목부터 삭제)
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+EXTRACTION_CACHE_ENABLED = os.getenv("EXTRACTION_CACHE_ENABLED", "true").lower() == "true"
+HASH_CHUNK_BYTES = 1 << 20
+
+
+def file_digest(path: str) -> str:
+    """파일 내용 SHA-256 (1MB 단위로 읽음)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_digest(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ExtractionCache:
+    """
+    파일 내용 주소 기반 추출 결과 캐시 + 청크 임베딩 캐시 (로컬 디스크)
+
+    - 추출 결과: key = sha256(파일) + 추출기 버전 + 확장자, 값은 gzip JSON 으로 저장한 Document 목록
+      같은 파일을 다른 이름/컬렉션으로 다시 올려도 pdfplumber 등 추출을 다시 하지 않는다.
+    - 청크 임베딩: key = sha256(청크 텍스트) + 모델 이름, 값은 float32 배열
+      추출 캐시가 맞으면 분할 결과도 같으므로 임베딩 계산도 건너뛴다.
+
+    두 캐시의 합이 max_bytes 를 넘으면 마지막 사용 시각이 오래된 항목부터 삭제한다.
+    """
+
+    def __init__(self, cache_dir: str = EXTRACTION_CACHE_DIR, max_bytes: int = EXTRACTION_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self._conn = sqlite3.connect(os.path.join(cache_dir, "index.sqlite3"), check_same_thread=False)
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS extraction_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    file_name TEXT,
+                    doc_count INTEGER NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    hit_count INTEGER DEFAULT 0,
+                    created_at TEXT,
+                    last_hit_at TEXT
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS chunk_embeddings (
+                    chunk_hash TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    vector BLOB NOT NULL,
+                    size_bytes INTEGER NOT NULL,
+                    last_hit_at TEXT,
+                    PRIMARY KEY (chunk_hash, model)
+                )
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_chunk_embeddings_last_hit
+                ON chunk_embeddings(last_hit_at)
+            """)
+            self._conn.commit()
+        self._total_bytes = self._compute_total_bytes()
+
+    @staticmethod
+    def build_key(digest: str, extractor_version: str, ext: str) -> str:
+        return f"{digest}-{extractor_version}-{ext.lower().lstrip('.')}"
+
+    def _path(self, cache_key: str) -> str:
+        return os.path.join(self.cache_dir, cache_key[:2], f"{cache_key}.json.gz")
+
+    def _compute_total_bytes(self) -> int:
+        with self._lock:
+            row = self._conn.execute("""
+                SELECT (SELECT COALESCE(SUM(size_bytes), 0) FROM extraction_cache)
+                     + (SELECT COALESCE(SUM(size_bytes), 0) FROM chunk_embeddings)
+            """).fetchone()
+        return int(row[0] or 0)
+
+    # --- 추출 결과 ---
+    def get_documents(self, cache_key: str, file_name: Optional[str] = None) -> Optional[List[Document]]:
+        """
+        캐시된 Document 목록. file_name 이 주어지면 원래 파일명으로 기록된
+        source/file_name 메타데이터를 현재 파일명으로 바꿔 반환한다.
+        """
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT file_name FROM extraction_cache WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+            if row is None:
+                EXTRACTION_CACHE_REQUESTS.inc(kind="extraction", result="miss")
+                return None
+            with gzip.open(self._path(cache_key), "rt", encoding="utf-8") as f:
+                payload = json.load(f)
+            with self._lock:
+                self._conn.execute("""
+                    UPDATE extraction_cache SET hit_count = hit_count + 1, last_hit_at = ?
+                    WHERE cache_key = ?
+                """, (datetime.now().isoformat(), cache_key))
+                self._conn.commit()
+        except FileNotFoundError:
+            self._delete_entry(cache_key)
+            EXTRACTION_CACHE_REQUESTS.inc(kind="extraction", result="miss")
+            return None
+        except Exception as e:
+            logger.error(f"추출 캐시 조회 오류: {str(e)}")
+            return None
+
+        EXTRACTION_CACHE_REQUESTS.inc(kind="extraction", result="hit")
+        original = row[0]
+        renames = {}
+        if file_name and original and file_name != original:
+            renames = {original: file_name, os.path.basename(original): os.path.basename(file_name)}
+        documents = []
+        for item in payload:
+            metadata = dict(item.get("metadata") or {})
+            for field in ("source", "file_name"):
+                if metadata.get(field) in renames:
+                    metadata[field] = renames[metadata[field]]
+            documents.append(Document(page_content=item["page_content"], metadata=metadata))
+        return documents
+
+    def put_documents(self, cache_key: str, documents: List[Document], file_name: Optional[str] = None) -> None:
+        path = self._path(cache_key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+                json.dump([{"page_content": doc.page_content, "metadata": doc.metadata} for doc in documents],
+                          f, ensure_ascii=False, default=str)
+            os.replace(tmp_path, path)
+            size = os.path.getsize(path)
+            now = datetime.now().isoformat()
+            with self._lock:
+                previous = self._conn.execute(
+                    "SELECT size_bytes FROM extraction_cache WHERE cache_key = ?", (cache_key,)).fetchone()
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO extraction_cache
+                    (cache_key, file_name, doc_count, size_bytes, hit_count, created_at, last_hit_at)
+                    VALUES (?, ?, ?, ?, 0, ?, ?)
+                """, (cache_key, file_name, len(documents), size, now, now))
+                self._conn.commit()
+                self._total_bytes += size - (previous[0] if previous else 0)
+        except Exception as e:
+            logger.error(f"추출 캐시 저장 오류: {str(e)}")
+            return
+        self._evict()
+
+    def _delete_entry(self, cache_key: str) -> None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT size_bytes FROM extraction_cache WHERE cache_key = ?", (cache_key,)).fetchone()
+            self._conn.execute("DELETE FROM extraction_cache WHERE cache_key = ?", (cache_key,))
+            self._conn.commit()
+            if row:
+                self._total_bytes -= row[0]
+        try:
+            os.remove(self._path(cache_key))
+        except OSError:
+            pass
+
+    # --- 청크 임베딩 ---
+    def get_embeddings(self, model: str, texts: List[str]) -> Dict[str, List[float]]:
+        """청크 해시 -> 임베딩 (캐시에 있는 것만)"""
+        hashes = list(dict.fromkeys(chunk_digest(t) for t in texts))
+        found = {}
+        try:
+            with self._lock:
+                for start in range(0, len(hashes), 500):
+                    batch = hashes[start:start + 500]
+                    for chunk_hash, blob in self._conn.execute(f"""
+                        SELECT chunk_hash, vector FROM chunk_embeddings
+                        WHERE model = ? AND chunk_hash IN ({','.join('?' * len(batch))})
+                    """, [model, *batch]):
+                        found[chunk_hash] = array("f", blob).tolist()
+                if found:
+                    now = datetime.now().isoformat()
+                    self._conn.executemany(
+                        "UPDATE chunk_embeddings SET last_hit_at = ? WHERE chunk_hash = ? AND model = ?",
+                        [(now, h, model) for h in found])
+                    self._conn.commit()
+        except Exception as e:
+            logger.error(f"임베딩 캐시 조회 오류: {str(e)}")
+        EXTRACTION_CACHE_REQUESTS.inc(len(found), kind="embedding", result="hit")
+        EXTRACTION_CACHE_REQUESTS.inc(len(hashes) - len(found), kind="embedding", result="miss")
+        return found
+
+    def put_embeddings(self, model: str, texts: List[str], embeddings: List[List[float]]) -> None:
+        now = datetime.now().isoformat()
+        rows = []
+        for text, vector in zip(texts, embeddings):
+            blob = array("f", vector).tobytes()
+            rows.append((chunk_digest(text), model, blob, len(blob), now))
+        if not rows:
+            return
+        try:
+            with self._lock:
+                self._conn.executemany("""
+                    INSERT OR IGNORE INTO chunk_embeddings (chunk_hash, model, vector, size_bytes, last_hit_at)
+                    VALUES (?, ?, ?, ?, ?)
+                """, rows)
+                self._conn.commit()
+                self._total_bytes += sum(r[3] for r in rows)
+        except Exception as e:
+            logger.error(f"임베딩 캐시 저장 오류: {str(e)}")
+            return
+        self._evict()
+
+    def embed_documents(self, model: str, texts: List[str],
+                        embed: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        """캐시에 없는 청크만 embed() 로 계산하고 입력 순서대로 임베딩 반환"""
+        cached = self.get_embeddings(model, texts)
+        hashes = [chunk_digest(t) for t in texts]
+        missing = list(dict.fromkeys(t for t, h in zip(texts, hashes) if h not in cached))
+        if missing:
+            computed = embed(missing)
+            if hasattr(computed, "tolist"):
+                computed = computed.tolist()
+            self.put_embeddings(model, missing, computed)
+            for text, vector in zip(missing, computed):
+                cached[chunk_digest(text)] = vector
+        return [cached[h] for h in hashes]
+
+    # --- 용량 관리 ---
+    def _evict(self) -> None:
+        """총 용량이 max_bytes 를 넘으면 90% 이하가 될 때까지 오래된 항목부터 삭제"""
+        if self._total_bytes <= self.max_bytes:
+            return
+        # 중복 삽입(INSERT OR IGNORE) 등으로 어긋난 누계를 실제 값으로 맞춘 뒤 판단
+        self._total_bytes = self._compute_total_bytes()
+        if self._total_bytes <= self.max_bytes:
+            return
+        target = int(self.max_bytes * 0.9)
+        removed_files = []
+        with self._lock:
+            candidates = self._conn.execute("""
+                SELECT 'e', cache_key, '', size_bytes, last_hit_at FROM extraction_cache
+                UNION ALL
+                SELECT 'c', chunk_hash, model, size_bytes, last_hit_at FROM chunk_embeddings
+                ORDER BY last_hit_at
+            """).fetchall()
+            for kind, key, model, size, _ in candidates:
+                if self._total_bytes <= target:
+                    break
+                if kind == 'e':
+                    self._conn.execute("DELETE FROM extraction_cache WHERE cache_key = ?", (key,))
+                    removed_files.append(self._path(key))
+                else:
+                    self._conn.execute(
+                        "DELETE FROM chunk_embeddings WHERE chunk_hash = ? AND model = ?", (key, model))
+                self._total_bytes -= size
+            self._conn.commit()
+        for path in removed_files:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        logger.info(f"Extraction cache evicted to {self._total_bytes} bytes")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM extraction_cache").fetchone()[0]
+            embeddings = self._conn.execute("SELECT COUNT(*) FROM chunk_embeddings").fetchone()[0]
+        return {'entries': entries, 'embeddings': embeddings,
+                'size_bytes': self._total_bytes, 'max_bytes': self.max_bytes}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache: Optional[ExtractionCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_extraction_cache() -> Optional[ExtractionCache]:
+    """프로세스 전역 추출 캐시 (EXTRACTION_CACHE_ENABLED=false 이면 None)"""
+    global _cache
+    if not EXTRACTION_CACHE_ENABLED:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ExtractionCache()
+            logger.info(f"Extraction cache: {_cache.cache_dir} (max {_cache.max_bytes} bytes)")
+        return _cache
@@ -9,6 +9,7 @@ import logging
 import json, re
 from typing import Union, List
 from icecream import ic
+from backend.app.LLMRateLimiter import get_rate_limiter, estimate_tokens, record_token_usage
 
 
 logging.basicConfig(level=logging.ERROR)
@@ -43,8 +44,25 @@ class GroqManager:
             logging.error('API Key가 입력되지 않았습니다.')
             self.api_key = ""
             raise ValueError('no GROQ_API_KEY')
-        # Groq 클라이언트 초기화
-        self.client = Groq(api_key=self.api_key)
+        # Groq 클라이언트 초기화 (재시도는 공유 속도 제한기에서 처리)
+        self.client = Groq(api_key=self.api_key, max_retries=0)
+        self.rate_limiter = get_rate_limiter()
+    
+    def _create_completion(self, **kwargs):
+        """속도 제한기를 거쳐 chat completion 호출 (RPM/TPM 제한, 백오프 재시도)"""
+        prompt_text = "".join(str(m.get("content", "")) for m in kwargs.get("messages", []))
+        tokens = estimate_tokens(prompt_text, min(kwargs.get("max_tokens", 1024), 1024))
+        response = self.rate_limiter.call(
+            "Groq",
+            lambda: self.client.chat.completions.create(**kwargs),
+            tokens=tokens,
+            usage_fn=lambda response: getattr(response.usage, "total_tokens", 0)
+        )
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            record_token_usage("Groq", kwargs.get("model"),
+                               getattr(usage, "prompt_tokens", 0), getattr(usage, "completion_tokens", 0))
+        return response
     
     def set_model(self, modelname: str) -> None:
         self.model = modelname    
@@ -162,7 +180,7 @@ class GroqManager:
         """
 
         try:
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
                 temperature=0,
@@ -232,7 +250,7 @@ class GroqManager:
             생성된 질문만 쉼표로 구분된 리스트 형태로 반환해주세요.
             """          
             self.set_model(model_name)
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_message}
@@ -269,7 +287,7 @@ class GroqManager:
 
                 Please provide a detailed answer based on the given context:"""
 
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": "You are an intelligent assistant. "
@@ -298,7 +316,7 @@ class GroqManager:
     def groq_generate(self, model_name: str, prompt: str) -> dict:
         try:         
 
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=model_name,
                 messages=[
                     {"role": "system", "content": "You are an intelligent assistant. "
@@ -360,7 +378,7 @@ class GroqManager:
 
             Please provide a detailed answer based on the given context:"""
 
-            response = self.client.chat.completions.create(
+            response = self._create_completion(
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_message},
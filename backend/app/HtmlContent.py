@@ -0,0 +1,107 @@
+from typing import List, Optional, Dict
+import logging
+
+from bs4 import BeautifulSoup
+
+from backend.app.TextNormalizer import clean_web_text
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+def get_content_patterns() -> List[str]:
+    """일반적인 콘텐츠 관련 클래스/ID 패턴"""
+    return [
+        # 기본 콘텐츠 패턴
+        'content', 'contents', 'article', 'post',
+        # 변형 패턴들
+        'article-content', 'post-content', 'entry-content',
+        'main-content', 'page-content', 'body-content',
+        # 본문 관련
+        'body-text', 'article-body', 'post-body', 'text-body',
+        # 추가 일반적인 패턴
+        'text', 'main', 'story', 'article-text', 'article_text'
+    ]
+
+def analyze_content_block(element) -> float:
+    """HTML 요소의 콘텐츠 점수를 계산"""
+    if not element:
+        return 0
+
+    text = element.get_text()
+    words = len(text.split())
+    tags = len(element.find_all())
+    paragraphs = len(element.find_all('p'))
+    links = len(element.find_all('a'))
+
+    # 점수 계산
+    score = words * 1.0  # 기본 점수는 단어 수
+    if tags > 0:
+        score *= (paragraphs / tags)  # 단락 비율 반영
+    if links > 0 and words > 0:
+        score *= (1 - (links / words))  # 링크 비율 반영
+
+    return score
+
+def extract_main_content(soup: BeautifulSoup) -> Optional[BeautifulSoup]:
+    """HTML에서 주요 콘텐츠 영역을 추출"""
+    candidates = []
+
+    # 1. 클래스/ID 기반 검색
+    for pattern in get_content_patterns():
+        elements = soup.find_all(class_=lambda x: x and pattern.lower() in x.lower())
+        candidates.extend(elements)
+
+        elements = soup.find_all(id=lambda x: x and pattern.lower() in x.lower())
+        candidates.extend(elements)
+
+    # 2. 태그 기반 검색
+    main_tags = ['article', 'main', 'section','body-text']
+    for tag in main_tags:
+        elements = soup.find_all(tag)
+        candidates.extend(elements)
+
+    # 3. 점수 기반 선택
+    best_element = None
+    best_score = 0
+    # 여러 패턴에 걸리는 같은 요소는 한 번만 점수 계산 (get_text/find_all 반복 방지)
+    scores: Dict[int, float] = {}
+
+    for element in candidates:
+        key = id(element)
+        if key not in scores:
+            scores[key] = analyze_content_block(element)
+        score = scores[key]
+        if score > best_score:
+            best_score = score
+            best_element = element
+
+    # 4. 대안 검색
+    if not best_element or best_score < 100:  # 임계값 조정 가능
+        # div 태그 중에서 가장 많은 텍스트를 포함한 요소 찾기
+        for div in soup.find_all('div'):
+            key = id(div)
+            score = scores[key] if key in scores else analyze_content_block(div)
+            if score > best_score:
+                best_score = score
+                best_element = div
+
+    return best_element
+
+def extract_title(soup: BeautifulSoup) -> str:
+    """h1 → class/id 에 title 이 들어간 요소 → <title> 순으로 제목 탐색"""
+    title_candidates = [
+        soup.find('h1'),
+        soup.find(class_=lambda x: x and 'title' in x.lower()),
+        soup.find(id=lambda x: x and 'title' in x.lower())
+    ]
+
+    for candidate in title_candidates:
+        if candidate:
+            title = clean_web_text(candidate.get_text())
+            if title:
+                return title
+    if soup.title and soup.title.string:
+        return clean_web_text(soup.title.string)
+    return ""
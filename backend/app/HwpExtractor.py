@@ -0,0 +1,275 @@
+from typing import List, Dict, Any, Optional, Callable, Iterator, Tuple, Union, IO
+import xml.etree.ElementTree as ET
+import logging
+import zipfile
+import struct
+import zlib
+import re
+import os
+
+import olefile
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 한 청크의 최대 글자 수 (페이지가 바뀌거나 이 길이를 넘으면 청크를 끊는다)
+HWP_CHUNK_CHARS = int(os.getenv("HWP_CHUNK_CHARS", "1800"))
+
+# HWP 5 레코드 태그 (HWPTAG_BEGIN = 0x10)
+HWPTAG_PARA_HEADER = 0x10 + 50
+HWPTAG_PARA_TEXT = 0x10 + 51
+HWPTAG_PARA_LINE_SEG = 0x10 + 53
+# 문단 머리 break type 비트: 구역 / 다단 / 쪽 / 단
+BREAK_SECTION = 0x01
+BREAK_PAGE = 0x04
+# PARA_TEXT 제어 문자: 1 WCHAR 짜리 (나머지 32 미만 코드는 8 WCHAR 차지)
+SINGLE_CHAR_CONTROLS = {0, 10, 13} | set(range(24, 32))
+
+SECTION_NAME = re.compile(r'^Contents/section(\d+)\.xml$', re.IGNORECASE)
+
+
+class HwpChunker:
+    """
+    문단 단위로 텍스트를 모아 페이지 경계 또는 max_chars 에서 청크로 끊는다
+
+    청크 메타데이터: page, page_end, section, paragraph_start, paragraph_end
+    """
+
+    def __init__(self, max_chars: int = HWP_CHUNK_CHARS):
+        self.max_chars = max_chars
+        self.chunks: List[Tuple[str, Dict[str, Any]]] = []
+        self._parts: List[str] = []
+        self._size = 0
+        self._meta: Dict[str, Any] = {}
+        self.page = 1
+        self.section = 1
+        self.paragraph = 0
+
+    def new_page(self) -> None:
+        self.flush()
+        self.page += 1
+
+    def new_section(self) -> None:
+        self.flush()
+        self.section += 1
+
+    def add(self, text: str) -> None:
+        self.paragraph += 1
+        text = text.strip()
+        if not text:
+            return
+        if not self._parts:
+            self._meta = {'page': self.page, 'section': self.section, 'paragraph_start': self.paragraph}
+        elif self._size + len(text) > self.max_chars:
+            self.flush()
+            self._meta = {'page': self.page, 'section': self.section, 'paragraph_start': self.paragraph}
+        self._parts.append(text)
+        self._size += len(text) + 1
+
+    def flush(self) -> None:
+        if self._parts:
+            self.chunks.append(("\n".join(self._parts),
+                                {**self._meta, 'page_end': self.page, 'paragraph_end': self.paragraph}))
+        self._parts, self._size = [], 0
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit('}', 1)[-1]
+
+
+def _int_attr(elem, name: str, default: int = 0) -> int:
+    try:
+        return int(elem.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_hwpx_section(stream: IO, chunker: HwpChunker, table_to_text: Callable[[List[List[str]]], str]) -> None:
+    """
+    HWPX 구역 XML 을 iterparse 로 한 번 읽으며 최상위 문단 단위로 chunker 에 전달
+
+    - 최상위 문단의 pageBreak="1" 또는 첫 lineseg 의 vertpos 가 이전 문단보다 작아지면 새 페이지
+    - 표(tbl) 안의 문단은 셀 텍스트로 모아 표가 끝날 때 table_to_text 로 변환
+    - 처리한 최상위 문단은 바로 clear() 해 메모리 사용량을 구역 크기와 무관하게 유지
+    """
+    table_depth = 0
+    paragraph_depth = 0
+    parts: List[str] = []
+    rows: List[List[str]] = []
+    row: List[str] = []
+    cell: List[str] = []
+    first_vertpos: Optional[int] = None
+    last_vertpos: Optional[int] = None
+
+    for event, elem in ET.iterparse(stream, events=('start', 'end')):
+        name = _local(elem.tag)
+        if event == 'start':
+            if name == 'p':
+                paragraph_depth += 1
+                if paragraph_depth == 1:
+                    parts, first_vertpos = [], None
+                    if elem.get('pageBreak') == '1' and chunker.paragraph:
+                        chunker.new_page()
+                        last_vertpos = None
+            elif name == 'tbl':
+                table_depth += 1
+                if table_depth == 1:
+                    rows = []
+            elif name == 'tr' and table_depth == 1:
+                row = []
+            elif name == 'tc' and table_depth == 1:
+                cell = []
+            elif name == 'lineseg' and paragraph_depth == 1 and first_vertpos is None:
+                first_vertpos = _int_attr(elem, 'vertpos')
+                # 배치 정보상 세로 위치가 되돌아가면 다음 쪽으로 넘어간 것
+                if last_vertpos is not None and first_vertpos < last_vertpos and chunker.paragraph:
+                    chunker.new_page()
+                last_vertpos = first_vertpos
+            continue
+
+        if name == 't':
+            text = ''.join(elem.itertext())
+            if table_depth:
+                cell.append(text)
+            else:
+                parts.append(text)
+        elif name == 'tab' and not table_depth:
+            parts.append('\t')
+        elif name == 'tc' and table_depth == 1:
+            row.append(' '.join(''.join(cell).split()))
+        elif name == 'tr' and table_depth == 1:
+            rows.append(row)
+        elif name == 'tbl':
+            table_depth -= 1
+            if table_depth == 0 and rows:
+                table_text = table_to_text(rows)
+                if table_text:
+                    parts.append(f"\n{table_text}\n")
+        elif name == 'p':
+            paragraph_depth -= 1
+            if table_depth:
+                cell.append('\n')
+            elif paragraph_depth == 0:
+                chunker.add(''.join(parts))
+                elem.clear()
+
+
+def extract_hwpx(source: Union[str, IO], table_to_text: Callable[[List[List[str]]], str],
+                 max_chars: int = HWP_CHUNK_CHARS) -> List[Tuple[str, Dict[str, Any]]]:
+    """HWPX(zip + XML) 구역 파일을 순서대로 파싱해 (본문, 메타데이터) 목록 반환"""
+    chunker = HwpChunker(max_chars)
+    with zipfile.ZipFile(source) as zf:
+        sections = sorted(
+            ((int(m.group(1)), name) for name in zf.namelist() for m in [SECTION_NAME.match(name)] if m))
+        for index, (_, name) in enumerate(sections):
+            if index:
+                chunker.new_section()
+                chunker.new_page()
+            with zf.open(name) as stream:
+                _parse_hwpx_section(stream, chunker, table_to_text)
+    chunker.flush()
+    return chunker.chunks
+
+
+def _iter_records(data: bytes) -> Iterator[Tuple[int, int, bytes]]:
+    """HWP 5 레코드 (tag, level, payload)"""
+    offset, total = 0, len(data)
+    while offset + 4 <= total:
+        header = struct.unpack_from('<I', data, offset)[0]
+        offset += 4
+        tag, level, size = header & 0x3FF, (header >> 10) & 0x3FF, (header >> 20) & 0xFFF
+        if size == 0xFFF:
+            size = struct.unpack_from('<I', data, offset)[0]
+            offset += 4
+        yield tag, level, data[offset:offset + size]
+        offset += size
+
+
+def _para_text(payload: bytes) -> str:
+    """PARA_TEXT (UTF-16LE) 에서 제어 문자를 제외한 텍스트"""
+    chars = []
+    count = len(payload) // 2
+    codes = struct.unpack_from(f'<{count}H', payload)
+    i = 0
+    while i < count:
+        code = codes[i]
+        if code >= 32:
+            chars.append(chr(code))
+            i += 1
+        elif code in SINGLE_CHAR_CONTROLS:
+            if code in (10, 13):
+                chars.append('\n')
+            i += 1
+        else:
+            if code == 9:
+                chars.append('\t')
+            i += 8
+    # 서로게이트 쌍 복원
+    return ''.join(chars).encode('utf-16', 'surrogatepass').decode('utf-16', 'replace')
+
+
+def extract_hwp5(source: Union[str, IO], max_chars: int = HWP_CHUNK_CHARS) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    HWP 5 바이너리(OLE)의 BodyText/Section* 레코드를 직접 읽어 문단 단위로 청크 생성
+
+    - 문단 머리의 쪽/구역 나누기 비트와 첫 줄 배치(PARA_LINE_SEG)의 세로 위치 되돌아감으로 페이지 계산
+    - 표/글상자 안 문단(하위 레벨)도 본문 순서대로 포함
+    """
+    chunker = HwpChunker(max_chars)
+    with olefile.OleFileIO(source) as ole:
+        header = ole.openstream('FileHeader').read()
+        flags = struct.unpack_from('<I', header, 36)[0]
+        # bit 1: 암호 설정, bit 2: 배포용 문서
+        if flags & 0x06:
+            raise ValueError("배포용(암호화) HWP 문서는 텍스트를 추출할 수 없습니다")
+        compressed = bool(flags & 0x01)
+
+        sections = sorted(
+            (int(entry[1][len('Section'):]), entry) for entry in ole.listdir()
+            if len(entry) == 2 and entry[0] == 'BodyText' and entry[1].startswith('Section'))
+        for index, (_, entry) in enumerate(sections):
+            if index:
+                chunker.new_section()
+                chunker.new_page()
+            data = ole.openstream(entry).read()
+            if compressed:
+                data = zlib.decompress(data, -15)
+
+            text: Optional[str] = None
+            top_level = False
+            seen_lineseg = False
+            last_vertpos: Optional[int] = None
+            for tag, level, payload in _iter_records(data):
+                if tag == HWPTAG_PARA_HEADER:
+                    if text is not None:
+                        chunker.add(text)
+                    text = ""
+                    top_level = level == 0
+                    seen_lineseg = False
+                    if top_level and len(payload) >= 12 and chunker.paragraph:
+                        if payload[11] & BREAK_PAGE:
+                            chunker.new_page()
+                            last_vertpos = None
+                elif tag == HWPTAG_PARA_TEXT and text is not None:
+                    text += _para_text(payload)
+                elif tag == HWPTAG_PARA_LINE_SEG and top_level and not seen_lineseg and len(payload) >= 8:
+                    seen_lineseg = True
+                    vertpos = struct.unpack_from('<i', payload, 4)[0]
+                    if last_vertpos is not None and vertpos < last_vertpos and chunker.paragraph:
+                        chunker.new_page()
+                    last_vertpos = vertpos
+            if text is not None:
+                chunker.add(text)
+    chunker.flush()
+    return chunker.chunks
+
+
+def is_hwpx(source: Union[str, IO]) -> bool:
+    """확장자와 무관하게 zip(HWPX) 인지 OLE(HWP 5) 인지 판별"""
+    try:
+        return zipfile.is_zipfile(source)
+    finally:
+        if not isinstance(source, str):
+            source.seek(0)
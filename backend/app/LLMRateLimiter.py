@@ -0,0 +1,325 @@
+from collections import deque, defaultdict
+from contextvars import ContextVar, Token
+from typing import Dict, Any, Optional, Callable, Tuple
+import threading
+import logging
+import random
+import os, time, re
+
+from backend.app.MetricsRegistry import get_metrics_registry
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 제공자별 기본 한도 (분당 요청 수, 분당 토큰 수). 0 이면 제한 없음
+# 환경변수 LLM_RPM_<PROVIDER>, LLM_TPM_<PROVIDER> 로 변경 가능
+DEFAULT_PROVIDER_LIMITS = {
+    "Groq": (30, 6000),
+    "Openai": (500, 200000),
+    "Ollama": (0, 0),
+}
+
+_metrics = get_metrics_registry()
+LLM_REQUESTS = _metrics.counter("rag_llm_requests_total", "LLM calls by provider and outcome", ["provider", "status"])
+LLM_RETRIES = _metrics.counter("rag_llm_retries_total", "LLM call retries", ["provider"])
+LLM_LATENCY = _metrics.histogram("rag_llm_request_duration_seconds", "LLM call latency", ["provider"])
+LLM_TOKENS = _metrics.counter("rag_llm_tokens_total", "LLM token usage", ["provider", "model", "kind"])
+
+
+def record_token_usage(provider: str, model: str, prompt_tokens: int, completion_tokens: int) -> None:
+    """제공자/모델별 토큰 사용량 메트릭 기록"""
+    LLM_TOKENS.inc(prompt_tokens or 0, provider=provider, model=model or "unknown", kind="prompt")
+    LLM_TOKENS.inc(completion_tokens or 0, provider=provider, model=model or "unknown", kind="completion")
+
+
+# 요청 사용자 (공정 스케줄링 단위). require_auth 에서 설정
+_current_user: ContextVar[Optional[str]] = ContextVar("llm_rate_limit_user", default=None)
+
+
+def set_current_user(user_id: Optional[str]) -> Token:
+    """현재 요청의 사용자 설정 (요청이 끝나면 반환된 토큰으로 reset_current_user 호출)"""
+    return _current_user.set(str(user_id) if user_id is not None else None)
+
+
+def reset_current_user(token: Token) -> None:
+    """set_current_user 이전 상태로 복원"""
+    _current_user.reset(token)
+
+
+def get_current_user() -> Optional[str]:
+    """현재 요청의 사용자 조회"""
+    return _current_user.get()
+
+
+def estimate_tokens(text: str, max_output_tokens: int = 0) -> int:
+    """토큰 수 추정 (한국어 기준 약 2자당 1토큰 + 최대 출력 토큰)"""
+    return max(1, len(text or "") // 2) + max_output_tokens
+
+
+def parse_retry_after(error: Exception) -> Optional[float]:
+    """
+    오류에서 서버가 알려준 대기 시간(초) 추출
+    (Retry-After 헤더 또는 Groq 의 'Please try again in 1m2.5s' 메시지)
+    """
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None)
+    if headers:
+        try:
+            retry_after = headers.get('retry-after')
+            if retry_after:
+                return float(retry_after)
+        except (TypeError, ValueError):
+            pass
+
+    match = re.search(r'Please try again in (\d+m)?(\d+(\.\d+)?)s', str(error))
+    if match:
+        minutes = int(match.group(1)[:-1]) if match.group(1) else 0
+        return minutes * 60 + float(match.group(2))
+    return None
+
+
+def is_retryable_error(error: Exception) -> bool:
+    """재시도 가능한 오류 여부 (Rate limit, 일시적 서버/네트워크 오류)"""
+    name = type(error).__name__
+    if any(key in name for key in ("RateLimit", "Timeout", "APIConnectionError", "ConnectionError")):
+        return True
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+    if status in (429, 500, 502, 503, 504):
+        return True
+    message = str(error).lower()
+    return "rate limit" in message or "please try again in" in message
+
+
+class TokenBucket:
+    """분당 한도를 초당 보충량으로 환산한 토큰 버킷"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.refill_rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+
+    @property
+    def unlimited(self) -> bool:
+        return self.capacity <= 0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_rate)
+        self.updated_at = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """amount 만큼 사용 가능해질 때까지 남은 시간"""
+        if self.unlimited:
+            return 0.0
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_rate
+
+    def consume(self, amount: float, now: float) -> None:
+        if self.unlimited:
+            return
+        self._refill(now)
+        # 실제 사용량 보정 시 음수가 될 수 있으며 이후 보충으로 상환됨
+        self.tokens -= amount
+
+
+class _ProviderState:
+    """제공자별 버킷과 사용자별 대기열"""
+
+    def __init__(self, rpm: int, tpm: int):
+        self.requests = TokenBucket(rpm)
+        self.tokens = TokenBucket(tpm)
+        self.paused_until = 0.0
+        self.queues: Dict[str, deque] = defaultdict(deque)
+        self.ring: deque = deque()   # 라운드로빈 사용자 순서
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        return max(self.paused_until - now,
+                   self.requests.wait_time(1, now),
+                   self.tokens.wait_time(tokens, now))
+
+
+class LLMRateLimiter:
+    """
+    제공자(Groq/Openai/Ollama)별 RPM/TPM 토큰 버킷 기반 호출 스케줄러
+
+    - 대기 중인 호출은 사용자별 큐에 넣고 라운드로빈으로 허가하여 한 사용자가 독점하지 않게 함
+    - 429/일시 오류는 지수 백오프 + 지터로 재시도하고, 서버가 알려준 대기 시간 동안
+      해당 제공자의 모든 호출을 함께 멈춤
+    """
+
+    def __init__(self, limits: Optional[Dict[str, Tuple[int, int]]] = None,
+                 max_retries: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.limits = dict(DEFAULT_PROVIDER_LIMITS)
+        if limits:
+            self.limits.update(limits)
+        self.max_retries = int(os.getenv("LLM_MAX_RETRIES", max_retries))
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._states: Dict[str, _ProviderState] = {}
+        self._cond = threading.Condition()
+
+    def _get_limits(self, provider: str) -> Tuple[int, int]:
+        rpm, tpm = self.limits.get(provider, (0, 0))
+        key = provider.upper()
+        try:
+            rpm = int(os.getenv(f"LLM_RPM_{key}", rpm))
+            tpm = int(os.getenv(f"LLM_TPM_{key}", tpm))
+        except ValueError:
+            logger.warning(f"잘못된 {provider} 속도 제한 설정, 기본값 사용")
+        return rpm, tpm
+
+    def _state(self, provider: str) -> _ProviderState:
+        state = self._states.get(provider)
+        if state is None:
+            state = _ProviderState(*self._get_limits(provider))
+            self._states[provider] = state
+        return state
+
+    def acquire(self, provider: str, tokens: int = 1, user_id: Optional[str] = None,
+                timeout: Optional[float] = None) -> bool:
+        """호출 허가 획득 (허가될 때까지 대기). timeout 초과 시 False"""
+        user = str(user_id or get_current_user() or "anonymous")
+        ticket = object()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with self._cond:
+            state = self._state(provider)
+            state.queues[user].append(ticket)
+            if user not in state.ring:
+                state.ring.append(user)
+
+            while True:
+                now = time.monotonic()
+                wait = None
+                if state.ring[0] == user and state.queues[user][0] is ticket:
+                    wait = state.wait_time(tokens, now)
+                    if wait <= 0:
+                        state.requests.consume(1, now)
+                        state.tokens.consume(min(tokens, state.tokens.capacity), now)
+                        self._dequeue(state, user)
+                        self._cond.notify_all()
+                        return True
+
+                if deadline is not None and now >= deadline:
+                    self._cancel(state, user, ticket)
+                    self._cond.notify_all()
+                    return False
+
+                timeout_left = wait if wait is not None else 1.0
+                if deadline is not None:
+                    timeout_left = min(timeout_left, deadline - now)
+                self._cond.wait(timeout=max(0.01, timeout_left))
+
+    def _dequeue(self, state: _ProviderState, user: str) -> None:
+        """허가된 요청 제거 후 사용자를 라운드로빈 맨 뒤로 이동"""
+        state.queues[user].popleft()
+        state.ring.popleft()
+        if state.queues[user]:
+            state.ring.append(user)
+        else:
+            del state.queues[user]
+
+    def _cancel(self, state: _ProviderState, user: str, ticket) -> None:
+        try:
+            state.queues[user].remove(ticket)
+        except ValueError:
+            pass
+        if not state.queues[user]:
+            del state.queues[user]
+            try:
+                state.ring.remove(user)
+            except ValueError:
+                pass
+
+    def record_usage(self, provider: str, actual_tokens: int, estimated_tokens: int) -> None:
+        """실제 토큰 사용량으로 추정치 보정"""
+        if not actual_tokens:
+            return
+        with self._cond:
+            state = self._state(provider)
+            state.tokens.consume(actual_tokens - min(estimated_tokens, state.tokens.capacity),
+                                 time.monotonic())
+
+    def pause(self, provider: str, seconds: float) -> None:
+        """서버 한도 초과 시 제공자 전체 호출을 일시 정지"""
+        with self._cond:
+            state = self._state(provider)
+            state.paused_until = max(state.paused_until, time.monotonic() + seconds)
+            self._cond.notify_all()
+
+    def backoff_delay(self, attempt: int, error: Optional[Exception] = None) -> float:
+        """지수 백오프 + 지터 (서버 대기 시간이 더 길면 그 값을 사용)"""
+        delay = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        delay = random.uniform(delay / 2, delay)
+        hint = parse_retry_after(error) if error is not None else None
+        if hint is not None:
+            delay = max(delay, hint + random.uniform(0, 0.5))
+        return delay
+
+    def call(self, provider: str, fn: Callable[[], Any], tokens: int = 1,
+             user_id: Optional[str] = None,
+             usage_fn: Optional[Callable[[Any], int]] = None,
+             on_retry: Optional[Callable[[int, float, Exception], None]] = None,
+             max_retries: Optional[int] = None) -> Any:
+        """
+        속도 제한과 재시도를 적용하여 fn 실행
+
+        Args:
+            provider (str): LLM 제공자 이름
+            fn (Callable): 실제 호출 함수
+            tokens (int): 추정 토큰 수
+            user_id (str): 공정 스케줄링에 사용할 사용자 (기본값: 현재 요청 사용자)
+            usage_fn (Callable): 결과에서 실제 사용 토큰 수를 꺼내는 함수
+            on_retry (Callable): 재시도 전 (시도 횟수, 대기 시간, 오류)로 호출
+            max_retries (int): 최대 시도 횟수
+        """
+        max_retries = max_retries or self.max_retries
+        user_id = user_id or get_current_user()
+        for attempt in range(1, max_retries + 1):
+            self.acquire(provider, tokens, user_id)
+            started = time.perf_counter()
+            try:
+                result = fn()
+            except Exception as e:
+                LLM_LATENCY.observe(time.perf_counter() - started, provider=provider)
+                if attempt == max_retries or not is_retryable_error(e):
+                    LLM_REQUESTS.inc(provider=provider, status="error")
+                    raise
+                LLM_RETRIES.inc(provider=provider)
+                delay = self.backoff_delay(attempt, e)
+                if parse_retry_after(e) is not None:
+                    self.pause(provider, delay)
+                logger.warning(f"{provider} 호출 재시도 {attempt}/{max_retries} ({delay:.2f}초 후): {str(e)}")
+                if on_retry:
+                    on_retry(attempt, delay, e)
+                time.sleep(delay)
+                continue
+
+            LLM_LATENCY.observe(time.perf_counter() - started, provider=provider)
+            LLM_REQUESTS.inc(provider=provider, status="ok")
+            if usage_fn:
+                try:
+                    self.record_usage(provider, usage_fn(result) or 0, tokens)
+                except Exception as e:
+                    logger.debug(f"토큰 사용량 기록 실패: {str(e)}")
+            return result
+
+
+_rate_limiter: Optional[LLMRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> LLMRateLimiter:
+    """프로세스 전역 공유 속도 제한기"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = LLMRateLimiter()
+        return _rate_limiter
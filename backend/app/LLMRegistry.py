@@ -0,0 +1,145 @@
+from typing import Dict, Any, Optional, Tuple
+import threading
+import hashlib
+import logging
+import os
+
+from langchain.prompts import PromptTemplate
+from langchain.chains.summarize import load_summarize_chain
+from langchain.chains.question_answering import load_qa_chain
+from langchain.text_splitter import TokenTextSplitter
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+class LLMRegistry:
+    """
+    제공자/모델별 LLM 클라이언트와 체인을 한 번만 생성해 재사용하는 레지스트리
+
+    요청마다 Ollama/ChatOpenAI/ChatGroq, PromptTemplate, load_summarize_chain,
+    load_qa_chain 을 새로 만들지 않고, 같은 키에는 같은 객체(및 HTTP 연결 풀)를 돌려준다.
+    """
+
+    def __init__(self):
+        self._llms: Dict[Tuple, Any] = {}
+        self._prompts: Dict[Tuple, PromptTemplate] = {}
+        self._chains: Dict[Tuple, Any] = {}
+        self._lock = threading.RLock()
+
+    def _create_llm(self, llm_name: str, llm_model: str, max_tokens: int):
+        """제공자별 LLM 클라이언트 생성"""
+        if llm_name == "Ollama":
+            from langchain_community.llms import Ollama
+            base_url = os.environ.get('OLLAMA_HOST')
+            if base_url:
+                return Ollama(model=llm_model, base_url=base_url)
+            return Ollama(model=llm_model)
+        elif llm_name == "Openai":
+            from langchain_community.chat_models import ChatOpenAI
+            return ChatOpenAI(model_name=llm_model, max_tokens=max_tokens)
+        elif llm_name == "Groq":
+            from langchain_groq import ChatGroq
+            return ChatGroq(model_name=llm_model, max_tokens=max_tokens)
+        raise ValueError(f"Unsupported LLM: {llm_name}")
+
+    def get_llm(self, llm_name: str, llm_model: str, max_tokens: int = 1024):
+        """(제공자, 모델) 별 LLM 클라이언트 조회 (없으면 생성)"""
+        key = (llm_name, llm_model, max_tokens)
+        llm = self._llms.get(key)
+        if llm is None:
+            with self._lock:
+                llm = self._llms.get(key)
+                if llm is None:
+                    llm = self._create_llm(llm_name, llm_model, max_tokens)
+                    self._llms[key] = llm
+                    logger.info(f"LLM 클라이언트 생성: {llm_name}-{llm_model}")
+        return llm
+
+    def register_llm(self, llm_name: str, llm_model: str, llm, max_tokens: int = 1024) -> None:
+        """외부에서 만든 LLM 클라이언트 등록 (예: LM Studio)"""
+        with self._lock:
+            self._llms[(llm_name, llm_model, max_tokens)] = llm
+
+    @staticmethod
+    def _prompt_key(template: str, input_variables, kwargs: Dict[str, Any]) -> Tuple:
+        """템플릿 해시 + 입력 변수 + 프롬프트 옵션 키 (dict 같은 해시 불가 값은 repr 로 비교)"""
+        template_hash = hashlib.sha256(template.encode('utf-8')).hexdigest()
+        return (template_hash, tuple(input_variables), repr(sorted(kwargs.items())))
+
+    def get_prompt(self, template: str, input_variables=("text",), **kwargs) -> PromptTemplate:
+        """템플릿 문자열별 PromptTemplate 조회"""
+        key = self._prompt_key(template, input_variables, kwargs)
+        prompt = self._prompts.get(key)
+        if prompt is None:
+            with self._lock:
+                prompt = self._prompts.get(key)
+                if prompt is None:
+                    prompt = PromptTemplate(template=template,
+                                            input_variables=list(input_variables), **kwargs)
+                    self._prompts[key] = prompt
+        return prompt
+
+    def get_summarize_chain(self, llm_name: str, llm_model: str, template: str,
+                            chain_type: str = "stuff", **prompt_kwargs):
+        """(제공자, 모델, 프롬프트, 프롬프트 옵션) 별 요약 체인 조회"""
+        input_variables = prompt_kwargs.get("input_variables", ("text",))
+        options = {k: v for k, v in prompt_kwargs.items() if k != "input_variables"}
+        key = ("summarize", llm_name, llm_model, chain_type,
+               self._prompt_key(template, input_variables, options))
+        chain = self._chains.get(key)
+        if chain is None:
+            with self._lock:
+                chain = self._chains.get(key)
+                if chain is None:
+                    llm = self.get_llm(llm_name, llm_model)
+                    prompt = self.get_prompt(template, **prompt_kwargs)
+                    chain = load_summarize_chain(llm, chain_type=chain_type, prompt=prompt)
+                    self._chains[key] = chain
+        return chain
+
+    def get_qa_chain(self, llm, chain_type: str = "stuff", verbose: bool = False):
+        """LLM 인스턴스별 QA 체인 조회"""
+        key = ("qa", id(llm), chain_type, verbose)
+        entry = self._chains.get(key)
+        # id 재사용에 대비해 같은 LLM 객체인지 확인
+        if entry is None or entry[0] is not llm:
+            with self._lock:
+                entry = self._chains.get(key)
+                if entry is None or entry[0] is not llm:
+                    entry = (llm, load_qa_chain(llm, chain_type=chain_type, verbose=verbose))
+                    self._chains[key] = entry
+        return entry[1]
+
+    def get_token_splitter(self, chunk_size: int, chunk_overlap: int) -> TokenTextSplitter:
+        """크기별 TokenTextSplitter 조회 (토크나이저 로딩 비용 절감)"""
+        key = ("token_splitter", chunk_size, chunk_overlap)
+        splitter = self._chains.get(key)
+        if splitter is None:
+            with self._lock:
+                splitter = self._chains.get(key)
+                if splitter is None:
+                    splitter = TokenTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+                    self._chains[key] = splitter
+        return splitter
+
+    def clear(self) -> None:
+        """캐시된 클라이언트와 체인 모두 제거 (API 키/호스트 변경 시)"""
+        with self._lock:
+            self._llms.clear()
+            self._prompts.clear()
+            self._chains.clear()
+
+
+_registry: Optional[LLMRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMRegistry:
+    """프로세스 전역 공유 LLM 레지스트리"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = LLMRegistry()
+        return _registry
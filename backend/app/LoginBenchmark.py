@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+로그인 처리량 벤치마크
+
+동시 클라이언트 수를 바꿔가며 비밀번호 검증(bcrypt)을 수행하고 초당 로그인 수와
+코어당 초당 로그인 수, p50/p95/p99 지연 시간을 JSON 으로 출력한다.
+
+    - inline: 요청 스레드에서 bcrypt.checkpw 직접 호출 (기존 방식)
+    - pool: PasswordHasher 워커 풀 사용
+    - db: AuthService.login 전체 경로 (--db 지정 시, 벤치마크 사용자 생성 후 삭제)
+
+사용 예:
+    python -m backend.app.LoginBenchmark --rounds 12 --concurrency 1,4,16,64 --logins 200
+    python -m backend.app.LoginBenchmark --db --concurrency 8,32 --output login_bench.json
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from typing import List, Dict, Any, Callable
+import argparse
+import logging
+import json
+import sys
+import os
+import time
+
+import bcrypt
+
+from backend.app.PasswordHasher import PasswordHasher
+from backend.app.BenchmarkStats import percentiles
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+BENCH_PASSWORD = "bench-Passw0rd!"
+
+
+def run_clients(login: Callable[[], Any], concurrency: int, total: int, cores: int) -> Dict[str, Any]:
+    """concurrency 개의 클라이언트 스레드로 total 건의 로그인을 수행"""
+    latencies: List[float] = []
+    errors = 0
+
+    def one(_):
+        start = time.perf_counter()
+        login()
+        return time.perf_counter() - start
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as clients:
+        for future in [clients.submit(one, i) for i in range(total)]:
+            try:
+                latencies.append(future.result())
+            except Exception as e:
+                errors += 1
+                logger.debug(f"login failed: {str(e)}")
+    elapsed = time.perf_counter() - started
+
+    per_sec = len(latencies) / elapsed if elapsed else 0.0
+    return {
+        'concurrency': concurrency,
+        'logins': len(latencies),
+        'errors': errors,
+        'seconds': round(elapsed, 3),
+        'logins_per_sec': round(per_sec, 2),
+        'logins_per_sec_per_core': round(per_sec / cores, 2),
+        'latency': percentiles(latencies)
+    }
+
+
+def bench_inline(rounds: int, levels: List[int], total: int, cores: int) -> List[Dict[str, Any]]:
+    hashed = bcrypt.hashpw(BENCH_PASSWORD.encode('utf-8'), bcrypt.gensalt(rounds=rounds))
+    password = BENCH_PASSWORD.encode('utf-8')
+    return [run_clients(lambda: bcrypt.checkpw(password, hashed), c, total, cores) for c in levels]
+
+
+def bench_pool(hasher: PasswordHasher, levels: List[int], total: int, cores: int) -> List[Dict[str, Any]]:
+    hashed = hasher.hash(BENCH_PASSWORD)
+    return [run_clients(lambda: hasher.verify(BENCH_PASSWORD, hashed), c, total, cores) for c in levels]
+
+
+def bench_db(levels: List[int], total: int, cores: int) -> List[Dict[str, Any]]:
+    """AuthService.login 전체 경로 (사용자 조회 -> 검증 -> 세션 생성)"""
+    from backend.app.auth_middleware import DatabasePool
+    from backend.app.auth_service import AuthService
+
+    pool = DatabasePool()
+    service = AuthService(pool, os.getenv('JWT_SECRET_KEY', 'login-bench'), timedelta(hours=1))
+    username = f"loginbench_{os.getpid()}"
+    service.register(username, f"{username}@bench.local", BENCH_PASSWORD)
+    try:
+        with pool.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("UPDATE users SET is_active = true WHERE username = %s", (username,))
+            conn.commit()
+        return [run_clients(lambda: service.login(username, BENCH_PASSWORD), c, total, cores) for c in levels]
+    finally:
+        with pool.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM sessions WHERE user_id IN (SELECT id FROM users WHERE username = %s)
+                """, (username,))
+                cur.execute("DELETE FROM users WHERE username = %s", (username,))
+            conn.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='로그인(bcrypt) 처리량 벤치마크')
+    parser.add_argument('--rounds', type=int, default=int(os.getenv('BCRYPT_ROUNDS', '12')), help='bcrypt cost factor')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='워커 풀 크기')
+    parser.add_argument('--concurrency', default='1,4,16,64', help='동시 클라이언트 수 목록 (쉼표 구분)')
+    parser.add_argument('--logins', type=int, default=200, help='동시성 단계별 로그인 수')
+    parser.add_argument('--skip-inline', action='store_true', help='inline 측정 생략')
+    parser.add_argument('--db', action='store_true', help='AuthService.login 전체 경로 측정 (DB 필요)')
+    parser.add_argument('--output', help='결과 JSON 파일 경로 (기본값: 표준 출력)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    levels = [int(c) for c in args.concurrency.split(',') if c.strip()]
+    cores = os.cpu_count() or 1
+    hasher = PasswordHasher(rounds=args.rounds, workers=args.workers,
+                            max_pending=max(levels) * 2)
+
+    report: Dict[str, Any] = {
+        'rounds': args.rounds,
+        'workers': args.workers,
+        'cpu_count': cores,
+        'started_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': {}
+    }
+    if not args.skip_inline:
+        logger.info("inline 측정")
+        report['results']['inline'] = bench_inline(args.rounds, levels, args.logins, cores)
+    logger.info("pool 측정")
+    report['results']['pool'] = bench_pool(hasher, levels, args.logins, cores)
+    if args.db:
+        # AuthService 는 전역 워커 풀을 사용하므로 같은 설정을 환경 변수로 전달
+        os.environ['BCRYPT_ROUNDS'] = str(args.rounds)
+        os.environ['BCRYPT_WORKERS'] = str(args.workers)
+        logger.info("db 측정")
+        report['results']['db'] = bench_db(levels, args.logins, cores)
+    report['finished_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    hasher.shutdown()
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
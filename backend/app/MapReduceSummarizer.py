@@ -0,0 +1,208 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import List, Dict, Any, Optional, Generator
+import threading
+import logging
+import queue
+import os
+
+from langchain.docstore.document import Document
+from backend.app.LLMRateLimiter import get_rate_limiter, get_current_user, estimate_tokens
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 제공자별 기본 동시 호출 수 (환경변수 SUMMARY_CONCURRENCY_<PROVIDER> 로 변경 가능)
+DEFAULT_PROVIDER_CONCURRENCY = {
+    "Ollama": 4,
+    "Groq": 3,
+    "Openai": 8,
+}
+
+
+class MapReduceSummarizer:
+    """
+    청크 요약(map)을 제공자별 동시성 한도 안에서 병렬로 실행하고,
+    요약 결과가 길면 계층적으로 다시 묶어 요약(reduce)하는 요약 엔진
+
+    run()은 기존 SSE 형식의 이벤트({'type': 'progress'|'info'|'warning', 'value': ...})를
+    yield 하고, 최종 요약 목록을 generator 반환값으로 돌려준다.
+    청크 하나의 실패는 나머지 청크로 요약을 계속하므로 종료 이벤트인 'error' 가 아닌 'warning' 으로 알린다.
+        summaries = yield from summarizer.run(splits, 40, 100)
+    """
+
+    # 같은 제공자를 쓰는 모든 요청이 공유하는 세마포어
+    _semaphores: Dict[str, threading.BoundedSemaphore] = {}
+    _semaphores_lock = threading.Lock()
+
+    def __init__(self, summarize_chain, llm_name: str,
+                 reduce_chain=None,
+                 max_retries: int = 5,
+                 max_total_words: Optional[int] = None,
+                 max_group_words: Optional[int] = None,
+                 max_reduce_levels: Optional[int] = None,
+                 user_id: Optional[str] = None):
+        """
+        Args:
+            summarize_chain: 청크 요약에 사용할 load_summarize_chain 체인
+            llm_name (str): LLM 제공자 이름 (Ollama, Openai, Groq)
+            reduce_chain: 요약을 다시 요약할 때 사용할 체인 (기본값: summarize_chain)
+            max_retries (int): 호출당 최대 재시도 횟수
+            max_total_words (int): 이 단어 수를 넘으면 reduce 단계를 반복
+            max_group_words (int): reduce 호출 한 번에 넣을 최대 단어 수
+            max_reduce_levels (int): reduce 단계 최대 반복 횟수
+            user_id (str): 속도 제한기 공정 스케줄링용 사용자 (기본값: 현재 요청 사용자)
+        """
+        self.summarize_chain = summarize_chain
+        self.reduce_chain = reduce_chain or summarize_chain
+        self.llm_name = llm_name
+        self.max_retries = max_retries
+        self.max_total_words = max_total_words or int(os.getenv("SUMMARY_MAX_WORDS", "10240"))
+        self.max_group_words = max_group_words or int(os.getenv("SUMMARY_GROUP_WORDS", "3000"))
+        self.max_reduce_levels = max_reduce_levels or int(os.getenv("SUMMARY_MAX_REDUCE_LEVELS", "4"))
+        # 작업 스레드에서는 요청 컨텍스트가 없으므로 생성 시점의 사용자를 보관
+        self.user_id = user_id or get_current_user()
+        self.rate_limiter = get_rate_limiter()
+        self.concurrency = self.get_provider_concurrency(llm_name)
+        self.reduce_levels = 0
+        self.failed_count = 0
+
+    @staticmethod
+    def get_provider_concurrency(llm_name: str) -> int:
+        """제공자별 동시 호출 한도 조회"""
+        default = DEFAULT_PROVIDER_CONCURRENCY.get(llm_name, 2)
+        try:
+            return max(1, int(os.getenv(f"SUMMARY_CONCURRENCY_{llm_name.upper()}", default)))
+        except ValueError:
+            return default
+
+    @classmethod
+    def _get_semaphore(cls, llm_name: str) -> threading.BoundedSemaphore:
+        with cls._semaphores_lock:
+            if llm_name not in cls._semaphores:
+                cls._semaphores[llm_name] = threading.BoundedSemaphore(
+                    cls.get_provider_concurrency(llm_name)
+                )
+            return cls._semaphores[llm_name]
+
+    def _invoke(self, chain, text: str, label: str, events: queue.Queue) -> Optional[str]:
+        """단일 요약 호출 (속도 제한 및 백오프 재시도는 공유 속도 제한기에서 처리). 실패 시 None 반환"""
+        semaphore = self._get_semaphore(self.llm_name)
+
+        def on_retry(attempt, delay, error):
+            events.put({'type': 'info', 'value': f"{label} 요약 오류 발생 (시도 {attempt}/{self.max_retries}): {str(error)}"})
+            events.put({'type': 'info', 'value': f"{delay:.2f}초 대기 후 재시도합니다."})
+
+        def invoke():
+            with semaphore:
+                return chain.invoke({"input_documents": [Document(page_content=text)]})
+
+        try:
+            result = self.rate_limiter.call(
+                self.llm_name, invoke,
+                tokens=estimate_tokens(text, 1024),
+                user_id=self.user_id,
+                on_retry=on_retry,
+                max_retries=self.max_retries
+            )
+            return result['output_text']
+        except Exception as e:
+            events.put({'type': 'warning', 'value': f"{label} 요약 실패: {str(e)}"})
+            return None
+
+    def _parallel(self, chain, texts: List[str], label: str,
+                  progress_start: float, progress_end: float) -> Generator[Dict[str, Any], None, List[str]]:
+        """텍스트 목록을 병렬로 요약하고 완료 순서대로 진행률을 yield"""
+        results: List[Optional[str]] = [None] * len(texts)
+        if not texts:
+            return []
+
+        events: queue.Queue = queue.Queue()
+        span = progress_end - progress_start
+        completed = 0
+
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(texts))) as executor:
+            futures = {
+                executor.submit(self._invoke, chain, text, f"{label} {i + 1}", events): i
+                for i, text in enumerate(texts)
+            }
+            pending = set(futures)
+            while pending:
+                finished, pending = wait(pending, timeout=0.5, return_when=FIRST_COMPLETED)
+                while not events.empty():
+                    yield events.get_nowait()
+                for future in finished:
+                    idx = futures[future]
+                    try:
+                        results[idx] = future.result()
+                    except Exception as e:
+                        logger.error(f"{label} {idx + 1} 요약 작업 오류: {str(e)}")
+                    completed += 1
+                    yield {'type': 'progress', 'value': progress_start + span * completed / len(texts)}
+
+        while not events.empty():
+            yield events.get_nowait()
+
+        # 입력 순서를 유지하고 실패한 항목은 제외
+        self.failed_count += sum(1 for r in results if not r)
+        return [r for r in results if r]
+
+    def _group(self, summaries: List[str]) -> List[str]:
+        """reduce 입력 크기에 맞게 요약 목록을 순서대로 묶음"""
+        groups, current, current_words = [], [], 0
+        for summary in summaries:
+            words = len(summary.split())
+            if current and current_words + words > self.max_group_words:
+                groups.append("\n\n".join(current))
+                current, current_words = [], 0
+            current.append(summary)
+            current_words += words
+        if current:
+            groups.append("\n\n".join(current))
+        return groups
+
+    def run(self, splits: List[Document], progress_start: float = 0.0,
+            progress_end: float = 100.0) -> Generator[Dict[str, Any], None, List[str]]:
+        """
+        map-reduce 요약 실행
+
+        Args:
+            splits (List[Document]): 분할된 청크 문서
+            progress_start (float): 시작 진행률
+            progress_end (float): 종료 진행률
+
+        Returns:
+            List[str]: 최종 요약 목록 (순서 유지, 합계 단어 수 <= max_total_words)
+        """
+        self.reduce_levels = 0
+        self.failed_count = 0
+
+        # 진행률의 70%는 map, 나머지는 reduce 단계에 배분
+        map_end = progress_start + (progress_end - progress_start) * 0.7
+        summaries = yield from self._parallel(
+            self.summarize_chain, [doc.page_content for doc in splits], "청크",
+            progress_start, map_end
+        )
+
+        reduce_start = map_end
+        total_words = sum(len(s.split()) for s in summaries)
+        # 요약이 하나뿐이어도 합계가 한도를 넘으면 다시 요약 (묶을 수 없는 큰 요약은 단독으로 요약)
+        while total_words > self.max_total_words and self.reduce_levels < self.max_reduce_levels:
+            groups = self._group(summaries)
+            self.reduce_levels += 1
+            reduce_end = reduce_start + (progress_end - reduce_start) * 0.5
+            yield {'type': 'info', 'value': f"요약 통합 단계 {self.reduce_levels}: {len(summaries)}개 → {len(groups)}개"}
+            reduced = yield from self._parallel(
+                self.reduce_chain, groups, f"통합{self.reduce_levels}",
+                reduce_start, reduce_end
+            )
+            reduced_words = sum(len(s.split()) for s in reduced)
+            if not reduced or reduced_words >= total_words:
+                # 통합 요약이 모두 실패하거나 더 줄지 않으면 기존 요약을 그대로 사용
+                break
+            summaries, total_words = reduced, reduced_words
+            reduce_start = reduce_end
+
+        yield {'type': 'progress', 'value': progress_end}
+        return summaries
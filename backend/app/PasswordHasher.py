@@ -0,0 +1,142 @@
+from concurrent.futures import ThreadPoolExecutor, Future
+from typing import Optional
+import threading
+import logging
+import time
+import os
+
+import bcrypt
+
+from backend.app.MetricsRegistry import get_metrics_registry
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+metrics = get_metrics_registry()
+HASH_LATENCY = metrics.histogram('rag_password_hash_seconds', 'bcrypt 해시/검증 소요 시간', ['op'],
+                                 buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0))
+HASH_QUEUE = metrics.gauge('rag_password_hash_queue_depth', 'bcrypt 작업 대기/실행 중 건수')
+
+
+class PasswordHasherBusy(RuntimeError):
+    """대기 작업 수가 한도를 넘었을 때 발생 (HTTP 503 으로 응답)"""
+
+
+class PasswordHasher:
+    """
+    bcrypt 해시/검증 전용 워커 풀
+
+    - bcrypt 는 계산 중 GIL 을 해제하므로 스레드 풀로 코어 수만큼 병렬 처리된다
+    - 요청 스레드는 DB 연결/트랜잭션을 잡지 않은 상태에서 결과만 기다린다
+    - 대기 작업이 max_pending 을 넘으면 즉시 실패시켜 로그인 폭주 시 큐가 무한히 쌓이지 않게 한다
+
+    설정:
+        BCRYPT_ROUNDS: 새 해시의 cost factor (기본 12)
+        BCRYPT_WORKERS: 워커 수 (기본 CPU 코어 수)
+        BCRYPT_MAX_PENDING: 최대 대기 작업 수 (기본 워커 수 * 32)
+        BCRYPT_TIMEOUT: 결과 대기 시간 초 (기본 30)
+    """
+
+    def __init__(self, rounds: Optional[int] = None, workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, timeout: Optional[float] = None):
+        self.rounds = rounds if rounds is not None else int(os.getenv('BCRYPT_ROUNDS', '12'))
+        self.workers = workers if workers is not None else int(os.getenv('BCRYPT_WORKERS', str(os.cpu_count() or 1)))
+        self.max_pending = max_pending if max_pending is not None else int(os.getenv('BCRYPT_MAX_PENDING', str(self.workers * 32)))
+        self.timeout = timeout if timeout is not None else float(os.getenv('BCRYPT_TIMEOUT', '30'))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._dummy_hash: Optional[bytes] = None
+        self._dummy_lock = threading.Lock()
+
+    def _submit(self, op: str, fn, *args) -> Future:
+        if not self._slots.acquire(blocking=False):
+            raise PasswordHasherBusy('로그인 요청이 많습니다. 잠시 후 다시 시도하세요.')
+        HASH_QUEUE.inc()
+
+        def run():
+            start = time.perf_counter()
+            try:
+                return fn(*args)
+            finally:
+                HASH_LATENCY.observe(time.perf_counter() - start, op=op)
+
+        try:
+            future = self._executor.submit(run)
+        except Exception:
+            HASH_QUEUE.dec()
+            self._slots.release()
+            raise
+
+        def done(_):
+            HASH_QUEUE.dec()
+            self._slots.release()
+
+        future.add_done_callback(done)
+        return future
+
+    # --- 비동기 ---
+    def hash_async(self, password: str) -> Future:
+        """해시 작업 제출 (Future[str])"""
+        return self._submit('hash', self._hash, password, self.rounds)
+
+    def verify_async(self, password: str, hashed_password: Optional[str]) -> Future:
+        """검증 작업 제출 (Future[bool]). 해시가 없으면 더미 해시로 검증해 응답 시간을 맞춘다."""
+        if not hashed_password:
+            return self._submit('verify', self._verify_dummy, password)
+        return self._submit('verify', self._verify, password, hashed_password)
+
+    # --- 동기 ---
+    def hash(self, password: str) -> str:
+        return self.hash_async(password).result(timeout=self.timeout)
+
+    def verify(self, password: str, hashed_password: Optional[str]) -> bool:
+        return self.verify_async(password, hashed_password).result(timeout=self.timeout)
+
+    def needs_rehash(self, hashed_password: str) -> bool:
+        """저장된 해시의 cost factor 가 현재 설정과 다른지 확인 ($2b$12$... 형식)"""
+        try:
+            return int(hashed_password.split('$')[2]) != self.rounds
+        except (IndexError, ValueError, AttributeError):
+            return False
+
+    # --- 워커에서 실행 ---
+    @staticmethod
+    def _hash(password: str, rounds: int) -> str:
+        return bcrypt.hashpw(password.encode('utf-8'), bcrypt.gensalt(rounds=rounds)).decode('utf-8')
+
+    @staticmethod
+    def _verify(password: str, hashed_password: str) -> bool:
+        try:
+            return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+        except Exception:
+            return False
+
+    def _verify_dummy(self, password: str) -> bool:
+        if self._dummy_hash is None:
+            with self._dummy_lock:
+                if self._dummy_hash is None:
+                    self._dummy_hash = bcrypt.hashpw(os.urandom(16), bcrypt.gensalt(rounds=self.rounds))
+        try:
+            bcrypt.checkpw(password.encode('utf-8'), self._dummy_hash)
+        except Exception:
+            pass
+        return False
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+
+_hasher: Optional[PasswordHasher] = None
+_hasher_lock = threading.Lock()
+
+
+def get_password_hasher() -> PasswordHasher:
+    """프로세스 전역 bcrypt 워커 풀"""
+    global _hasher
+    with _hasher_lock:
+        if _hasher is None:
+            _hasher = PasswordHasher()
+            logger.info(f"bcrypt worker pool: workers={_hasher.workers}, rounds={_hasher.rounds}")
+        return _hasher
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+PDF 추출 엔진 벤치마크
+
+같은 PDF 들을 엔진별(plumber, adaptive, pymupdf4llm, pypdf2)로 추출해 소요 시간, 페이지 수,
+추출 글자 수, 표를 찾은 페이지 수를 JSON 으로 출력한다. 기준 엔진(첫 번째)과 비교해
+속도 향상 배수와 표 페이지 재현율(기준 엔진이 표를 찾은 페이지 중 같은 페이지에서 표를 찾은 비율)을 함께 계산한다.
+추출 캐시는 사용하지 않는다.
+
+사용 예:
+    python -m backend.app.PdfExtractionBenchmark docs/*.pdf
+    python -m backend.app.PdfExtractionBenchmark --engines plumber,adaptive --repeat 3 --output pdf_bench.json samples/
+"""
+from typing import List, Dict, Any
+import argparse
+import logging
+import json
+import sys
+import os
+import time
+
+from backend.app.ExtractTextFromFile import ExtractTextFromFile, PDF_ENGINES
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+def collect_pdfs(paths: List[str]) -> List[str]:
+    """파일/디렉토리 목록에서 PDF 경로 수집 (디렉토리는 하위까지)"""
+    pdfs = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                pdfs.extend(os.path.join(root, f) for f in sorted(files) if f.lower().endswith('.pdf'))
+        elif path.lower().endswith('.pdf'):
+            pdfs.append(path)
+    return pdfs
+
+
+def run_engine(extractor: ExtractTextFromFile, path: str, engine: str, repeat: int) -> Dict[str, Any]:
+    timings = []
+    docs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        docs = extractor.extract_pdf(path, os.path.basename(path), engine)
+        timings.append(time.perf_counter() - start)
+    table_pages = sorted({d.metadata.get('page') for d in docs if d.metadata.get('tables_found')})
+    return {
+        'seconds': round(min(timings), 4),
+        'documents': len(docs),
+        'pages': len({d.metadata.get('page') for d in docs}),
+        'chars': sum(len(d.page_content) for d in docs),
+        'table_pages': table_pages
+    }
+
+
+def compare(baseline: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+    base_pages = set(baseline['table_pages'])
+    found = base_pages & set(result['table_pages'])
+    return {
+        'speedup': round(baseline['seconds'] / result['seconds'], 2) if result['seconds'] else None,
+        'table_page_recall': round(len(found) / len(base_pages), 3) if base_pages else None,
+        'chars_ratio': round(result['chars'] / baseline['chars'], 3) if baseline['chars'] else None
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PDF 추출 엔진 벤치마크')
+    parser.add_argument('paths', nargs='+', help='PDF 파일 또는 디렉토리')
+    parser.add_argument('--engines', default='plumber,adaptive',
+                        help=f"쉼표 구분 엔진 목록, 첫 번째가 기준 ({', '.join(PDF_ENGINES)})")
+    parser.add_argument('--repeat', type=int, default=1, help='파일/엔진별 반복 횟수 (최소 시간 사용)')
+    parser.add_argument('--output', help='결과 JSON 파일 경로 (기본값: 표준 출력)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    engines = [e.strip().lower() for e in args.engines.split(',') if e.strip()]
+    unknown = [e for e in engines if e not in PDF_ENGINES]
+    if unknown:
+        parser.error(f"알 수 없는 엔진: {', '.join(unknown)}")
+    pdfs = collect_pdfs(args.paths)
+    if not pdfs:
+        parser.error('PDF 파일이 없습니다')
+
+    extractor = ExtractTextFromFile()
+    files = []
+    totals = {engine: 0.0 for engine in engines}
+    for path in pdfs:
+        logger.info(f"benchmarking {path}")
+        results = {engine: run_engine(extractor, path, engine, args.repeat) for engine in engines}
+        for engine in engines:
+            totals[engine] += results[engine]['seconds']
+            if engine != engines[0]:
+                results[engine]['vs_' + engines[0]] = compare(results[engines[0]], results[engine])
+        files.append({'file': path, 'results': results})
+
+    report = {
+        'engines': engines,
+        'files': files,
+        'total_seconds': {engine: round(sec, 4) for engine, sec in totals.items()},
+        'total_speedup': {engine: round(totals[engines[0]] / sec, 2) if sec else None
+                          for engine, sec in totals.items() if engine != engines[0]}
+    }
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
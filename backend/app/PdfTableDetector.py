@@ -0,0 +1,95 @@
+from collections import Counter, defaultdict
+from typing import List, Dict, Any, Tuple
+import logging
+import os
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 선(가로/세로) 판정 허용 두께와 최소 길이 (pt)
+LINE_TOLERANCE = 2.0
+MIN_RULE_LENGTH = float(os.getenv("PDF_TABLE_MIN_RULE_LENGTH", "20"))
+# 텍스트 격자 판정: 같은 열 위치를 공유하는 행 수
+TEXT_GRID_MIN_ROWS = int(os.getenv("PDF_TABLE_TEXT_GRID_ROWS", "4"))
+TEXT_GRID_MIN_COLUMNS = 3
+COLUMN_BUCKET = 10.0
+
+
+def ruling_lines(page) -> Tuple[int, int]:
+    """
+    페이지의 가로/세로 괘선 수 (PyMuPDF page.get_drawings 기준)
+
+    선분('l'), 얇은 사각형('re'), 셀 모양 사각형을 모두 센다. 셀 사각형은 가로 2, 세로 2 로 계산한다.
+    """
+    horizontal = vertical = 0
+    for path in page.get_drawings():
+        for item in path.get("items", []):
+            op = item[0]
+            if op == "l":
+                p1, p2 = item[1], item[2]
+                dx, dy = abs(p1.x - p2.x), abs(p1.y - p2.y)
+                if dy <= LINE_TOLERANCE and dx >= MIN_RULE_LENGTH:
+                    horizontal += 1
+                elif dx <= LINE_TOLERANCE and dy >= MIN_RULE_LENGTH:
+                    vertical += 1
+            elif op == "re":
+                rect = item[1]
+                if rect.height <= LINE_TOLERANCE and rect.width >= MIN_RULE_LENGTH:
+                    horizontal += 1
+                elif rect.width <= LINE_TOLERANCE and rect.height >= MIN_RULE_LENGTH:
+                    vertical += 1
+                elif rect.width >= MIN_RULE_LENGTH and rect.height > LINE_TOLERANCE:
+                    horizontal += 2
+                    vertical += 2
+    return horizontal, vertical
+
+
+def text_grid_rows(words: List[tuple]) -> int:
+    """
+    괘선 없는 표 감지: 여러 행이 같은 열 시작 위치를 공유하는지 센다
+
+    Args:
+        words: page.get_text("words") 결과 (x0, y0, x1, y1, word, block, line, word_no)
+    Returns:
+        3개 이상의 공통 열 위치를 가진 행 수
+    """
+    if not words:
+        return 0
+    heights = sorted(w[3] - w[1] for w in words)
+    height = heights[len(heights) // 2] or 10.0
+
+    rows = defaultdict(list)
+    for w in words:
+        rows[round((w[1] + w[3]) / 2 / (height * 0.6))].append(w)
+
+    row_columns = []
+    for row_words in rows.values():
+        row_words.sort(key=lambda w: w[0])
+        starts = [row_words[0][0]]
+        for prev, cur in zip(row_words, row_words[1:]):
+            # 글자 높이의 1.5배 이상 떨어지면 다른 셀로 본다
+            if cur[0] - prev[2] > height * 1.5:
+                starts.append(cur[0])
+        if len(starts) >= TEXT_GRID_MIN_COLUMNS:
+            row_columns.append({round(x / COLUMN_BUCKET) for x in starts})
+
+    if len(row_columns) < TEXT_GRID_MIN_ROWS:
+        return 0
+    counts = Counter(col for cols in row_columns for col in cols)
+    shared = {col for col, n in counts.items() if n >= TEXT_GRID_MIN_ROWS}
+    return sum(1 for cols in row_columns if len(cols & shared) >= TEXT_GRID_MIN_COLUMNS)
+
+
+def analyze_page(page) -> Dict[str, Any]:
+    """표 가능성 판정 결과 (likely_table, 근거 수치)"""
+    horizontal, vertical = ruling_lines(page)
+    grid_rows = text_grid_rows(page.get_text("words"))
+    ruled = (horizontal >= 3 and vertical >= 2) or (horizontal >= 2 and vertical >= 3)
+    return {
+        'likely_table': ruled or grid_rows >= TEXT_GRID_MIN_ROWS,
+        'horizontal_rules': horizontal,
+        'vertical_rules': vertical,
+        'grid_rows': grid_rows
+    }
@@ -6,7 +6,20 @@ import sys, os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'backend/app'))
 from backend.app.CustomSentenceTransformerEmbeddings import CustomSentenceTransformerEmbeddings as CSTFM
 from backend.app.ExtractTextFromFile import ExtractTextFromFile
+from backend.app.TabularTextConverter import iter_batches
+from backend.app.ExtractionCache import get_extraction_cache
+from backend.app.TextNormalizer import normalize_for_storage
 from backend.app.QuoteExtractor import QuoteExtractor as QuoExt
+from backend.app.MapReduceSummarizer import MapReduceSummarizer
+from backend.app.LLMRateLimiter import get_current_user
+from backend.app.LLMRegistry import get_llm_registry
+from backend.app.RequestTracer import trace_span
+from backend.app.MetricsRegistry import get_metrics_registry
+from backend.app.AuthContextCache import get_auth_context_cache
+from backend.app.ScoreCalibration import (PostgresCalibrationStore, ScoreCalibration, DEFAULT_CALIBRATION,
+                                          calibrate, sample_queries)
+from backend.app.SummaryCache import (PostgresSummaryCache, build_prompt_version,
+                                      compute_content_hash, build_cache_key)
 
 from dotenv import load_dotenv
 from pathlib import Path
@@ -23,9 +36,7 @@ from psycopg2.extensions import register_adapter, adapt
 from psycopg2.extras import DictCursor, Json
 import numpy as np
 from langchain.docstore.document import Document
-from langchain.text_splitter import RecursiveCharacterTextSplitter, TokenTextSplitter
-from langchain.prompts import PromptTemplate
-from langchain.chains.summarize import load_summarize_chain
+from langchain.text_splitter import RecursiveCharacterTextSplitter
 from konlpy.tag import Okt
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from logging.handlers import RotatingFileHandler
@@ -36,6 +47,39 @@ from sshtunnel import SSHTunnelForwarder
 project_root = Path(__file__).parent
 log_dir = project_root / 'logs'
 CHUNKSIZE = 2048
+# 스트리밍 적재 시 한 번에 저장할 Document 수
+STREAM_BATCH_DOCS = int(os.getenv("STREAM_BATCH_DOCS", "256"))
+
+# 요약 프롬프트 (변경 시 요약 캐시의 prompt_version이 자동으로 바뀜)
+PAGE_SUMMARY_TEMPLATE = """[시스템 지시사항]
+                    이 프롬프트는 주어진 텍스트{text}를 한국어로 요약합니다.                  
+
+                    [요약 지침]
+                    1. 텍스트의 전반적인 주제와 핵심 개념을 1-2문장으로 소개하세요.
+
+                    2. 주요 항목들을 나열하고, 각 항목에 대해:
+                    - 항목명을 볼드체(**항목명**)로 표시
+                    - 핵심 개념을 간단히 설명
+                    - 주요 장단점이나 특징을 불릿 포인트(-)로 제시
+
+                    3. 형식 요구사항:
+                    - 전체 개요 먼저 제시
+                    - 각 항목을 번호로 구분
+                    - 중요 특징은 불릿 포인트로 표시
+                    - 3-4문단 이내로 제한
+                    - 전문 용어는 가능한 쉽게 설명
+
+                    4. 전체 개요에서 전체 내용을 아우르는 통찰을 제시하세요.
+
+                    [출력 형식]
+                    
+                    [전체 개요]
+                                       
+                    [주요 항목]
+                         
+
+                    """
+SOURCE_SUMMARY_TEMPLATE = "다음 텍스트를 요약해주세요. 주요 포인트만 추출하여 간단명료하게 작성하세요:\n\n{text}\n\n요약:"
 
 # 로그 디렉토리 생성
 try:
@@ -58,6 +102,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+INGESTED_CHUNKS = get_metrics_registry().counter(
+    "rag_ingested_chunks_total", "Chunks stored in the vector store", ["backend"])
+
 try:
     # 파일 핸들러 설정
     file_handler = RotatingFileHandler(
@@ -117,6 +164,9 @@ class PostgresDbManager:
             
             self.conn = self._create_connection()
             self._initialize_database()
+            self.summary_cache = PostgresSummaryCache(self.get_db_connection)
+            self.score_calibration = PostgresCalibrationStore(self.get_db_connection)
+            self.llm_registry = get_llm_registry()
             
             logger.info(f"PostgreSQL vector manager successfully initialized with db_type: {self.db_type}")
             
@@ -437,6 +487,62 @@ class PostgresDbManager:
                 
                 self.conn.commit()  # 확장 설치 후 커밋
                 logger.debug("documents Table successfully")                 
+
+                # 요약 캐시 테이블 생성 (컬렉션, 소스, 페이지, 모델, 프롬프트 버전, 내용 해시 기준)
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS summary_cache (
+                        cache_key VARCHAR(64) PRIMARY KEY,
+                        collection_id INTEGER NOT NULL,
+                        sources TEXT[] NOT NULL,
+                        page_range VARCHAR(100) NOT NULL,
+                        model VARCHAR(200) NOT NULL,
+                        prompt_version VARCHAR(50) NOT NULL,
+                        content_hash VARCHAR(64) NOT NULL,
+                        summary JSONB NOT NULL,
+                        hit_count INTEGER DEFAULT 0,
+                        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        last_hit_at TIMESTAMP,
+                        CONSTRAINT fk_summary_cache_collection
+                            FOREIGN KEY (collection_id)
+                            REFERENCES collections(id)
+                            ON DELETE CASCADE
+                    );
+                """)
+                cur.execute("""
+                    CREATE INDEX IF NOT EXISTS idx_summary_cache_sources
+                    ON summary_cache USING gin(sources);
+                """)
+                
+                self.conn.commit()
+                logger.debug("summary_cache Table successfully")
+                
+                # 컬렉션별 청크 수 (메트릭 수집 시 documents 테이블을 조회하지 않도록 증분 관리)
+                cur.execute("""
+                    ALTER TABLE collections ADD COLUMN IF NOT EXISTS chunk_count BIGINT;
+                """)
+                cur.execute("""
+                    UPDATE collections c
+                    SET chunk_count = (SELECT COUNT(*) FROM documents d WHERE d.collection_id = c.id)
+                    WHERE c.chunk_count IS NULL;
+                """)
+                self.conn.commit()
+                
+                # (사용자, 컬렉션)별 유효 권한 테이블 (트리거로 증분 갱신, 접근 확인은 단일 인덱스 조회)
+                self._initialize_collection_access(cur)
+                self.conn.commit()
+                logger.debug("user_collection_access Table successfully")
+                
+                # 컬렉션별 검색 점수 보정값 (ScoreCalibration, 오프라인 계산)
+                cur.execute("""
+                    CREATE TABLE IF NOT EXISTS score_calibration (
+                        collection_id INTEGER PRIMARY KEY REFERENCES collections(id) ON DELETE CASCADE,
+                        low DOUBLE PRECISION NOT NULL,
+                        high DOUBLE PRECISION NOT NULL,
+                        sample_size INTEGER NOT NULL,
+                        computed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+                    );
+                """)
+                self.conn.commit()
                                                 
                 # 인덱스 존재 여부 확인 후 생성
                 # 사용자 관련 인덱스
@@ -463,6 +569,14 @@ class PostgresDbManager:
                     cur.execute("CREATE INDEX idx_sessions_session_id ON sessions(session_id);")
                     logger.debug("Created index idx_sessions_session_id")
                 
+                # 세션 활동/종료 시각 (SessionActivityTracker 가 일괄 갱신) 및 reaper 용 인덱스
+                cur.execute("""
+                    ALTER TABLE sessions ADD COLUMN IF NOT EXISTS last_accessed TIMESTAMP WITH TIME ZONE;
+                    ALTER TABLE sessions ADD COLUMN IF NOT EXISTS ended_at TIMESTAMP WITH TIME ZONE;
+                    CREATE INDEX IF NOT EXISTS idx_sessions_active_expires
+                        ON sessions(expires_at) WHERE is_active = true;
+                """)
+                
                 # collection 관련 인덱스
                 cur.execute("""
                     SELECT EXISTS (
@@ -542,6 +656,194 @@ class PostgresDbManager:
             logger.error(traceback.format_exc())
             raise
         
+    def _initialize_collection_access(self, cur):
+        """
+        user_collection_access 테이블과 갱신 트리거 생성
+        
+        - 그룹 권한(can_*)은 사용자가 속한 그룹 권한의 BOOL_OR, groups 는 그룹별 권한 상세
+        - is_creator 는 컬렉션 생성자 여부 (생성자는 모든 권한을 가짐)
+        - user_groups 변경 시 해당 사용자, collection_permissions/collections 변경 시 해당 컬렉션만 재계산
+        """
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS user_collection_access (
+                user_id INTEGER NOT NULL,
+                collection_id INTEGER NOT NULL REFERENCES collections(id) ON DELETE CASCADE,
+                can_read BOOLEAN NOT NULL DEFAULT false,
+                can_write BOOLEAN NOT NULL DEFAULT false,
+                can_delete BOOLEAN NOT NULL DEFAULT false,
+                has_group_permission BOOLEAN NOT NULL DEFAULT false,
+                is_creator BOOLEAN NOT NULL DEFAULT false,
+                groups JSONB NOT NULL DEFAULT '[]'::jsonb,
+                PRIMARY KEY (user_id, collection_id)
+            );
+        """)
+        cur.execute("""
+            CREATE INDEX IF NOT EXISTS idx_user_collection_access_collection
+            ON user_collection_access(collection_id);
+        """)
+        
+        # 재계산 공통 쿼리: 조건에 맞는 (사용자, 컬렉션) 조합의 유효 권한
+        cur.execute("""
+            CREATE OR REPLACE FUNCTION compute_collection_access(p_user_id INTEGER, p_collection_id INTEGER)
+            RETURNS TABLE (
+                user_id INTEGER, collection_id INTEGER,
+                can_read BOOLEAN, can_write BOOLEAN, can_delete BOOLEAN,
+                has_group_permission BOOLEAN, is_creator BOOLEAN, groups JSONB
+            ) AS $$
+                WITH grants AS (
+                    SELECT ug.user_id, cp.collection_id, g.id AS group_id, g.name AS group_name,
+                           cp.can_read, cp.can_write, cp.can_delete
+                    FROM user_groups ug
+                    JOIN collection_permissions cp ON cp.group_id = ug.group_id
+                    JOIN groups g ON g.id = cp.group_id
+                    WHERE (p_user_id IS NULL OR ug.user_id = p_user_id)
+                      AND (p_collection_id IS NULL OR cp.collection_id = p_collection_id)
+                ),
+                pairs AS (
+                    SELECT user_id, collection_id FROM grants
+                    UNION
+                    SELECT c.creator, c.id FROM collections c
+                    WHERE (p_user_id IS NULL OR c.creator = p_user_id)
+                      AND (p_collection_id IS NULL OR c.id = p_collection_id)
+                )
+                SELECT
+                    p.user_id,
+                    p.collection_id,
+                    COALESCE(BOOL_OR(gr.can_read), false),
+                    COALESCE(BOOL_OR(gr.can_write), false),
+                    COALESCE(BOOL_OR(gr.can_delete), false),
+                    COUNT(gr.group_id) > 0,
+                    BOOL_OR(c.creator = p.user_id),
+                    COALESCE(
+                        JSONB_AGG(
+                            JSONB_BUILD_OBJECT(
+                                'group_id', gr.group_id,
+                                'group_name', gr.group_name,
+                                'permissions', JSONB_BUILD_OBJECT(
+                                    'can_read', gr.can_read,
+                                    'can_write', gr.can_write,
+                                    'can_delete', gr.can_delete
+                                )
+                            )
+                        ) FILTER (WHERE gr.group_id IS NOT NULL),
+                        '[]'::jsonb
+                    )
+                FROM pairs p
+                JOIN collections c ON c.id = p.collection_id
+                LEFT JOIN grants gr ON gr.user_id = p.user_id AND gr.collection_id = p.collection_id
+                GROUP BY p.user_id, p.collection_id;
+            $$ LANGUAGE sql STABLE;
+        """)
+        cur.execute("""
+            CREATE OR REPLACE FUNCTION refresh_collection_access(p_user_id INTEGER, p_collection_id INTEGER)
+            RETURNS void AS $$
+            BEGIN
+                DELETE FROM user_collection_access a
+                WHERE (p_user_id IS NULL OR a.user_id = p_user_id)
+                  AND (p_collection_id IS NULL OR a.collection_id = p_collection_id);
+                -- 같은 사용자/컬렉션을 동시에 갱신하는 트랜잭션과 기본 키가 겹치면 최신 계산값으로 덮어씀
+                INSERT INTO user_collection_access
+                SELECT * FROM compute_collection_access(p_user_id, p_collection_id)
+                ON CONFLICT (user_id, collection_id) DO UPDATE SET
+                    can_read = EXCLUDED.can_read,
+                    can_write = EXCLUDED.can_write,
+                    can_delete = EXCLUDED.can_delete,
+                    has_group_permission = EXCLUDED.has_group_permission,
+                    is_creator = EXCLUDED.is_creator,
+                    groups = EXCLUDED.groups;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        cur.execute("""
+            CREATE OR REPLACE FUNCTION trg_user_groups_collection_access()
+            RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    PERFORM refresh_collection_access(OLD.user_id, NULL);
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    PERFORM refresh_collection_access(NEW.user_id, NULL);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        cur.execute("""
+            CREATE OR REPLACE FUNCTION trg_collection_permissions_access()
+            RETURNS trigger AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    PERFORM refresh_collection_access(NULL, OLD.collection_id);
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    PERFORM refresh_collection_access(NULL, NEW.collection_id);
+                END IF;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        cur.execute("""
+            CREATE OR REPLACE FUNCTION trg_collections_access()
+            RETURNS trigger AS $$
+            BEGIN
+                PERFORM refresh_collection_access(NULL, NEW.id);
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        cur.execute("""
+            CREATE OR REPLACE FUNCTION trg_groups_access()
+            RETURNS trigger AS $$
+            DECLARE
+                cid INTEGER;
+            BEGIN
+                -- 그룹 이름이 바뀌면 groups 상세 갱신
+                FOR cid IN SELECT DISTINCT collection_id FROM collection_permissions WHERE group_id = NEW.id LOOP
+                    PERFORM refresh_collection_access(NULL, cid);
+                END LOOP;
+                RETURN NULL;
+            END;
+            $$ LANGUAGE plpgsql;
+        """)
+        cur.execute("""
+            DROP TRIGGER IF EXISTS user_groups_collection_access ON user_groups;
+            CREATE TRIGGER user_groups_collection_access
+            AFTER INSERT OR UPDATE OR DELETE ON user_groups
+            FOR EACH ROW EXECUTE FUNCTION trg_user_groups_collection_access();
+
+            DROP TRIGGER IF EXISTS collection_permissions_access ON collection_permissions;
+            CREATE TRIGGER collection_permissions_access
+            AFTER INSERT OR UPDATE OR DELETE ON collection_permissions
+            FOR EACH ROW EXECUTE FUNCTION trg_collection_permissions_access();
+
+            DROP TRIGGER IF EXISTS collections_access ON collections;
+            CREATE TRIGGER collections_access
+            AFTER INSERT OR UPDATE OF creator ON collections
+            FOR EACH ROW EXECUTE FUNCTION trg_collections_access();
+
+            DROP TRIGGER IF EXISTS groups_access ON groups;
+            CREATE TRIGGER groups_access
+            AFTER UPDATE OF name ON groups
+            FOR EACH ROW EXECUTE FUNCTION trg_groups_access();
+        """)
+        
+        # 최초 생성 시 전체 계산
+        cur.execute("SELECT EXISTS (SELECT 1 FROM user_collection_access)")
+        if not cur.fetchone()[0]:
+            cur.execute("SELECT refresh_collection_access(NULL, NULL)")
+
+    def rebuild_collection_access(self) -> bool:
+        """유효 권한 테이블 전체 재계산 (트리거 밖에서 데이터를 직접 수정한 경우)"""
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT refresh_collection_access(NULL, NULL)")
+            self.conn.commit()
+            return True
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error rebuilding collection access: {str(e)}")
+            return False
+
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """사용자명으로 사용자 검색"""
         try:
@@ -982,45 +1284,20 @@ class PostgresDbManager:
         """
         try:
             with self.conn.cursor() as cur:
-                # 사용자의 그룹을 통해 접근 가능한 모든 컬렉션 조회
+                # 사용자의 그룹을 통해 접근 가능한 모든 컬렉션 조회 (유효 권한 테이블)
                 cur.execute("""
-                    WITH user_permissions AS (
-                        SELECT DISTINCT
-                            c.id as collection_id,
-                            c.name as collection_name,
-                            c.created_at,
-                            g.id as group_id,
-                            g.name as group_name,
-                            cp.can_read,
-                            cp.can_write,
-                            cp.can_delete
-                        FROM collections c
-                        JOIN collection_permissions cp ON c.id = cp.collection_id
-                        JOIN groups g ON cp.group_id = g.id
-                        JOIN user_groups ug ON g.id = ug.group_id
-                        WHERE ug.user_id = %s
-                    )
                     SELECT 
-                        collection_id,
-                        collection_name,
-                        created_at,
-                        BOOL_OR(can_read) as can_read,
-                        BOOL_OR(can_write) as can_write,
-                        BOOL_OR(can_delete) as can_delete,
-                        ARRAY_AGG(
-                            jsonb_build_object(
-                                'group_id', group_id,
-                                'group_name', group_name,
-                                'permissions', jsonb_build_object(
-                                    'can_read', can_read,
-                                    'can_write', can_write,
-                                    'can_delete', can_delete
-                                )
-                            )
-                        ) as groups
-                    FROM user_permissions
-                    GROUP BY collection_id, collection_name, created_at
-                    ORDER BY collection_name
+                        a.collection_id,
+                        c.name as collection_name,
+                        c.created_at,
+                        a.can_read,
+                        a.can_write,
+                        a.can_delete,
+                        a.groups
+                    FROM user_collection_access a
+                    JOIN collections c ON c.id = a.collection_id
+                    WHERE a.user_id = %s AND a.has_group_permission
+                    ORDER BY c.name
                 """, (user_id,))
                 
                 results = []
@@ -1034,7 +1311,7 @@ class PostgresDbManager:
                             'can_write': row[4],
                             'can_delete': row[5]
                         },
-                        'groups': row[6]  # ARRAY_AGG로 생성된 그룹 정보
+                        'groups': row[6]  # 그룹별 권한 정보
                     }
                     results.append(collection)
                 
@@ -1064,32 +1341,27 @@ class PostgresDbManager:
         """
         try:
             with self.conn.cursor() as cur:
-                conditions = []
+                conditions = ["a.has_group_permission"]
                 if require_read:
-                    conditions.append("BOOL_OR(cp.can_read) = true")
+                    conditions.append("a.can_read")
                 if require_write:
-                    conditions.append("BOOL_OR(cp.can_write) = true")
+                    conditions.append("a.can_write")
                 if require_delete:
-                    conditions.append("BOOL_OR(cp.can_delete) = true")
+                    conditions.append("a.can_delete")
                 
                 where_clause = " AND ".join(conditions)
-                if where_clause:
-                    where_clause = f"HAVING {where_clause}"
                 
                 cur.execute(f"""
                     SELECT 
                         c.id,
                         c.name,
                         c.created_at,
-                        BOOL_OR(cp.can_read) as can_read,
-                        BOOL_OR(cp.can_write) as can_write,
-                        BOOL_OR(cp.can_delete) as can_delete
-                    FROM collections c
-                    JOIN collection_permissions cp ON c.id = cp.collection_id
-                    JOIN user_groups ug ON cp.group_id = ug.group_id
-                    WHERE ug.user_id = %s
-                    GROUP BY c.id, c.name, c.created_at
-                    {where_clause}
+                        a.can_read,
+                        a.can_write,
+                        a.can_delete
+                    FROM user_collection_access a
+                    JOIN collections c ON c.id = a.collection_id
+                    WHERE a.user_id = %s AND {where_clause}
                     ORDER BY c.name
                 """, (user_id,))
                 
@@ -1134,13 +1406,17 @@ class PostgresDbManager:
         """
         try:            
             with self.conn.cursor() as cur:
-                # 먼저 creator의 그룹이 admin인지 확인
-                cur.execute("""
-                    SELECT id
-                    FROM user_groups
-                    WHERE user_id = %s AND group_id = 'GRP000001'   
-                """, (user_id,))
-                is_admin = cur.fetchone() is not None
+                # 먼저 creator의 그룹이 admin인지 확인 (인증 캐시 우선)
+                auth_context = get_auth_context_cache().get_user(user_id=user_id)
+                if auth_context is not None:
+                    is_admin = auth_context['is_admin']
+                else:
+                    cur.execute("""
+                        SELECT id
+                        FROM user_groups
+                        WHERE user_id = %s AND group_id = 'GRP000001'   
+                    """, (user_id,))
+                    is_admin = cur.fetchone() is not None
                 
                 # admin인 경우 모든 컬렉션 반환, 아닌 경우 접근 가능한 컬렉션만 반환
                 if is_admin:
@@ -1160,19 +1436,18 @@ class PostgresDbManager:
                 else:
                     # 일반 사용자는 자신이 생성한 컬렉션 또는 권한이 있는 컬렉션만 접근 가능
                     cur.execute("""
-                        SELECT DISTINCT ON (c.id)    
+                        SELECT 
                             c.id as collection_id,
                             c.name as collection_name,
-                            CASE WHEN c.creator = %s THEN TRUE ELSE cp.can_read END as can_read,
-                            CASE WHEN c.creator = %s THEN TRUE ELSE cp.can_write END as can_write,
-                            CASE WHEN c.creator = %s THEN TRUE ELSE cp.can_delete END as can_delete,
+                            a.is_creator OR a.can_read as can_read,
+                            a.is_creator OR a.can_write as can_write,
+                            a.is_creator OR a.can_delete as can_delete,
                             c.creator
-                        FROM collections c
-                        LEFT JOIN collection_permissions cp ON c.id = cp.collection_id
-                        LEFT JOIN user_groups ug ON cp.group_id = ug.group_id
-                        WHERE c.creator = %s OR ug.user_id = %s
-                        ORDER BY c.id, cp.can_read DESC, cp.can_write DESC, cp.can_delete DESC
-                    """, (user_id, user_id, user_id, user_id, user_id))
+                        FROM user_collection_access a
+                        JOIN collections c ON c.id = a.collection_id
+                        WHERE a.user_id = %s
+                        ORDER BY c.id
+                    """, (user_id,))
                 
                 collections = cur.fetchall()
                 
@@ -1359,8 +1634,13 @@ class PostgresDbManager:
             logger.error(f"Error in get_or_create_collection: {str(e)}")
             raise
 
-    def store_documents(self, text: List[Any], filename: str, collection_name: str) -> int:
-        """문서 저장"""
+    def store_documents(self, text: List[Any], filename: Optional[str], collection_name: str) -> int:
+        """
+        문서 저장
+
+        임베딩은 STREAM_BATCH_DOCS 개씩 한 번에 계산한다. filename 이 None 이면 청크마다
+        metadata['source'] 를 소스로 사용한다 (여러 파일의 청크를 한 번에 저장할 때).
+        """
         try:
             # 입력 데이터 유효성 검사
             if not text:
@@ -1373,30 +1653,22 @@ class PostgresDbManager:
             collection_id = self._get_or_create_collection(collection_name)
             stored_count = 0
             failed_count = 0
+            sources = set()
+
+            # 1~2. 텍스트 컨텐츠 처리 및 정규화 (공백 통합, 인코딩 불가 문자 제거, 길이 제한)
+            contents = [self._prepare_chunk_content(chunk) for chunk in text]
+            # 3. 임베딩 생성 (묶음 단위)
+            embeddings = self._embed_chunk_batch(contents)
             
-            for idx, chunk in enumerate(text, 1):
+            for idx, (chunk, content, embedding) in enumerate(zip(text, contents, embeddings), 1):
                 try:
-                    # 1. 텍스트 컨텐츠 처리
-                    content = chunk.page_content if hasattr(chunk, 'page_content') else str(chunk)
-                    
-                    if not isinstance(content, str):
-                        content = str(content)
-                    
-                    # 2. 텍스트 정규화
-                    content = content.replace('\xa0', ' ')
-                    content = ' '.join(content.split())
-                    content = content.encode('utf-8', errors='ignore').decode('utf-8')
-                    
-                    # 입력 길이 제한
-                    if len(content) > CHUNKSIZE:  # 예시 길이 제한
-                        content = content[:CHUNKSIZE]
-                    
                     logger.debug(f"Processing chunk {idx}: {content[:100]}...")
                     
-                    # 3. 임베딩 생성
+                    if embedding is None:
+                        failed_count += 1
+                        continue
+                    
                     try:
-                        embedding = self.embeddings.embed_documents([content])[0]
-                        
                         # 추가 검증
                         if not embedding or (isinstance(embedding, list) and len(embedding) == 0):
                             logger.warning(f"Empty embedding generated for chunk {idx}")
@@ -1419,16 +1691,24 @@ class PostgresDbManager:
                         continue
                     
                     # 4. 메타데이터 준비
+                    chunk_metadata = chunk.metadata if hasattr(chunk, 'metadata') else {}
+                    source = str(filename) if filename is not None else str(chunk_metadata.get('source', ''))
                     metadata = {
-                        'source': str(filename),
-                        'page': chunk.metadata.get('page', 0) if hasattr(chunk, 'metadata') else 0,
+                        'source': source,
+                        'page': chunk_metadata.get('page', 0),
                         'chunk_size': len(content),
                         'processed_at': time.strftime('%Y-%m-%d %H:%M:%S')
                     }
+                    # 추출기가 남긴 구조 메타데이터(제목 경로, 구역, 행 범위 등)는 필터링용으로 유지
+                    for key, value in chunk_metadata.items():
+                        if key not in metadata and key != 'file_name' and isinstance(value, (str, int, float, bool)):
+                            metadata[key] = value
                     
                     # 5. 데이터베이스 저장
                     with self.conn.cursor() as cur:
                         try:
+                            # 청크 하나의 실패가 같은 트랜잭션의 앞선 저장까지 되돌리지 않도록 세이브포인트 사용
+                            cur.execute("SAVEPOINT store_chunk")
                             cur.execute("""
                                 INSERT INTO documents (
                                     id, collection_id, content, metadata, embedding, search_vector
@@ -1447,12 +1727,14 @@ class PostgresDbManager:
                                 embedding,
                                 content
                             ))
+                            cur.execute("RELEASE SAVEPOINT store_chunk")
                             stored_count += 1
+                            sources.add(source)
                         except psycopg2.Error as db_err:
                             logger.error(f"Database insertion error for chunk {idx}: {db_err}")
                             logger.error(f"Problematic data - Content: {content[:200]}, Metadata: {metadata}")
                             failed_count += 1
-                            self.conn.rollback()
+                            cur.execute("ROLLBACK TO SAVEPOINT store_chunk")
                             continue
                     
                 except Exception as e:
@@ -1463,8 +1745,18 @@ class PostgresDbManager:
             # 부분 성공/실패 로깅
             logger.debug(f"Document storage completed. Stored: {stored_count}, Failed: {failed_count}")
             
-            # 커밋은 모든 청크 처리 후에
+            # 컬렉션 청크 수 갱신 후 커밋은 모든 청크 처리 후에
+            if stored_count:
+                with self.conn.cursor() as cur:
+                    cur.execute("""
+                        UPDATE collections SET chunk_count = COALESCE(chunk_count, 0) + %s WHERE id = %s
+                    """, (stored_count, collection_id))
             self.conn.commit()
+            INGESTED_CHUNKS.inc(stored_count, backend="postgres")
+            
+            # 재등록된 소스의 요약 캐시 무효화
+            if stored_count:
+                self.invalidate_summary_cache(collection_id, sorted(sources))
             
             return stored_count
             
@@ -1474,6 +1766,45 @@ class PostgresDbManager:
             logger.error(traceback.format_exc())
             raise
 
+    def _prepare_chunk_content(self, chunk) -> str:
+        """저장할 청크 본문 (문자열 변환, 정규화, CHUNKSIZE 길이 제한)"""
+        content = chunk.page_content if hasattr(chunk, 'page_content') else str(chunk)
+        if not isinstance(content, str):
+            content = str(content)
+        content = normalize_for_storage(content)
+        if len(content) > CHUNKSIZE:
+            content = content[:CHUNKSIZE]
+        return content
+
+    def _embed_chunk_batch(self, contents: List[str]) -> List[Optional[List[float]]]:
+        """
+        STREAM_BATCH_DOCS 개씩 임베딩. 묶음 임베딩이 실패하면 그 묶음만 청크별로 다시 계산하고,
+        실패한 청크는 None
+        """
+        embeddings: List[Optional[List[float]]] = []
+        for batch in iter_batches(contents, STREAM_BATCH_DOCS):
+            try:
+                embeddings.extend(self._embed_chunks(batch))
+                continue
+            except Exception as e:
+                logger.error(f"Batch embedding error, retrying per chunk: {str(e)}")
+            for idx, content in enumerate(batch, len(embeddings) + 1):
+                try:
+                    embeddings.append(self._embed_chunks([content])[0])
+                except Exception as e:
+                    logger.error(f"Embedding generation error for chunk {idx}: {str(e)}")
+                    logger.error(f"Problematic content: {content[:200]}")
+                    embeddings.append(None)
+        return embeddings
+
+    def store_document_batch(self, documents: List[Document], collection_name: str) -> int:
+        """
+        여러 파일의 Document 를 한 번에 임베딩/저장 (소스는 각 Document 의 metadata['source'])
+
+        대량 적재(BulkImport)에서 파일 경계와 무관하게 임베딩 묶음을 채우는 용도
+        """
+        return self.store_documents(text=documents, filename=None, collection_name=collection_name)
+
     def split_embed_docs_store(self, text: List[Document], filename: str, collection_name: str) -> int:
         """VectorStore 방식으로 문서 처리"""
         store = None
@@ -1532,6 +1863,56 @@ class PostgresDbManager:
                 except Exception as close_error:
                     logger.error(f"Error closing vector store: {close_error}")
                 
+    def split_embed_docs_stream(self, documents, filename: str, collection_name: str) -> int:
+        """
+        Document 이터러블(CSV 행 묶음 등)을 STREAM_BATCH_DOCS 개씩 저장
+
+        묶음마다 store_documents 로 커밋하므로 전체 Document 목록을 메모리에 두지 않는다.
+        도중에 실패하면 이번 실행에서 저장한 청크(metadata['ingest_id'] 로 구분)를 지우고 예외를 다시 던진다
+        (반쯤 적재된 소스가 남지 않도록, 같은 소스의 이전 청크는 그대로 둔다).
+        """
+        ingest_id = uuid.uuid4().hex
+        stored_count = 0
+
+        def tagged():
+            for doc in documents:
+                doc.metadata['ingest_id'] = ingest_id
+                yield doc
+
+        try:
+            for batch in iter_batches(tagged(), STREAM_BATCH_DOCS):
+                stored_count += self.store_documents(
+                    text=batch,
+                    filename=filename,
+                    collection_name=collection_name
+                )
+                logger.info(f"Stored {stored_count} chunks from {filename}")
+            return stored_count
+        except Exception as e:
+            logger.error(f"Critical error in split_embed_docs_stream after {stored_count} chunks: {str(e)}")
+            logger.error(traceback.format_exc())
+            if stored_count:
+                removed = self.delete_ids(collection_name, self._ingest_run_ids(collection_name, ingest_id))
+                logger.warning(f"Removed {removed} chunks of {filename} stored before the failure")
+            raise
+
+    def _ingest_run_ids(self, collection_name: str, ingest_id: str) -> List[str]:
+        """split_embed_docs_stream 한 번의 실행에서 저장한 청크 ID"""
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    SELECT d.id
+                    FROM documents d
+                    JOIN collections c ON d.collection_id = c.id
+                    WHERE c.name = %s
+                    AND d.metadata->>'ingest_id' = %s
+                """, (collection_name, ingest_id))
+                return [str(row['id']) for row in cur.fetchall()]
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error listing chunks of ingest run {ingest_id}: {e}")
+            return []
+
     def add_user_to_group(self, user_id: int, group_id: str) -> bool:
         """사용자를 그룹에 추가"""
         try:
@@ -1542,7 +1923,9 @@ class PostgresDbManager:
                     ON CONFLICT (user_id, group_id) DO NOTHING
                     RETURNING id
                 """, (user_id, group_id))
-                return cur.fetchone() is not None
+                added = cur.fetchone() is not None
+            get_auth_context_cache().invalidate_user(user_id=user_id)
+            return added
         except Exception as e:
             logger.error(f"Error adding user to group: {str(e)}")
             return False
@@ -1575,8 +1958,8 @@ class PostgresDbManager:
         try:
             with self.conn.cursor() as cur:
                 cur.execute("""
-                    SELECT can_read, can_write, can_delete
-                    FROM user_collection_permissions
+                    SELECT is_creator OR can_read, is_creator OR can_write, is_creator OR can_delete
+                    FROM user_collection_access
                     WHERE user_id = %s AND collection_id = %s
                 """, (user_id, collection_id))
                 result = cur.fetchone()
@@ -1608,11 +1991,11 @@ class PostgresDbManager:
                         c.id,
                         c.name,
                         c.created_at,
-                        ucp.can_read,
-                        ucp.can_write,
-                        ucp.can_delete
+                        ucp.is_creator OR ucp.can_read,
+                        ucp.is_creator OR ucp.can_write,
+                        ucp.is_creator OR ucp.can_delete
                     FROM collections c
-                    JOIN user_collection_permissions ucp 
+                    JOIN user_collection_access ucp 
                         ON c.id = ucp.collection_id
                     WHERE ucp.user_id = %s
                     ORDER BY c.created_at DESC
@@ -1670,6 +2053,17 @@ class PostgresDbManager:
             logger.error(traceback.format_exc())
             return None
         
+    def get_collection_chunk_counts(self) -> Dict[str, int]:
+        """컬렉션별 청크 수 (collections.chunk_count, documents 테이블 미조회)"""
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT name, COALESCE(chunk_count, 0) FROM collections")
+                return {row[0]: int(row[1]) for row in cur.fetchall()}
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"컬렉션 청크 수 조회 오류: {str(e)}")
+            return {}
+        
     def get_persist_directory(self) -> None:
         """PostgreSQL은 persist_directory가 필요하지 않음"""
         return None
@@ -1694,7 +2088,11 @@ class PostgresDbManager:
     
     
     def search_collection(self, collection_names: Union[str, List[str]], query: str, n_results: int = 5, 
-                     source_name: str = None, score_threshold: float = 0.5) -> List[Dict]:
+                     source_name: str = None, score_threshold: float = 0.5, calibrated: bool = True) -> List[Dict]:
+        """
+        키워드 + 벡터 혼합 검색. score 는 컬렉션별 보정값(ScoreCalibration)으로 변환한 점수이며
+        score_threshold 도 보정 점수 기준이다. calibrated=False 이면 원점수를 그대로 사용한다.
+        """
         try:
            
             # collection_names를 항상 리스트로 처리
@@ -1709,8 +2107,10 @@ class PostgresDbManager:
             )
             
             # 쿼리 전처리 및 토큰화
-            querytmp = QuoExt.extract_and_join(query)
-            keywords = self.split_keywords(querytmp)            
+            with trace_span("search.quote_extract"):
+                querytmp = QuoExt.extract_and_join(query)
+            with trace_span("search.split_keywords"):
+                keywords = self.split_keywords(querytmp)            
 
             logger.debug(f"Keywords: {[k.encode('utf-8') for k in keywords]}")
             
@@ -1741,7 +2141,8 @@ class PostgresDbManager:
                 like_params = []
             
             processed_query = ' '.join(keywords)           
-            query_embedding = self.embeddings.embed_query(processed_query)
+            with trace_span("search.embedding"):
+                query_embedding = self.embeddings.embed_query(processed_query)
             
             if isinstance(query_embedding, np.ndarray):
                 query_embedding = query_embedding.tolist()
@@ -1764,6 +2165,10 @@ class PostgresDbManager:
                 # collection_id_condition 정의
                 collection_id_condition = f"d.collection_id = ANY(ARRAY[{', '.join(map(str, collection_ids))}])"
 
+                # 컬렉션별 점수 보정값 (SQL 에서 보정 점수로 필터/정렬)
+                calibration_sql, calibration_params, raw_floor = self._calibration_clause(
+                    collection_ids, score_threshold, calibrated)
+
                 if source_name:
                     query_sql = f"""
                         WITH keyword_matches AS (
@@ -1810,13 +2215,9 @@ class PostgresDbManager:
                             FULL OUTER JOIN vector_matches v ON k.page_content = v.page_content
                             WHERE (k.page_content IS NOT NULL OR v.vector_score >= %s)
                         )
-                        SELECT *
-                        FROM scored_results
-                        WHERE combined_score >= %s
-                        ORDER BY combined_score DESC
-                        LIMIT %s
+                        {calibration_sql.format(source='scored_results')}
                     """
-                    query_params = like_params + [query_embedding, score_threshold, score_threshold, n_results]
+                    query_params = like_params + [query_embedding, raw_floor] + calibration_params + [n_results]
                 else:
                     query_sql = f"""
                         WITH keyword_matches AS (
@@ -1864,18 +2265,15 @@ class PostgresDbManager:
                             FROM vector_matches v
                             LEFT JOIN keyword_matches k ON v.page_content = k.page_content
                         )
-                        SELECT *
-                        FROM scored_results
-                        WHERE combined_score >= %s
-                        ORDER BY combined_score DESC
-                        LIMIT %s
+                        {calibration_sql.format(source='scored_results')}
                     """
-                    query_params = like_params + [query_embedding, query_embedding, score_threshold, n_results]
+                    query_params = like_params + [query_embedding, query_embedding] + calibration_params + [n_results]
 
                 logger.debug(f"Query params: {len(query_params)}")
                 logger.debug(f"Keywords: {keywords}")
-                cur.execute(query_sql, query_params)
-                results = cur.fetchall()
+                with trace_span("search.sql"):
+                    cur.execute(query_sql, query_params)
+                    results = cur.fetchall()
 
                 filtered_results = []
                 for row in results:
@@ -1888,7 +2286,8 @@ class PostgresDbManager:
                         result_dict = {
                             'page_content': row['page_content'].decode('utf-8') if isinstance(row['page_content'], bytes) else str(row['page_content']),
                             'metadata': metadata,
-                            'score': float(row['combined_score'])
+                            'score': float(row['calibrated_score']),
+                            'raw_score': float(row['combined_score'])
                         }
                         filtered_results.append(result_dict)
                     except Exception as e:
@@ -1905,13 +2304,14 @@ class PostgresDbManager:
             return []
         
     def search_keyword_collection(self, collection_names: Union[str, List[str]], query: str, n_results: int = 5, 
-                    source_name: str = None, score_threshold: float = 0.5) -> List[Dict]:
+                    source_name: str = None, score_threshold: float = 0.5, calibrated: bool = True) -> List[Dict]:
        try:           
            if isinstance(collection_names, str):
                collection_names = [collection_names]
                
            # 벡터 임베딩 생성
-           vector_embedding = self.embeddings.embed_query(query)
+           with trace_span("search.embedding"):
+               vector_embedding = self.embeddings.embed_query(query)
            if isinstance(vector_embedding, np.ndarray):
                vector_embedding = vector_embedding.tolist()
 
@@ -1935,6 +2335,8 @@ class PostgresDbManager:
                    return []
 
                collection_id_condition = f"d.collection_id = ANY(ARRAY[{', '.join(map(str, collection_ids))}])"
+               calibration_sql, calibration_params, raw_floor = self._calibration_clause(
+                   collection_ids, score_threshold, calibrated)
 
                query_sql = f"""
                    WITH fts_matches AS (
@@ -1981,18 +2383,7 @@ class PostgresDbManager:
                        FULL OUTER JOIN vector_matches v ON f.page_content = v.page_content
                        WHERE COALESCE(f.fts_score, 0) > 0.1 OR COALESCE(v.vector_score, 0) > %s
                    )
-                   SELECT 
-                       page_content,
-                       metadata,
-                       collection_id,
-                       headline,
-                       combined_score,
-                       fts_score,
-                       vector_score
-                   FROM combined_scores
-                   WHERE combined_score >= %s
-                   ORDER BY combined_score DESC
-                   LIMIT %s
+                   {calibration_sql.format(source='combined_scores')}
                """
                
                # processed_query가 문자열이 맞는지 확인
@@ -2004,13 +2395,14 @@ class PostgresDbManager:
                    processed_query,  # for ts_headline
                    processed_query,  # for plainto_tsquery
                    vector_embedding,
-                   score_threshold,
-                   score_threshold,
+                   raw_floor,
+                   *calibration_params,
                    n_results
                ]
 
-               cur.execute(query_sql, query_params)
-               results = cur.fetchall()
+               with trace_span("search.sql"):
+                   cur.execute(query_sql, query_params)
+                   results = cur.fetchall()
 
                filtered_results = []
                for row in results:
@@ -2023,7 +2415,8 @@ class PostgresDbManager:
                        result_dict = {
                            'page_content': row['page_content'].decode('utf-8') if isinstance(row['page_content'], bytes) else str(row['page_content']),
                            'metadata': metadata,
-                           'score': float(row['combined_score'])
+                           'score': float(row['calibrated_score']),
+                           'raw_score': float(row['combined_score'])
                        }
                        filtered_results.append(result_dict)
                    except Exception as e:
@@ -2039,6 +2432,71 @@ class PostgresDbManager:
            logger.debug(traceback.format_exc())
            return []
 
+    def _calibration_clause(self, collection_ids: List[int], score_threshold: float,
+                            calibrated: bool = True) -> Tuple[str, List, float]:
+        """
+        보정 점수 계산용 SELECT 절, 파라미터, 원점수 사전 필터 값
+
+        반환된 SQL 의 {source} 에 점수 CTE 이름을 넣어 사용한다.
+        """
+        if calibrated:
+            calibrations = self.score_calibration.get_many(collection_ids)
+        else:
+            calibrations = {cid: DEFAULT_CALIBRATION for cid in collection_ids}
+        ids = list(calibrations.keys())
+        lows = [calibrations[cid].low for cid in ids]
+        highs = [calibrations[cid].high for cid in ids]
+        raw_floor = min(c.raw_threshold(score_threshold) for c in calibrations.values())
+        sql = """
+                        SELECT sr.*,
+                               LEAST(1.0, GREATEST(0.0,
+                                   (sr.combined_score - cal.low) / NULLIF(cal.high - cal.low, 0)
+                               )) as calibrated_score
+                        FROM {source} sr
+                        JOIN unnest(%s::int[], %s::float8[], %s::float8[]) AS cal(collection_id, low, high)
+                            ON cal.collection_id = sr.collection_id
+                        WHERE sr.combined_score >= cal.low + %s * (cal.high - cal.low)
+                        ORDER BY calibrated_score DESC
+                        LIMIT %s"""
+        return sql, [ids, lows, highs, score_threshold], raw_floor
+
+    def calibrate_scores(self, collection_name: str, num_queries: int = 200, k: int = 10,
+                         queries: Optional[List[str]] = None) -> Optional[ScoreCalibration]:
+        """
+        컬렉션의 청크 일부(또는 queries 로 받은 실제 질의)로 검색해 점수 보정값을 계산하고 저장 (오프라인 작업)
+        """
+        try:
+            with self.conn.cursor() as cur:
+                cur.execute("SELECT id FROM collections WHERE name = %s", (collection_name,))
+                row = cur.fetchone()
+                if not row:
+                    return None
+                collection_id = row[0]
+                cur.execute("""
+                    SELECT content FROM documents
+                    WHERE collection_id = %s
+                    ORDER BY random()
+                    LIMIT %s
+                """, (collection_id, num_queries * 2))
+                texts = [r[0] for r in cur.fetchall()]
+            self.conn.commit()
+
+            def raw_search(query):
+                # 질의를 뽑은 청크 자신을 제외할 수 있도록 한 개 더 조회
+                return self.search_collection(collection_name, query, n_results=k + 1,
+                                              score_threshold=0.0, calibrated=False)
+
+            calibration = calibrate(raw_search, queries or sample_queries(texts, num_queries), k)
+            if calibration.is_default:
+                return None
+            self.score_calibration.put(collection_id, calibration)
+            logger.info(f"Score calibration for '{collection_name}': {calibration.to_dict()}")
+            return calibration
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"calibrate_scores error: {str(e)}")
+            return None
+
     def preprocess_fts_query(self, query: str) -> List[str]:
         """Full Text Search 쿼리 전처리"""
         # 불용어 제거, 형태소 분석 등 추가 가능
@@ -2364,17 +2822,53 @@ class PostgresDbManager:
         try:
             with self.conn.cursor() as cur:
                 cur.execute("""
-                    SELECT id
-                    FROM documents
-                    WHERE collection_name = %s 
-                    AND metadata->>'source' = %s
+                    SELECT d.id
+                    FROM documents d
+                    JOIN collections c ON d.collection_id = c.id
+                    WHERE c.name = %s 
+                    AND d.metadata->>'source' = %s
                 """, (collection_name, source))
                 
                 return [str(row['id']) for row in cur.fetchall()]
         except Exception as e:
+            self.conn.rollback()
             logger.error(f"문서 ID 조회 오류: {e}")
             return []
 
+    def delete_ids(self, collection_name: str, ids: List[str]) -> int:
+        """
+        문서 ID 로 청크 삭제 (재적재 시 새 청크를 저장한 뒤 이전 청크만 지우는 용도)
+
+        Returns:
+            삭제한 청크 수
+        """
+        if not ids:
+            return 0
+        try:
+            collection_id = self.get_collection_id(collection_name)
+            with self.conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM documents
+                    WHERE collection_id = %s
+                    AND id = ANY(%s::uuid[])
+                    RETURNING metadata->>'source' as source
+                """, (collection_id, list(ids)))
+                deleted = cur.fetchall()
+                if deleted:
+                    cur.execute("""
+                        UPDATE collections SET chunk_count = GREATEST(COALESCE(chunk_count, 0) - %s, 0)
+                        WHERE id = %s
+                    """, (len(deleted), collection_id))
+            self.conn.commit()
+            if deleted:
+                self.invalidate_summary_cache(collection_id, list({row['source'] for row in deleted}))
+            return len(deleted)
+        except Exception as e:
+            self.conn.rollback()
+            logger.error(f"Error in delete_ids: {str(e)}")
+            logger.error(traceback.format_exc())
+            return 0
+
     def delete_source(self, collection_id: int, sources: Union[str, List[str]]) -> Dict[str, List[str]]:
         """소스별 문서 삭제"""
         try:
@@ -2413,6 +2907,10 @@ class PostgresDbManager:
                         
                         deleted = cur.fetchall()
                         if deleted:
+                            cur.execute("""
+                                UPDATE collections SET chunk_count = GREATEST(COALESCE(chunk_count, 0) - %s, 0)
+                                WHERE id = %s
+                            """, (len(deleted), collection_id))
                             successful.extend([row['source'] for row in deleted])
                             logger.info(f"Successfully deleted {len(deleted)} documents from source '{source}'")
                         else:
@@ -2427,6 +2925,10 @@ class PostgresDbManager:
                 
                 self.conn.commit()  # 모든 성공한 삭제 작업 커밋
                 
+                # 삭제된 소스의 요약 캐시 무효화
+                if successful:
+                    self.invalidate_summary_cache(collection_id, list(set(successful)))
+                
                 # 결과 로깅
                 logger.info(f"Delete operation completed. Successful: {len(successful)}, Failed: {len(failed)}")
                 return {
@@ -2444,17 +2946,18 @@ class PostgresDbManager:
     def check_source_exists(self, collection_name: str, source: str) -> bool:
         """소스 존재 여부 확인"""
         try:
+            # 파일 객체는 파일 이름만, 문자열 소스(상대 경로, URL)는 저장된 그대로 비교
             if not isinstance(source, str):  # 파일 객체인 경우
-                source = source.name
-            source = os.path.basename(source)
+                source = os.path.basename(source.name)
             
             with self.conn.cursor() as cur:
                 cur.execute("""
                     SELECT EXISTS (
                         SELECT 1 
-                        FROM documents 
-                        WHERE collection_name = %s 
-                        AND metadata->>'source' = %s
+                        FROM documents d
+                        JOIN collections c ON d.collection_id = c.id
+                        WHERE c.name = %s 
+                        AND d.metadata->>'source' = %s
                     )
                 """, (collection_name, str(source)))
                 
@@ -2860,14 +3363,30 @@ class PostgresDbManager:
             logging.error(f"선택 메시지 저장 오류: {str(e)}")            
             return False
     
-    def extract_text_from_file(self, file, file_name):
-        return self.extractor.extract_text_from_file(file, file_name)
+    def _embed_chunks(self, texts):
+        """청크 임베딩 (추출 캐시의 청크 해시별 임베딩을 재사용하고 나머지만 계산)"""
+        cache = get_extraction_cache()
+        if cache is None:
+            embeddings = self.embeddings.embed_documents(texts)
+        else:
+            model = getattr(self.embeddings, 'MODEL_NAME', type(self.embeddings).__name__)
+            embeddings = cache.embed_documents(model, texts, self.embeddings.embed_documents)
+        return embeddings.tolist() if isinstance(embeddings, np.ndarray) else embeddings
+
+    def extract_text_from_file(self, file, file_name, pdf_engine=None):
+        return self.extractor.extract_text_from_file(file, file_name, pdf_engine=pdf_engine)
 
 
     def set_return_docnum(self, docnum: int):
         """반환할 문서 수 설정"""
         self.docnum = docnum
         
+    def invalidate_summary_cache(self, collection_id: int, sources: Optional[List[str]] = None) -> int:
+        """소스 재등록/삭제 시 요약 캐시 무효화"""
+        if collection_id is None:
+            return 0
+        return self.summary_cache.invalidate(collection_id, sources)
+
     def summarize_documents_from_page(self, collection_id: int, sources: List[str], 
                              llm_name: str, llm_model: str, 
                              page: int=1) -> Generator:
@@ -2881,93 +3400,89 @@ class PostgresDbManager:
             llm_model (str): LLM 모델
             page (int): 페이지 번호 (기본값: 1)
         """
+        # 생성기는 요청 처리 후에 소비될 수 있으므로 호출 시점의 사용자를 보관
+        user_id = get_current_user()
+
         def generator():
             try:
                 total_steps = len(sources) + 3
                 current_step = 0
 
-                # 문서 수집 및 페이지 수 확인
+                # 문서 수집 및 페이지 수 확인 (선택한 모든 소스의 해당 페이지)
                 total_pages = 0
+                page_contents = []
                 for source in sources:
                     docs = self.get_document_page_content(collection_id, source, page)
+                    if docs:
+                        page_contents.append((source, docs))
                     total_pages += 1                                      
                     current_step += 1
                     yield {'type': 'progress', 'value': (current_step / total_steps) * 100}                  
 
-                # LLM 초기화
-                if llm_name == "Ollama":
-                    from langchain_community.llms import Ollama
-                    llm = Ollama(model=llm_model)
-                elif llm_name == "Openai":
-                    from langchain_community.chat_models import ChatOpenAI
-                    llm = ChatOpenAI(model_name=llm_model, max_tokens=1024)
-                elif llm_name == "Groq":
-                    from langchain_groq import ChatGroq
-                    llm = ChatGroq(model_name=llm_model, max_tokens=1024)
-                else:
-                    raise ValueError(f"Unsupported LLM: {llm_name}")
+                metadata = {
+                    'collection': collection_id,
+                    'sources': sources,
+                    'model': f"{llm_name}-{llm_model}",
+                    'total_chunks': 1
+                }
+
+                if not page_contents:
+                    yield {'type': 'error', 'value': f"{page} 페이지 내용이 없습니다."}
+                    return
+
+                # 요약 캐시 조회 (요약에 들어가는 모든 소스/페이지 내용으로 해시)
+                prompt_version = build_prompt_version(PAGE_SUMMARY_TEMPLATE)
+                content_hash = compute_content_hash(f"{source}\x1f{content}" for source, content in page_contents)
+                cache_key = build_cache_key(collection_id, sources, f"page:{page}",
+                                            metadata['model'], prompt_version, content_hash)
+                cached = self.summary_cache.get(cache_key)
+                if cached is not None:
+                    yield {'type': 'progress', 'value': 100}
+                    yield {
+                        'pages': cached,
+                        'cache_hit': True,
+                        'metadata': {**metadata, 'cache_hit': True}
+                    }
+                    return
+
+                # 요약 체인 조회 (LLM 클라이언트/프롬프트/체인은 레지스트리에서 재사용)
+                summarize_chain = self.llm_registry.get_summarize_chain(
+                    llm_name, llm_model, PAGE_SUMMARY_TEMPLATE, validate_template=True
+                )
                 
                 current_step += 1
                 yield {'type': 'progress', 'value': (current_step / total_steps) * 100}
 
-                splits = [Document(page_content=docs)]
+                # 텍스트 분할 (여러 소스의 페이지를 합치면 한 번의 호출 한도를 넘을 수 있음)
+                page_document = Document(page_content="\n\n".join(content for _, content in page_contents))
+                text_splitter = self.llm_registry.get_token_splitter(self.chunk_size, 100)
+                splits = text_splitter.split_documents([page_document])
                 
                 current_step += 1
                 yield {'type': 'progress', 'value': (current_step / total_steps) * 100}
 
-                # 요약 프롬프트
-                from langchain.prompts import PromptTemplate
-                summarize_prompt = PromptTemplate(
-                    template="""[시스템 지시사항]
-                    이 프롬프트는 주어진 텍스트{text}를 한국어로 요약합니다.                  
-
-                    [요약 지침]
-                    1. 텍스트의 전반적인 주제와 핵심 개념을 1-2문장으로 소개하세요.
-
-                    2. 주요 항목들을 나열하고, 각 항목에 대해:
-                    - 항목명을 볼드체(**항목명**)로 표시
-                    - 핵심 개념을 간단히 설명
-                    - 주요 장단점이나 특징을 불릿 포인트(-)로 제시
-
-                    3. 형식 요구사항:
-                    - 전체 개요 먼저 제시
-                    - 각 항목을 번호로 구분
-                    - 중요 특징은 불릿 포인트로 표시
-                    - 3-4문단 이내로 제한
-                    - 전문 용어는 가능한 쉽게 설명
-
-                    4. 전체 개요에서 전체 내용을 아우르는 통찰을 제시하세요.
-
-                    [출력 형식]
-                    
-                    [전체 개요]
-                                       
-                    [주요 항목]
-                         
-
-                    """,
-                    input_variables=["text"],
-                    validate_template=True
+                # 소스 요약과 같은 요약 엔진 사용 (제공자별 동시성 한도, 속도 제한기, 통합 요약)
+                summarizer = MapReduceSummarizer(summarize_chain, llm_name, user_id=user_id)
+                summaries = yield from summarizer.run(
+                    splits, (current_step / total_steps) * 100, 100
                 )
+                if not summaries:
+                    yield {'type': 'error', 'value': "페이지 요약에 실패했습니다."}
+                    return
+                summary_text = "\n\n".join(summaries)
+                logger.debug(f"Summary: {summary_text}")
 
-                # 요약 체인 생성
-                from langchain.chains.summarize import load_summarize_chain
-                summarize_chain = load_summarize_chain(llm, chain_type="stuff", prompt=summarize_prompt)
-
-                # 단일 문서 요약
-                chunk = splits[0]  # 단일 Document 사용
-                summary = summarize_chain.invoke({"input_documents": [chunk]})
-                logger.debug(f"Summary: {summary['output_text']}")
+                # 모든 청크가 요약된 경우에만 캐시에 저장
+                if summarizer.failed_count == 0:
+                    self.summary_cache.put(cache_key, collection_id, sources, f"page:{page}",
+                                           metadata['model'], prompt_version, content_hash,
+                                           summary_text)
 
                 # 요약 결과 반환
                 yield {
-                    'pages': summary['output_text'],
-                    'metadata': {
-                        'collection': collection_id,
-                        'sources': sources,
-                        'model': f"{llm_name}-{llm_model}",
-                        'total_chunks': 1
-                    }
+                    'pages': summary_text,
+                    'cache_hit': False,
+                    'metadata': {**metadata, 'cache_hit': False}
                 }
                 
             except Exception as e:
@@ -2977,6 +3492,11 @@ class PostgresDbManager:
 
         return generator()
     
+    @staticmethod
+    def _split_summary_pages(final_summary: str, page_size: int) -> List[str]:
+        """요약 결과를 page_size 단어 단위 페이지로 분할"""
+        words = final_summary.split()
+        return [' '.join(words[i:i + page_size]) for i in range(0, len(words), page_size)]
 
     def summarize_documents_from_source(self, collection_name: str, sources: List[str], 
                                  llm_name: str, llm_model: str, 
@@ -2991,125 +3511,104 @@ class PostgresDbManager:
             llm_model (str): LLM 모델
             page_size (int): 각 페이지당 단어 수 (기본값: 2048)
         """
+        # 생성기는 요청 처리 후에 소비될 수 있으므로 호출 시점의 사용자를 보관
+        user_id = get_current_user()
+
         def generator():
             try:
                 total_steps = len(sources) + 3
                 current_step = 0
 
-                # 문서 수집 및 페이지 수 확인
+                # 문서 수집 (페이지 수 제한 없음 - map-reduce로 요약)
                 all_documents = []
                 total_pages = 0
                 for source in sources:
                     docs = self.get_documents_by_source(collection_name, source)
                     total_pages += len(docs)
-                    
-                    # 100페이지 초과 확인
-                    if total_pages > 100:
-                        yield {
-                            'type': 'error',
-                            'value': f"문서의 총 페이지 수({total_pages})가 100페이지를 초과합니다. 요약이 불가능합니다."
-                        }
-                        return
-
                     all_documents.extend(docs)
                     current_step += 1
                     yield {'type': 'progress', 'value': (current_step / total_steps) * 100}
 
-                # LLM 초기화
-                if llm_name == "Ollama":
-                    from langchain_community.llms import Ollama
-                    llm = Ollama(model=llm_model)
-                elif llm_name == "Openai":
-                    from langchain_community.chat_models import ChatOpenAI
-                    llm = ChatOpenAI(model_name=llm_model, max_tokens=1024)
-                elif llm_name == "Groq":
-                    from langchain_groq import ChatGroq
-                    llm = ChatGroq(model_name=llm_model, max_tokens=1024)
-                else:
-                    raise ValueError(f"Unsupported LLM: {llm_name}")
+                metadata = {
+                    'collection': collection_name,
+                    'sources': sources,
+                    'model': f"{llm_name}-{llm_model}",
+                    'page_size': page_size
+                }
+
+                # 요약 캐시 조회
+                collection_id = self.get_collection_id(collection_name)
+                prompt_version = build_prompt_version(SOURCE_SUMMARY_TEMPLATE)
+                content_hash = compute_content_hash(doc.page_content for doc in all_documents)
+                cache_key = build_cache_key(collection_id, sources, "all", metadata['model'],
+                                            prompt_version, content_hash)
+                cached = self.summary_cache.get(cache_key) if collection_id else None
+                if cached is not None:
+                    pages = self._split_summary_pages(cached['summary'], page_size)
+                    yield {'type': 'progress', 'value': 100}
+                    yield {
+                        'type': 'summary',
+                        'cache_hit': True,
+                        'value': {
+                            'total_pages': len(pages),
+                            'pages': pages,
+                            'metadata': {
+                                **metadata,
+                                'total_chunks': cached.get('total_chunks', 0),
+                                'reduce_levels': cached.get('reduce_levels', 0),
+                                'cache_hit': True
+                            }
+                        }
+                    }
+                    return
+
+                # 요약 체인 조회 (LLM 클라이언트/프롬프트/체인은 레지스트리에서 재사용)
+                summarize_chain = self.llm_registry.get_summarize_chain(
+                    llm_name, llm_model, SOURCE_SUMMARY_TEMPLATE
+                )
                 
                 current_step += 1
                 yield {'type': 'progress', 'value': (current_step / total_steps) * 100}
 
                 # 텍스트 분할
-                from langchain.text_splitter import TokenTextSplitter
-                text_splitter = TokenTextSplitter(chunk_size=self.chunk_size, chunk_overlap=100)
+                text_splitter = self.llm_registry.get_token_splitter(self.chunk_size, 100)
                 splits = text_splitter.split_documents(all_documents)
                 
-                # 분할된 청크 수 확인
-                if len(splits) > 100:
-                    yield {
-                        'type': 'error',
-                        'value': f"분할된 청크의 수({len(splits)})가 100을 초과합니다. 요약이 불가능합니다."
-                    }
-                    return
-                
                 current_step += 1
                 yield {'type': 'progress', 'value': (current_step / total_steps) * 100}
 
-                # 요약 프롬프트
-                from langchain.prompts import PromptTemplate
-                summarize_prompt = PromptTemplate(
-                    template="다음 텍스트를 요약해주세요. 주요 포인트만 추출하여 간단명료하게 작성하세요:\n\n{text}\n\n요약:",
-                    input_variables=["text"]
+                # 청크 병렬 요약 + 계층적 통합 요약
+                summarizer = MapReduceSummarizer(summarize_chain, llm_name, user_id=user_id)
+                summaries = yield from summarizer.run(
+                    splits, (current_step / total_steps) * 100, 100
                 )
 
-                # 요약 체인 생성
-                from langchain.chains.summarize import load_summarize_chain
-                summarize_chain = load_summarize_chain(llm, chain_type="stuff", prompt=summarize_prompt)
-
-                # 각 청크 요약
-                summaries = []
-                for i, chunk in enumerate(splits):
-                    retry_count = 0
-                    max_retries = 5
-                    while retry_count < max_retries:
-                        try:
-                            summary = summarize_chain.invoke({"input_documents": [chunk]})
-                            summaries.append(summary['output_text'])
-                            yield {'type': 'progress', 'value': ((current_step + (i+1)/len(splits)) / total_steps) * 100}
-                            break
-                        except Exception as e:
-                            retry_count += 1
-                            yield {'type': 'info', 'value': f"요약 오류 발생 (시도 {retry_count}/{max_retries}): {str(e)}"}
-                            
-                            if retry_count == max_retries:
-                                yield {'type': 'error', 'value': f"최대 재시도 횟수 도달. 청크 {i+1} 요약 실패."}
-
                 # 최종 요약 생성
                 final_summary = "\n\n".join(summaries)
+
+                # 모든 청크가 요약된 경우에만 캐시에 저장
+                if collection_id and summaries and summarizer.failed_count == 0:
+                    self.summary_cache.put(cache_key, collection_id, sources, "all",
+                                           metadata['model'], prompt_version, content_hash,
+                                           {'summary': final_summary,
+                                            'total_chunks': len(splits),
+                                            'reduce_levels': summarizer.reduce_levels})
                 
                 # 페이지로 분할
-                words = final_summary.split()
-                pages = []
-                current_page = []
-                word_count = 0
-
-                for word in words:
-                    current_page.append(word)
-                    word_count += 1
-                    
-                    if word_count >= page_size:
-                        pages.append(' '.join(current_page))
-                        current_page = []
-                        word_count = 0
-                
-                # 마지막 페이지 처리
-                if current_page:
-                    pages.append(' '.join(current_page))
+                pages = self._split_summary_pages(final_summary, page_size)
 
                 # 페이지 정보와 함께 요약 결과 반환
                 yield {
                     'type': 'summary',
+                    'cache_hit': False,
                     'value': {
                         'total_pages': len(pages),
                         'pages': pages,
                         'metadata': {
-                            'collection': collection_name,
-                            'sources': sources,
-                            'model': f"{llm_name}-{llm_model}",
-                            'page_size': page_size,
-                            'total_chunks': len(splits)
+                            **metadata,
+                            'total_chunks': len(splits),
+                            'reduce_levels': summarizer.reduce_levels,
+                            'cache_hit': False
                         }
                     }
                 }
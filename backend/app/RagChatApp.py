@@ -8,7 +8,9 @@ from backend.app.PostgresDbManager import PostgresDbManager
 from backend.app.db_manager import DatabaseManager
 from backend.app.CustomSentenceTransformerEmbeddings import CustomSentenceTransformerEmbeddings as CSTFM
 from backend.app.systemMessageManager import SystemMessageManager
-from backend.app.ollamaOptimizer import OllamaFullGPUOptimizer
+from backend.app.ollamaOptimizer import OllamaFullGPUOptimizer, ModelNotAvailableError
+from backend.app.LLMRegistry import get_llm_registry
+from backend.app.RequestTracer import trace_span, traced
 
 
 from dotenv import load_dotenv, set_key
@@ -29,6 +31,7 @@ import getpass
 import traceback
 from abc import ABC, abstractmethod
 import psutil
+import queue
 from typing import  List,  Union
 
 logging.basicConfig(level=logging.ERROR)
@@ -157,6 +160,8 @@ class RAGChatApp:
     def _initialize_other_components(self):
         """Initialize other components of the RAG application"""
         self.lm_llm = load_llm()
+        # LLM 클라이언트/체인은 요청마다 만들지 않고 레지스트리에서 재사용
+        self.llm_registry = get_llm_registry()
         self.llm_model = self.lm_llm
         self.llm_name = ""
         self.embeddings = load_embeddings()
@@ -169,6 +174,10 @@ class RAGChatApp:
             connection_pool_size=15,  # 연결 풀 크기
             base_url=os.environ['OLLAMA_HOST']  # 명시적으로 URL 전달
         )
+        # 자주 쓰는 모델은 시작 시 백그라운드로 메모리에 올림 (첫 요청이 로드/pull 을 기다리지 않도록)
+        warmup_models = [m.strip() for m in os.getenv('OLLAMA_WARMUP_MODELS', '').split(',') if m.strip()]
+        pull_on_startup = os.getenv('OLLAMA_PULL_ON_STARTUP', 'false').lower() == 'true'
+        self.ollama_processor.start_warmup(warmup_models, pull_missing=pull_on_startup)
         sysMan = SystemMessageManager();
         sysManMessge=sysMan.get_selected_system_message(sysMan.get_current_selected_message_name())
         self.system_message = sysManMessge
@@ -263,6 +272,31 @@ class RAGChatApp:
             logger.error(f"Query processing error: {str(e)}")
             raise          
 
+    def ollama_generate_stream(self, model_name: str, prompt: str):
+        """
+        Ollama 응답을 토큰 조각 단위로 전달하는 생성기
+        조각마다 {'type': 'token', 'value': str} 를, 마지막에 {'type': 'done', 'metadata': dict} 를 yield 합니다.
+        (생성은 작업 스레드에서 실행하고 조각은 큐로 넘겨받음)
+        """
+        pieces = queue.Queue()
+        future = self.ollama_processor.executor.submit(
+            self.ollama_processor.direct_ollama_generate,
+            model_name, prompt, self.system_message,
+            stream=True, on_token=pieces.put
+        )
+        while True:
+            try:
+                yield {'type': 'token', 'value': pieces.get(timeout=0.1)}
+            except queue.Empty:
+                if future.done() and pieces.empty():
+                    break
+        result = future.result()
+        error = result.get('metadata', {}).get('error')
+        if error:
+            yield {'type': 'error', 'value': error}
+        else:
+            yield {'type': 'done', 'metadata': result.get('metadata', {})}
+
                         
     def set_collection_name(self, ragname):
         try:
@@ -434,6 +468,7 @@ class RAGChatApp:
             logger.error(error_message)
 
 
+    @traced("rag.perform_search")
     def perform_search(self, query, db_manager, collection_names: Union[str, List[str]], select_sources, score_threshold: float = 0.5):
         try:
             project_root = Path(__file__).parent.parent
@@ -453,13 +488,14 @@ class RAGChatApp:
             logger.debug(f"Searching in collections: {collection_names}")
             logger.debug(f"Selected sources: {select_sources}")
             
-            raw_results = db_manager.search_collection(
-            #raw_results = db_manager.search_keyword_collection(
-                collection_names,
-                query, 
-                n_results=FILLTERED_DOC_NUMBER,
-                score_threshold=score_threshold
-            )
+            with trace_span("rag.search_collection"):
+                raw_results = db_manager.search_collection(
+                #raw_results = db_manager.search_keyword_collection(
+                    collection_names,
+                    query, 
+                    n_results=FILLTERED_DOC_NUMBER,
+                    score_threshold=score_threshold
+                )
 
             if not raw_results:
                 logger.debug("No raw results found for query")
@@ -643,6 +679,9 @@ class RAGChatApp:
                 response = self.fallback_to_llm(query, llm_name)
                 return response, []
                 
+        except ModelNotAvailableError:
+            # 모델 미설치는 API 가 503 으로 알릴 수 있도록 그대로 전달
+            raise
         except Exception as e:
             error_message = f"Error in process_regular_query: {str(e)}"
             logger.error(error_message)
@@ -703,7 +742,7 @@ class RAGChatApp:
             elif llm_name == "Ollama":
                 response = self.ollama_generate(model_name=self.llm_model, prompt=prompt)
             else:
-                chain = load_qa_chain(self.llm, chain_type="stuff", verbose=True)
+                chain = self.llm_registry.get_qa_chain(self.lm_llm, chain_type="stuff", verbose=True)
                 response = chain.run(input_documents=[originalDoc, comparisonDoc], question=prompt)
 
             if isinstance(response, str):
@@ -733,7 +772,7 @@ class RAGChatApp:
             elif llm_name == "Ollama":
                 response = self.ollama_generate(model_name=self.llm_model, prompt=prompt)
             else:
-                chain = load_qa_chain(self.llm, chain_type="stuff", verbose=True)
+                chain = self.llm_registry.get_qa_chain(self.lm_llm, chain_type="stuff", verbose=True)
                 response = chain.run(input_documents=[originalDoc], question=prompt)
 
             if isinstance(response, str):
@@ -748,6 +787,10 @@ class RAGChatApp:
         
         
     def generate_response(self, docs, query, llm_name):
+        with trace_span(f"llm.{llm_name or 'LMStudio'}"):
+            return self._generate_response(docs, query, llm_name)
+
+    def _generate_response(self, docs, query, llm_name):
         try:                  
             if llm_name == "Groq":
                 docs_list = [docs] if isinstance(docs, str) else docs                
@@ -786,7 +829,7 @@ class RAGChatApp:
                 context = "\n".join([doc.page_content for  doc in docs])
                 prompt = prompt_template.format(context=context, question=query)
                 
-                chain = load_qa_chain(self.llm, chain_type="stuff", verbose=True)
+                chain = self.llm_registry.get_qa_chain(self.lm_llm, chain_type="stuff", verbose=True)
                 response = chain.run(input_documents=docs or "", question=prompt)            
                 return response
 
@@ -802,6 +845,8 @@ class RAGChatApp:
             logger.info("선택한 소스나 문서에서 관련 정보를 찾을 수 없어 LLM에 질의합니다.")
             response = self.generate_response(None, query, llm_name)
             return response
+        except ModelNotAvailableError:
+            raise
         except Exception as e:
             error_message = f"fallback_to_llm 오류 발생: {e}"
             logger.error(error_message)
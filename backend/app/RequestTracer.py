@@ -0,0 +1,191 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import List, Dict, Any, Optional
+import threading
+import logging
+import time
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 단계별 지연 시간 히스토그램 버킷 (밀리초)
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+
+
+class LatencyHistogram:
+    """누적 버킷 히스토그램 (Prometheus histogram 과 같은 le 의미)"""
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)   # 마지막은 +Inf
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value_ms: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value_ms <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.total += value_ms
+        self.max = max(self.max, value_ms)
+
+    def quantile(self, q: float) -> float:
+        """버킷 경계 기준 근사 분위수"""
+        if not self.count:
+            return 0.0
+        target = q * self.count
+        seen = 0
+        for i, c in enumerate(self.counts):
+            seen += c
+            if seen >= target:
+                return float(self.buckets[i]) if i < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self) -> Dict[str, Any]:
+        cumulative, running = {}, 0
+        for bound, c in zip(self.buckets, self.counts):
+            running += c
+            cumulative[str(bound)] = running
+        cumulative["+Inf"] = self.count
+        return {
+            'count': self.count,
+            'sum_ms': round(self.total, 3),
+            'avg_ms': round(self.total / self.count, 3) if self.count else 0.0,
+            'max_ms': round(self.max, 3),
+            'p50_ms': self.quantile(0.5),
+            'p95_ms': self.quantile(0.95),
+            'p99_ms': self.quantile(0.99),
+            'buckets': cumulative
+        }
+
+
+class StageMetrics:
+    """단계 이름별 히스토그램 집계 (프로세스 전역)"""
+
+    def __init__(self):
+        self._histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, stage: str, value_ms: float) -> None:
+        with self._lock:
+            histogram = self._histograms.get(stage)
+            if histogram is None:
+                histogram = self._histograms[stage] = LatencyHistogram()
+            histogram.observe(value_ms)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {stage: h.to_dict() for stage, h in sorted(self._histograms.items())}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+
+
+class Trace:
+    """한 요청의 span 기록 (중첩 구조는 parent 이름으로 표현)"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started_at = time.perf_counter()
+        self.spans: List[Dict[str, Any]] = []
+        self._stack: List[str] = []
+        self._lock = threading.Lock()
+
+    def add_span(self, name: str, start: float, duration_ms: float, parent: Optional[str]) -> None:
+        with self._lock:
+            self.spans.append({
+                'name': name,
+                'parent': parent,
+                'start_ms': round((start - self.started_at) * 1000, 3),
+                'duration_ms': round(duration_ms, 3)
+            })
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started_at) * 1000
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'total_ms': round(self.elapsed_ms(), 3),
+            'spans': sorted(self.spans, key=lambda s: s['start_ms'])
+        }
+
+    def server_timing(self) -> str:
+        """Server-Timing 헤더 값"""
+        parts = []
+        for s in self.spans:
+            metric = s['name'].replace('.', '_').replace(' ', '_')
+            parts.append(f"{metric};dur={s['duration_ms']}")
+        parts.append(f"total;dur={round(self.elapsed_ms(), 3)}")
+        return ", ".join(parts)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("request_trace", default=None)
+_current_span: ContextVar[Optional[str]] = ContextVar("request_span", default=None)
+_stage_metrics = StageMetrics()
+
+
+def get_stage_metrics() -> StageMetrics:
+    """프로세스 전역 단계별 지연 시간 집계"""
+    return _stage_metrics
+
+
+def start_trace(name: str) -> Trace:
+    """현재 컨텍스트(요청)에 새 trace 시작"""
+    trace = Trace(name)
+    _current_trace.set(trace)
+    _current_span.set(None)
+    return trace
+
+
+def end_trace() -> Optional[Trace]:
+    """현재 trace 종료 및 전체 시간 집계"""
+    trace = _current_trace.get()
+    if trace is not None:
+        _stage_metrics.observe(trace.name, trace.elapsed_ms())
+        _current_trace.set(None)
+    return trace
+
+
+def get_current_trace() -> Optional[Trace]:
+    return _current_trace.get()
+
+
+@contextmanager
+def trace_span(name: str):
+    """
+    단계 span 기록. trace 가 없어도 집계 히스토그램에는 반영된다.
+
+        with trace_span("search.embedding"):
+            query_embedding = self.embeddings.embed_query(query)
+    """
+    parent = _current_span.get()
+    token = _current_span.set(name)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_ms = (time.perf_counter() - start) * 1000
+        _current_span.reset(token)
+        _stage_metrics.observe(name, duration_ms)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add_span(name, start, duration_ms, parent)
+
+
+def traced(name: str):
+    """함수 전체를 span 으로 기록하는 데코레이터"""
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with trace_span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
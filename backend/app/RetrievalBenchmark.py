@@ -0,0 +1,414 @@
+#!/usr/bin/env python3
+"""
+검색 경로 성능 벤치마크
+
+합성 한국어 코퍼스(또는 JSONL 코퍼스)를 로컬 Postgres+pgvector / Chroma 에 적재하고
+store_documents, search_collection, search_keyword_collection, get_all_documents_source 의
+처리량, p50/p95/p99 지연 시간, 전수 비교(brute-force) 기준 recall@k 를 JSON 으로 출력한다.
+정답 매칭은 청크 메타데이터의 순번(bench_chunk_id)으로 하며, 청크 본문은 메모리에 모두 두지 않고
+질의 생성용 표본(QUERY_POOL_SIZE 개)만 보관한다.
+
+사용 예:
+    python -m backend.app.RetrievalBenchmark --backend postgres --chunks 10000 --output bench.json
+    python -m backend.app.RetrievalBenchmark --backend chroma --corpus corpus.jsonl --queries 500
+"""
+from typing import List, Dict, Any, Optional, Iterator
+import argparse
+import tempfile
+import logging
+import random
+import json
+import sys
+import os
+import time
+
+import numpy as np
+from langchain.docstore.document import Document
+
+from backend.app.BenchmarkStats import percentiles
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+# 합성 코퍼스 어휘 (공공기관 문서 형태)
+ORGANIZATIONS = ["한국지능정보사회진흥원", "행정안전부", "과학기술정보통신부", "서울특별시", "부산광역시",
+                 "국토교통부", "보건복지부", "환경부", "교육부", "중소벤처기업부"]
+TOPICS = ["인공지능", "데이터", "클라우드", "정보보안", "디지털플랫폼", "공공서비스", "개인정보",
+          "전자정부", "스마트시티", "사이버보안", "빅데이터", "메타버스", "자율주행", "탄소중립"]
+NOUNS = ["사업계획", "예산", "추진체계", "성과지표", "운영지침", "협약", "입찰", "감리", "유지보수",
+         "교육과정", "위탁기관", "실태조사", "표준화", "인증", "시범사업", "품질관리", "위험관리",
+         "이행점검", "개선방안", "기술지원", "보고서", "회의록", "공모", "평가위원회", "집행계획"]
+VERBS = ["수립한다", "추진한다", "검토하였다", "확정하였다", "점검한다", "보고하였다",
+         "개선하였다", "지원한다", "마련하였다", "운영한다", "강화한다", "공고하였다"]
+CONNECTORS = ["또한", "아울러", "한편", "이에 따라", "특히", "따라서"]
+QUERY_SUFFIXES = ["에 대해 알려주세요", " 관련 내용은?", " 현황을 요약해줘", "은 어떻게 되나요?"]
+
+
+def generate_korean_corpus(num_chunks: int, chunks_per_source: int = 20,
+                           sentences_per_chunk: int = 6, seed: int = 42) -> Iterator[Dict[str, Any]]:
+    """
+    결정적 합성 한국어 코퍼스 생성
+
+    Yields:
+        dict: {'source': 파일명, 'page': 페이지, 'text': 청크 본문}
+    """
+    rng = random.Random(seed)
+    for idx in range(num_chunks):
+        doc_no = idx // chunks_per_source
+        org = ORGANIZATIONS[doc_no % len(ORGANIZATIONS)]
+        topic = TOPICS[(doc_no // len(ORGANIZATIONS)) % len(TOPICS)]
+        sentences = []
+        for s in range(sentences_per_chunk):
+            noun1, noun2 = rng.sample(NOUNS, 2)
+            year = 2018 + rng.randint(0, 7)
+            sentence = (f"{org}는 {year}년 {topic} {noun1} 관련 {noun2}을 {rng.choice(VERBS)}. "
+                        f"(문서번호 제{doc_no}-{idx}-{s}호)")
+            if s and rng.random() < 0.4:
+                sentence = f"{rng.choice(CONNECTORS)} {sentence}"
+            sentences.append(sentence)
+        yield {
+            'source': f"{org}_{topic}_{doc_no:07d}.pdf",
+            'page': (idx % chunks_per_source) // 2 + 1,
+            'text': " ".join(sentences)
+        }
+
+
+def load_corpus(path: str, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """JSONL 코퍼스 로드 (한 줄에 {'source', 'page', 'text'})"""
+    with open(path, 'r', encoding='utf-8') as f:
+        for idx, line in enumerate(f):
+            if limit is not None and idx >= limit:
+                break
+            record = json.loads(line)
+            yield {
+                'source': record.get('source', 'unknown'),
+                'page': record.get('page', 0),
+                'text': record['text']
+            }
+
+
+# 질의 생성용으로 보관하는 청크 본문 표본 수 (코퍼스 크기와 무관하게 메모리 일정)
+QUERY_POOL_SIZE = 10000
+# 정답 매칭용 청크 순번 메타데이터 키
+CHUNK_ID_KEY = "bench_chunk_id"
+
+
+def normalize_content(text: str, max_length: int) -> str:
+    """store_documents 와 동일한 정규화 후 저장소가 실제로 저장하는 길이로 자름"""
+    text = text.replace('\xa0', ' ')
+    text = ' '.join(text.split())
+    return text[:max_length]
+
+
+class GroundTruthIndex:
+    """
+    전수 비교용 임베딩 행렬 (대규모 코퍼스는 디스크 memmap 사용)
+    코사인 유사도 기준 top-k 를 블록 단위로 계산한다.
+    """
+
+    def __init__(self, num_chunks: int, dim: int, work_dir: str, block_size: int = 200000):
+        self.block_size = block_size
+        self.path = os.path.join(work_dir, "ground_truth.f32")
+        self.matrix = np.memmap(self.path, dtype=np.float32, mode='w+', shape=(num_chunks, dim))
+        self.size = 0
+
+    def add(self, embeddings: List[List[float]]) -> None:
+        arr = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(arr, axis=1, keepdims=True)
+        arr = arr / np.maximum(norms, 1e-12)
+        self.matrix[self.size:self.size + len(arr)] = arr
+        self.size += len(arr)
+
+    def top_k(self, query_embedding: List[float], k: int) -> List[int]:
+        query = np.asarray(query_embedding, dtype=np.float32)
+        query = query / max(float(np.linalg.norm(query)), 1e-12)
+        best_idx = np.empty(0, dtype=np.int64)
+        best_score = np.empty(0, dtype=np.float32)
+        for start in range(0, self.size, self.block_size):
+            block = self.matrix[start:min(start + self.block_size, self.size)]
+            scores = block @ query
+            take = min(k, len(scores))
+            local = np.argpartition(-scores, take - 1)[:take]
+            best_idx = np.concatenate([best_idx, local + start])
+            best_score = np.concatenate([best_score, scores[local]])
+            if len(best_idx) > k:
+                keep = np.argpartition(-best_score, k - 1)[:k]
+                best_idx, best_score = best_idx[keep], best_score[keep]
+        order = np.argsort(-best_score)
+        return [int(i) for i in best_idx[order]]
+
+    def close(self) -> None:
+        del self.matrix
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class RetrievalBenchmark:
+    """Postgres / Chroma 검색 경로 벤치마크 실행기"""
+
+    def __init__(self, backend: str, collection_name: str, k: int = 5,
+                 ingest_batch: int = 20, work_dir: Optional[str] = None,
+                 persist_directory: Optional[str] = None):
+        self.backend = backend
+        self.collection_name = collection_name
+        self.k = k
+        self.ingest_batch = ingest_batch
+        self.work_dir = work_dir or tempfile.mkdtemp(prefix="ragbench_")
+        self.db = self._create_manager(persist_directory)
+        self.embeddings = self.db.embeddings
+        self.max_length = self._stored_length()
+        # 질의 생성용 본문 표본 (저수지 표본 추출)
+        self.query_pool: List[str] = []
+        self._pool_rng = random.Random(0)
+        self.sources: List[str] = []
+        self._source_set = set()
+        self.num_chunks = 0
+
+    def _create_manager(self, persist_directory: Optional[str]):
+        if self.backend == "postgres":
+            from backend.app.PostgresDbManager import PostgresDbManager
+            return PostgresDbManager()
+        elif self.backend == "chroma":
+            from backend.app.ChromaDbManager import ChromaDbManager
+            return ChromaDbManager(persist_directory or os.path.join(self.work_dir, "chroma_db"))
+        raise ValueError(f"Unsupported backend: {self.backend}")
+
+    def _stored_length(self) -> int:
+        """
+        저장소가 청크를 그대로 저장하는 최대 길이
+        (Postgres 는 CHUNKSIZE 에서 자르고, Chroma 는 chunk_size 를 넘으면 다시 분할하므로 그 이하로 맞춤)
+        """
+        if self.backend == "postgres":
+            from backend.app.PostgresDbManager import CHUNKSIZE
+            return int(CHUNKSIZE)
+        return int(getattr(self.db, 'chunk_size', None) or os.getenv("CHUNK_SIZE", "1000"))
+
+    def _sample_for_queries(self, content: str) -> None:
+        if len(self.query_pool) < QUERY_POOL_SIZE:
+            self.query_pool.append(content)
+            return
+        slot = self._pool_rng.randrange(self.num_chunks)
+        if slot < QUERY_POOL_SIZE:
+            self.query_pool[slot] = content
+
+    def _store(self, docs: List[Document], source: str) -> int:
+        if self.backend == "postgres":
+            return self.db.store_documents(docs, source, self.collection_name)
+        # Chroma 는 업로드 경로와 동일하게 split_embed_docs_store 사용
+        return self.db.split_embed_docs_store(docs, source, self.collection_name)
+
+    def ingest(self, records: Iterator[Dict[str, Any]], num_chunks: int) -> Dict[str, Any]:
+        """코퍼스 적재 및 전수 비교용 임베딩 생성"""
+        ground_truth = None
+        latencies: List[float] = []
+        stored_total = 0
+        batch: List[Dict[str, Any]] = []
+        started = time.perf_counter()
+
+        def flush(batch):
+            nonlocal ground_truth, stored_total
+            # 소스 단위로 저장 (실제 업로드와 동일)
+            by_source: Dict[str, List[Document]] = {}
+            contents = []
+            for record in batch:
+                content = normalize_content(record['text'], self.max_length)
+                contents.append(content)
+                by_source.setdefault(record['source'], []).append(
+                    Document(page_content=content, metadata={'source': record['source'], 'page': record['page'],
+                                                             CHUNK_ID_KEY: self.num_chunks})
+                )
+                self.num_chunks += 1
+                self._sample_for_queries(content)
+            # 저장되는 본문과 같은 텍스트로 전수 비교용 임베딩 생성
+            embeddings = self.embeddings.embed_documents(contents)
+            if ground_truth is None:
+                ground_truth = GroundTruthIndex(num_chunks, len(embeddings[0]), self.work_dir)
+            ground_truth.add(embeddings)
+
+            for source, docs in by_source.items():
+                if source not in self._source_set:
+                    self._source_set.add(source)
+                    self.sources.append(source)
+                t0 = time.perf_counter()
+                stored = self._store(docs, source) or 0
+                latencies.append(time.perf_counter() - t0)
+                # Chroma 의 split_embed_docs_store 는 컬렉션 전체 건수를 반환
+                stored_total = stored if self.backend == "chroma" else stored_total + stored
+
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.ingest_batch:
+                flush(batch)
+                batch = []
+        if batch:
+            flush(batch)
+
+        elapsed = time.perf_counter() - started
+        self.ground_truth = ground_truth
+        store_seconds = sum(latencies)
+        return {
+            'chunks': self.num_chunks,
+            'sources': len(self.sources),
+            'stored': stored_total,
+            'elapsed_seconds': elapsed,
+            'store_chunks_per_second': self.num_chunks / store_seconds if store_seconds else 0.0,
+            'store_call_latency': percentiles(latencies)
+        }
+
+    def build_queries(self, num_queries: int, seed: int = 7) -> List[str]:
+        """적재된 청크 표본에서 키워드를 뽑아 질의 생성"""
+        rng = random.Random(seed)
+        queries = []
+        for _ in range(num_queries):
+            words = [w for w in rng.choice(self.query_pool).split() if len(w) > 1 and not w.startswith("(")]
+            picked = rng.sample(words, min(3, len(words)))
+            queries.append(" ".join(picked) + rng.choice(QUERY_SUFFIXES))
+        return queries
+
+    def _recall(self, results: List[Dict[str, Any]], truth: List[int]) -> float:
+        retrieved = set()
+        for result in results[:self.k]:
+            idx = (result.get('metadata') or {}).get(CHUNK_ID_KEY)
+            if idx is not None:
+                retrieved.add(int(idx))
+        # 청크 순번 기준 비교 (같은 본문이 여러 번 있으면 순번이 다르므로 별개 청크로 취급)
+        truth_set = set(truth[:self.k])
+        return len(retrieved & truth_set) / max(1, len(truth_set))
+
+    def _search(self, method: str, query: str) -> List[Dict[str, Any]]:
+        if self.backend == "postgres":
+            fn = getattr(self.db, method)
+            return fn(self.collection_name, query, n_results=self.k, score_threshold=0.0) or []
+        # Chroma 의 점수 임계값은 min-max 정규화 이후 적용되므로 0 으로 비교
+        return self.db.search_collection(self.collection_name, query, self.k, similarity_threshold=0.0) or []
+
+    def run_search(self, method: str, queries: List[str]) -> Dict[str, Any]:
+        """질의별 지연 시간과 recall@k 측정"""
+        latencies, recalls = [], []
+        started = time.perf_counter()
+        for query in queries:
+            truth = self.ground_truth.top_k(self.embeddings.embed_query(query), self.k)
+            t0 = time.perf_counter()
+            results = self._search(method, query)
+            latencies.append(time.perf_counter() - t0)
+            recalls.append(self._recall(results, truth))
+        elapsed = time.perf_counter() - started
+        return {
+            'queries': len(queries),
+            'queries_per_second': len(queries) / sum(latencies) if latencies else 0.0,
+            'latency': percentiles(latencies),
+            f'recall@{self.k}': float(np.mean(recalls)) if recalls else 0.0,
+            'elapsed_seconds': elapsed
+        }
+
+    def run_source_listing(self, repeats: int = 20) -> Dict[str, Any]:
+        """get_all_documents_source 전체 조회 및 부분 문자열 검색 지연 시간"""
+        results = {}
+        probes = {
+            'all': '',
+            'filtered': self.sources[len(self.sources) // 2][:6] if self.sources else ''
+        }
+        for name, search in probes.items():
+            latencies = []
+            count = 0
+            for _ in range(repeats):
+                t0 = time.perf_counter()
+                count = len(self.db.get_all_documents_source(self.collection_name, search) or [])
+                latencies.append(time.perf_counter() - t0)
+            results[name] = {'search': search, 'returned': count, 'latency': percentiles(latencies)}
+        return results
+
+    def cleanup(self) -> None:
+        try:
+            self.db.delete_collection(self.collection_name)
+        except Exception as e:
+            logger.warning(f"벤치마크 컬렉션 삭제 실패: {str(e)}")
+        if getattr(self, 'ground_truth', None) is not None:
+            self.ground_truth.close()
+        try:
+            self.db.close()
+        except Exception:
+            pass
+
+
+def run_benchmark(args) -> Dict[str, Any]:
+    backends = ["postgres", "chroma"] if args.backend == "both" else [args.backend]
+    report = {
+        'config': {
+            'chunks': args.chunks,
+            'queries': args.queries,
+            'k': args.k,
+            'corpus': args.corpus or 'synthetic',
+            'seed': args.seed
+        },
+        'started_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'results': {}
+    }
+
+    for backend in backends:
+        collection_name = f"{args.collection}_{backend}"
+        bench = RetrievalBenchmark(backend, collection_name, k=args.k,
+                                   ingest_batch=args.batch, work_dir=args.work_dir)
+        try:
+            records = (load_corpus(args.corpus, args.chunks) if args.corpus
+                       else generate_korean_corpus(args.chunks, seed=args.seed))
+            logger.info(f"[{backend}] 적재 시작: {args.chunks} chunks")
+            result = {'ingest': bench.ingest(records, args.chunks)}
+
+            queries = bench.build_queries(args.queries, seed=args.seed)
+            logger.info(f"[{backend}] 검색 측정: {len(queries)} queries")
+            result['search_collection'] = bench.run_search('search_collection', queries)
+            if backend == "postgres":
+                result['search_keyword_collection'] = bench.run_search('search_keyword_collection', queries)
+            result['get_all_documents_source'] = bench.run_source_listing()
+            report['results'][backend] = result
+        except Exception as e:
+            logger.error(f"[{backend}] 벤치마크 실패: {str(e)}", exc_info=True)
+            report['results'][backend] = {'error': str(e)}
+        finally:
+            if not args.keep:
+                bench.cleanup()
+
+    report['finished_at'] = time.strftime('%Y-%m-%d %H:%M:%S')
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description='RAG 검색 경로 벤치마크')
+    parser.add_argument('--backend', choices=['postgres', 'chroma', 'both'], default='both')
+    parser.add_argument('--chunks', type=int, default=10000, help='적재할 청크 수 (10k ~ 5M)')
+    parser.add_argument('--queries', type=int, default=200, help='측정할 질의 수')
+    parser.add_argument('--k', type=int, default=5, help='recall@k 의 k')
+    parser.add_argument('--batch', type=int, default=200, help='적재 배치 크기 (청크)')
+    parser.add_argument('--corpus', help='JSONL 코퍼스 경로 (없으면 합성 코퍼스 생성)')
+    parser.add_argument('--save-corpus', help='합성 코퍼스를 JSONL 로 저장하고 종료')
+    parser.add_argument('--collection', default='ragbench', help='벤치마크 컬렉션 이름 접두어')
+    parser.add_argument('--work-dir', help='임시 파일(전수 비교 행렬, Chroma) 디렉토리')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--keep', action='store_true', help='종료 후 컬렉션 유지')
+    parser.add_argument('--output', help='결과 JSON 파일 경로 (기본값: 표준 출력)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    if args.save_corpus:
+        with open(args.save_corpus, 'w', encoding='utf-8') as f:
+            for record in generate_korean_corpus(args.chunks, seed=args.seed):
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return
+
+    report = run_benchmark(args)
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
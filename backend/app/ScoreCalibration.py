@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+검색 점수 보정 (컬렉션별 오프라인 계산, 질의 시에는 선형 변환만 수행)
+
+질의마다 결과 집합으로 MinMaxScaler 를 맞추면 1위는 항상 1.0, 마지막은 0.0 이 되어
+임계값 필터가 요청한 결과 수에 따라 달라진다. 대신 컬렉션별로 표본 질의의 원점수 분포에서
+low(배경 수준) / high(강한 일치 수준)를 미리 구해 저장하고, 질의 시에는
+    score = clip((raw - low) / (high - low), 0, 1)
+로 변환한다. 보정값이 없는 컬렉션은 원점수를 [0, 1] 로 자른 값을 사용한다.
+
+표본 질의는 저장된 청크에서 단어 몇 개를 뽑은 짧은 질의(또는 --queries-file 의 실제 질의 로그)이며,
+질의를 뽑은 청크 자신은 결과에서 제외한다 (자기 일치로 high/low 가 부풀지 않도록).
+절반으로 맞춘 보정값을 나머지 절반에 적용해 대부분의 질의가 기본 임계값에 걸러지면 저장하지 않는다.
+
+사용 예:
+    python -m backend.app.ScoreCalibration --backend postgres --collection 공공문서
+    python -m backend.app.ScoreCalibration --backend chroma --all --samples 300
+    python -m backend.app.ScoreCalibration --backend postgres --all --queries-file queries.txt
+"""
+from typing import List, Dict, Any, Optional, Callable, Iterable, Union
+from datetime import datetime
+import threading
+import argparse
+import logging
+import sqlite3
+import random
+import time
+import json
+import sys
+import os
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 보정값 캐시 유지 시간 (다른 프로세스에서 재계산한 값 반영 주기)
+CALIBRATION_CACHE_TTL = float(os.getenv("SCORE_CALIBRATION_CACHE_TTL", "300"))
+# high - low 최소 폭 (분포가 좁은 컬렉션에서 점수가 튀지 않도록)
+MIN_CALIBRATION_SPAN = 0.05
+# 검증용 임계값 (검색 기본 score_threshold) 과 이 임계값을 넘어야 하는 검증 질의 비율
+CALIBRATION_CHECK_THRESHOLD = float(os.getenv("SCORE_CALIBRATION_CHECK_THRESHOLD", "0.5"))
+CALIBRATION_MIN_PASS_RATE = float(os.getenv("SCORE_CALIBRATION_MIN_PASS_RATE", "0.5"))
+
+
+class ScoreCalibration:
+    """컬렉션별 점수 보정값 (low -> 0.0, high -> 1.0)"""
+
+    def __init__(self, low: float = 0.0, high: float = 1.0, sample_size: int = 0,
+                 computed_at: Optional[str] = None):
+        self.low = float(low)
+        self.high = float(high)
+        self.sample_size = int(sample_size)
+        self.computed_at = computed_at
+
+    @property
+    def is_default(self) -> bool:
+        return self.sample_size == 0
+
+    def normalize(self, raw: float) -> float:
+        span = self.high - self.low
+        if span <= 0:
+            return 1.0 if raw >= self.high else 0.0
+        return min(1.0, max(0.0, (float(raw) - self.low) / span))
+
+    def raw_threshold(self, threshold: float) -> float:
+        """보정 점수 임계값에 해당하는 원점수"""
+        return self.low + float(threshold) * (self.high - self.low)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {'low': self.low, 'high': self.high, 'sample_size': self.sample_size,
+                'computed_at': self.computed_at}
+
+
+DEFAULT_CALIBRATION = ScoreCalibration()
+
+
+def _percentile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def fit_calibration(top_scores: List[float], floor_scores: List[float]) -> ScoreCalibration:
+    """
+    표본 질의 결과로 보정값 계산
+
+    Args:
+        top_scores: 질의별 1위 원점수
+        floor_scores: 질의별 k위(마지막) 원점수
+    """
+    if not top_scores or not floor_scores:
+        return DEFAULT_CALIBRATION
+    low = _percentile(floor_scores, 0.5)
+    high = _percentile(top_scores, 0.95)
+    if high - low < MIN_CALIBRATION_SPAN:
+        high = low + MIN_CALIBRATION_SPAN
+    return ScoreCalibration(low, high, len(top_scores), datetime.now().isoformat())
+
+
+def sample_queries(texts: Iterable[str], num_queries: int, seed: int = 7,
+                   min_chars: int = 20, min_words: int = 2, max_words: int = 4) -> List[Dict[str, str]]:
+    """
+    저장된 청크에서 단어 몇 개를 뽑아 실제 사용자 질의와 비슷한 짧은 표본 질의 생성
+
+    Returns:
+        [{'query': 질의, 'source': 질의를 뽑은 청크 본문}] (source 는 결과에서 제외할 자기 일치 판별용)
+    """
+    rng = random.Random(seed)
+    pool = [t for t in texts if t and len(t.strip()) >= min_chars]
+    rng.shuffle(pool)
+    queries = []
+    for text in pool:
+        if len(queries) >= num_queries:
+            break
+        words = [w for w in text.split() if len(w) > 1]
+        if len(words) < min_words:
+            continue
+        picked = rng.sample(words, min(len(words), rng.randint(min_words, max_words)))
+        queries.append({'query': " ".join(picked), 'source': text})
+    return queries
+
+
+def _content_key(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def _scores_without_source(results: List[Dict[str, Any]], source: Optional[str], k: int) -> List[float]:
+    """질의를 뽑은 청크(자기 일치)를 뺀 상위 k 개 원점수"""
+    source_key = _content_key(source) if source else None
+    scores = [r['raw_score'] for r in results
+              if source_key is None or _content_key(r.get('page_content', '')) != source_key]
+    return scores[:k]
+
+
+def calibrate(search: Callable[[str], List[Dict[str, Any]]], queries: List[Union[str, Dict[str, str]]], k: int,
+              check_threshold: float = CALIBRATION_CHECK_THRESHOLD,
+              min_pass_rate: float = CALIBRATION_MIN_PASS_RATE) -> ScoreCalibration:
+    """
+    search(query) -> 검색 결과 목록(원점수 내림차순, 'page_content'/'raw_score' 포함, k+1 개) 으로
+    표본 질의를 실행해 보정값 계산
+
+    queries 는 sample_queries 결과 또는 실제 질의 문자열 목록. 짝수 번째 질의로 맞춘 보정값에서
+    홀수 번째 질의의 1위 점수가 check_threshold 이상인 비율이 min_pass_rate 미만이면
+    (일반 질의 대부분이 걸러지는 보정값) 기본값을 반환한다.
+    """
+    top_scores, floor_scores = [], []
+    for item in queries:
+        query, source = (item, None) if isinstance(item, str) else (item['query'], item.get('source'))
+        try:
+            scores = _scores_without_source(search(query), source, k)
+        except Exception as e:
+            logger.debug(f"calibration query failed: {str(e)}")
+            continue
+        if scores:
+            top_scores.append(scores[0])
+            floor_scores.append(scores[-1])
+
+    check_top = top_scores[1::2]
+    if check_top:
+        trial = fit_calibration(top_scores[0::2], floor_scores[0::2])
+        pass_rate = sum(1 for score in check_top if trial.normalize(score) >= check_threshold) / len(check_top)
+        if pass_rate < min_pass_rate:
+            logger.warning(f"Rejected score calibration {trial.to_dict()}: only {pass_rate:.0%} of held-out "
+                           f"queries reach threshold {check_threshold}")
+            return DEFAULT_CALIBRATION
+    return fit_calibration(top_scores, floor_scores)
+
+
+class _CalibrationCache:
+    """저장소 조회 결과를 TTL 동안 메모리에 보관"""
+
+    def __init__(self, ttl: float = CALIBRATION_CACHE_TTL):
+        self._ttl = ttl
+        self._cache: Dict[Any, tuple] = {}
+        self._cache_lock = threading.Lock()
+
+    def _cached(self, key) -> Optional[ScoreCalibration]:
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry and time.time() < entry[1]:
+                return entry[0]
+        return None
+
+    def _remember(self, key, calibration: ScoreCalibration) -> None:
+        with self._cache_lock:
+            self._cache[key] = (calibration, time.time() + self._ttl)
+
+    def _forget(self, key=None) -> None:
+        with self._cache_lock:
+            if key is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(key, None)
+
+
+class PostgresCalibrationStore(_CalibrationCache):
+    """score_calibration 테이블 기반 보정값 저장소 (테이블은 PostgresDbManager에서 생성)"""
+
+    def __init__(self, get_connection: Callable):
+        super().__init__()
+        self.get_connection = get_connection
+
+    def get_many(self, collection_ids: List[int]) -> Dict[int, ScoreCalibration]:
+        result = {}
+        missing = []
+        for cid in collection_ids:
+            cached = self._cached(cid)
+            if cached is None:
+                missing.append(cid)
+            else:
+                result[cid] = cached
+        if missing:
+            conn = self.get_connection()
+            try:
+                with conn.cursor() as cur:
+                    cur.execute("""
+                        SELECT collection_id, low, high, sample_size, computed_at
+                        FROM score_calibration
+                        WHERE collection_id = ANY(%s)
+                    """, (missing,))
+                    rows = {row[0]: row for row in cur.fetchall()}
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"점수 보정값 조회 오류: {str(e)}")
+                rows = {}
+            for cid in missing:
+                row = rows.get(cid)
+                calibration = (ScoreCalibration(row[1], row[2], row[3], str(row[4]))
+                               if row else DEFAULT_CALIBRATION)
+                self._remember(cid, calibration)
+                result[cid] = calibration
+        return result
+
+    def get(self, collection_id: int) -> ScoreCalibration:
+        return self.get_many([collection_id])[collection_id]
+
+    def put(self, collection_id: int, calibration: ScoreCalibration) -> bool:
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO score_calibration (collection_id, low, high, sample_size, computed_at)
+                    VALUES (%s, %s, %s, %s, CURRENT_TIMESTAMP)
+                    ON CONFLICT (collection_id) DO UPDATE
+                    SET low = EXCLUDED.low, high = EXCLUDED.high,
+                        sample_size = EXCLUDED.sample_size, computed_at = EXCLUDED.computed_at
+                """, (collection_id, calibration.low, calibration.high, calibration.sample_size))
+            conn.commit()
+            self._forget(collection_id)
+            return True
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"점수 보정값 저장 오류: {str(e)}")
+            return False
+
+
+class SqliteCalibrationStore(_CalibrationCache):
+    """로컬 SQLite 파일 기반 보정값 저장소 (ChromaDB persist_directory 옆에 저장)"""
+
+    def __init__(self, db_path: str):
+        super().__init__()
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS score_calibration (
+                    collection TEXT PRIMARY KEY,
+                    low REAL NOT NULL,
+                    high REAL NOT NULL,
+                    sample_size INTEGER NOT NULL,
+                    computed_at TEXT
+                )
+            """)
+            self._conn.commit()
+
+    def get(self, collection: str) -> ScoreCalibration:
+        cached = self._cached(collection)
+        if cached is not None:
+            return cached
+        try:
+            with self._lock:
+                row = self._conn.execute("""
+                    SELECT low, high, sample_size, computed_at
+                    FROM score_calibration WHERE collection = ?
+                """, (collection,)).fetchone()
+        except Exception as e:
+            logger.error(f"점수 보정값 조회 오류: {str(e)}")
+            row = None
+        calibration = ScoreCalibration(*row) if row else DEFAULT_CALIBRATION
+        self._remember(collection, calibration)
+        return calibration
+
+    def put(self, collection: str, calibration: ScoreCalibration) -> bool:
+        try:
+            with self._lock:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO score_calibration
+                    (collection, low, high, sample_size, computed_at) VALUES (?, ?, ?, ?, ?)
+                """, (collection, calibration.low, calibration.high, calibration.sample_size,
+                      calibration.computed_at or datetime.now().isoformat()))
+                self._conn.commit()
+            self._forget(collection)
+            return True
+        except Exception as e:
+            logger.error(f"점수 보정값 저장 오류: {str(e)}")
+            return False
+
+    def delete(self, collection: str) -> None:
+        try:
+            with self._lock:
+                self._conn.execute("DELETE FROM score_calibration WHERE collection = ?", (collection,))
+                self._conn.commit()
+        except Exception as e:
+            logger.error(f"점수 보정값 삭제 오류: {str(e)}")
+        self._forget(collection)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='컬렉션별 검색 점수 보정값 계산')
+    parser.add_argument('--backend', choices=['postgres', 'chroma'], default='postgres')
+    parser.add_argument('--collection', action='append', help='대상 컬렉션 (여러 번 지정 가능)')
+    parser.add_argument('--all', action='store_true', help='모든 컬렉션')
+    parser.add_argument('--samples', type=int, default=200, help='표본 질의 수')
+    parser.add_argument('--k', type=int, default=10, help='표본 질의별 검색 결과 수')
+    parser.add_argument('--queries-file', help='실제 질의 로그 (한 줄에 질의 하나, 지정하면 청크 표본 대신 사용)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    if args.backend == 'postgres':
+        from backend.app.PostgresDbManager import PostgresDbManager
+        db = PostgresDbManager()
+    else:
+        from backend.app.ChromaDbManager import ChromaDbManager
+        db = ChromaDbManager()
+
+    names = args.collection or []
+    if args.all:
+        names = db.get_list_collections()
+    if not names:
+        parser.error('--collection 또는 --all 을 지정하세요')
+
+    queries = None
+    if args.queries_file:
+        with open(args.queries_file, encoding='utf-8') as f:
+            queries = [line.strip() for line in f if line.strip()][:args.samples]
+
+    report = {}
+    for name in names:
+        calibration = db.calibrate_scores(name, num_queries=args.samples, k=args.k, queries=queries)
+        report[name] = calibration.to_dict() if calibration else None
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+from datetime import datetime, timezone
+from typing import Dict, Any, Optional, Set
+from psycopg2.extras import RealDictCursor, execute_values
+import threading
+import logging
+import time
+import os
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 세션 조회 공통 쿼리 (SessionService.validate_session, AuthService.check_session)
+SESSION_LOOKUP_SQL = """
+    SELECT
+        u.id,
+        u.id as user_id,
+        u.username,
+        u.email,
+        s.expires_at,
+        s.ip_address,
+        s.created_at,
+        s.is_active
+    FROM sessions s
+    JOIN users u ON s.user_id = u.id
+    WHERE s.session_id = %s
+    AND s.is_active = true
+    AND s.expires_at > NOW()
+"""
+
+
+def _to_epoch(value) -> Optional[float]:
+    """datetime(naive 는 UTC 로 간주) -> epoch 초"""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class SessionActivityTracker:
+    """
+    세션 검증 경로의 DB 쓰기/조회를 줄이기 위한 프로세스 전역 도우미
+
+    - 검증된 세션을 짧은 TTL 동안 메모리에 보관 (세션 만료 시각을 넘기지 않음)
+    - last_accessed 갱신은 메모리에 모았다가 주기적으로 한 번의 UPDATE 로 반영
+    - 백그라운드 reaper 가 만료 세션 비활성화 및 오래된 세션 삭제를 청크 단위로 수행
+
+    로그아웃/세션 종료 시에는 invalidate 로 캐시를 즉시 제거한다.
+    여러 프로세스로 실행될 때 다른 프로세스의 로그아웃은 TTL 이내에 반영된다.
+    """
+
+    def __init__(self,
+                 cache_ttl: Optional[float] = None,
+                 max_entries: int = 10000,
+                 flush_interval: Optional[float] = None,
+                 flush_batch: int = 500,
+                 reap_interval: Optional[float] = None,
+                 reap_chunk: int = 1000,
+                 retention_days: Optional[int] = None):
+        self.cache_ttl = cache_ttl if cache_ttl is not None else float(os.getenv('SESSION_CACHE_TTL', '30'))
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval if flush_interval is not None else float(os.getenv('SESSION_TOUCH_FLUSH_INTERVAL', '15'))
+        self.flush_batch = flush_batch
+        self.reap_interval = reap_interval if reap_interval is not None else float(os.getenv('SESSION_REAP_INTERVAL', '300'))
+        self.reap_chunk = reap_chunk
+        self.retention_days = retention_days if retention_days is not None else int(os.getenv('SESSION_RETENTION_DAYS', '7'))
+
+        self._cache: Dict[str, tuple] = {}
+        self._user_sessions: Dict[int, Set[str]] = {}
+        self._pending: Dict[str, datetime] = {}
+        self._last_flush = time.time()
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+
+        self._db_pool = None
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # --- 검증 결과 캐시 ---
+    def get(self, session_id: str) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        with self._lock:
+            entry = self._cache.get(session_id)
+            if entry is None:
+                return None
+            data, cached_until = entry
+            if now >= cached_until:
+                self._drop(session_id)
+                return None
+            # 호출자가 결과를 수정해도 캐시 항목은 바뀌지 않도록 복사본 반환
+            return dict(data)
+
+    def put(self, session_id: str, data: Dict[str, Any]) -> None:
+        cached_until = time.time() + self.cache_ttl
+        expires_at = _to_epoch(data.get('expires_at'))
+        if expires_at is not None:
+            cached_until = min(cached_until, expires_at)
+        user_id = data.get('user_id')
+        with self._lock:
+            if len(self._cache) >= self.max_entries:
+                self._evict_expired()
+                if len(self._cache) >= self.max_entries:
+                    self._drop(next(iter(self._cache)))
+            self._cache[session_id] = (dict(data), cached_until)
+            if user_id is not None:
+                self._user_sessions.setdefault(int(user_id), set()).add(session_id)
+
+    def invalidate(self, session_id: str) -> None:
+        """로그아웃/세션 종료 시 호출"""
+        with self._lock:
+            self._drop(session_id)
+            self._pending.pop(session_id, None)
+
+    def invalidate_user(self, user_id: int) -> None:
+        """사용자의 모든 세션이 비활성화될 때 호출 (재로그인 등)"""
+        with self._lock:
+            for session_id in list(self._user_sessions.get(int(user_id), ())):
+                self._drop(session_id)
+                self._pending.pop(session_id, None)
+
+    def _drop(self, session_id: str) -> None:
+        entry = self._cache.pop(session_id, None)
+        if entry is None:
+            return
+        user_id = entry[0].get('user_id')
+        if user_id is not None:
+            sessions = self._user_sessions.get(int(user_id))
+            if sessions is not None:
+                sessions.discard(session_id)
+                if not sessions:
+                    del self._user_sessions[int(user_id)]
+
+    def _evict_expired(self) -> None:
+        now = time.time()
+        for session_id in [k for k, (_, until) in self._cache.items() if until <= now]:
+            self._drop(session_id)
+
+    def lookup(self, conn, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        캐시 우선 세션 조회. 유효하면 last_accessed 갱신을 예약한다.
+
+        Args:
+            conn: 캐시 미스 시 사용할 DB 연결
+            session_id: 세션 ID
+
+        Returns:
+            세션 정보 딕셔너리 또는 None
+        """
+        data = self.get(session_id)
+        if data is None:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                cur.execute(SESSION_LOOKUP_SQL, (session_id,))
+                row = cur.fetchone()
+            if not row:
+                return None
+            data = dict(row)
+            self.put(session_id, data)
+        self.touch(session_id, conn)
+        return data
+
+    # --- last_accessed 갱신 모으기 ---
+    def touch(self, session_id: str, conn=None) -> None:
+        """
+        last_accessed 갱신 예약. 백그라운드 스레드가 없으면 주기/배치 크기에 도달했을 때
+        전달받은 연결로 바로 반영한다.
+        """
+        with self._lock:
+            self._pending[session_id] = datetime.now(timezone.utc)
+            due = (len(self._pending) >= self.flush_batch or
+                   time.time() - self._last_flush >= self.flush_interval)
+        if conn is not None and due and not self.is_running():
+            self.flush(conn)
+
+    def flush(self, conn) -> int:
+        """모아둔 last_accessed 갱신을 한 번의 UPDATE 로 반영"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                self._last_flush = time.time()
+            if not pending:
+                return 0
+            try:
+                with conn.cursor() as cur:
+                    execute_values(cur, """
+                        UPDATE sessions s
+                        SET last_accessed = v.accessed_at
+                        FROM (VALUES %s) AS v(session_id, accessed_at)
+                        WHERE s.session_id = v.session_id
+                        AND (s.last_accessed IS NULL OR s.last_accessed < v.accessed_at)
+                    """, list(pending.items()), template="(%s, %s::timestamptz)",
+                        page_size=self.flush_batch)
+                conn.commit()
+                return len(pending)
+            except Exception as e:
+                conn.rollback()
+                # 실패한 갱신은 다음 주기에 다시 시도 (그 사이 새로 들어온 값 우선)
+                with self._lock:
+                    for session_id, accessed_at in pending.items():
+                        self._pending.setdefault(session_id, accessed_at)
+                logger.error(f"Session touch flush failed: {str(e)}")
+                return 0
+
+    # --- 만료 세션 정리 ---
+    def expire_sessions(self, conn) -> int:
+        """만료된 활성 세션을 청크 단위로 비활성화"""
+        total = 0
+        while True:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE sessions
+                    SET is_active = false,
+                        ended_at = NOW()
+                    WHERE id IN (
+                        SELECT id FROM sessions
+                        WHERE is_active = true
+                        AND expires_at < NOW()
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                """, (self.reap_chunk,))
+                count = cur.rowcount
+            conn.commit()
+            total += count
+            if count < self.reap_chunk:
+                return total
+
+    def purge_sessions(self, conn) -> int:
+        """보관 기간이 지난 비활성/만료 세션을 청크 단위로 삭제"""
+        total = 0
+        while True:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    DELETE FROM sessions
+                    WHERE id IN (
+                        SELECT id FROM sessions
+                        WHERE (is_active = false OR expires_at < NOW())
+                        AND COALESCE(ended_at, expires_at) < NOW() - make_interval(days => %s)
+                        LIMIT %s
+                        FOR UPDATE SKIP LOCKED
+                    )
+                """, (self.retention_days, self.reap_chunk))
+                count = cur.rowcount
+            conn.commit()
+            total += count
+            if count < self.reap_chunk:
+                return total
+
+    def reap(self, conn) -> Dict[str, int]:
+        try:
+            expired = self.expire_sessions(conn)
+            purged = self.purge_sessions(conn)
+            if expired or purged:
+                logger.info(f"Session reaper: expired={expired}, purged={purged}")
+            return {'expired': expired, 'purged': purged}
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Session reaper failed: {str(e)}")
+            return {'expired': 0, 'purged': 0}
+
+    # --- 백그라운드 스레드 ---
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, db_pool) -> None:
+        """
+        last_accessed 반영 및 reaper 백그라운드 스레드 시작
+
+        Args:
+            db_pool: get_connection() 컨텍스트 매니저를 제공하는 연결 풀 (DatabasePool)
+        """
+        if self.is_running():
+            return
+        self._db_pool = db_pool
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="session-reaper", daemon=True)
+        self._thread.start()
+        logger.info("Session activity tracker started")
+
+    def stop(self) -> None:
+        """스레드 종료 및 남은 갱신 반영"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if self._db_pool is not None and self._pending:
+            try:
+                with self._db_pool.get_connection() as conn:
+                    self.flush(conn)
+            except Exception as e:
+                logger.error(f"Final session flush failed: {str(e)}")
+
+    def _run(self) -> None:
+        next_reap = time.time()
+        while not self._stop.wait(self.flush_interval):
+            try:
+                with self._db_pool.get_connection() as conn:
+                    if self._pending:
+                        self.flush(conn)
+                    if time.time() >= next_reap:
+                        self.reap(conn)
+                        next_reap = time.time() + self.reap_interval
+            except Exception as e:
+                logger.error(f"Session tracker loop error: {str(e)}")
+
+
+_tracker: Optional[SessionActivityTracker] = None
+_tracker_lock = threading.Lock()
+
+
+def get_session_tracker() -> SessionActivityTracker:
+    """프로세스 전역 세션 활동 추적기"""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = SessionActivityTracker()
+        return _tracker
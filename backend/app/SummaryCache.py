@@ -0,0 +1,221 @@
+from typing import List, Any, Optional, Callable, Iterable
+from datetime import datetime
+import threading
+import hashlib
+import logging
+import sqlite3
+import json
+import os
+
+from psycopg2.extras import Json
+from backend.app.MetricsRegistry import get_metrics_registry
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+SUMMARY_CACHE_REQUESTS = get_metrics_registry().counter(
+    "rag_summary_cache_requests_total", "Summary cache lookups", ["backend", "result"])
+
+
+# 요약 파이프라인(프롬프트, 분할, map-reduce 설정)이 바뀌면 올려서 기존 캐시를 무효화
+SUMMARY_PROMPT_VERSION = "1"
+
+
+def build_prompt_version(template: str) -> str:
+    """프롬프트 버전 문자열 생성 (파이프라인 버전 + 템플릿 해시)"""
+    digest = hashlib.sha256(template.encode('utf-8')).hexdigest()[:12]
+    return f"{SUMMARY_PROMPT_VERSION}-{digest}"
+
+
+def compute_content_hash(texts: Iterable[str]) -> str:
+    """문서 내용 해시 (조회 순서와 무관하도록 정렬 후 계산)"""
+    hasher = hashlib.sha256()
+    for text in sorted(texts):
+        hasher.update(text.encode('utf-8', errors='ignore'))
+        hasher.update(b'\x1e')
+    return hasher.hexdigest()
+
+
+def build_cache_key(collection, sources: List[str], page_range: str, model: str,
+                    prompt_version: str, content_hash: str) -> str:
+    """(컬렉션, 소스, 페이지 범위, 모델, 프롬프트 버전, 내용 해시) 캐시 키"""
+    parts = [str(collection), "\x1f".join(sorted(str(s) for s in sources)),
+             str(page_range), model, prompt_version, content_hash]
+    return hashlib.sha256("\x1e".join(parts).encode('utf-8')).hexdigest()
+
+
+class PostgresSummaryCache:
+    """summary_cache 테이블 기반 요약 캐시 (테이블은 PostgresDbManager에서 생성)"""
+
+    def __init__(self, get_connection: Callable):
+        self.get_connection = get_connection
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    UPDATE summary_cache
+                    SET hit_count = hit_count + 1, last_hit_at = CURRENT_TIMESTAMP
+                    WHERE cache_key = %s
+                    RETURNING summary
+                """, (cache_key,))
+                row = cur.fetchone()
+            conn.commit()
+            SUMMARY_CACHE_REQUESTS.inc(backend="postgres", result="hit" if row else "miss")
+            return row[0] if row else None
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"요약 캐시 조회 오류: {str(e)}")
+            return None
+
+    def put(self, cache_key: str, collection_id, sources: List[str], page_range: str,
+            model: str, prompt_version: str, content_hash: str, summary: Any) -> bool:
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cur:
+                cur.execute("""
+                    INSERT INTO summary_cache (
+                        cache_key, collection_id, sources, page_range,
+                        model, prompt_version, content_hash, summary
+                    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                    ON CONFLICT (cache_key) DO UPDATE
+                    SET summary = EXCLUDED.summary, created_at = CURRENT_TIMESTAMP
+                """, (cache_key, collection_id, [str(s) for s in sources], str(page_range),
+                      model, prompt_version, content_hash, Json(summary)))
+            conn.commit()
+            return True
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"요약 캐시 저장 오류: {str(e)}")
+            return False
+
+    def invalidate(self, collection_id, sources: Optional[List[str]] = None) -> int:
+        """컬렉션(또는 특정 소스가 포함된) 캐시 항목 삭제"""
+        conn = self.get_connection()
+        try:
+            with conn.cursor() as cur:
+                if sources:
+                    cur.execute("""
+                        DELETE FROM summary_cache
+                        WHERE collection_id = %s AND sources && %s
+                    """, (collection_id, [str(s) for s in sources]))
+                else:
+                    cur.execute("DELETE FROM summary_cache WHERE collection_id = %s", (collection_id,))
+                deleted = cur.rowcount
+            conn.commit()
+            if deleted:
+                logger.debug(f"요약 캐시 {deleted}건 무효화: {collection_id} {sources}")
+            return deleted
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"요약 캐시 무효화 오류: {str(e)}")
+            return 0
+
+
+class SqliteSummaryCache:
+    """로컬 SQLite 파일 기반 요약 캐시 (ChromaDB persist_directory 옆에 저장)"""
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        with self._lock:
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS summary_cache (
+                    cache_key TEXT PRIMARY KEY,
+                    collection TEXT NOT NULL,
+                    page_range TEXT NOT NULL,
+                    model TEXT NOT NULL,
+                    prompt_version TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    summary TEXT NOT NULL,
+                    hit_count INTEGER DEFAULT 0,
+                    created_at TEXT,
+                    last_hit_at TEXT
+                )
+            """)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS summary_cache_sources (
+                    cache_key TEXT NOT NULL,
+                    collection TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    PRIMARY KEY (cache_key, source)
+                )
+            """)
+            self._conn.execute("""
+                CREATE INDEX IF NOT EXISTS idx_summary_cache_sources
+                ON summary_cache_sources(collection, source)
+            """)
+            self._conn.commit()
+
+    def get(self, cache_key: str) -> Optional[Any]:
+        try:
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT summary FROM summary_cache WHERE cache_key = ?", (cache_key,)
+                ).fetchone()
+                if row:
+                    self._conn.execute("""
+                        UPDATE summary_cache SET hit_count = hit_count + 1, last_hit_at = ?
+                        WHERE cache_key = ?
+                    """, (datetime.now().isoformat(), cache_key))
+                    self._conn.commit()
+            SUMMARY_CACHE_REQUESTS.inc(backend="sqlite", result="hit" if row else "miss")
+            return json.loads(row[0]) if row else None
+        except Exception as e:
+            logger.error(f"요약 캐시 조회 오류: {str(e)}")
+            return None
+
+    def put(self, cache_key: str, collection, sources: List[str], page_range: str,
+            model: str, prompt_version: str, content_hash: str, summary: Any) -> bool:
+        try:
+            with self._lock:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO summary_cache (
+                        cache_key, collection, page_range, model,
+                        prompt_version, content_hash, summary, created_at
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                """, (cache_key, str(collection), str(page_range), model, prompt_version,
+                      content_hash, json.dumps(summary, ensure_ascii=False),
+                      datetime.now().isoformat()))
+                self._conn.executemany("""
+                    INSERT OR IGNORE INTO summary_cache_sources (cache_key, collection, source)
+                    VALUES (?, ?, ?)
+                """, [(cache_key, str(collection), str(s)) for s in sources])
+                self._conn.commit()
+            return True
+        except Exception as e:
+            logger.error(f"요약 캐시 저장 오류: {str(e)}")
+            return False
+
+    def invalidate(self, collection, sources: Optional[List[str]] = None) -> int:
+        """컬렉션(또는 특정 소스가 포함된) 캐시 항목 삭제"""
+        try:
+            with self._lock:
+                if sources:
+                    placeholders = ",".join("?" * len(sources))
+                    keys = [row[0] for row in self._conn.execute(f"""
+                        SELECT DISTINCT cache_key FROM summary_cache_sources
+                        WHERE collection = ? AND source IN ({placeholders})
+                    """, [str(collection)] + [str(s) for s in sources])]
+                else:
+                    keys = [row[0] for row in self._conn.execute(
+                        "SELECT cache_key FROM summary_cache WHERE collection = ?", (str(collection),)
+                    )]
+                for key in keys:
+                    self._conn.execute("DELETE FROM summary_cache WHERE cache_key = ?", (key,))
+                    self._conn.execute("DELETE FROM summary_cache_sources WHERE cache_key = ?", (key,))
+                self._conn.commit()
+            if keys:
+                logger.debug(f"요약 캐시 {len(keys)}건 무효화: {collection} {sources}")
+            return len(keys)
+        except Exception as e:
+            logger.error(f"요약 캐시 무효화 오류: {str(e)}")
+            return 0
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,392 @@
+from typing import List, Dict, Any, Optional, Iterable, Iterator
+from datetime import datetime, date
+import logging
+import codecs
+import json
+import csv
+import os
+
+import numpy as np
+import pandas as pd
+from langchain.docstore.document import Document
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+DATE_FORMAT = "%Y-%m-%d"
+# 한 Document 에 담을 최대 문자 수 (행 단위로 자르므로 한 행이 더 길면 그 행만 단독 Document)
+TABULAR_CHUNK_CHARS = int(os.getenv("TABULAR_CHUNK_CHARS", os.getenv("CHUNK_SIZE", "1000")))
+# 헤더 중요도/키 컬럼 분석에 사용할 표본 행 수
+HEADER_SAMPLE_ROWS = int(os.getenv("TABULAR_HEADER_SAMPLE_ROWS", "2000"))
+# CSV 스트리밍 읽기 단위 (행)
+CSV_CHUNK_ROWS = int(os.getenv("CSV_CHUNK_ROWS", "50000"))
+# 인코딩/구분자 판별에 사용할 앞부분 바이트 수
+CSV_SAMPLE_BYTES = int(os.getenv("CSV_SAMPLE_BYTES", str(1 << 20)))
+
+
+def _format_numbers(values: np.ndarray) -> np.ndarray:
+    """실수 배열 -> 문자열 배열 (정수는 소수점 없이, 나머지는 소수 둘째 자리, NaN/inf 는 빈 문자열)"""
+    out = np.full(values.shape, "", dtype=object)
+    finite = np.isfinite(values)
+    is_int = finite & (values == np.floor(values))
+    # int64 범위 안의 정수만 일괄 변환 (2^63 이상은 astype 에서 넘쳐 잘못된 값이 됨)
+    small_int = is_int & (np.abs(values) < 2.0 ** 63)
+    if small_int.any():
+        out[small_int] = np.char.mod("%d", values[small_int].astype(np.int64)).astype(object)
+    big_int = is_int & ~small_int
+    if big_int.any():
+        out[big_int] = [str(int(v)) for v in values[big_int]]
+    is_dec = finite & ~is_int
+    if is_dec.any():
+        out[is_dec] = np.char.mod("%.2f", values[is_dec]).astype(object)
+    return out
+
+
+def clean_series(series: pd.Series, date_format: str = DATE_FORMAT) -> pd.Series:
+    """
+    ExtractTextFromFile.clean_value 와 같은 규칙을 컬럼 단위로 적용
+
+    - 결측값: ""
+    - 날짜/시간: date_format
+    - 숫자: 정수는 소수점 없이, 소수는 둘째 자리까지
+    - 문자열: 앞뒤 공백 제거
+    """
+    index = series.index
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series.dt.strftime(date_format).fillna("")
+    if pd.api.types.is_bool_dtype(series):
+        # clean_value 는 bool 을 int 로 취급했으므로 True/False 대신 1/0
+        return series.map({True: "1", False: "0"}).astype(object).fillna("")
+    if pd.api.types.is_numeric_dtype(series):
+        return pd.Series(_format_numbers(series.to_numpy(dtype=float, na_value=np.nan)), index=index)
+
+    # object 컬럼: 값 타입별로 나눠 각각 일괄 변환
+    values = series.to_numpy(dtype=object)
+    out = np.full(len(values), "", dtype=object)
+    notna = series.notna().to_numpy()
+
+    is_str = notna & series.map(lambda v: isinstance(v, str)).to_numpy(dtype=bool)
+    if is_str.any():
+        out[is_str] = pd.Series(values[is_str]).str.strip().to_numpy(dtype=object)
+
+    is_date = notna & series.map(lambda v: isinstance(v, (datetime, date, np.datetime64))).to_numpy(dtype=bool)
+    if is_date.any():
+        out[is_date] = pd.to_datetime(pd.Series(values[is_date]), errors="coerce").dt.strftime(date_format).fillna("").to_numpy(dtype=object)
+
+    is_bool = notna & series.map(lambda v: isinstance(v, (bool, np.bool_))).to_numpy(dtype=bool)
+    if is_bool.any():
+        out[is_bool] = ["1" if v else "0" for v in values[is_bool]]
+
+    rest = notna & ~is_str & ~is_date & ~is_bool
+    if rest.any():
+        numeric = pd.to_numeric(pd.Series(values[rest]), errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        formatted = _format_numbers(numeric)
+        # 숫자로 바꿀 수 없는 값은 문자열로
+        not_numeric = ~np.isfinite(numeric)
+        if not_numeric.any():
+            formatted[not_numeric] = [str(v).strip() for v in values[rest][not_numeric]]
+        out[rest] = formatted
+    return pd.Series(out, index=index)
+
+
+def clean_frame(df: pd.DataFrame, date_format: str = DATE_FORMAT) -> pd.DataFrame:
+    """모든 컬럼을 clean_series 로 변환한 문자열 DataFrame"""
+    return pd.DataFrame({col: clean_series(df[col], date_format) for col in df.columns}, index=df.index)
+
+
+def _value_patterns(values: pd.Series) -> pd.Series:
+    """값 형식 분류 (numeric / decimal / alphanumeric / text / mixed / empty)"""
+    s = values.astype(str).str.strip()
+    pattern = pd.Series("mixed", index=s.index)
+    has_digit = s.str.contains(r"\d", regex=True)
+    has_alpha = s.str.contains(r"[^\W\d_]", regex=True)
+    pattern[s.str.fullmatch(r"[^\W\d_\s]+(?:\s+[^\W\d_\s]+)*")] = "text"
+    pattern[has_digit & has_alpha] = "alphanumeric"
+    pattern[s.str.fullmatch(r"\d*\.\d+|\d+\.\d*")] = "decimal"
+    pattern[s.str.fullmatch(r"\d+")] = "numeric"
+    pattern[s == ""] = "empty"
+    return pattern
+
+
+def analyze_header_importance(df: pd.DataFrame, sample_rows: int = HEADER_SAMPLE_ROWS) -> Dict[str, float]:
+    """
+    컬럼별 중요도 (0~1 정규화). ExtractTextFromFile.analyze_header_importance 와 같은 기준을
+    표본 행에 대해 컬럼 단위 연산으로 계산한다.
+    """
+    if df.empty:
+        return {}
+    sample = df.head(sample_rows) if len(df) > sample_rows else df
+    n = len(sample)
+
+    # 1. 고유성 / 2. 완전성
+    counts = sample.notna().sum()
+    unique_ratio = (sample.nunique(dropna=True) / counts.where(counts > 0)).fillna(0.0)
+    uniqueness = unique_ratio * np.where((unique_ratio >= 0.3) & (unique_ratio <= 0.9), 2, 1)
+    completion = counts / n
+
+    as_text = sample.astype(str)
+    scores = {}
+    for column in sample.columns:
+        col_data = sample[column].dropna()
+        score = float(uniqueness[column] + completion[column])
+
+        # 3. 길이/형식 일관성 (상위 10개 값)
+        head = col_data.head(10)
+        if not head.empty:
+            lengths = head.astype(str).str.len().to_numpy()
+            consistency = 1 / (1 + (np.var(lengths) if len(lengths) > 1 else 0))
+            patterns = _value_patterns(head)
+            consistency += 1 - patterns.nunique() / len(patterns)
+            score += consistency
+
+        # 4. 참조 빈도 (상위 5개 값이 다른 컬럼에 나타나는 비율)
+        if not col_data.empty:
+            refs = col_data.head(5).astype(str).tolist()
+            reference = 0.0
+            for other in sample.columns:
+                if other == column:
+                    continue
+                other_text = as_text[other]
+                reference += sum(int(other_text.str.contains(v, regex=False).sum()) for v in refs)
+            score += min(reference / (len(refs) * n), 1.0)
+        scores[column] = score
+
+    max_score = max(scores.values()) if scores else 0
+    if max_score > 0:
+        return {col: s / max_score for col, s in scores.items()}
+    return {col: 1.0 / len(scores) for col in scores}
+
+
+def select_key_columns(importance_scores: Dict[str, float]) -> List[str]:
+    """중요도 상위 30% (컬럼이 3개 이하면 0.5 이상) 를 키 컬럼으로 선택"""
+    if not importance_scores:
+        return []
+    scores = sorted(importance_scores.values(), reverse=True)
+    if len(scores) <= 3:
+        threshold = 0.5
+    else:
+        threshold = scores[max(1, int(len(scores) * 0.3)) - 1]
+    key_columns = [col for col, score in importance_scores.items() if score >= threshold]
+    if not key_columns:
+        key_columns = [max(importance_scores.items(), key=lambda x: x[1])[0]]
+    return key_columns
+
+
+def rows_to_text(cleaned: pd.DataFrame, key_columns: List[str]) -> pd.Series:
+    """
+    행별 문장 생성 (기존 _convert_df_to_text 와 같은 형식)
+        "키1 값, 키2 값. 컬럼 값. 컬럼 값,"
+    """
+    def labeled(col):
+        return str(col) + " " + cleaned[col]
+
+    others = [c for c in cleaned.columns if c not in key_columns]
+    parts = []
+    if key_columns:
+        key_part = labeled(key_columns[0])
+        if len(key_columns) > 1:
+            key_part = key_part.str.cat([labeled(c) for c in key_columns[1:]], sep=", ")
+        parts.append(key_part)
+    parts.extend(labeled(c) for c in others)
+    if not parts:
+        return pd.Series("", index=cleaned.index)
+    text = parts[0]
+    if len(parts) > 1:
+        text = text.str.cat(parts[1:], sep=". ")
+    return text + ","
+
+
+def batch_rows(row_texts: pd.Series, row_numbers: np.ndarray, metadata: Dict[str, Any],
+               max_chars: int = TABULAR_CHUNK_CHARS) -> List[Document]:
+    """
+    연속된 행을 max_chars 이하 Document 로 묶음 (row_start/row_end 메타데이터 포함)
+    """
+    if row_texts.empty:
+        return []
+    texts = row_texts.tolist()
+    lengths = np.fromiter((len(t) + 1 for t in texts), dtype=np.int64, count=len(texts))
+    cumulative = np.cumsum(lengths)
+    documents = []
+    start = 0
+    total = len(texts)
+    while start < total:
+        base = cumulative[start - 1] if start else 0
+        end = int(np.searchsorted(cumulative, base + max_chars, side="right"))
+        end = max(end, start + 1)
+        documents.append(Document(
+            page_content=" ".join(texts[start:end]),
+            metadata={**metadata,
+                      "row_start": int(row_numbers[start]),
+                      "row_end": int(row_numbers[end - 1])}
+        ))
+        start = end
+    return documents
+
+
+class TabularTextConverter:
+    """
+    DataFrame -> 검색용 텍스트 Document 변환 (컬럼 단위 연산)
+
+    key_columns 를 지정하지 않으면 첫 프레임의 표본으로 한 번만 감지해
+    이후 프레임(CSV 스트리밍)에도 같은 키 컬럼을 사용한다.
+    """
+
+    def __init__(self, max_chars: int = TABULAR_CHUNK_CHARS, date_format: str = DATE_FORMAT,
+                 key_columns: Optional[List[str]] = None):
+        self.max_chars = max_chars
+        self.date_format = date_format
+        self.key_columns = key_columns
+
+    def detect_key_columns(self, df: pd.DataFrame) -> List[str]:
+        try:
+            key_columns = select_key_columns(analyze_header_importance(df))
+        except Exception as e:
+            logger.error(f"Error detecting key columns: {str(e)}")
+            key_columns = []
+        if not key_columns and len(df.columns) > 0:
+            key_columns = [df.columns[0]]
+        logger.info(f"Detected {len(key_columns)} key columns: {key_columns}")
+        return key_columns
+
+    def convert(self, df: pd.DataFrame, metadata: Dict[str, Any], first_row: int = 1) -> List[Document]:
+        """
+        한 프레임 변환
+
+        Args:
+            df: 원본 DataFrame
+            metadata: 모든 Document 에 넣을 메타데이터 (source, page 등)
+            first_row: df 첫 행의 행 번호 (스트리밍 시 누적 행 번호)
+        """
+        if df.empty:
+            return []
+        if self.key_columns is None:
+            self.key_columns = self.detect_key_columns(df)
+        key_columns = [c for c in self.key_columns if c in df.columns]
+        cleaned = clean_frame(df, self.date_format)
+        row_texts = rows_to_text(cleaned, key_columns)
+        row_numbers = np.arange(first_row, first_row + len(df))
+        return batch_rows(row_texts, row_numbers, metadata, self.max_chars)
+
+    def convert_frames(self, frames: Iterable[pd.DataFrame], metadata: Dict[str, Any]) -> Iterator[Document]:
+        """여러 프레임(CSV 청크)을 순서대로 변환하며 Document 를 바로 내보냄"""
+        next_row = 1
+        for df in frames:
+            yield from self.convert(df, metadata, first_row=next_row)
+            next_row += len(df)
+
+    def to_markdown(self, df: pd.DataFrame, first_row: int = 1) -> str:
+        """레코드별 Markdown (기존 create_markdown_format 형식)"""
+        cleaned = clean_frame(df, self.date_format)
+        records = []
+        for offset, row in enumerate(cleaned.itertuples(index=False, name=None)):
+            lines = [f"### Record {first_row + offset}\n"]
+            for col, value in zip(cleaned.columns, row):
+                lines.append(f"- **{col}**: {value}")
+                if value:
+                    lines.append(f"- ##{str(col).lower().replace(' ', '_')}_{value.lower().replace(' ', '_')}")
+            lines.append("\n---\n")
+            records.append("\n".join(lines))
+        return "\n".join(records)
+
+    def to_json(self, df: pd.DataFrame, first_row: int = 1) -> str:
+        """레코드별 JSON (기존 create_json_format 형식)"""
+        cleaned = clean_frame(df, self.date_format)
+        columns = [str(c) for c in cleaned.columns]
+        tag_names = [c.lower().replace(' ', '_') for c in columns]
+        raw_tags = df.astype(str).apply(lambda s: s.str.lower().str.replace(' ', '_', regex=False))
+        notna = df.notna().to_numpy()
+        records = []
+        for offset, (values, tags, present) in enumerate(zip(cleaned.itertuples(index=False, name=None),
+                                                             raw_tags.itertuples(index=False, name=None),
+                                                             notna)):
+            records.append({
+                "record_id": first_row + offset,
+                "fields": dict(zip(columns, values)),
+                "search_tags": [f"{name}_{tag}" for name, tag, ok in zip(tag_names, tags, present) if ok and tag]
+            })
+        return json.dumps({"records": records}, ensure_ascii=False, indent=2, default=str)
+
+
+def _read_sample(source, size: int) -> bytes:
+    """경로 또는 파일 객체에서 앞부분 size 바이트 읽기 (파일 객체는 원래 위치로 되돌림)"""
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            return f.read(size)
+    position = source.tell()
+    data = source.read(size)
+    source.seek(position)
+    return data.encode("utf-8") if isinstance(data, str) else data
+
+
+def detect_csv_encoding(sample: bytes) -> str:
+    """
+    앞부분 표본으로 인코딩 판별 (UTF-8 BOM -> UTF-8 -> CP949 순)
+
+    표본 끝에서 잘린 멀티바이트 문자는 무시하도록 증분 디코더로 검사한다.
+    """
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    for encoding in ("utf-8", "cp949"):
+        try:
+            codecs.getincrementaldecoder(encoding)().decode(sample, final=False)
+            return encoding
+        except UnicodeDecodeError:
+            continue
+    return "cp949"
+
+
+def detect_csv_delimiter(sample_text: str, file_name: Optional[str] = None) -> str:
+    """확장자(.tsv) 또는 표본 첫 줄들로 구분자 판별 (기본 ',')"""
+    if file_name and file_name.lower().endswith(".tsv"):
+        return "\t"
+    lines = sample_text.splitlines()[:20]
+    try:
+        return csv.Sniffer().sniff("\n".join(lines), delimiters=",\t;|").delimiter
+    except csv.Error:
+        return ","
+
+
+def csv_read_options(source, file_name: Optional[str] = None) -> Dict[str, Any]:
+    """pd.read_csv 에 전달할 encoding / sep 옵션 (표본 CSV_SAMPLE_BYTES 만 읽어 판별)"""
+    sample = _read_sample(source, CSV_SAMPLE_BYTES)
+    encoding = detect_csv_encoding(sample)
+    text = codecs.getincrementaldecoder(encoding)(errors="replace").decode(sample, final=False)
+    if file_name is None and isinstance(source, (str, os.PathLike)):
+        file_name = os.fspath(source)
+    return {
+        "encoding": encoding,
+        "sep": detect_csv_delimiter(text, file_name),
+        # 표본 이후에 잘못된 바이트가 있어도 전체 적재가 실패하지 않도록
+        "encoding_errors": "replace",
+    }
+
+
+def read_csv_sample(source, nrows: int = HEADER_SAMPLE_ROWS, **read_kwargs) -> pd.DataFrame:
+    """키 컬럼 감지용 앞부분 nrows 행 (파일 객체는 원래 위치로 되돌림)"""
+    position = None if isinstance(source, (str, os.PathLike)) else source.tell()
+    try:
+        return pd.read_csv(source, nrows=nrows, **read_kwargs)
+    finally:
+        if position is not None:
+            source.seek(position)
+
+
+def iter_csv_frames(path, chunksize: int = CSV_CHUNK_ROWS, **read_kwargs) -> Iterator[pd.DataFrame]:
+    """CSV 를 chunksize 행씩 읽는 스트리밍 리더 (파일 전체를 메모리에 올리지 않음)"""
+    with pd.read_csv(path, chunksize=chunksize, **read_kwargs) as reader:
+        for frame in reader:
+            yield frame
+
+
+def iter_batches(items: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """이터러블을 size 개씩 묶어 순서대로 내보냄 (스트리밍 적재용)"""
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+텍스트 정규화 골든 검증 / 마이크로 벤치마크
+
+TextNormalizer 의 각 함수를 이전 구현(정규식을 매번 컴파일하며 단계별로 적용하던 코드)과 비교한다.
+- 골든 검증: 내장 샘플 + 고정 시드 무작위 문자열 + 지정한 텍스트 파일에서 두 구현의 출력이 모두 같아야 한다.
+  하나라도 다르면 불일치 예시를 출력하고 종료 코드 1 로 끝난다.
+- 벤치마크: 같은 입력에 대해 함수별 이전/신규 소요 시간과 속도 향상 배수를 JSON 으로 출력한다.
+
+사용 예:
+    python -m backend.app.TextNormalizationBenchmark
+    python -m backend.app.TextNormalizationBenchmark --fuzz 20000 --repeat 5 --output norm_bench.json docs/*.txt
+"""
+from typing import List, Dict, Any, Callable, Tuple
+import argparse
+import logging
+import random
+import json
+import sys
+import time
+import re
+
+from backend.app.TextNormalizer import (
+    clean_layout_text, clean_extracted_text, clean_web_text, collapse_whitespace, normalize_for_storage
+)
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+# ---- 이전 구현 (비교 기준, 동작을 바꾸지 말 것) ----
+
+def legacy_clean_text2(text):
+    text = re.sub(r'\n{2,}', '\n\n', text)
+    text = re.sub(r' +', ' ', text)
+    text = re.sub(r'-\n', '', text)
+    return text.strip()
+
+
+def legacy_clean_text(text):
+    if not text:
+        return ""
+    text = str(text).strip()
+    text = re.sub(r'\.{2,}', '.', text)
+    text = re.sub(r'\|{2,}', '|', text)
+    text = re.sub(r'○', ' ', text)
+    text = re.sub(r'[|.]{2,}', ' ', text)
+    text = re.sub(r'[^\S\n]+', ' ', text)
+    text = re.sub(r'(\d)\s*:\s*(\d)', r'\1:\2', text)
+    text = re.sub(r'(\d)\s*~\s*(\d)', r'\1~\2', text)
+    text = re.sub(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]', '', text)
+    text = re.sub(r'(\w)\s*\|\s*(\w)', r'\1 \2', text)
+    text = re.sub(r'^\|\s*', '', text)
+    text = re.sub(r'\s*\|$', '', text)
+    text = re.sub(r'(\w)\s*-\s*(\w)', r'\1 \2', text)
+    text = re.sub(r'^\-\s*', '', text)
+    text = re.sub(r'\s*\-$', '', text)
+    text = re.sub(r'(\w)[□○●◦]\s*(\w)', r'\1 \2', text)
+    text = re.sub(r'^[□○●◦]\s*', '', text)
+    text = re.sub(r'\s*[□○●◦]$', '', text)
+    text = re.sub(r'[^\S\n]+', ' ', text)
+    text = re.sub(r'-{2,}', ' ', text)
+    return text.strip()
+
+
+def legacy_webcrawl_clean_text(text):
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def legacy_webpagecrawl_clean_text(text):
+    text = re.sub(r'https?://\S+', '', text)
+    text = re.sub(r'출처\s*:\s*.*$', '', text, flags=re.MULTILINE)
+    text = re.sub(r'\([^)]*?(링크|http|www|\.com|\.kr)[^)]*?\)', '', text)
+    text = re.sub(r'\s+', ' ', text)
+    return text.strip()
+
+
+def legacy_store_normalize(content):
+    content = content.replace('\xa0', ' ')
+    content = ' '.join(content.split())
+    return content.encode('utf-8', errors='ignore').decode('utf-8')
+
+
+PAIRS: List[Tuple[str, Callable[[str], str], Callable[[str], str]]] = [
+    ('clean_layout_text', legacy_clean_text2, clean_layout_text),
+    ('clean_extracted_text', legacy_clean_text, clean_extracted_text),
+    ('collapse_whitespace', legacy_webcrawl_clean_text, collapse_whitespace),
+    ('clean_web_text', legacy_webpagecrawl_clean_text, clean_web_text),
+    ('normalize_for_storage', legacy_store_normalize, normalize_for_storage),
+]
+
+GOLDEN_SAMPLES = [
+    "",
+    "   ",
+    "제1장 총칙\n\n\n\n제1조(목적) 이 규정은 ...... 정한다.",
+    "| 구분 || 내용 |\n|---|---|\n| 회의 | 10 : 30 ~ 12 : 00 |",
+    "○ 추진 배경\n  □ 예산  -  집행 현황 ●세부 ◦항목 -",
+    "- 항목 하나\n-- 구분선 --\n문장 끝 -",
+    "기간: 2024. 1. 1 ~ 2024. 12. 31\t(담당:홍길동)",
+    "하이픈으로 이어진 단-\n어와 NBSP\xa0공백",
+    "자세한 내용은 https://example.com/a?b=1 참고 (링크: www.example.kr)\n출처: 연합뉴스\n다음 줄.",
+    "제어\x00문자\x07와 \x0b수직탭\x1c구분\x7f",
+    "...|..|.|||. ○○ □□",
+    "|시작과 끝|",
+    "Lorem ipsum dolor sit amet, consectetur adipiscing elit.  Sed do eiusmod tempor.\n\n\nUt enim ad minim.",
+]
+
+FUZZ_ALPHABET = [
+    'a', 'Z', '1', '9', '가', '힣', ' ', '  ', '\n', '\n\n', '\t', '\r', '\xa0', '　',
+    '.', '..', '|', '||', '-', '--', ':', '~', '(', ')', '/', '_',
+    '○', '□', '●', '◦', '\x00', '\x07', '\x0b', '\x0c', '\x1c', '\x1f', '\x7f',
+    'http://', 'https://x.kr', 'www', '.com', '링크', '출처', '출처 : ', '\ud800',
+]
+
+
+PROSE_WORDS = [
+    '정부는', '올해', '예산을', '편성하고', '관련', '사업을', '추진한다.', '회의', '결과를', '보고했다.',
+    '2024년', '3월', '10:30', '참석자', 'The', 'system', 'stores', 'documents', 'for', 'retrieval.',
+]
+
+
+def prose_chunks(count: int, seed: int, words: int = 300) -> List[str]:
+    """기호가 드문 일반 본문 청크 (실제 추출 결과에 가까운 벤치마크 입력)"""
+    rng = random.Random(seed)
+    return [' '.join(rng.choice(PROSE_WORDS) for _ in range(words)) + '\n\n' for _ in range(count)]
+
+
+def fuzz_samples(count: int, seed: int) -> List[str]:
+    rng = random.Random(seed)
+    return [''.join(rng.choice(FUZZ_ALPHABET) for _ in range(rng.randint(0, 24))) for _ in range(count)]
+
+
+def check(samples: List[str], max_examples: int = 5) -> Dict[str, Any]:
+    """이전/신규 구현 출력 비교"""
+    result = {}
+    for name, legacy, current in PAIRS:
+        mismatches = []
+        for text in samples:
+            expected, actual = legacy(text), current(text)
+            if expected != actual:
+                mismatches.append({'input': text, 'expected': expected, 'actual': actual})
+        result[name] = {
+            'samples': len(samples),
+            'mismatches': len(mismatches),
+            'examples': mismatches[:max_examples]
+        }
+    return result
+
+
+def bench(samples: List[str], repeat: int) -> Dict[str, Any]:
+    """함수별 이전/신규 구현 소요 시간 (repeat 회 중 최소값)"""
+    result = {}
+    for name, legacy, current in PAIRS:
+        timings = {}
+        for label, func in (('legacy', legacy), ('current', current)):
+            best = float('inf')
+            for _ in range(repeat):
+                start = time.perf_counter()
+                for text in samples:
+                    func(text)
+                best = min(best, time.perf_counter() - start)
+            timings[label] = best
+        result[name] = {
+            'legacy_seconds': round(timings['legacy'], 4),
+            'current_seconds': round(timings['current'], 4),
+            'speedup': round(timings['legacy'] / timings['current'], 2) if timings['current'] else None
+        }
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='텍스트 정규화 골든 검증 / 벤치마크')
+    parser.add_argument('files', nargs='*', help='추가 검증/벤치마크용 텍스트 파일 (utf-8)')
+    parser.add_argument('--fuzz', type=int, default=5000, help='무작위 검증 문자열 수')
+    parser.add_argument('--seed', type=int, default=0, help='무작위 문자열 시드')
+    parser.add_argument('--repeat', type=int, default=3, help='벤치마크 반복 횟수 (최소 시간 사용)')
+    parser.add_argument('--check-only', action='store_true', help='골든 검증만 실행')
+    parser.add_argument('--output', help='결과 JSON 파일 경로 (기본값: 표준 출력)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    documents = []
+    for path in args.files:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            documents.append(f.read())
+
+    samples = GOLDEN_SAMPLES + documents + fuzz_samples(args.fuzz, args.seed)
+    report = {'check': check(samples)}
+    if not args.check_only:
+        # 파일이 없으면 일반 본문 청크와 기호가 많은 표/목록 텍스트를 섞어 사용
+        corpus = documents or prose_chunks(500, args.seed) + ['\n'.join(GOLDEN_SAMPLES)] * 100
+        report['benchmark'] = bench(corpus, args.repeat)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+    failed = [name for name, r in report['check'].items() if r['mismatches']]
+    if failed:
+        logger.error(f"정규화 결과가 이전 구현과 다릅니다: {', '.join(failed)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+from typing import Union
+import logging
+import re
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 모든 패턴은 모듈 로드 시 한 번만 컴파일한다.
+# 순서에 의존하는 치환은 기존 순서를 그대로 유지하고, 결과가 같음이 확인된 경우에만 하나의 패턴으로 합쳤다.
+# 문장 시작/끝(^, $) 패턴은 합치면 앵커 최적화가 사라져 오히려 느려지므로 나눠 둔다.
+# 한글 텍스트에서는 str.translate 가 정규식/str.replace 보다 느려 사용하지 않는다.
+# (TextNormalizationBenchmark --check 가 기존 구현과의 출력 일치를 검증)
+
+# --- clean_layout_text (기존 clean_text2) ---
+_MULTI_NEWLINE = re.compile(r'\n{3,}')
+_MULTI_SPACE = re.compile(r' {2,}')
+_HYPHEN_BREAK = re.compile(r'-\n')
+
+# --- clean_extracted_text (기존 clean_text) ---
+# 연속된 점/| 를 각각 하나로 (서로 다른 문자 집합이라 한 번에 처리해도 결과가 같다)
+_REPEATED_DOT_PIPE = re.compile(r'([.|])\1+')
+_MIXED_DOT_PIPE = re.compile(r'[|.]{2,}')
+_INLINE_SPACE = re.compile(r'[^\S\n]+')
+_TIME_COLON = re.compile(r'(\d)\s*:\s*(\d)')
+_NUMBER_RANGE = re.compile(r'(\d)\s*~\s*(\d)')
+_INNER_PIPE = re.compile(r'(\w)\s*\|\s*(\w)')
+_LEADING_PIPE = re.compile(r'^\|\s*')
+_TRAILING_PIPE = re.compile(r'\s*\|$')
+_INNER_HYPHEN = re.compile(r'(\w)\s*-\s*(\w)')
+_LEADING_HYPHEN = re.compile(r'^-\s*')
+_TRAILING_HYPHEN = re.compile(r'\s*-$')
+_INNER_BULLET = re.compile(r'(\w)[□○●◦]\s*(\w)')
+_LEADING_BULLET = re.compile(r'^[□○●◦]\s*')
+_TRAILING_BULLET = re.compile(r'\s*[□○●◦]$')
+_DASH_RUN = re.compile(r'-{2,}')
+_CONTROL_CHARS = re.compile(r'[\x00-\x08\x0B\x0C\x0E-\x1F\x7F]')
+
+# --- clean_web_text (webpagecrawl) ---
+_URL = re.compile(r'https?://\S+')
+_SOURCE_LINE = re.compile(r'출처\s*:\s*.*$', re.MULTILINE)
+_LINK_PARENS = re.compile(r'\([^)]*?(링크|http|www|\.com|\.kr)[^)]*?\)')
+
+
+def decode_text(data: Union[bytes, str]) -> str:
+    """bytes 를 utf-8, 실패하면 cp949 로 디코딩 (둘 다 실패하면 ValueError)"""
+    if not isinstance(data, bytes):
+        return data
+    try:
+        return data.decode('utf-8')
+    except UnicodeDecodeError:
+        try:
+            return data.decode('cp949')
+        except UnicodeDecodeError as e:
+            raise ValueError(f"Failed to decode bytes: {data[:50]!r}") from e
+
+
+def collapse_whitespace(text: str) -> str:
+    """연속된 공백/줄바꿈을 공백 하나로 줄이고 앞뒤 공백 제거"""
+    return ' '.join(text.split())
+
+
+def clean_layout_text(text: str) -> str:
+    """
+    추출기 공통 정제: 빈 줄은 최대 한 줄, 연속 공백은 하나, 줄 끝 하이픈 이음 제거
+
+    문단 구조(줄바꿈)는 유지한다.
+    """
+    text = _MULTI_NEWLINE.sub('\n\n', text)
+    if '  ' in text:
+        text = _MULTI_SPACE.sub(' ', text)
+    if '-\n' in text:
+        text = _HYPHEN_BREAK.sub('', text)
+    return text.strip()
+
+
+def clean_extracted_text(text: Union[bytes, str]) -> str:
+    """
+    표/목록 기호가 많은 추출 텍스트 정제
+
+    점/| 반복 축약, ○□●◦ 기호와 단독 |, - 제거, 시간(1 : 30)/범위(1 ~ 3) 표기 붙이기, 제어 문자 제거.
+    해당 문자가 없는 단계는 건너뛴다.
+    """
+    text = decode_text(text)
+    if not text:
+        return ""
+    text = str(text).strip()
+
+    if '.' in text or '|' in text:
+        text = _REPEATED_DOT_PIPE.sub(r'\1', text)
+        text = _MIXED_DOT_PIPE.sub(' ', text)
+    text = text.replace('○', ' ')
+    text = _INLINE_SPACE.sub(' ', text)
+    if ':' in text:
+        text = _TIME_COLON.sub(r'\1:\2', text)
+    if '~' in text:
+        text = _NUMBER_RANGE.sub(r'\1~\2', text)
+    text = _CONTROL_CHARS.sub('', text)
+    if '|' in text:
+        text = _INNER_PIPE.sub(r'\1 \2', text)
+        text = _LEADING_PIPE.sub('', text)
+        text = _TRAILING_PIPE.sub('', text)
+    if '-' in text:
+        text = _INNER_HYPHEN.sub(r'\1 \2', text)
+        text = _LEADING_HYPHEN.sub('', text)
+        text = _TRAILING_HYPHEN.sub('', text)
+    if '□' in text or '●' in text or '◦' in text:
+        text = _INNER_BULLET.sub(r'\1 \2', text)
+        text = _LEADING_BULLET.sub('', text)
+        text = _TRAILING_BULLET.sub('', text)
+    # 앞 단계에서 공백류는 모두 ' ' 로 바뀌었으므로 남은 것은 삭제로 생긴 연속 공백뿐
+    if '  ' in text:
+        text = _MULTI_SPACE.sub(' ', text)
+    if '--' in text:
+        text = _DASH_RUN.sub(' ', text)
+    return text.strip()
+
+
+def clean_web_text(text: str) -> str:
+    """웹 본문 정제: URL, 출처 표기, 링크가 든 괄호 제거 후 공백 정리"""
+    if 'http' in text:
+        text = _URL.sub('', text)
+    if '출처' in text:
+        text = _SOURCE_LINE.sub('', text)
+    if '(' in text:
+        text = _LINK_PARENS.sub('', text)
+    return collapse_whitespace(text)
+
+
+def normalize_for_storage(text: str) -> str:
+    """
+    저장 직전 정규화: 공백(줄바꿈, NBSP 포함)을 하나로 줄이고 utf-8 로 인코딩할 수 없는 서로게이트 제거
+    """
+    text = collapse_whitespace(text)
+    try:
+        text.encode('utf-8')
+    except UnicodeEncodeError:
+        text = text.encode('utf-8', errors='ignore').decode('utf-8')
+    return text
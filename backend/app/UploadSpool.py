@@ -0,0 +1,104 @@
+from typing import Optional
+import tempfile
+import logging
+import shutil
+import uuid
+import os
+
+from flask import Request, current_app
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.DEBUG)
+
+
+# 업로드 본문을 디스크로 옮길 때 한 번에 읽는 크기
+UPLOAD_CHUNK_BYTES = int(os.getenv("UPLOAD_CHUNK_BYTES", str(1 << 20)))
+SPOOL_PREFIX = ".upload-"
+
+
+def upload_folder() -> str:
+    """업로드 저장 폴더 (app.config['UPLOAD_FOLDER'], 없으면 시스템 임시 폴더)"""
+    try:
+        folder = current_app.config.get('UPLOAD_FOLDER')
+    except RuntimeError:
+        folder = None
+    folder = folder or tempfile.gettempdir()
+    os.makedirs(folder, exist_ok=True)
+    return folder
+
+
+class UploadRequest(Request):
+    """
+    multipart 파일 필드를 처음부터 업로드 폴더의 파일로 받는 Request
+
+    기본 Request 는 본문을 SpooledTemporaryFile(500KB 초과 시 별도 임시 파일)에 받고,
+    file.save() 가 이를 다시 uploads/ 로 복사한다. 여기서는 파서가 청크 단위로 쓰는
+    파일이 업로드 폴더에 있으므로 materialize_upload() 가 rename 만으로 최종 경로를 만든다.
+    옮겨지지 않은 파일은 요청 종료 시 삭제한다.
+    """
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        stream = tempfile.NamedTemporaryFile(mode="w+b", dir=upload_folder(), prefix=SPOOL_PREFIX, delete=False)
+        if not hasattr(self, '_spooled_paths'):
+            self._spooled_paths = []
+        self._spooled_paths.append(stream.name)
+        return stream
+
+    def close(self) -> None:
+        try:
+            super().close()
+        finally:
+            for path in getattr(self, '_spooled_paths', []):
+                if os.path.exists(path):
+                    try:
+                        os.remove(path)
+                    except OSError as e:
+                        logger.warning(f"Failed to remove spooled upload {path}: {e}")
+
+
+def materialize_upload(file_storage, filename: str, folder: Optional[str] = None) -> str:
+    """
+    업로드 파일을 <folder>/<uuid>/<filename> 경로로 확정하고 경로 반환
+
+    - UploadRequest 로 받은 파일은 같은 파일시스템 안의 rename (복사 없음)
+    - 그 외 스트림은 UPLOAD_CHUNK_BYTES 단위로 복사 (전체를 메모리에 올리지 않음)
+    같은 이름의 동시 업로드가 서로 덮어쓰지 않도록 업로드마다 하위 폴더를 만든다.
+    """
+    folder = folder or upload_folder()
+    target_dir = os.path.join(folder, uuid.uuid4().hex)
+    os.makedirs(target_dir)
+    target = os.path.join(target_dir, os.path.basename(filename))
+
+    stream = getattr(file_storage, 'stream', file_storage)
+    spooled = getattr(stream, 'name', None)
+    if isinstance(spooled, str) and os.path.basename(spooled).startswith(SPOOL_PREFIX) and os.path.exists(spooled):
+        stream.close()
+        try:
+            os.replace(spooled, target)
+            return target
+        except OSError as e:
+            logger.warning(f"Rename of spooled upload failed, copying instead: {e}")
+        with open(spooled, 'rb') as src, open(target, 'wb') as out:
+            shutil.copyfileobj(src, out, UPLOAD_CHUNK_BYTES)
+        return target
+
+    try:
+        stream.seek(0)
+    except (AttributeError, OSError, ValueError):
+        pass
+    with open(target, 'wb') as out:
+        shutil.copyfileobj(stream, out, UPLOAD_CHUNK_BYTES)
+    return target
+
+
+def discard_upload(path: str) -> None:
+    """materialize_upload 로 만든 파일과 업로드별 폴더 삭제"""
+    try:
+        if os.path.exists(path):
+            os.remove(path)
+        os.rmdir(os.path.dirname(path))
+        logger.debug(f"Temporary file {path} has been deleted.")
+    except OSError as e:
+        logger.error(f"Error deleting file {path}: {str(e)}")
+
@@ -0,0 +1,573 @@
+#!/usr/bin/env python3
+"""
+동시 다중 페이지 웹 크롤러 → 컬렉션 적재
+
+브라우저(Chromium) 하나를 띄우고 미리 만든 페이지 풀을 돌려 쓰며, 동시 요청 수를 제한해 크롤링한다.
+- URL 정규화(프래그먼트/기본 포트 제거, 호스트 소문자) 후 중복 제거, 리다이렉트된 최종 URL 도 기록
+- 호스트별 요청 간격(--host-delay, robots.txt 의 Crawl-delay 가 더 길면 그 값)과 robots.txt 준수
+- block_private_hosts(API 크롤링)이면 사설/루프백/링크로컬 등 내부 주소로 해석되는 호스트로의 요청을 막는다
+- 본문은 HtmlContent.extract_main_content 로 찾고, 같은 본문(내용 해시)이 다른 URL 로 나오면 한 번만 적재
+- 청크 분할 후 여러 페이지의 청크를 모아 store_document_batch 로 임베딩/저장 (크기 제한 큐 뒤의 별도 스레드에서
+  실행해 크롤링과 겹침, 저장이 밀리면 큐가 차서 크롤링 속도를 늦춘다)
+
+사용 예:
+    python -m backend.app.WebCrawler https://www.example.go.kr/news --collection 보도자료 --max-pages 200 --max-depth 2
+    python -m backend.app.WebCrawler --fixture --dry-run          # 로컬 고정 사이트로 오프라인 확인
+"""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Optional, Iterable, AsyncIterator
+from urllib.parse import urljoin, urldefrag, urlsplit, urlunsplit
+from urllib import robotparser
+import argparse
+import asyncio
+import hashlib
+import ipaddress
+import socket
+import logging
+import json
+import sys
+import os
+import time
+
+from bs4 import BeautifulSoup
+from playwright.async_api import async_playwright
+from langchain.docstore.document import Document
+from langchain.text_splitter import RecursiveCharacterTextSplitter
+
+from backend.app.HtmlContent import extract_main_content, extract_title
+from backend.app.TextNormalizer import clean_web_text
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(logging.INFO)
+
+
+CRAWL_CONCURRENCY = int(os.getenv("CRAWL_CONCURRENCY", "4"))
+CRAWL_MAX_PAGES = int(os.getenv("CRAWL_MAX_PAGES", "200"))
+CRAWL_HOST_DELAY = float(os.getenv("CRAWL_HOST_DELAY", "1.0"))
+CRAWL_TIMEOUT_MS = int(os.getenv("CRAWL_TIMEOUT_MS", "30000"))
+CRAWL_USER_AGENT = os.getenv("CRAWL_USER_AGENT", "RAGSEARCH-crawler/1.0")
+# 한 번에 임베딩/저장할 청크 수 (여러 페이지의 청크를 모아 채운다)
+CRAWL_BATCH_DOCS = int(os.getenv("CRAWL_BATCH_DOCS", "256"))
+# 저장을 기다리는 페이지 수 상한 (가득 차면 크롤링 워커가 기다린다)
+CRAWL_INGEST_QUEUE_PAGES = int(os.getenv("CRAWL_INGEST_QUEUE_PAGES", "64"))
+
+# 페이지 이동 없이 건너뛸 링크 (문서 파일은 BulkImport / 업로드 경로로 적재)
+SKIP_EXTENSIONS = ('.pdf', '.zip', '.hwp', '.hwpx', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
+                   '.jpg', '.jpeg', '.png', '.gif', '.svg', '.webp', '.mp3', '.mp4', '.avi', '.exe')
+# 본문 추출에 쓰지 않는 리소스는 요청 자체를 막는다
+BLOCKED_RESOURCE_TYPES = {"image", "media", "font"}
+# 본문 영역 탐색 전에 제거하는 태그 (링크 수집은 제거 전에 한다)
+EXCLUDED_TAGS = ['script', 'style', 'noscript', 'nav', 'footer', 'header']
+
+
+def normalize_url(url: str, base: Optional[str] = None) -> Optional[str]:
+    """중복 판정용 URL (http/https 만, 프래그먼트/기본 포트 제거, 호스트 소문자). 사용할 수 없으면 None"""
+    try:
+        url = urljoin(base, url.strip()) if base else url.strip()
+        url, _ = urldefrag(url)
+        parts = urlsplit(url)
+        if parts.scheme not in ('http', 'https') or not parts.hostname:
+            return None
+        host = parts.hostname.lower()
+        if ':' in host:
+            host = f"[{host}]"
+        port = parts.port
+        if port is not None and (parts.scheme, port) not in (('http', 80), ('https', 443)):
+            host = f"{host}:{port}"
+        return urlunsplit((parts.scheme, host, parts.path or '/', parts.query, ''))
+    except ValueError:
+        return None
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc
+
+
+def is_public_address(address: str) -> bool:
+    """인터넷에서 접근 가능한 유니캐스트 주소인지 (사설, 루프백, 링크로컬(메타데이터 서버 포함), 예약, 멀티캐스트는 False)"""
+    try:
+        ip = ipaddress.ip_address(address.split('%', 1)[0])
+    except ValueError:
+        return False
+    if ip.version == 6 and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
+
+
+def is_public_host(host: str) -> bool:
+    """호스트가 해석되는 모든 주소가 공인 주소인지 (해석 실패는 False)"""
+    try:
+        infos = socket.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+    except (OSError, UnicodeError):
+        return False
+    return bool(infos) and all(is_public_address(info[4][0]) for info in infos)
+
+
+def is_public_url(url: str) -> bool:
+    """http/https URL 이고 호스트가 공인 주소로만 해석되는지"""
+    normalized = normalize_url(url)
+    return normalized is not None and is_public_host(urlsplit(normalized).hostname)
+
+
+class PublicHostGuard:
+    """내부 주소로 해석되는 호스트 차단 (호스트별 DNS 조회 결과를 크롤링 동안 캐시)"""
+
+    def __init__(self):
+        self._hosts: Dict[str, bool] = {}
+
+    async def allowed(self, url: str) -> bool:
+        host = urlsplit(url).hostname
+        if not host:
+            return False
+        if host not in self._hosts:
+            loop = asyncio.get_running_loop()
+            self._hosts[host] = await loop.run_in_executor(None, is_public_host, host)
+            if not self._hosts[host]:
+                logger.warning(f"Blocked request to non-public host {host}")
+        return self._hosts[host]
+
+
+def parse_page(html: str, url: str) -> Dict[str, Any]:
+    """HTML 에서 제목, 본문(줄 단위 정제), 링크 추출"""
+    soup = BeautifulSoup(html, 'html.parser')
+    links = []
+    for anchor in soup.find_all('a', href=True):
+        link = normalize_url(anchor['href'], url)
+        if link:
+            links.append(link)
+    title = extract_title(soup)
+
+    for tag in soup(EXCLUDED_TAGS):
+        tag.decompose()
+    main_content = extract_main_content(soup) or soup.body or soup
+    lines = (clean_web_text(line) for line in main_content.get_text('\n').splitlines())
+    text = '\n'.join(line for line in lines if line)
+    return {'url': url, 'title': title, 'text': text, 'links': links}
+
+
+class HostPoliteness:
+    """
+    호스트별 요청 간격과 robots.txt
+
+    같은 호스트의 요청 시작 시각을 최소 delay 초씩 벌린다 (다른 호스트는 서로 기다리지 않음).
+    robots.txt 는 호스트마다 한 번 브라우저 컨텍스트의 요청 API 로 가져와 캐시한다.
+    """
+
+    def __init__(self, request_context, delay: float, user_agent: str, respect_robots: bool = True,
+                 timeout_ms: int = CRAWL_TIMEOUT_MS):
+        self.request_context = request_context
+        self.delay = delay
+        self.user_agent = user_agent
+        self.respect_robots = respect_robots
+        self.timeout_ms = timeout_ms
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._next_slot: Dict[str, float] = {}
+        self._robots: Dict[str, Optional[robotparser.RobotFileParser]] = {}
+
+    async def _load_robots(self, url: str) -> Optional[robotparser.RobotFileParser]:
+        parts = urlsplit(url)
+        robots_url = urlunsplit((parts.scheme, parts.netloc, '/robots.txt', '', ''))
+        parser = robotparser.RobotFileParser(robots_url)
+        try:
+            response = await self.request_context.get(robots_url, timeout=self.timeout_ms)
+            if response.status in (401, 403):
+                parser.disallow_all = True
+            elif response.status >= 400:
+                parser.allow_all = True
+            else:
+                parser.parse((await response.text()).splitlines())
+        except Exception as e:
+            logger.debug(f"robots.txt unavailable for {parts.netloc}: {e}")
+            parser.allow_all = True
+        return parser
+
+    async def allowed(self, url: str) -> bool:
+        if not self.respect_robots:
+            return True
+        host = host_of(url)
+        if host not in self._robots:
+            # 같은 호스트의 동시 첫 요청이 robots.txt 를 여러 번 받지 않도록 호스트 잠금 안에서 적재
+            async with self._locks.setdefault(host, asyncio.Lock()):
+                if host not in self._robots:
+                    self._robots[host] = await self._load_robots(url)
+        return self._robots[host].can_fetch(self.user_agent, url)
+
+    def _host_delay(self, host: str) -> float:
+        parser = self._robots.get(host)
+        crawl_delay = parser.crawl_delay(self.user_agent) if parser is not None else None
+        return max(self.delay, float(crawl_delay or 0))
+
+    async def wait_turn(self, url: str) -> None:
+        host = host_of(url)
+        loop = asyncio.get_running_loop()
+        async with self._locks.setdefault(host, asyncio.Lock()):
+            wait = self._next_slot.get(host, 0.0) - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self._next_slot[host] = loop.time() + self._host_delay(host)
+
+
+class PagePool:
+    """미리 연 브라우저 탭을 돌려 쓰는 풀 (오류가 난 탭은 닫고 새로 연다)"""
+
+    def __init__(self, context, size: int):
+        self.context = context
+        self.size = size
+        self._pages: asyncio.Queue = asyncio.Queue()
+
+    async def open(self) -> None:
+        for _ in range(self.size):
+            await self._pages.put(await self.context.new_page())
+
+    @asynccontextmanager
+    async def page(self) -> AsyncIterator[Any]:
+        page = await self._pages.get()
+        healthy = True
+        try:
+            yield page
+        except Exception:
+            healthy = False
+            raise
+        finally:
+            if not healthy:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+                page = await self.context.new_page()
+            await self._pages.put(page)
+
+
+class WebCrawler:
+    """
+    브라우저 하나 + 페이지 풀로 동시 크롤링
+
+    seed 에서 시작해 max_depth 단계까지 링크를 따라가며, 방문 예정 URL 이 max_pages 를 넘으면 더 넣지 않는다.
+    페이지를 읽을 때마다 on_page(결과) 를 호출한다 (코루틴 함수도 가능).
+    block_private_hosts 이면 페이지 이동, 리다이렉트 도착 URL, 페이지가 부르는 하위 요청 모두 공인 주소 호스트만 허용한다.
+    """
+
+    def __init__(self, concurrency: int = CRAWL_CONCURRENCY, max_pages: int = CRAWL_MAX_PAGES, max_depth: int = 1,
+                 host_delay: float = CRAWL_HOST_DELAY, same_host: bool = True, respect_robots: bool = True,
+                 timeout_ms: int = CRAWL_TIMEOUT_MS, wait_until: str = "load", user_agent: str = CRAWL_USER_AGENT,
+                 block_private_hosts: bool = False):
+        self.concurrency = max(1, concurrency)
+        self.max_pages = max_pages
+        self.max_depth = max_depth
+        self.host_delay = host_delay
+        self.same_host = same_host
+        self.respect_robots = respect_robots
+        self.timeout_ms = timeout_ms
+        self.wait_until = wait_until
+        self.user_agent = user_agent
+        self.block_private_hosts = block_private_hosts
+        self.stats = {'scheduled': 0, 'fetched': 0, 'duplicate_content': 0, 'robots_blocked': 0,
+                      'private_blocked': 0, 'skipped_non_html': 0, 'failed': 0}
+        self.failures: List[Dict[str, str]] = []
+
+    @staticmethod
+    async def _route_request(route, guard: Optional[PublicHostGuard]) -> None:
+        if route.request.resource_type in BLOCKED_RESOURCE_TYPES:
+            await route.abort()
+        elif guard is not None and not await guard.allowed(route.request.url):
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def crawl(self, seeds: Iterable[str], on_page) -> Dict[str, Any]:
+        start = time.perf_counter()
+        seen = set()
+        content_hashes = set()
+        seed_urls = [url for url in (normalize_url(s) for s in seeds) if url]
+        seed_hosts = {host_of(url) for url in seed_urls}
+        frontier: asyncio.Queue = asyncio.Queue()
+        guard = PublicHostGuard() if self.block_private_hosts else None
+
+        def enqueue(url: str, depth: int) -> None:
+            if url in seen or len(seen) >= self.max_pages:
+                return
+            if self.same_host and host_of(url) not in seed_hosts:
+                return
+            if os.path.splitext(urlsplit(url).path)[1].lower() in SKIP_EXTENSIONS:
+                self.stats['skipped_non_html'] += 1
+                return
+            seen.add(url)
+            self.stats['scheduled'] += 1
+            frontier.put_nowait((url, depth))
+
+        async with async_playwright() as playwright:
+            browser = await playwright.chromium.launch(headless=True)
+            try:
+                context = await browser.new_context(ignore_https_errors=True, user_agent=self.user_agent)
+                async def route_request(route) -> None:
+                    await self._route_request(route, guard)
+
+                await context.route("**/*", route_request)
+                pool = PagePool(context, self.concurrency)
+                await pool.open()
+                politeness = HostPoliteness(context.request, self.host_delay, self.user_agent,
+                                            self.respect_robots, self.timeout_ms)
+
+                async def visit(url: str, depth: int) -> None:
+                    if guard is not None and not await guard.allowed(url):
+                        self.stats['private_blocked'] += 1
+                        return
+                    if not await politeness.allowed(url):
+                        self.stats['robots_blocked'] += 1
+                        return
+                    await politeness.wait_turn(url)
+                    async with pool.page() as page:
+                        response = await page.goto(url, wait_until=self.wait_until, timeout=self.timeout_ms)
+                        if response is None or not response.ok:
+                            raise RuntimeError(f"HTTP {response.status if response else 'no response'}")
+                        if 'html' not in (response.headers.get('content-type') or 'text/html'):
+                            self.stats['skipped_non_html'] += 1
+                            return
+                        html = await page.content()
+                        final_url = normalize_url(page.url) or url
+                    if guard is not None and not await guard.allowed(final_url):
+                        self.stats['private_blocked'] += 1
+                        return
+                    # 리다이렉트로 도착한 URL 도 방문한 것으로 기록
+                    seen.add(final_url)
+                    result = parse_page(html, final_url)
+                    self.stats['fetched'] += 1
+
+                    digest = hashlib.sha256(result['text'].encode('utf-8')).hexdigest()
+                    if digest in content_hashes:
+                        self.stats['duplicate_content'] += 1
+                    elif result['text']:
+                        content_hashes.add(digest)
+                        result['depth'] = depth
+                        outcome = on_page(result)
+                        if asyncio.iscoroutine(outcome):
+                            await outcome
+                    if depth < self.max_depth:
+                        for link in result['links']:
+                            enqueue(link, depth + 1)
+
+                async def worker() -> None:
+                    while True:
+                        url, depth = await frontier.get()
+                        try:
+                            await visit(url, depth)
+                        except Exception as e:
+                            self.stats['failed'] += 1
+                            self.failures.append({'url': url, 'error': f"{type(e).__name__}: {e}"})
+                            logger.warning(f"Failed to crawl {url}: {e}")
+                        finally:
+                            frontier.task_done()
+
+                for url in seed_urls:
+                    enqueue(url, 0)
+                workers = [asyncio.create_task(worker()) for _ in range(self.concurrency)]
+                try:
+                    await frontier.join()
+                finally:
+                    for task in workers:
+                        task.cancel()
+                    await asyncio.gather(*workers, return_exceptions=True)
+            finally:
+                await browser.close()
+
+        elapsed = time.perf_counter() - start
+        return {
+            **self.stats,
+            'seconds': round(elapsed, 3),
+            'pages_per_second': round(self.stats['fetched'] / elapsed, 2) if elapsed else None,
+            'failures': self.failures
+        }
+
+
+class CrawlIngestor:
+    """
+    크롤링한 페이지를 청크로 나눠 모았다가 batch_docs 개마다 store_document_batch 로 저장
+
+    소스 이름은 URL. 컬렉션에 이미 있는 URL 은 새 청크를 저장한 뒤 이전 청크를 지운다
+    (저장이 실패하면 이전 청크를 그대로 둔다).
+    """
+
+    def __init__(self, db_manager, backend: str, collection: str, batch_docs: int = CRAWL_BATCH_DOCS,
+                 chunk_size: Optional[int] = None, chunk_overlap: Optional[int] = None):
+        self.db = db_manager
+        self.backend = backend
+        self.collection = collection
+        self.batch_docs = batch_docs
+        self.splitter = RecursiveCharacterTextSplitter(
+            chunk_size=chunk_size or int(os.getenv("CHUNK_SIZE", "1000")),
+            chunk_overlap=chunk_overlap if chunk_overlap is not None else int(os.getenv("CHUNK_OVERLAP", "200"))
+        )
+        self._documents: List[Document] = []
+        self._pages = 0
+        # 이번 묶음이 저장되면 지울 이전 청크 id 와 교체되는 페이지 수
+        self._stale_ids: List[str] = []
+        self._replacing = 0
+        self.stats = {'pages_stored': 0, 'chunks': 0, 'chunks_stored': 0, 'replaced': 0, 'store_failures': 0,
+                      'store_seconds': 0.0}
+
+    def add(self, page: Dict[str, Any]) -> None:
+        source = page['url']
+        if self.db is not None and self.db.check_source_exists(self.collection, source):
+            self._stale_ids.extend(self.db.get_ids_by_source(self.collection, source))
+            self._replacing += 1
+        metadata = {
+            'source': source,
+            'file_name': source,
+            'url': source,
+            'title': page['title'],
+            'crawl_depth': page.get('depth', 0),
+            'crawled_at': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        chunks = self.splitter.split_documents([Document(page_content=page['text'], metadata=metadata)])
+        self._documents.extend(chunks)
+        self._pages += 1
+        self.stats['chunks'] += len(chunks)
+        if len(self._documents) >= self.batch_docs:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._documents:
+            return
+        documents, pages = self._documents, self._pages
+        stale_ids, replacing = self._stale_ids, self._replacing
+        self._documents, self._pages, self._stale_ids, self._replacing = [], 0, [], 0
+        if self.db is None:
+            return
+        start = time.perf_counter()
+        try:
+            self.stats['chunks_stored'] += self.db.store_document_batch(documents, self.collection)
+            self.stats['pages_stored'] += pages
+            logger.info(f"Stored {len(documents)} chunks from {pages} pages into {self.collection}")
+        except Exception as e:
+            self.stats['store_failures'] += pages
+            logger.error(f"Failed to store {len(documents)} crawled chunks: {e}")
+            return
+        finally:
+            self.stats['store_seconds'] += time.perf_counter() - start
+        # 새 청크가 저장된 뒤에만 이전 청크 삭제
+        if stale_ids:
+            self.db.delete_ids(self.collection, stale_ids)
+        self.stats['replaced'] += replacing
+
+
+async def crawl_into_collection(db_manager, backend: str, collection: str, urls: List[str],
+                                batch_docs: int = CRAWL_BATCH_DOCS, **crawler_options) -> Dict[str, Any]:
+    """
+    urls 에서 시작해 크롤링하며 바로 collection 에 적재 (db_manager 가 None 이면 추출/분할만)
+
+    크롤링 워커는 페이지를 크기 제한 큐(CRAWL_INGEST_QUEUE_PAGES)에 넣기만 하고, 소비 태스크 하나가
+    단일 스레드 실행기에서 분할/임베딩/저장을 순서대로 처리한다. 묶음 저장 중에도 큐에 자리가 있으면
+    크롤링은 계속되고, 저장이 밀려 큐가 가득 차면 워커가 기다린다.
+    """
+    ingestor = CrawlIngestor(db_manager, backend, collection, batch_docs=batch_docs)
+    crawler = WebCrawler(**crawler_options)
+    loop = asyncio.get_running_loop()
+    pages: asyncio.Queue = asyncio.Queue(maxsize=max(1, CRAWL_INGEST_QUEUE_PAGES))
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="crawl-ingest") as store_executor:
+        async def consume() -> None:
+            while True:
+                page = await pages.get()
+                if page is None:
+                    break
+                try:
+                    await loop.run_in_executor(store_executor, ingestor.add, page)
+                except Exception as e:
+                    # 한 페이지의 실패로 소비가 멈추면 큐가 차서 크롤링 전체가 멈춘다
+                    ingestor.stats['store_failures'] += 1
+                    logger.error(f"Failed to ingest {page['url']}: {e}")
+
+        consumer = asyncio.create_task(consume())
+        try:
+            crawl_report = await crawler.crawl(urls, pages.put)
+        finally:
+            # 남은 페이지를 모두 처리한 뒤 마지막 묶음 저장
+            await pages.put(None)
+            await consumer
+            await loop.run_in_executor(store_executor, ingestor.flush)
+    return {
+        'collection': collection,
+        'backend': backend,
+        'crawl': crawl_report,
+        'ingest': {k: round(v, 3) if isinstance(v, float) else v for k, v in ingestor.stats.items()}
+    }
+
+
+def create_db_manager(backend: str, persist_directory: Optional[str] = None):
+    if backend == 'postgres':
+        from backend.app.PostgresDbManager import PostgresDbManager
+        return PostgresDbManager()
+    from backend.app.ChromaDbManager import ChromaDbManager
+    return ChromaDbManager(persist_directory or "")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='동시 다중 페이지 웹 크롤러 → 컬렉션 적재')
+    parser.add_argument('urls', nargs='*', help='시작 URL')
+    parser.add_argument('--collection', help='적재할 컬렉션 이름 (--dry-run 이 아니면 필수)')
+    parser.add_argument('--db', choices=['chroma', 'postgres'], default=os.getenv('DB_TYPE', 'chroma').lower(),
+                        help='저장소 (기본값: DB_TYPE 환경 변수)')
+    parser.add_argument('--persist-directory', help='Chroma 저장 경로 (기본값: ChromaDbManager 기본 경로)')
+    parser.add_argument('--max-pages', type=int, default=CRAWL_MAX_PAGES, help='최대 방문 페이지 수')
+    parser.add_argument('--max-depth', type=int, default=1, help='시작 URL 로부터 따라갈 링크 단계')
+    parser.add_argument('--concurrency', type=int, default=CRAWL_CONCURRENCY, help='동시에 여는 페이지 수')
+    parser.add_argument('--host-delay', type=float, help=f'같은 호스트 요청 간 최소 간격(초), 기본값 {CRAWL_HOST_DELAY}')
+    parser.add_argument('--allow-external', action='store_true', help='시작 URL 과 다른 호스트의 링크도 따라감')
+    parser.add_argument('--ignore-robots', action='store_true', help='robots.txt 무시')
+    parser.add_argument('--wait-until', default='load', choices=['load', 'domcontentloaded', 'networkidle'],
+                        help='페이지 로딩 완료 기준 (JS 렌더링 사이트는 networkidle)')
+    parser.add_argument('--batch-docs', type=int, default=CRAWL_BATCH_DOCS, help='한 번에 임베딩/저장할 청크 수')
+    parser.add_argument('--dry-run', action='store_true', help='저장하지 않고 크롤링/추출/분할만 실행')
+    parser.add_argument('--fixture', action='store_true', help='로컬 고정 사이트(CrawlFixtureServer)를 띄워 크롤링')
+    parser.add_argument('--output', help='결과 JSON 파일 경로 (기본값: 표준 출력)')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, stream=sys.stderr)
+
+    if not args.urls and not args.fixture:
+        parser.error('시작 URL 또는 --fixture 가 필요합니다')
+    if not args.dry_run and not args.collection:
+        parser.error('--collection 이 필요합니다 (저장하지 않으려면 --dry-run)')
+
+    db_manager = None
+    if not args.dry_run:
+        db_manager = create_db_manager(args.db, args.persist_directory)
+        if args.db == 'postgres' and db_manager.get_collection_id(args.collection) is None:
+            parser.error(f"컬렉션이 없습니다: {args.collection} (먼저 생성하세요)")
+
+    host_delay = args.host_delay
+    if host_delay is None:
+        host_delay = 0.05 if args.fixture else CRAWL_HOST_DELAY
+    options = dict(concurrency=args.concurrency, max_pages=args.max_pages, max_depth=args.max_depth,
+                   host_delay=host_delay, same_host=not args.allow_external, respect_robots=not args.ignore_robots,
+                   wait_until=args.wait_until)
+
+    def run(urls: List[str]) -> Dict[str, Any]:
+        return asyncio.run(crawl_into_collection(db_manager, args.db, args.collection or "", urls,
+                                                 batch_docs=args.batch_docs, **options))
+
+    if args.fixture:
+        from backend.app.CrawlFixtureServer import fixture_server
+        with fixture_server() as server:
+            report = run(args.urls or [server.base_url + "/"])
+            # 같은 경로를 두 번 가져오지 않았는지, 요청 간격이 지켜졌는지 확인용
+            report['fixture'] = {
+                'base_url': server.base_url,
+                'hits': server.hit_counts(),
+                'min_interval_seconds': round(server.min_interval(), 3)
+            }
+    else:
+        report = run(args.urls)
+
+    output = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
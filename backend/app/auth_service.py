@@ -4,8 +4,10 @@ import jwt
 from psycopg2.extras import RealDictCursor
 import os
 from typing import Optional, Tuple, Dict, List,Union
-import bcrypt
 import logging
+from backend.app.AuthContextCache import get_auth_context_cache
+from backend.app.PasswordHasher import get_password_hasher
+from backend.app.SessionActivityTracker import get_session_tracker
 
 class AuthService:
     def __init__(self, db_pool, jwt_secret_key, jwt_expiration_delta):
@@ -14,6 +16,12 @@ class AuthService:
         self.jwt_expiration_delta = jwt_expiration_delta
         self.currentuser=0
         self.logger = logging.getLogger(__name__)
+        # 토큰 클레임/그룹 소속 캐시 (require_auth, require_admin 에서 매 요청 DB 조회 방지)
+        self.auth_cache = get_auth_context_cache()
+        # 세션 검증 결과 캐시 + last_accessed 일괄 반영
+        self.session_tracker = get_session_tracker()
+        # bcrypt 해시/검증은 전용 워커 풀에서 DB 연결을 잡지 않은 상태로 수행
+        self.password_hasher = get_password_hasher()
 
     def get_currentuser_id(self):
         return self.currentuser
@@ -23,46 +31,69 @@ class AuthService:
         사용자 로그인을 처리하고 세션을 생성합니다.
         Returns: (user_data, token, session_id)
         """
+        conn = None
         try: 
+            # 1) 사용자 조회 (짧은 읽기 후 연결 반환)
             with self.db_pool.get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    # 사용자 확인
                     cur.execute("""
                         SELECT id, username, password_hash, is_active, group_id
                         FROM users
                         WHERE username = %s
                     """, (username,))
                     user = cur.fetchone()                
-                    
-                    if not user:
-                        raise ValueError('사용자가 존재하지 않습니다.\n회원가입하세요!')
-                    
-                    if not user['is_active']:
-                        raise ValueError('등록 대기 상태입니다.\n관리자에게 문의하세요!')
+                conn.rollback()
+            conn = None
+            
+            if not user:
+                raise ValueError('사용자가 존재하지 않습니다.\n회원가입하세요!')
+            
+            if not user['is_active']:
+                raise ValueError('등록 대기 상태입니다.\n관리자에게 문의하세요!')
+
+            # 2) 비밀번호 검증 (워커 풀, DB 연결 없이 대기)
+            if not self._verify_password(password, user['password_hash']):
+                raise ValueError('올바른 비밀번호를 입력하세요!')
+
+            # cost factor 가 바뀐 경우 로그인 시점에 재해시
+            new_password_hash = None
+            if self.password_hasher.needs_rehash(user['password_hash']):
+                new_password_hash = self._hash_password(password)
 
-                    if not self._verify_password(password, user['password_hash']):
-                        raise ValueError('올바른 비밀번호를 입력하세요!')
+            token = self._generate_token(user['id'], user['username'])
+            session_id = os.urandom(32).hex()
+            expires_at = datetime.utcnow() + self.jwt_expiration_delta
 
+            # 3) 세션 교체 트랜잭션
+            with self.db_pool.get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # 기존 세션 비활성화
                     self._deactivate_user_sessions(cur, user['id'])
 
                     # 새로운 세션 생성
-                    token = self._generate_token(user['id'], user['username'])
-                    session_id = os.urandom(32).hex()
-                    expires_at = datetime.utcnow() + self.jwt_expiration_delta
-
                     self._create_session(cur, session_id, user['id'], token, expires_at)
+                    
+                    if new_password_hash:
+                        cur.execute("""
+                            UPDATE users SET password_hash = %s
+                            WHERE id = %s AND password_hash = %s
+                        """, (new_password_hash, user['id'], user['password_hash']))
                     conn.commit()
-                    self.currentuser= int(user['id'])
-                    return user, token, session_id
+            self.session_tracker.invalidate_user(user['id'])
+            self.currentuser= int(user['id'])
+            return user, token, session_id
         except Exception as e:
-            conn.rollback()
+            if conn is not None:
+                conn.rollback()
             self.logger.error(f"Database connection error: {e}")
             raise
 
     def register(self, username: str, email: str, password: str) -> Dict:
         """새로운 사용자를 등록합니다."""
+        conn = None
         try:
+            # 해시는 트랜잭션 밖에서 계산
+            password_hash = self._hash_password(password)
             with self.db_pool.get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     # 중복 체크
@@ -73,7 +104,6 @@ class AuthService:
                         raise ValueError('이미 사용 중인 이메일입니다.')
 
                     # 사용자 생성
-                    password_hash = self._hash_password(password)
                     cur.execute("""
                         INSERT INTO users (username, email, password_hash,is_active, group_id)
                         VALUES (%s, %s, %s, false, 'GRP000002')
@@ -82,35 +112,22 @@ class AuthService:
                     conn.commit()
                     return cur.fetchone()
         except Exception as e:
-            conn.rollback()
+            if conn is not None:
+                conn.rollback()
             self.logger.error(f"Database connection error: {e}")
             raise
        
 
     def check_session(self, session_id: str) -> Optional[Dict]:
         """세션의 유효성을 검사합니다."""
+        session_data = self.session_tracker.get(session_id)
+        if session_data is not None:
+            self.session_tracker.touch(session_id)
+            return session_data
         try:
             with self.db_pool.get_connection() as conn:
-                with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    cur.execute("""
-                        SELECT 
-                            u.id, 
-                            u.username, 
-                            s.expires_at,
-                            s.is_active
-                        FROM sessions s
-                        JOIN users u ON s.user_id = u.id
-                        WHERE s.session_id = %s
-                    """, (session_id,))
-                    
-                    session_data = cur.fetchone()
-                    
-                    if not session_data or \
-                    not session_data['is_active'] or \
-                    session_data['expires_at'] <= datetime.utcnow():
-                        return None
-                        
-                    return session_data
+                # 활성/만료 조건은 쿼리에서 확인
+                return self.session_tracker.lookup(conn, session_id)
         except Exception as e:
             self.logger.error(f"Database connection error: {e}")
             raise
@@ -118,25 +135,31 @@ class AuthService:
     
     def change_password(self, user_id: int, current_password: str, new_password: str) -> dict:
         """현재 로그인된 사용자의 비밀번호를 변경합니다."""
+        conn = None
         try:
+            # 현재 비밀번호 조회 (짧은 읽기 후 연결 반환)
             with self.db_pool.get_connection() as conn:
                 with conn.cursor(cursor_factory=RealDictCursor) as cur:
-                    # 현재 비밀번호 확인
                     cur.execute("""
                         SELECT password_hash
                         FROM users
                         WHERE id = %s
                     """, (user_id,))
-                    
                     user = cur.fetchone()
-                    if not user or not self._verify_password(current_password, user['password_hash']):
-                        return {
-                            'success': False,
-                            'message': '현재 비밀번호가 일치하지 않습니다.'
-                        }
-
-                    # 새 비밀번호 설정
-                    new_password_hash = self._hash_password(new_password)
+                conn.rollback()
+            conn = None
+
+            # 검증/해시는 DB 연결 없이 워커 풀에서 수행
+            if not user or not self._verify_password(current_password, user['password_hash']):
+                return {
+                    'success': False,
+                    'message': '현재 비밀번호가 일치하지 않습니다.'
+                }
+            new_password_hash = self._hash_password(new_password)
+
+            # 새 비밀번호 설정
+            with self.db_pool.get_connection() as conn:
+                with conn.cursor(cursor_factory=RealDictCursor) as cur:
                     cur.execute("""
                         UPDATE users 
                         SET password_hash = %s
@@ -145,13 +168,14 @@ class AuthService:
                     
                     conn.commit()
                     
-                    return {
-                        'success': True,
-                        'message': '비밀번호가 성공적으로 변경되었습니다.'
-                    }
+            return {
+                'success': True,
+                'message': '비밀번호가 성공적으로 변경되었습니다.'
+            }
 
         except Exception as e:
-            conn.rollback()
+            if conn is not None:
+                conn.rollback()
             self.logger.error(f"Password change error for user {user_id}: {str(e)}")
             return {
                 'success': False,
@@ -160,6 +184,7 @@ class AuthService:
         
     def logout(self, session_id: str) -> None:
         """사용자 세션을 종료합니다."""
+        self.session_tracker.invalidate(session_id)
         try:
             with self.db_pool.get_connection() as conn:
                 with conn.cursor() as cur:
@@ -176,14 +201,33 @@ class AuthService:
         
     
     def is_admin(self, username: str) -> bool:
+        context = self.get_auth_context(username=username)
+        return bool(context and context['is_admin'])
+
+    def get_auth_context(self, username: str = None, user_id: int = None) -> Optional[Dict]:
+        """
+        사용자의 인증 컨텍스트(user_id, username, 그룹 목록, 관리자 여부)를 조회합니다.
+        캐시에 없을 때만 DB를 조회합니다.
+        """
+        context = self.auth_cache.get_user(user_id=user_id, username=username)
+        if context is not None:
+            return context
         try:
             with self.db_pool.get_connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute("""
-                        SELECT 1 FROM users u JOIN user_groups ug ON u.id = ug.user_id
-                        WHERE u.username = %s AND ug.group_id = 'GRP000001'
-                    """, (username,))
-                    return cur.fetchone() is not None
+                    condition = "u.username = %s" if username is not None else "u.id = %s"
+                    cur.execute(f"""
+                        SELECT u.id, u.username,
+                               COALESCE(ARRAY_AGG(ug.group_id) FILTER (WHERE ug.group_id IS NOT NULL), '{{}}')
+                        FROM users u
+                        LEFT JOIN user_groups ug ON u.id = ug.user_id
+                        WHERE {condition}
+                        GROUP BY u.id, u.username
+                    """, (username if username is not None else user_id,))
+                    row = cur.fetchone()
+                    if not row:
+                        return None
+                    return self.auth_cache.put_user(row[0], row[1], list(row[2]))
         except Exception as e:
             self.logger.error(f"Database connection error: {e}")
             raise
@@ -255,6 +299,7 @@ class AuthService:
                         ON CONFLICT (user_id, group_id) DO NOTHING
                         """, (user_id, group_id, datetime.now()))
                     conn.commit()
+                    self.auth_cache.invalidate_user(user_id=user_id)
                     return {
                         'success': True,
                         'message': '성공적으로 생성되었습니다.'
@@ -281,6 +326,7 @@ class AuthService:
                             WHERE user_id = %s
                         """, (user_id,))
                         conn.commit()
+                        self.auth_cache.invalidate_user(user_id=user_id)
                         return {
                             'success': True,
                             'message': '모든 그룹 연결이 제거되었습니다.'
@@ -317,6 +363,7 @@ class AuthService:
                             """, (user_id, tuple(groups_to_remove)))
 
                         conn.commit()
+                        self.auth_cache.invalidate_user(user_id=user_id)
                         return {
                             'success': True,
                             'message': '그룹 업데이트에 성공했습니다.'
@@ -508,6 +555,7 @@ class AuthService:
                         WHERE user_id = %s AND group_id = %s
                         """, (user_id, group_id))
                     conn.commit()
+                    self.auth_cache.invalidate_user(user_id=user_id)
                     return {
                         'success': True,
                         'message': '성공적으로 생성되었습니다.'
@@ -643,6 +691,8 @@ class AuthService:
                             'message': '그룹을 찾을 수 없습니다.'
                         }
                     conn.commit()
+                    # 삭제된 그룹의 소속 정보가 캐시에 남지 않도록 전체 무효화
+                    self.auth_cache.clear()
                     return {
                         'success': True,
                         'message': '성공적으로 삭제되었습니다.'
@@ -669,6 +719,8 @@ class AuthService:
                     
                     updated_ids = [row[0] for row in cur.fetchall()]
                     conn.commit()
+                    for updated_id in updated_ids:
+                        self.auth_cache.invalidate_user(user_id=updated_id)
                     
                     return {
                         'success': True,
@@ -697,6 +749,7 @@ class AuthService:
                     
                     updated_ids = [row[0] for row in cur.fetchall()]
                     conn.commit()
+                    self.auth_cache.clear()
                     
                     return {
                         'success': True,
@@ -712,9 +765,14 @@ class AuthService:
         
 
     def verify_token(self, token: str) -> Optional[Dict]:
-        """JWT 토큰의 유효성을 검증합니다."""
+        """JWT 토큰의 유효성을 검증합니다. (검증된 클레임은 만료 전까지 캐시)"""
+        claims = self.auth_cache.get_claims(token)
+        if claims is not None:
+            return claims
         try:
-            return jwt.decode(token, self.jwt_secret_key, algorithms=['HS256'])
+            claims = jwt.decode(token, self.jwt_secret_key, algorithms=['HS256'])
+            self.auth_cache.put_claims(token, claims)
+            return claims
         except jwt.ExpiredSignatureError:
             raise ValueError('Token has expired')
         except jwt.InvalidTokenError:
@@ -732,16 +790,8 @@ class AuthService:
         Returns:
             str: 해시된 비밀번호
         """
-        try:
-            # 비밀번호를 바이트로 인코딩
-            password_bytes = password.encode('utf-8')
-            # salt 생성 및 해시화
-            salt = bcrypt.gensalt()
-            hashed = bcrypt.hashpw(password_bytes, salt)
-            # 해시된 비밀번호를 문자열로 디코딩
-            return hashed.decode('utf-8')
-        except Exception as e:            
-            raise
+        return self.password_hasher.hash(password)
+
     def _verify_password(self,plain_password: str, hashed_password: str) -> bool:
         """
         비밀번호 검증 함수
@@ -753,14 +803,8 @@ class AuthService:
         Returns:
             bool: 비밀번호 일치 여부
         """
-        try:
-            # 문자열을 바이트로 인코딩
-            plain_bytes = plain_password.encode('utf-8')
-            hashed_bytes = hashed_password.encode('utf-8')
-            # 비밀번호 검증
-            return bcrypt.checkpw(plain_bytes, hashed_bytes)
-        except Exception as e:        
-            return False
+        # 잘못된 해시 형식은 False, 워커 풀 포화/대기 시간 초과는 예외로 전달
+        return self.password_hasher.verify(plain_password, hashed_password)
         
     def _generate_token(self, user_id: int, username: str) -> str:
         payload = {
@@ -4,6 +4,7 @@ import logging
 from typing import Optional, Dict, Any
 from psycopg2.extras import RealDictCursor
 import json
+from backend.app.SessionActivityTracker import get_session_tracker
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -12,6 +13,8 @@ class SessionService:
     def __init__(self, conn):
         self.conn = conn
         self.session_duration = timedelta(hours=24)
+        # 검증 결과 캐시 + last_accessed 일괄 반영 (프로세스 전역)
+        self.tracker = get_session_tracker()
         
     def create_session(self, user_id: int, ip_address: str, user_agent: str) -> str:
         session_id = str(uuid.uuid4())
@@ -37,33 +40,8 @@ class SessionService:
             세션 정보 딕셔너리 또는 None
         """
         try:
-            with self.conn.cursor(cursor_factory=RealDictCursor) as cur:
-                cur.execute("""
-                    SELECT 
-                        u.id as user_id,
-                        u.username,
-                        u.email,
-                        s.expires_at,
-                        s.ip_address,
-                        s.created_at
-                    FROM sessions s
-                    JOIN users u ON s.user_id = u.id
-                    WHERE s.session_id = %s 
-                    AND s.is_active = true 
-                    AND s.expires_at > NOW()
-                """, (session_id,))
-                result = cur.fetchone()
-                
-                if result:
-                    # 세션 접근 시간 업데이트
-                    cur.execute("""
-                        UPDATE sessions 
-                        SET last_accessed = NOW()
-                        WHERE session_id = %s
-                    """, (session_id,))
-                    self.conn.commit()
-                    
-                return result
+            # 캐시에 있으면 DB 조회 없이 반환, last_accessed 는 모아서 반영
+            return self.tracker.lookup(self.conn, session_id)
 
         except Exception as e:
             self.conn.rollback()
@@ -79,6 +57,7 @@ class SessionService:
         Returns:
             성공 여부
         """
+        self.tracker.invalidate(session_id)
         try:
             with self.conn.cursor() as cur:
                 cur.execute("""
@@ -108,23 +87,11 @@ class SessionService:
             정리된 세션 수
         """
         try:
-            with self.conn.cursor() as cur:
-                cur.execute("""
-                    UPDATE sessions 
-                    SET 
-                        is_active = false,
-                        ended_at = NOW()
-                    WHERE expires_at < NOW()
-                    AND is_active = true
-                    RETURNING session_id
-                """)
-                cleaned_sessions = cur.fetchall()
-                self.conn.commit()
-                
-                count = len(cleaned_sessions)
-                if count > 0:
-                    logger.info(f"Cleaned up {count} expired sessions")
-                return count
+            # 한 번에 모든 행을 잠그지 않도록 청크 단위로 비활성화
+            count = self.tracker.expire_sessions(self.conn)
+            if count > 0:
+                logger.info(f"Cleaned up {count} expired sessions")
+            return count
 
         except Exception as e:
             self.conn.rollback()
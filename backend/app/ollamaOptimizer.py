@@ -8,10 +8,29 @@ import os, time
 import psutil
 import queue
 
+from backend.app.LLMRateLimiter import get_rate_limiter, estimate_tokens, record_token_usage
+
 # 로거 설정
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.DEBUG)
 
+class StreamInterruptedError(RuntimeError):
+    """토큰을 이미 전달한 뒤 스트리밍이 끊긴 경우 (재시도하면 같은 토큰을 다시 보내므로 재시도하지 않음)"""
+
+
+class ModelNotAvailableError(RuntimeError):
+    """요청한 모델이 Ollama 서버에 설치되어 있지 않은 경우 (요청 경로에서는 pull 하지 않으므로 API 는 503 으로 응답)"""
+
+
+def normalize_model_name(model_name):
+    """태그가 없는 모델 이름은 ':latest' 로 취급 ('llama3' 와 'llama3:latest' 는 같은 모델)"""
+    model_name = (model_name or "").strip()
+    # 레지스트리 주소의 포트(host:5000/model)는 태그가 아니므로 마지막 경로만 확인
+    if model_name and ':' not in model_name.rsplit('/', 1)[-1]:
+        return f"{model_name}:latest"
+    return model_name
+
+
 class OllamaAPIClient:
     """Ollama API에 직접 HTTP 요청을 보내는 클래스"""
     
@@ -19,6 +38,10 @@ class OllamaAPIClient:
         self.base_url = base_url or os.environ.get('OLLAMA_HOST', 'http://localhost:11434')
         self.api_url = f"{self.base_url}/api"
         self.session = requests.Session()
+        # 모델 메모리 유지 시간 (요청마다 keep_alive 로 전달, 예: "30m", -1 은 무기한)
+        self.keep_alive = os.environ.get('OLLAMA_KEEP_ALIVE', '30m')
+        self.connect_timeout = 10
+        self.stream_read_timeout = int(os.environ.get('OLLAMA_STREAM_TIMEOUT', '120'))
         
         # 연결 유지 설정
         adapter = requests.adapters.HTTPAdapter(
@@ -35,38 +58,107 @@ class OllamaAPIClient:
         response.raise_for_status()
         return response.json().get('models', [])
     
-    def generate(self, model_name, prompt, system_message=None, options=None):
-        """모델에 프롬프트를 전송하고 응답을 생성합니다."""
+    def list_running_models(self):
+        """메모리에 올라와 있는 모델 목록을 가져옵니다."""
+        response = self.session.get(f"{self.api_url}/ps", timeout=30)
+        response.raise_for_status()
+        return response.json().get('models', [])
+    
+    def _build_payload(self, model_name, prompt, system_message, options, stream, keep_alive):
         full_prompt = f"{system_message}\n\n{prompt}" if system_message else prompt
-        
         payload = {
             "model": model_name,
             "prompt": full_prompt,
-            "stream": False
+            "stream": stream
         }
-        
         # 옵션이 있으면 추가
         if options:
             payload["options"] = options
-            
-        start_time = time.time()
-        
-        response = self.session.post(
+        keep_alive = keep_alive if keep_alive is not None else self.keep_alive
+        if keep_alive:
+            payload["keep_alive"] = keep_alive
+        return payload
+    
+    def generate_stream(self, model_name, prompt, system_message=None, options=None, keep_alive=None):
+        """
+        NDJSON 스트리밍으로 응답을 생성합니다.
+        토큰 조각마다 {'response': str, 'done': False} 를, 마지막에 통계가 담긴 {'done': True, ...} 를 yield 합니다.
+        """
+        payload = self._build_payload(model_name, prompt, system_message, options, True, keep_alive)
+        with self.session.post(
             f"{self.api_url}/generate",
             json=payload,
-            timeout=300  # 긴 타임아웃 설정
-        )
-        response.raise_for_status()
-        result = response.json()
+            stream=True,
+            timeout=(self.connect_timeout, self.stream_read_timeout)  # 조각 사이 대기 시간 기준
+        ) as response:
+            response.raise_for_status()
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("error"):
+                    raise RuntimeError(chunk["error"])
+                yield chunk
+                if chunk.get("done"):
+                    break
+    
+    def generate(self, model_name, prompt, system_message=None, options=None,
+                 stream=False, keep_alive=None, on_token=None):
+        """
+        모델에 프롬프트를 전송하고 응답을 생성합니다.
+        
+        Args:
+            stream (bool): True 이면 NDJSON 스트리밍으로 받아 on_token 으로 조각을 전달
+            keep_alive (str|int): 모델을 메모리에 유지할 시간 (예: "30m", -1 은 무기한)
+            on_token (callable): 스트리밍 시 토큰 조각을 받을 콜백
+        """
+        start_time = time.time()
+        
+        if stream:
+            parts = []
+            result = {}
+            for chunk in self.generate_stream(model_name, prompt, system_message, options, keep_alive):
+                piece = chunk.get("response", "")
+                if piece:
+                    parts.append(piece)
+                    if on_token:
+                        on_token(piece)
+                if chunk.get("done"):
+                    result = chunk
+            response_text = "".join(parts)
+        else:
+            payload = self._build_payload(model_name, prompt, system_message, options, False, keep_alive)
+            response = self.session.post(
+                f"{self.api_url}/generate",
+                json=payload,
+                timeout=(self.connect_timeout, 300)  # 긴 타임아웃 설정
+            )
+            response.raise_for_status()
+            result = response.json()
+            response_text = result.get("response", "")
         
         # 결과 포맷팅
         return {
-            "response": result.get("response", ""),
+            "response": response_text,
             "prompt_eval_count": result.get("prompt_eval_count", 0),
             "eval_count": result.get("eval_count", 0),
+            # Ollama 는 나노초 단위로 반환
+            "load_duration": result.get("load_duration", 0) / 1e9,
             "total_duration": time.time() - start_time
         }
     
+    def load_model(self, model_name, keep_alive=None):
+        """빈 프롬프트로 모델을 메모리에 올리고 로드 시간(초)을 반환합니다."""
+        payload = {"model": model_name}
+        keep_alive = keep_alive if keep_alive is not None else self.keep_alive
+        if keep_alive:
+            payload["keep_alive"] = keep_alive
+        start_time = time.time()
+        response = self.session.post(f"{self.api_url}/generate", json=payload, timeout=(self.connect_timeout, 600))
+        response.raise_for_status()
+        result = response.json()
+        return result.get("load_duration", 0) / 1e9 or (time.time() - start_time)
+    
     def pull_model(self, model_name):
         """모델을 다운로드합니다."""
         payload = {"name": model_name}
@@ -85,6 +177,7 @@ class OllamaConnectionPool:
         self.pool_size = pool_size
         self.base_url = base_url
         self.clients = queue.Queue(maxsize=pool_size)
+        self._local = threading.local()
         self._init_clients()
         
     def _init_clients(self):
@@ -110,11 +203,16 @@ class OllamaConnectionPool:
             client.close()
     
     def __enter__(self):
-        self.current_client = self.get_client()
-        return self.current_client
+        # 워밍업과 요청이 동시에 풀을 사용하므로 스레드별로 대여한 클라이언트를 보관
+        stack = getattr(self._local, 'clients', None)
+        if stack is None:
+            stack = self._local.clients = []
+        client = self.get_client()
+        stack.append(client)
+        return client
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        self.release_client(self.current_client)
+        self.release_client(self._local.clients.pop())
     
     def close_all(self):
         """모든 클라이언트 연결 종료"""
@@ -142,38 +240,148 @@ class OllamaFullGPUOptimizer:
         # 요청 처리 세마포어 - 동시 요청 수 제한
         self.request_semaphore = threading.Semaphore(max_workers)
         
+        # 공유 속도 제한기 (사용자 간 공정 스케줄링 및 백오프 재시도)
+        self.rate_limiter = get_rate_limiter()
+        
         # 모델 로드 상태 추적
         self.loaded_models = set()
+        self.available_models = set()
+        self.available_models_checked_at = 0.0
+        # 요청 경로에서 설치되지 않은 모델을 pull 할지 여부 (기본값 false - 수 GB 다운로드가 요청을 막지 않도록
+        # 시작 시 OLLAMA_PULL_ON_STARTUP 또는 관리자 워밍업 API(pull=true)로 설치)
+        self.pull_on_demand = os.environ.get('OLLAMA_PULL_ON_DEMAND', 'false').lower() == 'true'
+        self.model_load_stats = {}
         self.model_load_lock = threading.RLock()
         
         logger.info(f"Connecting to Ollama server at: {self.host_name}")
         logger.info(f"Connection pool size: {connection_pool_size}, Max workers: {max_workers}")
     
+    def _refresh_available_models(self):
+        """서버에 설치된 모델 목록 갱신 (조회는 잠금 밖에서, 결과 반영만 잠금 안에서)"""
+        with self.connection_pool as client:
+            models = client.list_models()
+        with self.model_load_lock:
+            self.available_models = {normalize_model_name(model.get('name')) for model in models}
+            self.available_models_checked_at = time.time()
+    
     def ensure_model_loaded(self, model_name):
-        """모델이 서버에 로드되어 있는지 확인하고 로드되지 않았다면 로드합니다."""
+        """
+        모델이 서버에 설치되어 있는지 확인합니다. 설치되지 않았으면 ModelNotAvailableError.
+
+        요청 경로에서는 pull 하지 않는다 (warmup_models(pull_missing=True) 시작/관리자 작업으로 설치).
+        OLLAMA_PULL_ON_DEMAND=true 일 때만 요청 경로에서 pull 하며, 목록 조회와 pull 같은 네트워크 호출 동안
+        model_load_lock 을 잡지 않는다 (다른 요청과 통계 조회가 기다리지 않도록).
+        """
+        model_key = normalize_model_name(model_name)
         with self.model_load_lock:
-            if model_name in self.loaded_models:
-                return
-            
-            logger.info(f"Checking if model {model_name} is loaded...")
+            if model_key in self.loaded_models:
+                return True
+            # 설치 목록은 짧은 주기로만 다시 조회 (목록에 없으면 한 번 더 확인)
+            stale = model_key not in self.available_models or time.time() - self.available_models_checked_at > 60
+        
+        if stale:
+            try:
+                self._refresh_available_models()
+            except Exception as e:
+                logger.error(f"Error ensuring model is loaded: {str(e)}")
+                # 목록 조회 실패 시에는 서버가 직접 판단하도록 요청을 진행
+                return True
+        
+        if model_key not in self.available_models:
+            if not self.pull_on_demand:
+                logger.error(f"Model {model_name} is not installed on the Ollama server. Run the warmup/pull admin task first.")
+                raise ModelNotAvailableError(f"Model {model_name} is not available on the Ollama server")
             try:
+                logger.info(f"Model {model_name} not installed, pulling now (OLLAMA_PULL_ON_DEMAND=true)...")
                 with self.connection_pool as client:
-                    # 모델 정보 확인
-                    models = client.list_models()
-                    model_names = [model.get('name') for model in models]
-                    
-                    if model_name in model_names:
-                        logger.info(f"Model {model_name} is already loaded")
-                        self.loaded_models.add(model_name)
-                        return
-                    
-                    # 모델이 로드되어 있지 않으면 로드
-                    logger.info(f"Model {model_name} not loaded, loading now...")
                     client.pull_model(model_name)
-                    self.loaded_models.add(model_name)
-                    logger.info(f"Model {model_name} successfully loaded")
             except Exception as e:
-                logger.error(f"Error ensuring model is loaded: {str(e)}")
+                logger.error(f"Error pulling model {model_name}: {str(e)}")
+                raise ModelNotAvailableError(f"Model {model_name} is not available on the Ollama server") from e
+            logger.info(f"Model {model_name} successfully pulled")
+        
+        with self.model_load_lock:
+            self.available_models.add(model_key)
+            self.loaded_models.add(model_key)
+        return True
+    
+    def record_load_latency(self, model_name, seconds):
+        """모델별 로드 지연 시간 기록"""
+        if seconds is None:
+            return
+        with self.model_load_lock:
+            stats = self.model_load_stats.setdefault(model_name, {
+                "load_count": 0,
+                "total_load_seconds": 0.0,
+                "max_load_seconds": 0.0,
+                "last_load_seconds": 0.0,
+                "cold_loads": 0
+            })
+            stats["load_count"] += 1
+            stats["total_load_seconds"] += seconds
+            stats["max_load_seconds"] = max(stats["max_load_seconds"], seconds)
+            stats["last_load_seconds"] = seconds
+            # 1초 이상이면 메모리에 없던 모델을 새로 올린 것으로 간주
+            if seconds >= 1.0:
+                stats["cold_loads"] += 1
+    
+    def get_model_stats(self):
+        """모델별 로드 지연 통계 조회"""
+        with self.model_load_lock:
+            result = {}
+            for model_name, stats in self.model_load_stats.items():
+                result[model_name] = {
+                    **stats,
+                    "avg_load_seconds": stats["total_load_seconds"] / stats["load_count"] if stats["load_count"] else 0.0
+                }
+            return result
+    
+    def warmup_models(self, model_names, pull_missing=False, keep_alive=None):
+        """
+        모델을 미리 메모리에 올립니다. (시작 시 또는 관리자 작업에서 호출)
+        
+        Args:
+            model_names (list): 워밍업할 모델 이름 목록
+            pull_missing (bool): 설치되지 않은 모델을 pull 할지 여부
+            keep_alive (str|int): 메모리 유지 시간
+        
+        Returns:
+            dict: 모델별 결과 {'status': 'loaded'|'missing'|'error', 'load_seconds': float}
+        """
+        results = {}
+        try:
+            self._refresh_available_models()
+        except Exception as e:
+            logger.error(f"Error listing Ollama models: {str(e)}")
+        
+        for model_name in model_names:
+            try:
+                with self.connection_pool as client:
+                    if normalize_model_name(model_name) not in self.available_models:
+                        if not pull_missing:
+                            results[model_name] = {"status": "missing"}
+                            continue
+                        logger.info(f"Pulling model {model_name}...")
+                        client.pull_model(model_name)
+                        with self.model_load_lock:
+                            self.available_models.add(normalize_model_name(model_name))
+                    
+                    load_seconds = client.load_model(model_name, keep_alive=keep_alive)
+                self.record_load_latency(model_name, load_seconds)
+                with self.model_load_lock:
+                    self.loaded_models.add(normalize_model_name(model_name))
+                results[model_name] = {"status": "loaded", "load_seconds": load_seconds}
+                logger.info(f"Model {model_name} warmed up in {load_seconds:.2f} seconds")
+            except Exception as e:
+                logger.error(f"Error warming up model {model_name}: {str(e)}")
+                results[model_name] = {"status": "error", "error": str(e)}
+        return results
+    
+    def start_warmup(self, model_names, pull_missing=False, keep_alive=None):
+        """워밍업을 백그라운드에서 실행합니다. (요청 스레드를 막지 않음)"""
+        if not model_names:
+            return None
+        return self.executor.submit(self.warmup_models, list(model_names), pull_missing, keep_alive)
     
     def direct_ollama_generate(self, model_name, prompt, system_message=None, **kwargs):
         """
@@ -188,61 +396,91 @@ class OllamaFullGPUOptimizer:
         Returns:
             dict: 생성된 응답과 메타데이터를 포함하는 딕셔너리
         """
-        # 세마포어를 사용하여 동시 요청 수 제한
-        with self.request_semaphore:
-            start_time = time.time()
+        start_time = time.time()
+        
+        try:
+            # 모델 설치 확인 (설치되지 않았으면 ModelNotAvailableError - 호출자가 503 으로 응답)
+            self.ensure_model_loaded(model_name)
             
-            try:
-                # 모델 로드 확인
-                self.ensure_model_loaded(model_name)
-                
-                # 시스템 프롬프트 설정
-                system_prompt = system_message if system_message else """
-                    You are an intelligent assistant. 
-                    You always provide well-reasoned, structured, and comprehensive answers.
-                    Please provide your answer in Korean, ensuring it is natural and fluent.
-                """
-                
-                # 옵션 설정 - GPU를 최대한 활용하기 위해 옵션을 전달하지 않음
-                # Ollama 서버의 기본 설정을 사용하게 함 (일반적으로 가능한 모든 GPU 사용)
-                options = kwargs.get('options', None)
-                
-                # 연결 풀에서 클라이언트 가져오기
-                with self.connection_pool as client:
-                    # 요청 전송
-                    response = client.generate(
-                        model_name=model_name,
-                        prompt=prompt,
-                        system_message=system_prompt,
-                        options=options
-                    )
-                    
-                    # 결과 포맷팅
-                    result = {
-                        "content": response["response"],
-                        "metadata": {
-                            "model": model_name,
-                            "usage": {
-                                "prompt_tokens": response.get("prompt_eval_count", 0),
-                                "completion_tokens": response.get("eval_count", 0),
-                                "total_duration": response.get("total_duration", time.time() - start_time)
-                            },
-                            "gpu_used": True  # 직접 API 요청은 서버의 GPU 설정을 사용
-                        }
-                    }
-                    
-                    logger.info(f"Response generated in {result['metadata']['usage']['total_duration']:.2f} seconds")
-                    return result
+            # 시스템 프롬프트 설정
+            system_prompt = system_message if system_message else """
+                You are an intelligent assistant. 
+                You always provide well-reasoned, structured, and comprehensive answers.
+                Please provide your answer in Korean, ensuring it is natural and fluent.
+            """
             
-            except Exception as e:
-                error_msg = f"Processing error: {str(e)}"
-                logger.error(error_msg)
-                return {"content": f"Error: {str(e)}", "metadata": {"error": str(e)}}
+            # 옵션 설정 - GPU를 최대한 활용하기 위해 옵션을 전달하지 않음
+            # Ollama 서버의 기본 설정을 사용하게 함 (일반적으로 가능한 모든 GPU 사용)
+            options = kwargs.get('options', None)
+            
+            # 스트리밍은 첫 토큰을 전달하기 전까지만 재시도 (이후 재시도하면 같은 토큰을 다시 보냄)
+            on_token = kwargs.get('on_token')
+            emitted = [0]
+            
+            def forward_token(piece):
+                emitted[0] += 1
+                on_token(piece)
+            
+            def generate_once():
+                # 세마포어(동시 요청 수 제한)와 풀 클라이언트는 호출하는 동안만 점유
+                # (속도 제한기의 재시도 대기 중에는 다른 요청이 사용할 수 있도록 반납)
+                with self.request_semaphore:
+                    with self.connection_pool as client:
+                        try:
+                            return client.generate(
+                                model_name=model_name,
+                                prompt=prompt,
+                                system_message=system_prompt,
+                                options=options,
+                                stream=kwargs.get('stream', False),
+                                keep_alive=kwargs.get('keep_alive'),
+                                on_token=forward_token if on_token else None
+                            )
+                        except Exception as e:
+                            if emitted[0]:
+                                raise StreamInterruptedError(
+                                    f"Ollama stream interrupted after {emitted[0]} chunks: {type(e).__name__}"
+                                ) from e
+                            raise
+            
+            # 요청 전송 (속도 제한기 경유)
+            response = self.rate_limiter.call(
+                "Ollama",
+                generate_once,
+                tokens=estimate_tokens(f"{system_prompt}{prompt}"),
+                usage_fn=lambda r: r.get("prompt_eval_count", 0) + r.get("eval_count", 0)
+            )
+            
+            # 결과 포맷팅
+            result = {
+                "content": response["response"],
+                "metadata": {
+                    "model": model_name,
+                    "usage": {
+                        "prompt_tokens": response.get("prompt_eval_count", 0),
+                        "completion_tokens": response.get("eval_count", 0),
+                        "total_duration": response.get("total_duration", time.time() - start_time)
+                    },
+                    "load_duration": response.get("load_duration", 0),
+                    "gpu_used": True  # 직접 API 요청은 서버의 GPU 설정을 사용
+                }
+            }
+            self.record_load_latency(model_name, response.get("load_duration"))
+            record_token_usage("Ollama", model_name,
+                               response.get("prompt_eval_count", 0), response.get("eval_count", 0))
+            
+            logger.info(f"Response generated in {result['metadata']['usage']['total_duration']:.2f} seconds")
+            return result
+        
+        except ModelNotAvailableError:
+            raise
+        except Exception as e:
+            error_msg = f"Processing error: {str(e)}"
+            logger.error(error_msg)
+            return {"content": f"Error: {str(e)}", "metadata": {"error": str(e)}}
     
     def batch_process(self, prompts, model_name, system_message=None, **kwargs):
         """여러 프롬프트를 병렬로 처리합니다."""
-        # 모델 로드 확인
-        self.ensure_model_loaded(model_name)
         
         # 병렬 처리를 위한 작업 제출
         futures = []
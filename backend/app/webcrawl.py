@@ -2,13 +2,11 @@ import asyncio
 from playwright.async_api import async_playwright
 from typing import Dict, List
 import re
+from backend.app.TextNormalizer import collapse_whitespace
 
 def clean_text(text: str) -> str:
-    """텍스트 클리닝 함수"""
-    # 연속된 공백 제거
-    text = re.sub(r'\s+', ' ', text)
-    # 앞뒤 공백 제거
-    return text.strip()
+    """텍스트 클리닝 함수 (연속된 공백 제거, 앞뒤 공백 제거)"""
+    return collapse_whitespace(text)
 
 def is_meaningful_text(text: str, min_length: int = 10) -> bool:
     """의미있는 텍스트인지 판단하는 함수"""
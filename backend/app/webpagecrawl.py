@@ -5,33 +5,13 @@ from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
 from typing import List, Dict, Optional
 from bs4 import BeautifulSoup
 import re
-
-def get_content_patterns() -> List[str]:
-    """일반적인 콘텐츠 관련 클래스/ID 패턴"""
-    return [
-        # 기본 콘텐츠 패턴
-        'content', 'contents', 'article', 'post',
-        # 변형 패턴들
-        'article-content', 'post-content', 'entry-content',
-        'main-content', 'page-content', 'body-content',
-        # 본문 관련
-        'body-text', 'article-body', 'post-body', 'text-body',
-        # 추가 일반적인 패턴
-        'text', 'main', 'story', 'article-text', 'article_text'
-    ]
+from backend.app.TextNormalizer import clean_web_text
+# 본문 영역/제목 탐지는 crawl4ai 없이 쓸 수 있도록 HtmlContent 로 분리 (기존 이름으로 계속 import 가능)
+from backend.app.HtmlContent import get_content_patterns, analyze_content_block, extract_main_content, extract_title
 
 def clean_text(text: str) -> str:
-    """텍스트 클리닝 함수"""
-    # URL과 링크 정보 제거
-    text = re.sub(r'https?://\S+', '', text)  # URL 제거
-    text = re.sub(r'출처\s*:\s*.*$', '', text, flags=re.MULTILINE)  # 출처 정보 제거
-    text = re.sub(r'\([^)]*?(링크|http|www|\.com|\.kr)[^)]*?\)', '', text)  # 괄호 안의 링크 정보 제거
-    
-    # 불필요한 공백 제거
-    text = re.sub(r'\s+', ' ', text)
-    text = text.strip()
-    
-    return text
+    """텍스트 클리닝 함수 (URL, 출처 정보, 괄호 안의 링크 정보 제거 후 공백 정리)"""
+    return clean_web_text(text)
 
 def split_into_sentences(text: str) -> List[str]:
     """텍스트를 문장 단위로 분리하는 함수"""
@@ -45,8 +25,9 @@ def split_into_sentences(text: str) -> List[str]:
     # 문장 분리
     sentences = re.split(pattern, text)
     
-    # 빈 문장 제거하고 클리닝
-    return [clean_text(sent) for sent in sentences if clean_text(sent)]
+    # 문장마다 한 번만 클리닝하고 빈 문장 제거
+    cleaned = (clean_text(sent) for sent in sentences)
+    return [sent for sent in cleaned if sent]
 
 def is_valid_sentence(text: str) -> bool:
     """
@@ -92,8 +73,7 @@ def get_continuous_sentences(text: str, min_length: int = 10) -> List[str]:
     
     # 의미 있는 문장만 필터링
     meaningful_sentences = []
-    for sentence in sentences:
-        cleaned_sentence = clean_text(sentence)
+    for cleaned_sentence in sentences:  # split_into_sentences 가 이미 정제한 문장
         # 최소 길이, 불필요한 패턴 체크, 문장 구조 체크
         if (len(cleaned_sentence) >= min_length and 
             not any(pattern in cleaned_sentence.lower() for pattern in [
@@ -108,65 +88,6 @@ def get_continuous_sentences(text: str, min_length: int = 10) -> List[str]:
     
     return meaningful_sentences
 
-def analyze_content_block(element) -> float:
-    """HTML 요소의 콘텐츠 점수를 계산"""
-    if not element:
-        return 0
-    
-    text = element.get_text()
-    words = len(text.split())
-    tags = len(element.find_all())
-    paragraphs = len(element.find_all('p'))
-    links = len(element.find_all('a'))
-    
-    # 점수 계산
-    score = words * 1.0  # 기본 점수는 단어 수
-    if tags > 0:
-        score *= (paragraphs / tags)  # 단락 비율 반영
-    if links > 0 and words > 0:
-        score *= (1 - (links / words))  # 링크 비율 반영
-    
-    return score
-
-def extract_main_content(soup: BeautifulSoup) -> Optional[BeautifulSoup]:
-    """HTML에서 주요 콘텐츠 영역을 추출"""
-    candidates = []
-    
-    # 1. 클래스/ID 기반 검색
-    for pattern in get_content_patterns():
-        elements = soup.find_all(class_=lambda x: x and pattern.lower() in x.lower())
-        candidates.extend(elements)
-        
-        elements = soup.find_all(id=lambda x: x and pattern.lower() in x.lower())
-        candidates.extend(elements)
-    
-    # 2. 태그 기반 검색
-    main_tags = ['article', 'main', 'section','body-text']
-    for tag in main_tags:
-        elements = soup.find_all(tag)
-        candidates.extend(elements)
-    
-    # 3. 점수 기반 선택
-    best_element = None
-    best_score = 0
-    
-    for element in candidates:
-        score = analyze_content_block(element)
-        if score > best_score:
-            best_score = score
-            best_element = element
-    
-    # 4. 대안 검색
-    if not best_element or best_score < 100:  # 임계값 조정 가능
-        # div 태그 중에서 가장 많은 텍스트를 포함한 요소 찾기
-        for div in soup.find_all('div'):
-            score = analyze_content_block(div)
-            if score > best_score:
-                best_score = score
-                best_element = div
-    
-    return best_element
-
 async def extract_text_from_page(url: str) -> Dict[str, any]:
     """웹페이지에서 텍스트를 추출하는 함수"""
     browser_config = BrowserConfig(
@@ -193,22 +114,11 @@ async def extract_text_from_page(url: str) -> Dict[str, any]:
             main_content = extract_main_content(soup)
             
             if main_content:
-                text = clean_text(main_content.get_text())
-                sentences = get_continuous_sentences(text)
+                # get_continuous_sentences 가 정제하므로 여기서 다시 정제하지 않음
+                sentences = get_continuous_sentences(main_content.get_text())
                 
                 # 제목 추출 시도
-                title = ""
-                title_candidates = [
-                    soup.find('h1'),
-                    soup.find(class_=lambda x: x and 'title' in x.lower()),
-                    soup.find(id=lambda x: x and 'title' in x.lower())
-                ]
-                
-                for candidate in title_candidates:
-                    if candidate:
-                        title = clean_text(candidate.get_text())
-                        if title:
-                            break
+                title = extract_title(soup)
                 
                 return {
                     'title': title,